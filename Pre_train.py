@@ -4,6 +4,10 @@ from sklearn.neural_network import MLPRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_absolute_error, r2_score
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gateway'))
+from gateway_MLP_int8 import calibrate_scales, int8_c_constants
 
 FILE_NAME = './dataset/Pre_train_Dataset.csv'
 COL_TIME = 'timestamp'
@@ -15,6 +19,7 @@ N_FEATURES = 3   # temp, hum, time_n
 N_IN = WINDOW_SIZE * N_FEATURES  # 12
 H1_SIZE = 64
 H2_SIZE = 32
+EDGE_LR = 0.01   # MLP_edge_sensor.ino lr (int8 학습 배율 산출용)
 
 
 def train_offline_mlp(file_path):
@@ -117,7 +122,7 @@ def train_offline_mlp(file_path):
 
     # ===================== Gateway Python 코드 출력 =====================
     print("\n" + "=" * 60)
-    print("   Gateway Python Code")
+    print("   Gateway Python Code (gateway/gateway_params.py)")
     print("=" * 60)
 
     print(f"X_MEAN = {scaler_X.mean_.tolist()}")
@@ -131,6 +136,19 @@ def train_offline_mlp(file_path):
     print(f"W3 = {W3.tolist()}")
     print(f"B3 = {B3.tolist()}")
 
+    # ===================== int8 양자화 =====================
+    scales = calibrate_scales(W1, B1, W2, B2, W3, B3, X_scaled)
+    print("\n" + "=" * 60)
+    print("   Gateway Python Code — int8 (gateway/gateway_params.py QUANT_SCALES)")
+    print("=" * 60)
+    print(f"QUANT_SCALES = {scales}")
+
+    print("\n" + "=" * 60)
+    print("   ESP32 Code — int8 (edge_node/MLP_edge_sensor_int8.ino)")
+    print("=" * 60)
+    print_int8_code(W1, B1, W2, B2, W3, B3, scaler_X.mean_, np.sqrt(scaler_X.var_),
+                    scaler_y.mean_, np.sqrt(scaler_y.var_), scales)
+
     # ===================== 정확도 확인 =====================
     y_pred = scaler_y.inverse_transform(mlp.predict(X_scaled))
     r2 = r2_score(y, y_pred)
@@ -140,5 +158,10 @@ def train_offline_mlp(file_path):
     print(f"MAE Temp: {mae_t:.4f}°C, MAE Hum: {mae_h:.4f}%")
 
 
+def print_int8_code(W1, B1, W2, B2, W3, B3, x_mean, x_std, y_mean, y_std, scales, lr=EDGE_LR):
+    """int8 스케치용 상수 출력 (gateway_MLP_int8.int8_c_constants)."""
+    print(int8_c_constants(W1, B1, W2, B2, W3, B3, x_mean, x_std, y_mean, y_std, scales, lr))
+
+
 if __name__ == "__main__":
     train_offline_mlp(FILE_NAME)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+실험 로그 분석: edge_node/edge_log_*.csv 및 비교군 로그 → README 결과 표 재생성.
+실행: python analysis/experiment_analytics.py [--no-cache] [--json]
+
+- 각 CSV를 NumPy 컬럼 배열로 파싱하고, CSV 옆에 `.<파일명>.cache.npz`로 캐시 (mtime/size, 내용 해시 기준)
+- 로그별 TX 절감률(24시간 환산), MAE/MAPE, inference_time_us 분포, heap 사용량 계산
+"""
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import hashlib
+import argparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 분석 대상 로그 (없는 파일은 건너뜀)
+LOG_PATTERNS = [
+    "edge_node/edge_log_*.csv",
+    "experiment_log_online.csv",
+    "experiment_log_threshold.csv",
+    "raw_24h_dataset.csv",
+    "compare_group_logging/experiment_log_threshold.csv",
+    "compare_group_logging/raw_24h_dataset.csv",
+]
+
+PERIODIC_TX_PER_DAY = 1440  # 1분 주기 전송 기준
+DAY_SEC = 86400
+CACHE_VERSION = 1
+
+# status 문자열 → 정수 코드 (edge_log의 status, 비교군 로그의 Event)
+STATUS_SKIP = 0
+STATUS_SEND = 1
+STATUS_HEARTBEAT = 2
+_STATUS_CODES = {"SKIP": STATUS_SKIP, "EST": STATUS_SKIP, "SEND & TRAIN": STATUS_SEND, "RX": STATUS_SEND, "HEARTBEAT": STATUS_HEARTBEAT}
+
+# 로그 종류별 헤더 → 공통 컬럼 매핑 (None이면 해당 컬럼 없음)
+_SCHEMAS = {
+    # edge_serial_logger_*.py
+    "edge": {
+        "timestamp": "timestamp", "actual_t": "actual_t", "actual_h": "actual_h",
+        "pred_t": "pred_t", "pred_h": "pred_h", "error_t": "error_t", "error_h": "error_h",
+        "status": "status", "inference_time_us": "inference_time_us",
+        "free_heap": "free_heap", "total_heap": "total_heap",
+    },
+    # threshold_edge_logger.py, mqtt_to_csv.py (RX/EST)
+    "event": {
+        "timestamp": "Timestamp", "actual_t": "Actual_T", "actual_h": "Actual_H",
+        "pred_t": "Pred_T", "pred_h": "Pred_H", "error_t": "Error_T", "error_h": "Error_H",
+        "status": "Event", "inference_time_us": None, "free_heap": None, "total_heap": None,
+    },
+    # normal_edge_logger.py (1분 주기 전송, 예측 없음)
+    "periodic": {
+        "timestamp": "Timestamp", "actual_t": "Temperature", "actual_h": "Humidity",
+        "pred_t": None, "pred_h": None, "error_t": None, "error_h": None,
+        "status": None, "inference_time_us": None, "free_heap": None, "total_heap": None,
+    },
+}
+
+FLOAT_COLUMNS = ["actual_t", "actual_h", "pred_t", "pred_h", "error_t", "error_h"]
+INT_COLUMNS = ["inference_time_us", "free_heap", "total_heap"]
+
+
+def find_logs(root=ROOT):
+    paths = []
+    for pattern in LOG_PATTERNS:
+        paths.extend(sorted(glob.glob(os.path.join(root, pattern))))
+    return paths
+
+
+def _detect_schema(header):
+    cols = set(header)
+    for kind, mapping in _SCHEMAS.items():
+        if all(src in cols for src in mapping.values() if src):
+            return kind
+    return None
+
+
+def _to_float(values):
+    out = np.full(len(values), np.nan, dtype=np.float64)
+    for i, v in enumerate(values):
+        try:
+            out[i] = float(v)
+        except ValueError:
+            pass
+    return out
+
+
+def parse_log(path):
+    """CSV 한 파일 → {컬럼명: np.ndarray}. 알 수 없는 헤더면 None."""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader, [])]
+        rows = [r for r in reader if len(r) == len(header)]
+    kind = _detect_schema(header)
+    if kind is None:
+        return None
+    mapping = _SCHEMAS[kind]
+    raw = list(zip(*rows)) if rows else [()] * len(header)
+    by_name = dict(zip(header, raw))
+    n = len(rows)
+
+    cols = {"kind": np.array(kind)}
+    ts = np.array([s.strip().replace(" ", "T") for s in by_name[mapping["timestamp"]]], dtype="datetime64[s]")
+    cols["ts"] = ts.astype(np.int64)
+    for name in FLOAT_COLUMNS:
+        src = mapping[name]
+        cols[name] = _to_float(by_name[src]) if src else np.full(n, np.nan)
+    for name in INT_COLUMNS:
+        src = mapping[name]
+        cols[name] = np.nan_to_num(_to_float(by_name[src])).astype(np.int64) if src else np.zeros(n, dtype=np.int64)
+    src = mapping["status"]
+    if src:
+        cols["status"] = np.array([_STATUS_CODES.get(s.strip(), STATUS_SKIP) for s in by_name[src]], dtype=np.int8)
+    else:
+        cols["status"] = np.full(n, STATUS_SEND, dtype=np.int8)  # 주기 전송: 전부 TX
+    return cols
+
+
+def _cache_path(path):
+    d, name = os.path.split(path)
+    return os.path.join(d, f".{name}.cache.npz")
+
+
+def _file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_log(path, use_cache=True):
+    """캐시 우선 로드. mtime/size가 같으면 즉시 사용, 다르면 내용 해시로 재검증 후 필요 시 재파싱."""
+    st = os.stat(path)
+    cache = _cache_path(path)
+    digest = None
+    if use_cache and os.path.exists(cache):
+        try:
+            with np.load(cache, allow_pickle=False) as z:
+                cached = {k: z[k] for k in z.files}
+            if int(cached["_version"]) == CACHE_VERSION:
+                if int(cached["_mtime_ns"]) == st.st_mtime_ns and int(cached["_size"]) == st.st_size:
+                    return {k: v for k, v in cached.items() if not k.startswith("_")}
+                digest = _file_digest(path)
+                if str(cached["_digest"]) == digest:
+                    cols = {k: v for k, v in cached.items() if not k.startswith("_")}
+                    _write_cache(cache, cols, st, digest)
+                    return cols
+        except Exception:
+            pass  # 손상된 캐시는 무시하고 재파싱
+    cols = parse_log(path)
+    if cols is not None and use_cache:
+        _write_cache(cache, cols, st, digest or _file_digest(path))
+    return cols
+
+
+def _write_cache(cache, cols, st, digest):
+    try:
+        np.savez(
+            cache,
+            _version=CACHE_VERSION,
+            _mtime_ns=st.st_mtime_ns,
+            _size=st.st_size,
+            _digest=np.array(digest),
+            **cols,
+        )
+    except OSError as e:
+        print(f"cache write skipped ({cache}): {e}")
+
+
+def _percentiles(x, qs=(50, 95, 99)):
+    if x.size == 0:
+        return {f"p{q}": None for q in qs}
+    return {f"p{q}": float(v) for q, v in zip(qs, np.percentile(x, qs))}
+
+
+def compute_metrics(cols):
+    """
+    로그 컬럼 → 요약 지표. TX는 SEND 건수(README 표와 동일, 하트비트 제외).
+    절감률은 24시간 환산 TX(tx_per_day)의 1일 1,440회 대비 — 로그 길이(24~26.5시간)에 따라 치우치지 않도록.
+    """
+    ts = cols["ts"]
+    status = cols["status"]
+    n = ts.size
+    if n == 0:
+        return {"rows": 0}
+    duration = float(ts[-1] - ts[0])
+    tx = int(np.count_nonzero(status == STATUS_SEND))
+    hb = int(np.count_nonzero(status == STATUS_HEARTBEAT))
+
+    tx_per_day = tx * DAY_SEC / duration if duration > 0 else None
+    out = {
+        "kind": str(cols["kind"]),
+        "rows": int(n),
+        "duration_h": round(duration / 3600.0, 2),
+        "tx": tx,
+        "heartbeat": hb,
+        "tx_per_day": round(tx_per_day, 1) if tx_per_day is not None else None,
+        "tx_saving_pct": round((1.0 - tx_per_day / PERIODIC_TX_PER_DAY) * 100.0, 1) if tx_per_day is not None else None,
+    }
+
+    for ch in ("t", "h"):
+        err = np.abs(cols[f"error_{ch}"])
+        actual = np.abs(cols[f"actual_{ch}"])
+        ok = np.isfinite(err) & np.isfinite(actual) & (actual > 0)
+        out[f"mae_{ch}"] = round(float(err[ok].mean()), 4) if ok.any() else None
+        out[f"mape_{ch}"] = round(float((err[ok] / actual[ok]).mean() * 100.0), 2) if ok.any() else None
+
+    inf = cols["inference_time_us"]
+    inf = inf[inf > 0]
+    if inf.size:
+        out["inference_us"] = {"mean": round(float(inf.mean()), 1), "max": int(inf.max()), **_percentiles(inf)}
+    free, total = cols["free_heap"], cols["total_heap"]
+    if np.any(total > 0):
+        out["heap"] = {
+            "min_free": int(free[free > 0].min()),
+            "mean_free": round(float(free[free > 0].mean()), 1),
+            "total": int(total.max()),
+            "peak_used": int(total.max() - free[free > 0].min()),
+        }
+    return out
+
+
+def analyze(paths=None, use_cache=True):
+    """
+    모든 로그를 로드·집계. {상대경로: 지표} 반환.
+    순차 처리: CSV 파싱은 순수 Python이라 스레드로는 빨라지지 않고, 반복 실행은 .npz 캐시가 처리.
+    """
+    paths = find_logs() if paths is None else paths
+    results = {}
+    for path in paths:
+        cols = load_log(path, use_cache=use_cache)
+        if cols is not None:
+            results[os.path.relpath(path, ROOT)] = compute_metrics(cols)
+    return results
+
+
+def format_table(results):
+    lines = [
+        "| 로그 | 전송 횟수/24h | 절감률 | 온도 MAE / 오차 | 습도 MAE / 오차 | 추론 p50/p99 (µs) | 최소 free heap |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for name, m in results.items():
+        if m.get("rows", 0) == 0:
+            continue
+
+        def err(ch):
+            mae, mape = m.get(f"mae_{ch}"), m.get(f"mape_{ch}")
+            return "—" if mae is None else f"{mae:.3f} / {mape:.2f}%"
+
+        inf = m.get("inference_us")
+        inf_s = f"{inf['p50']:.0f} / {inf['p99']:.0f}" if inf else "—"
+        heap_s = f"{m['heap']['min_free']:,}" if "heap" in m else "—"
+        tx_s = f"{m['tx_per_day']:,.0f}" if m["tx_per_day"] is not None else f"{m['tx']:,}"
+        saving_s = f"−{m['tx_saving_pct']}%" if m["tx_saving_pct"] is not None else "—"
+        lines.append(
+            f"| `{name}` | {tx_s} | {saving_s} | {err('t')} | {err('h')} | {inf_s} | {heap_s} |"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="실험 로그 → 전송 절감/오차 비교 표")
+    parser.add_argument("paths", nargs="*", help="분석할 CSV (생략 시 기본 로그 전체)")
+    parser.add_argument("--no-cache", action="store_true", help="파싱 캐시 사용 안 함")
+    parser.add_argument("--json", action="store_true", help="표 대신 JSON 출력")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    results = analyze([os.path.abspath(p) for p in args.paths] or None, use_cache=not args.no_cache)
+    elapsed = time.perf_counter() - t0
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(format_table(results))
+        print(f"\n({len(results)} logs, {elapsed * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+센서 로그 리플레이: 실측값 시퀀스를 엣지 loop()와 같은 δ-트리거 규칙으로 모델 변형별로 재생해 비교.
+실행: python analysis/replay.py [로그 CSV ...] [--beta-temp 0.5] [--beta-hum 3.0] [--budget 96] [--json]
+
+- 변형: float32 (MLP_edge_sensor.ino), int8 (MLP_edge_sensor_int8.ino),
+  부분 학습 float32-last2 / float32-last (UPDATE_SCOPE 2 / 1: 마지막 2개 층 / 출력층만, 나머지 층 고정),
+  경량 백엔드 ar / holt / kalman (gateway_predictors, edge_node/predictors.h)
+- 지표: TX 횟수·절감률, 예측 MAE (전 구간), predict/update 1회 시간(µs)·FLOPs, 노드당 모델 메모리
+- float32 대비 정확도 손실, 속도 향상, 메모리 절감 보고
+- --budget: 변형마다 게이트웨이 적응형 δ(gateway_beta.BetaController)를 넣은 재생을 추가.
+  게이트웨이처럼 TX의 회신에는 그 TX를 관측하기 전 δ가 실리므로, TX마다 관측한 오차로 바뀐 δ는 다음 TX의 회신부터
+  엣지에 적용 (1 교환 지연). 목표 대비 δ-트리거 TX/day 보고
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _p in (os.path.join(ROOT, "analysis"), os.path.join(ROOT, "gateway")):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+from experiment_analytics import load_log, PERIODIC_TX_PER_DAY, DAY_SEC
+from gateway_params import new_model
+from gateway_beta import BetaController
+from gateway_predictors import mlp_flops
+
+DEFAULT_LOGS = ["edge_node/edge_log_0.5.csv"]
+EDGE_LR = 0.01
+EPSILON = 0.001
+HEARTBEAT_STEPS = 10  # HEARTBEAT_INTERVAL 600초 / 1분 주기
+
+# 이름 → 모델 생성 (첫 항목이 비교 기준)
+VARIANTS = {
+    "float32": lambda: new_model(verbose=False),
+    "int8": lambda: new_model(verbose=False, quantized=True),
+    "float32-last2": lambda: new_model(verbose=False, update_scope="last2"),
+    "float32-last": lambda: new_model(verbose=False, update_scope="last"),
+    "ar": lambda: new_model(predictor="ar"),
+    "holt": lambda: new_model(predictor="holt"),
+    "kalman": lambda: new_model(predictor="kalman"),
+}
+
+
+def model_nbytes(model):
+    """노드 1개 모델 메모리 (가중치·bias·윈도우, 경량 백엔드는 상태 배열)."""
+    if hasattr(model, "nbytes"):
+        return int(model.nbytes)
+    return int(sum(getattr(model, k).nbytes for k in ("w1", "b1", "w2", "b2", "w3", "b3", "window_buf")))
+
+
+def model_flops(model):
+    """스텝당 FLOPs {predict, update, shift}. int8 MLP도 같은 층 크기로 집계 (정수 연산 포함)."""
+    return model.flops() if hasattr(model, "flops") else mlp_flops(model)
+
+
+def replay(model, actual_t, actual_h, time_n, beta_temp, beta_hum, controller=None, ts=None):
+    """
+    엣지 loop() 재생: forward → 오차 판정 → (TX 시) update → 예측값으로 윈도우 이동.
+    controller가 있으면 TX마다 회신 δ(관측 전 controller.betas)로 교체한 뒤 observe(ts[i]) — gateway.py가 회신을
+    온라인 학습·δ 갱신보다 먼저 보내는 것과 같은 순서. triggered는 하트비트가 아닌 δ-트리거 TX.
+    """
+    n = actual_t.size
+    pred = np.empty((n, 2), dtype=np.float64)
+    sent = np.zeros(n, dtype=bool)
+    triggered = np.zeros(n, dtype=bool)
+    predict_ns, update_ns = [], []
+    since_send = 0
+    for i in range(n):
+        t0 = time.perf_counter_ns()
+        p = model.predict()
+        predict_ns.append(time.perf_counter_ns() - t0)
+        pred_t, pred_h = float(p[0]), float(p[1])
+        pred[i] = pred_t, pred_h
+
+        since_send += 1
+        err_t, err_h = abs(actual_t[i] - pred_t), abs(actual_h[i] - pred_h)
+        triggered[i] = err_t >= beta_temp - EPSILON or err_h >= beta_hum - EPSILON
+        if triggered[i] or since_send >= HEARTBEAT_STEPS:
+            sent[i] = True
+            since_send = 0
+            if controller is not None:
+                beta_temp, beta_hum = controller.betas("replay")
+                controller.observe("replay", float(ts[i]), err_t, err_h)
+            t0 = time.perf_counter_ns()
+            model.online_update(float(actual_t[i]), float(actual_h[i]), lr=EDGE_LR)
+            update_ns.append(time.perf_counter_ns() - t0)
+        model.shift_window(pred_t, pred_h, float(time_n[i]))
+    return pred, sent, triggered, np.array(predict_ns), np.array(update_ns), (beta_temp, beta_hum)
+
+
+def replay_log(path, beta_temp=0.5, beta_hum=3.0, variants=VARIANTS, budget=None):
+    cols = load_log(path)
+    ok = np.isfinite(cols["actual_t"]) & np.isfinite(cols["actual_h"])
+    ts = cols["ts"][ok]
+    actual_t, actual_h = cols["actual_t"][ok], cols["actual_h"][ok]
+    time_n = (ts % DAY_SEC) / float(DAY_SEC)  # 로그 시각은 현지 시각
+    duration = float(ts[-1] - ts[0]) if ts.size > 1 else 0.0
+    half = ts.size // 2  # 적응형 δ 수렴 후 구간 (후반부)
+
+    runs = [(name, factory, None) for name, factory in variants.items()]
+    if budget:
+        runs += [(f"{name}@{budget:g}/day", factory, budget) for name, factory in variants.items()]
+
+    out, sent_by = {}, {}
+    for name, factory, target in runs:
+        model = factory()
+        controller = BetaController(target, beta_temp, beta_hum) if target else None
+        pred, sent, triggered, predict_ns, update_ns, betas = replay(
+            model, actual_t, actual_h, time_n, beta_temp, beta_hum, controller=controller, ts=ts)
+        tx = int(sent.sum())
+        sent_by[name] = sent
+        out[name] = {
+            "tx": tx,
+            "steps": int(actual_t.size),
+            "tx_per_day": round(tx * DAY_SEC / duration, 1) if duration > 0 else None,
+            "trigger_tx_per_day": round(int(triggered.sum()) * DAY_SEC / duration, 1) if duration > 0 else None,
+            "settled_trigger_tx_per_day": round(int(triggered[half:].sum()) * DAY_SEC / (duration - float(ts[half] - ts[0])), 1)
+            if duration > 0 else None,
+            "budget": target,
+            "final_beta": [round(float(b), 3) for b in betas],
+            "tx_saving_pct": round((1.0 - tx * DAY_SEC / duration / PERIODIC_TX_PER_DAY) * 100.0, 1) if duration > 0 else None,
+            "mae_t": round(float(np.abs(actual_t - pred[:, 0]).mean()), 4),
+            "mae_h": round(float(np.abs(actual_h - pred[:, 1]).mean()), 4),
+            "predict_us": round(float(np.median(predict_ns)) / 1000.0, 2),
+            "update_us": round(float(np.median(update_ns)) / 1000.0, 2) if update_ns.size else None,
+            "model_bytes": model_nbytes(model),
+            "flops": model_flops(model),
+        }
+
+    first = runs[0][0]
+    for name, m in out.items():
+        base_name = name.split("@")[0] if "@" in name else first  # 적응형 δ는 같은 모델의 고정 δ와 비교
+        if name == base_name:
+            continue
+        base = out[base_name]
+        m["vs_" + base_name] = {
+            "mae_t_delta": round(m["mae_t"] - base["mae_t"], 4),
+            "mae_h_delta": round(m["mae_h"] - base["mae_h"], 4),
+            "tx_delta": m["tx"] - base["tx"],
+            "trigger_agreement_pct": round(float((sent_by[name] == sent_by[base_name]).mean()) * 100.0, 2),
+            "predict_speedup": round(base["predict_us"] / m["predict_us"], 2) if m["predict_us"] else None,
+            "update_speedup": round(base["update_us"] / m["update_us"], 2) if m["update_us"] and base["update_us"] else None,
+            "memory_ratio": round(m["model_bytes"] / base["model_bytes"], 3),
+            "flops_ratio": round(flops_per_step(m) / flops_per_step(base), 4),
+        }
+    return {"rows": int(actual_t.size), "duration_h": round(duration / 3600.0, 2), "variants": out}
+
+
+def flops_per_step(m):
+    """1분 스텝 평균 FLOPs: predict·shift는 매 스텝, update는 TX 스텝에서만."""
+    f = m["flops"]
+    return f["predict"] + f["shift"] + f["update"] * m["tx"] / m["steps"]
+
+
+def format_table(results):
+    lines = [
+        "| 로그 | 모델 | TX | 절감률 | δ-트리거 TX/day 전체 / 후반 (목표) | 최종 δ (T/H) | 온도 MAE | 습도 MAE | predict (µs) | update (µs) | FLOPs/스텝 | 모델 (B/노드) |",
+        "|---|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for name, r in results.items():
+        for variant, m in r["variants"].items():
+            upd = f"{m['update_us']:.1f}" if m["update_us"] is not None else "—"
+            target = f" ({m['budget']:g})" if m["budget"] else ""
+            lines.append(
+                f"| `{name}` | {variant} | {m['tx']:,} | −{m['tx_saving_pct']}% | {m['trigger_tx_per_day']} / {m['settled_trigger_tx_per_day']}{target} "
+                f"| {m['final_beta'][0]} / {m['final_beta'][1]} | {m['mae_t']:.3f} | {m['mae_h']:.3f} "
+                f"| {m['predict_us']:.1f} | {upd} | {flops_per_step(m):,.0f} | {m['model_bytes']:,} |"
+            )
+    for name, r in results.items():
+        for variant, m in r["variants"].items():
+            for key, d in m.items():
+                if not key.startswith("vs_"):
+                    continue
+                lines.append(
+                    f"\n{name} {variant} {key.replace('_', ' ')}: MAE T {d['mae_t_delta']:+.3f} / H {d['mae_h_delta']:+.3f}, "
+                    f"TX {d['tx_delta']:+d}, 트리거 일치 {d['trigger_agreement_pct']}%, "
+                    f"predict x{d['predict_speedup']}, update x{d['update_speedup']}, 메모리 x{d['memory_ratio']}, FLOPs x{d['flops_ratio']}"
+                )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="센서 로그 리플레이 (모델 변형별 정확도·속도·메모리)")
+    parser.add_argument("paths", nargs="*", help=f"리플레이할 로그 CSV (기본: {', '.join(DEFAULT_LOGS)})")
+    parser.add_argument("--beta-temp", type=float, default=0.5)
+    parser.add_argument("--beta-hum", type=float, default=3.0)
+    parser.add_argument("--budget", type=float, default=None,
+                        help="적응형 δ 목표 TX/day (하트비트 제외, GATEWAY_TX_BUDGET과 같은 의미)")
+    parser.add_argument("--json", action="store_true", help="표 대신 JSON 출력")
+    args = parser.parse_args()
+
+    paths = [os.path.abspath(p) for p in args.paths] or [os.path.join(ROOT, p) for p in DEFAULT_LOGS]
+    results = {
+        os.path.relpath(p, ROOT): replay_log(p, args.beta_temp, args.beta_hum, budget=args.budget)
+        for p in paths
+    }
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(format_table(results))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
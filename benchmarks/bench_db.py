@@ -0,0 +1,57 @@
+# benchmarks/bench_db.py
+"""
+저장 함수(insert/query) 벤치마크. MySQL 서버 없이 돌도록 실제 SQLite 백엔드(server/db_sqlite.py, 임시 파일)에 대해 측정
+— 스키마를 따로 두지 않으므로 init_db()의 테이블·인덱스·롤업이 바뀌어도 그대로 동작.
+시드 2만 건(1분 간격)은 롤업(run_maintenance)까지 돌려 get_stats가 롤업 + 원본 꼬리 경로를 타게 한다.
+시드·중복 행은 실제 RX처럼 edge_ts_ms = 엣지 unix ms, created_at = 그 시각 (server/dedup.key_time) — MySQL 키
+(node_id, edge_ts_ms, created_at)와 SQLite 키 (node_id, edge_ts_ms)가 같은 행을 중복으로 보는 경로만 잰다.
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from bench_utils import measure
+from server import db_sqlite
+
+SEED_ROWS = 20000
+SEED_START = datetime(2026, 2, 25, 12, 0, 0)
+
+
+def _row(i):
+    """시드 i번째 RX 행 (1분 간격, 키 시각 = created_at)."""
+    created_at = SEED_START + timedelta(minutes=i)
+    return 24.0, 35.0, 23.8, 35.4, 400, "bench", int(created_at.timestamp() * 1000), created_at
+
+
+def _seed(backend):
+    backend.init_db()
+    backend.insert_readings([_row(i) for i in range(SEED_ROWS)])
+    backend.run_maintenance(now=SEED_START + timedelta(minutes=SEED_ROWS))
+
+
+def run(quick=False):
+    saved = os.environ.get("SQLITE_PATH")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["SQLITE_PATH"] = os.path.join(tmp, "bench_db.sqlite3")
+            backend = db_sqlite
+            _seed(backend)
+            # 이미 저장된 (node_id, edge_ts_ms) 재전송: 멱등 insert가 무시하는 경로 (QoS 1 재전달·다중 게이트웨이)
+            duplicate = [_row(0)]
+            return [
+                measure("db.insert_reading", lambda: backend.insert_reading(24.2, 35.1, 23.9, 35.5, 412), quick=quick),
+                measure("db.insert_readings.duplicate", lambda: backend.insert_readings(duplicate), quick=quick),
+                measure(
+                    "db.insert_edge_log",
+                    lambda: backend.insert_edge_log(24.2, 35.1, 23.9, 35.5, 0.3, 1, 0.4, "SEND & TRAIN", 1057156,
+                                                    318568, 346716),
+                    quick=quick,
+                ),
+                measure("db.get_recent.200", lambda: backend.get_recent(limit=200), quick=quick),
+                measure("db.get_stats", backend.get_stats, quick=quick),
+            ]
+    finally:
+        if saved is None:
+            os.environ.pop("SQLITE_PATH", None)
+        else:
+            os.environ["SQLITE_PATH"] = saved
@@ -0,0 +1,72 @@
+# benchmarks/bench_db_backends.py
+"""
+저장 백엔드 비교: SQLite(WAL, 임시 파일) vs MySQL. 건별 insert, 100건 배치 insert, 1만 건 bulk_insert(백필), get_recent, get_stats.
+MySQL은 MYSQL_* 설정으로 접속 가능할 때만 측정하며, 운영 DB 대신 MYSQL_BENCH_DATABASE(기본 aoii_bench)를 사용.
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from bench_utils import measure
+from server import db, db_sqlite
+
+BATCH = [(24.2, 35.1, 23.9, 35.5, 412)] * 100
+BULK_COLUMNS = ("created_at", "actual_temp", "actual_humidity", "pred_temp", "pred_humidity", "error_temp",
+                "error_humidity", "transmission_delay_ms")
+BULK = [(datetime(2026, 1, 1) + timedelta(minutes=i), 24.2, 35.1, 23.9, 35.5, 0.3, -0.4, 412) for i in range(10000)]
+SEED_ROWS = 20000
+
+
+def _suite(prefix, backend, quick):
+    backend.init_db()
+    for _ in range(SEED_ROWS // len(BATCH)):
+        backend.insert_readings(BATCH)
+    results = [
+        measure(f"{prefix}.insert_reading", lambda: backend.insert_reading(24.2, 35.1, 23.9, 35.5, 412), quick=quick),
+        measure(f"{prefix}.insert_readings.100", lambda: backend.insert_readings(BATCH), quick=quick),
+        measure(f"{prefix}.bulk_insert.10000", lambda: backend.bulk_insert("readings", BULK_COLUMNS, BULK), quick=quick),
+        measure(f"{prefix}.get_recent.200", lambda: backend.get_recent(limit=200), quick=quick),
+        measure(f"{prefix}.get_stats", backend.get_stats, quick=quick),
+    ]
+    return results
+
+
+def _mysql_available(database):
+    if db.pymysql is None:
+        return False
+    try:
+        cfg = db._config()
+        cfg.pop("database")
+        conn = db.pymysql.connect(connect_timeout=2, **cfg)
+    except Exception as e:
+        print(f"  (MySQL 측정 생략: {e})")
+        return False
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
+            cur.execute(f"DROP TABLE IF EXISTS `{database}`.readings")
+        conn.commit()
+    finally:
+        conn.close()
+    return True
+
+
+def run(quick=False):
+    results = []
+    saved = {k: os.environ.get(k) for k in ("SQLITE_PATH", "MYSQL_DATABASE")}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["SQLITE_PATH"] = os.path.join(tmp, "bench.sqlite3")
+            results += _suite("db_backend.sqlite", db_sqlite, quick)
+
+        database = os.environ.get("MYSQL_BENCH_DATABASE", "aoii_bench")
+        if _mysql_available(database):
+            os.environ["MYSQL_DATABASE"] = database
+            results += _suite("db_backend.mysql", db.mysql_backend, quick)
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+    return results
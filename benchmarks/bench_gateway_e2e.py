@@ -0,0 +1,79 @@
+# benchmarks/bench_gateway_e2e.py
+"""
+게이트웨이 E2E: 가짜 시리얼 포트에 gateway_edge.ino 형식 라인을 채워 넣고 run_gateway()로 전부 처리.
+파싱 → 예측 검증 → MQTT 발행(가짜 클라이언트) → 온라인 학습 → 시간 동기화 회신까지 1프레임 단위 시간.
+"""
+import time
+
+from bench_utils import measure_batch, quiet
+from gateway_params import new_model
+from gateway_node import NodeRegistry
+
+FRAMES = 2000
+
+
+class FakeSerial:
+    """pyserial Serial 대역: in_waiting / readline / write / close."""
+
+    def __init__(self, lines):
+        self._lines = [l.encode() + b"\n" for l in lines]
+        self._pos = 0
+        self.written = []
+
+    @property
+    def in_waiting(self):
+        return len(self._lines[self._pos]) if self._pos < len(self._lines) else 0
+
+    def readline(self):
+        line = self._lines[self._pos]
+        self._pos += 1
+        return line
+
+    def write(self, data):
+        self.written.append(data)
+        return len(data)
+
+    def exhausted(self):
+        return self._pos >= len(self._lines)
+
+    def close(self):
+        pass
+
+
+class FakeMqttClient:
+    def __init__(self):
+        self.published = 0
+
+    def publish(self, topic, payload, qos=0):
+        self.published += 1
+
+    def reconnect(self):
+        pass
+
+
+def make_lines(n):
+    base_ms = int(time.time() * 1000)
+    lines = ["LoRa Gateway Node Ready (433MHz)", "Received: 0.0,0.0"]
+    for i in range(n):
+        t = 24.0 + 0.8 * ((i % 40) - 20) / 20.0
+        h = 35.0 + 3.0 * ((i % 60) - 30) / 30.0
+        lines.append(f"Received: {base_ms + i * 60000},{t:.2f},{h:.2f}")
+        lines.append(f"Sync sent: {base_ms // 1000 + i * 60}")
+        lines.append("-----------------------")
+    return lines
+
+
+def run(quick=False):
+    import gateway  # 지연 import: serial/paho 모듈 로드 비용을 측정에서 제외
+
+    n = FRAMES // 4 if quick else FRAMES
+    lines = make_lines(n)
+
+    def run_once():
+        ser = FakeSerial(lines)
+        client = FakeMqttClient()
+        with quiet():
+            gateway.run_gateway(ser, client, NodeRegistry(new_model), poll_interval=0, should_stop=ser.exhausted)
+        assert client.published == n
+
+    return [measure_batch("gateway.e2e_per_frame", run_once, ops=n)]
@@ -0,0 +1,49 @@
+# benchmarks/bench_ingest.py
+"""
+mqtt_to_csv: row_from_payload 및 CSV 기록 경로 (on_message 1건 처리).
+server/ingest.py: 콜백 스레드 fan-out 비용 (디코딩 1회 + 싱크 4개 큐), CSV 싱크 배치 200건 기록.
+"""
+import os
+import json
+import tempfile
+
+from bench_utils import measure, quiet
+from gateway_protocol import build_rx_payload, encode_payload
+from server import mqtt_to_csv
+from server.ingest import Ingestor, Sink, csv_sink
+
+PAYLOAD = build_rx_payload(
+    "2026-02-25 12:52:34", 0.5364, 24.23, 25.6, 23.91, 26.02, 0.32, 0.42, 377, transmission_delay_ms=412,
+)
+
+
+class _Msg:
+    def __init__(self, payload):
+        self.topic = mqtt_to_csv.MQTT_TOPIC
+        self.payload = payload
+
+
+def run(quick=False):
+    results = [measure("ingest.row_from_payload", lambda: mqtt_to_csv.row_from_payload(PAYLOAD), quick=quick)]
+
+    original = mqtt_to_csv.CSV_FILENAME
+    with tempfile.TemporaryDirectory() as tmp:
+        mqtt_to_csv.CSV_FILENAME = os.path.join(tmp, "experiment_log_online.csv")
+        try:
+            msg = _Msg(encode_payload(PAYLOAD).encode("utf-8"))
+            with quiet():
+                results.append(measure(
+                    "ingest.csv_on_message", lambda: mqtt_to_csv.on_message(None, None, msg), quick=quick,
+                ))
+            results.append(measure("ingest.json_decode", lambda: json.loads(msg.payload.decode("utf-8")), quick=quick))
+
+            # 싱크 스레드는 시작하지 않음 → 콜백 스레드 몫(디코딩·필터·put_nowait)만 측정
+            fanout = Ingestor([Sink(name, lambda batch: None, maxsize=0) for name in ("db", "csv", "metrics", "stream")])
+            results.append(measure("ingest.fanout_dispatch_4sinks", lambda: fanout.dispatch(msg.payload.decode("utf-8")),
+                                   quick=quick))
+            sink = csv_sink(os.path.join(tmp, "batched.csv"))
+            batch = [fanout.dispatch(msg.payload.decode("utf-8"))] * 200
+            results.append(measure("ingest.csv_sink_batch200", lambda: sink.handle(batch), quick=quick))
+        finally:
+            mqtt_to_csv.CSV_FILENAME = original
+    return results
@@ -0,0 +1,60 @@
+# benchmarks/bench_model.py
+"""GatewayMLP 마이크로벤치마크: predict / online_update / shift_window (float32, int8), EST 궤적 전개·틱."""
+from bench_utils import measure, quiet
+from gateway_params import new_model
+from gateway_node import NodeMirror
+from gateway_rollout import ROLLOUT_STEPS, rollout
+
+
+def run(quick=False):
+    model = new_model()
+    model.predict()
+    results = [
+        measure("model.predict", model.predict, quick=quick),
+        measure("model.shift_window", lambda: model.shift_window(24.1, 35.2, 0.5), quick=quick),
+    ]
+
+    def update():
+        model.predict()
+        model.online_update(24.3, 35.0, lr=0.01)
+
+    with quiet():
+        results.append(measure("model.predict+online_update", update, quick=quick))
+
+    def rx_step():
+        # gateway.py RX 처리 1회분: update → shift → predict
+        pred = model.last_pred_t, model.last_pred_h
+        model.online_update(24.3, 35.0, lr=0.01)
+        model.shift_window(pred[0], pred[1], 0.5)
+        model.predict()
+
+    with quiet():
+        results.append(measure("model.rx_step", rx_step, quick=quick))
+
+    q = new_model(verbose=False, quantized=True)
+    q.predict()
+    results.append(measure("model.int8_predict", q.predict, quick=quick))
+
+    def q_update():
+        q.predict()
+        q.online_update(24.3, 35.0, lr=0.01)
+
+    results.append(measure("model.int8_predict+online_update", q_update, quick=quick))
+
+    # EST 틱: 직접 계산(shift+predict) vs 궤적에서 꺼냄(shift만, 궤적을 다 쓰면 틱에서 재전개 — 전개 비용 분할 포함).
+    # 전개는 원래 RX 직후에 하므로 실제 틱 지연은 shift_window 수준
+    model = new_model(verbose=False)
+    pred = model.predict()
+    results.append(measure(f"model.rollout_{ROLLOUT_STEPS}", lambda: rollout(model, pred, 0.5, ROLLOUT_STEPS, 60),
+                           quick=quick))
+    for name, steps in (("direct", 0), ("trajectory", ROLLOUT_STEPS)):
+        node = NodeMirror("n0", new_model(verbose=False), now=0.0, rollout_steps=steps)
+        node.on_rx(24.3, 35.0, 0.5, 0.0)
+        clock = [0.0]
+
+        def tick(node=node):
+            clock[0] += 60.0
+            node.est_tick((0.5 + clock[0] / 86400) % 1.0, clock[0])
+
+        results.append(measure(f"model.est_tick.{name}", tick, quick=quick))
+    return results
@@ -0,0 +1,64 @@
+# benchmarks/bench_model_cache.py
+"""
+노드 모델 캐시 (gateway_model_cache.py): 상주 노드 RX vs 축출된 노드 RX(memmap 슬롯 적재 + LRU 1개 축출),
+축출된 노드의 EST 틱. 노드 2,000개 중 RAM 예산은 100개분, 무작위 노드 순서라 적재가 매번 다른 슬롯.
+fault-in은 엣지 회신 대기 1초보다 수천 배 작아야 정상 (회신은 적재 전에 나감).
+"""
+import random
+
+from bench_utils import measure
+from gateway_params import new_model
+from gateway_model_cache import CachedNodeRegistry, private_arrays
+
+FLEET = 2000
+RESIDENT = 100
+
+
+def _registry():
+    per = sum(a.nbytes for a in private_arrays(new_model(verbose=False)).values())
+    registry = CachedNodeRegistry(lambda: new_model(verbose=False), per * RESIDENT)
+    for i in range(FLEET):
+        registry.get(f"n{i:05d}", now=0.0).on_rx(24.0, 35.0, 0.5, 0.0)
+    return registry
+
+
+def _rx(registry, node_ids):
+    """node_ids를 무작위 순으로 돌며 on_rx (값은 미러 예측 근처라 발산 없음)."""
+    nodes = [registry.nodes[n] for n in node_ids]
+    rng = random.Random(0)
+    order = [rng.randrange(len(nodes)) for _ in range(4096)]
+    state = [0]
+
+    def rx():
+        i = state[0] = (state[0] + 1) % len(order)
+        node = nodes[order[i]]
+        node.on_rx(float(node.pred[0]), float(node.pred[1]), 0.5, 1.0)
+    return rx
+
+
+def _cold_tick(registry):
+    cold = [registry.nodes[n] for n in sorted(registry.cache.spilled)]
+    state = [0]
+
+    def tick():
+        i = state[0] = (state[0] + 1) % len(cold)
+        cold[i].est_tick(0.5, 1.0)
+    return tick
+
+
+def run(quick=False):
+    registry = _registry()
+    try:
+        hot = list(registry.cache.resident)
+        results = [measure("model_cache.rx_hit", _rx(registry, hot), quick=quick)]
+        cache = registry.cache
+        misses = cache.misses
+        results.append(measure("model_cache.rx_fault_in", _rx(registry, sorted(cache.spilled)), quick=quick))
+        # 상주 노드 RX와의 차이가 적재+축출 비용. 적재 자체만의 평균·최대는 캐시 통계로
+        stats = cache.stats()
+        print(f"  (fault-in {cache.misses - misses} times: avg {stats['fault_in_avg_ms']:.3f} ms,"
+              f" max {stats['fault_in_max_ms']:.3f} ms, hit rate during run {stats['hit_rate']:.2f})")
+        results.append(measure("model_cache.est_tick_cold", _cold_tick(registry), quick=quick))
+        return results
+    finally:
+        registry.close()
@@ -0,0 +1,54 @@
+# benchmarks/bench_protocol.py
+"""게이트웨이 시리얼 라인 파싱 및 MQTT 페이로드 인코딩."""
+from bench_utils import measure
+from gateway_protocol import (
+    parse_received_line, build_rx_payload, build_est_payload, build_est_batch_payload, decode_est_batch, encode_payload,
+)
+
+LINE = "Received: 1772056846123,24.23,25.60"
+LINE_LEGACY = "Received: 24.23,25.60"
+FLEET = 1000
+EST_ROWS = [(f"n{i:05d}", 23.91 + i * 1e-3, 26.02 - i * 1e-3, 377 + i) for i in range(FLEET)]
+
+
+def _est_per_node():
+    return [
+        encode_payload(build_est_payload("2026-02-25 12:52:34", 0.5364, t, h, tx, node_id=n))
+        for n, t, h, tx in EST_ROWS
+    ]
+
+
+def _est_batch():
+    return encode_payload(build_est_batch_payload("2026-02-25 12:52:34", 0.5364, EST_ROWS))
+
+
+def run(quick=False):
+    return [
+        measure("protocol.parse_received_line", lambda: parse_received_line(LINE), quick=quick),
+        measure("protocol.parse_received_line.legacy", lambda: parse_received_line(LINE_LEGACY), quick=quick),
+        measure(
+            "protocol.encode_rx",
+            lambda: encode_payload(build_rx_payload(
+                "2026-02-25 12:52:34", 0.5364, 24.23, 25.6, 23.91, 26.02, 0.32, 0.42, 377, transmission_delay_ms=412,
+            )),
+            quick=quick,
+        ),
+        measure(
+            "protocol.encode_est",
+            lambda: encode_payload(build_est_payload("2026-02-25 12:52:34", 0.5364, 23.91, 26.02, 377)),
+            quick=quick,
+        ),
+    ] + _est_tick(quick)
+
+
+def _est_tick(quick):
+    """노드 1,000개 EST 1틱: 노드별 메시지 vs ESTB 1개 (시간 + 발행 바이트)."""
+    per_node = measure(f"protocol.est_tick_{FLEET}.per_node", _est_per_node, quick=quick)
+    per_node["bytes"] = sum(len(m) for m in _est_per_node())
+    per_node["messages"] = FLEET
+    batch = measure(f"protocol.est_tick_{FLEET}.batch", _est_batch, quick=quick)
+    batch["bytes"] = len(_est_batch())
+    batch["messages"] = 1
+    payload = build_est_batch_payload("2026-02-25 12:52:34", 0.5364, EST_ROWS)
+    decode = measure(f"protocol.est_tick_{FLEET}.batch_decode", lambda: decode_est_batch(payload), quick=quick)
+    return [per_node, batch, decode]
@@ -0,0 +1,57 @@
+# benchmarks/bench_query.py
+"""
+게이트웨이 로컬 조회 API (gateway_query.py): 시리얼 루프 쪽 스냅샷 publish 비용(RX마다 1회),
+프로세스 안 조회(get + 캐시된 JSON), HTTP keep-alive 연결 1개의 왕복 (127.0.0.1, 요청 1개 = op 1회).
+노드 1,000개, 궤적 10스텝. HTTP 왕복이 수천 qps를 넘어야 정상.
+"""
+import http.client
+
+from bench_utils import measure
+from gateway_params import new_model
+from gateway_node import NodeRegistry
+from gateway_query import SnapshotBoard, QueryServer
+
+FLEET = 1000
+
+
+def _board():
+    registry = NodeRegistry(lambda: new_model(verbose=False), rollout_steps=10)
+    board = SnapshotBoard()
+    for i in range(FLEET):
+        node = registry.get(f"n{i:04d}", now=0.0)
+        node.on_rx(24.0, 35.0, 0.5, 0.0)
+        board.publish(node, 0.0, rx={"time": 0.0, "actual_t": 24.0, "actual_h": 35.0}, aoii={})
+    return registry, board
+
+
+def _cycle(items):
+    state = [0]
+
+    def next_item():
+        i = state[0] = (state[0] + 1) % len(items)
+        return items[i]
+    return next_item
+
+
+def run(quick=False):
+    registry, board = _board()
+    nodes = _cycle(registry.values())
+    results = [measure("query.publish", lambda: board.publish(nodes(), 1.0), quick=quick)]
+
+    ids = _cycle([f"n{i:04d}" for i in range(FLEET)])
+    results.append(measure("query.get_json", lambda: board.get(ids()).to_json(), quick=quick))
+
+    server = QueryServer(board, "127.0.0.1:0").start()
+    host, port = server.address.rsplit(":", 1)
+    conn = http.client.HTTPConnection(host, int(port))
+    try:
+        def http_get():
+            conn.request("GET", f"/nodes/{ids()}")
+            conn.getresponse().read()
+        results.append(measure("query.http_keepalive", http_get, quick=quick))
+        results.append(measure("query.http_estimate_at", lambda: (
+            conn.request("GET", f"/nodes/{ids()}/estimate?at=300"), conn.getresponse().read()), quick=quick))
+        return results
+    finally:
+        conn.close()
+        server.close()
@@ -0,0 +1,48 @@
+# benchmarks/bench_scheduler.py
+"""EST 주기 판정: 폴링마다 전체 노드 est_due() 순회 vs 타이머 휠 (노드 5,000개, 60초 주기가 고르게 분산)."""
+from bench_utils import measure
+from gateway_node import NodeMirror, EST_INTERVAL_SEC
+from gateway_timer_wheel import TimerWheel, EST
+
+FLEET = 5000
+POLL_SEC = 0.05  # gateway.POLL_INTERVAL
+
+
+class _Node(NodeMirror):
+    """est_due()만 쓰는 모델 없는 노드 (스케줄링 비용만 측정)."""
+
+    def __init__(self, node_id, last_est_time):
+        self.node_id = node_id
+        self.last_est_time = last_est_time
+
+
+def _scan_poll():
+    nodes = [_Node(f"n{i:05d}", i * EST_INTERVAL_SEC / FLEET) for i in range(FLEET)]
+    clock = [EST_INTERVAL_SEC]
+
+    def poll():
+        now = clock[0] = clock[0] + POLL_SEC
+        for node in nodes:
+            if node.est_due(now):
+                node.last_est_time = now
+    return poll
+
+
+def _wheel_poll():
+    wheel = TimerWheel(0.0)
+    for i in range(FLEET):
+        wheel.schedule(f"n{i:05d}", EST, EST_INTERVAL_SEC + i * EST_INTERVAL_SEC / FLEET)
+    clock = [EST_INTERVAL_SEC]
+
+    def poll():
+        now = clock[0] = clock[0] + POLL_SEC
+        for node_id, kind, deadline in wheel.advance(now):
+            wheel.schedule(node_id, kind, deadline + EST_INTERVAL_SEC)
+    return poll
+
+
+def run(quick=False):
+    return [
+        measure(f"scheduler.poll_{FLEET}.scan", _scan_poll(), quick=quick),
+        measure(f"scheduler.poll_{FLEET}.wheel", _wheel_poll(), quick=quick),
+    ]
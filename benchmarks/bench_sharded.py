@@ -0,0 +1,50 @@
+# benchmarks/bench_sharded.py
+"""
+샤딩 게이트웨이 처리량: 노드 256개의 프레임을 가짜 시리얼에 채워 넣고, 워커 수(1/2/4)별로
+acceptor 수신·회신 → 워커 검증·학습·발행(가짜 MQTT)까지 전부 끝나는 데 걸린 1프레임당 시간.
+워커 기동은 측정에서 제외. 워커 수에 따른 확장은 코어 수가 상한 — 1코어 환경에서는 1/2/4 워커가
+이득 없이 같거나 느리고(실행마다 140~330 µs, 워커가 늘수록 프로세스 간 전달 비용만 추가), 4코어 라즈베리파이에서의
+확장은 아직 측정하지 않았다. 그래서 샤딩 게이트웨이는 처리량 개선이 아니라 노드 격리로만 설명한다.
+"""
+import time
+
+from bench_utils import measure_batch, quiet
+from bench_gateway_e2e import FakeSerial
+
+FRAMES = 4000
+NODES = 256
+WORKER_COUNTS = (1, 2, 4)
+
+
+def make_lines(n, nodes=NODES):
+    base_ms = int(time.time() * 1000)
+    lines = [f"Received: n{k:04d},0.0,0.0" for k in range(nodes)]
+    for i in range(n):
+        t = 24.0 + 0.8 * ((i % 40) - 20) / 20.0
+        h = 35.0 + 3.0 * ((i % 60) - 30) / 30.0
+        lines.append(f"Received: n{i % nodes:04d},{base_ms + i * 1000},{t:.2f},{h:.2f}")
+        lines.append("-----------------------")
+    return lines
+
+
+def run(quick=False):
+    from gateway_sharded import ShardedGateway  # 지연 import: serial/paho 모듈 로드 비용 제외
+
+    n = FRAMES // 4 if quick else FRAMES
+    lines = make_lines(n)
+    results = []
+    for workers in WORKER_COUNTS:
+        sharded = ShardedGateway(workers, capacity=NODES, use_mqtt=False, quiet=True,
+                                 prefix=f"aoii_bench_{workers}").start()
+
+        def run_once():
+            ser = FakeSerial(lines)
+            with quiet():
+                sharded.run(ser, poll_interval=0, should_stop=ser.exhausted)
+            sharded.wait_idle(timeout=120)
+
+        try:
+            results.append(measure_batch(f"gateway.sharded_{workers}w_per_frame", run_once, ops=n))
+        finally:
+            sharded.stop()
+    return results
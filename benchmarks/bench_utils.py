@@ -0,0 +1,128 @@
+# benchmarks/bench_utils.py
+"""벤치마크 공통: 경로 설정, 반복 측정, 결과 JSON 저장, 기준(baseline) 대비 회귀 비교."""
+import os
+import sys
+import json
+import time
+import platform
+import contextlib
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GATEWAY_DIR = os.path.join(ROOT, "gateway")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# gateway/ 모듈은 스크립트 디렉터리 기준 import (from gateway_MLP_Logic import ...)
+for _p in (ROOT, GATEWAY_DIR):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+
+def measure(name, fn, min_time=0.2, repeat=5, quick=False):
+    """
+    fn()을 반복 호출해 1회당 시간(ns) 측정. 1 repeat가 min_time 이상 걸리도록 반복 수를 자동 보정하고
+    repeat번 측정한 중앙값/최소값을 기록. quick=True면 측정 시간을 줄인다 (CI/라즈베리파이 빠른 확인용).
+    """
+    if quick:
+        min_time, repeat = min_time / 4, 3
+    number = 1
+    while True:
+        t0 = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter_ns() - t0
+        if elapsed >= min_time * 1e9:
+            break
+        number *= 2 if elapsed < min_time * 1e8 else 4
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter_ns() - t0) / number)
+    return _result(name, samples, number)
+
+
+def measure_batch(name, run_once, ops, repeat=3):
+    """run_once()가 ops개 작업을 처리하는 경우 (E2E 등). 1작업당 시간으로 환산."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        run_once()
+        samples.append((time.perf_counter_ns() - t0) / ops)
+    return _result(name, samples, ops)
+
+
+def _result(name, samples, number):
+    samples = sorted(samples)
+    median = samples[len(samples) // 2]
+    return {
+        "name": name,
+        "ns_per_op": round(median, 1),
+        "ns_per_op_min": round(samples[0], 1),
+        "ops_per_sec": round(1e9 / median, 1) if median > 0 else None,
+        "iterations": number,
+        "repeat": len(samples),
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    """게이트웨이/모델의 print 출력 억제 (포맷 비용은 측정에 포함)."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def save_results(results, path=None):
+    """결과 JSON 저장. path 생략 시 benchmarks/results/<시각>.json."""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    doc = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "benchmarks": {r["name"]: r for r in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+    return path
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current, baseline, tolerance=0.2):
+    """
+    baseline 대비 ns_per_op 비율 비교. ratio > 1 + tolerance면 regression.
+    반환: [(name, baseline_ns, current_ns, ratio, status)], status ∈ {"ok", "faster", "REGRESSION", "new"}
+    """
+    base = baseline.get("benchmarks", {})
+    rows = []
+    for name, r in current.get("benchmarks", {}).items():
+        b = base.get(name)
+        if b is None:
+            rows.append((name, None, r["ns_per_op"], None, "new"))
+            continue
+        ratio = r["ns_per_op"] / b["ns_per_op"] if b["ns_per_op"] else None
+        if ratio is None:
+            status = "ok"
+        elif ratio > 1 + tolerance:
+            status = "REGRESSION"
+        elif ratio < 1 - tolerance:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, b["ns_per_op"], r["ns_per_op"], ratio, status))
+    return rows
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+성능 벤치마크 실행기 (예측·수집·저장 핫패스).
+실행: python benchmarks/run_benchmarks.py [--quick] [--only model,db] [--save-baseline] [--tolerance 0.2]
+
+- 결과는 benchmarks/results/<시각>.json 으로 저장
+- benchmarks/baseline.json 이 있으면 ns/op 기준 비교, tolerance 초과 시 REGRESSION 표시 후 종료 코드 1
+- 라즈베리파이에서 측정한 결과를 --save-baseline 으로 기준값으로 등록
+"""
+import os
+import sys
+import argparse
+import importlib
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_utils import BASELINE_PATH, save_results, load_results, compare
+
+SUITES = {
+    "model": "bench_model",
+    "protocol": "bench_protocol",
+    "ingest": "bench_ingest",
+    "db": "bench_db",
+    "db_backends": "bench_db_backends",
+    "e2e": "bench_gateway_e2e",
+    "sharded": "bench_sharded",
+    "scheduler": "bench_scheduler",
+    "model_cache": "bench_model_cache",
+    "query": "bench_query",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Edge-Online-ML-AoII 벤치마크")
+    parser.add_argument("--quick", action="store_true", help="짧은 측정 (대략적인 값)")
+    parser.add_argument("--only", default="", help=f"실행할 스위트 (쉼표 구분): {', '.join(SUITES)}")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmarks/results/<시각>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="비교 기준 JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀 판정 허용 비율 (기본 0.2 = +20%%)")
+    args = parser.parse_args()
+
+    selected = [s.strip() for s in args.only.split(",") if s.strip()] or list(SUITES)
+    results = []
+    for suite in selected:
+        if suite not in SUITES:
+            print(f"unknown suite: {suite}")
+            return 2
+        module = importlib.import_module(SUITES[suite])
+        for r in module.run(quick=args.quick):
+            results.append(r)
+            print(f"  {r['name']:<40} {r['ns_per_op'] / 1000:>12.2f} µs/op  {r['ops_per_sec']:>12,.0f} ops/s")
+
+    path = save_results(results, args.output)
+    print(f"\n결과 저장: {path}")
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("기준값 없음 (--save-baseline 으로 생성)")
+        return 0
+
+    rows = compare(load_results(path), load_results(args.baseline), tolerance=args.tolerance)
+    print(f"\n기준값 대비 ({args.baseline}, 허용 +{args.tolerance:.0%})")
+    regressions = 0
+    for name, base_ns, cur_ns, ratio, status in rows:
+        if ratio is None:
+            print(f"  {name:<40} {'—':>10}  {status}")
+            continue
+        print(f"  {name:<40} x{ratio:>8.2f}  {status}")
+        regressions += status == "REGRESSION"
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,6 +36,11 @@ Adafruit_AHTX0 aht;
 
 float window_buf[WINDOW_SIZE][N_FEATURES];
 
+// 온라인 학습 범위 (게이트웨이 GATEWAY_UPDATE_SCOPE의 이 노드 값과 같아야 미러가 일치)
+//   1 = 출력층(W3, B3)만 (last), 2 = 마지막 2개 층 (last2), 3 = 전체 (full)
+//   1·2는 역전파 외적이 줄어 update_model 연산·가중치 쓰기가 감소 (W3만: 66개, W2·W3: 2,146개, 전체: 2,978개)
+#define UPDATE_SCOPE 3
+
 // ==========================================
 // *** Pre_train.py 실행 후 아래 가중치를 교체할 것 ***
 // ==========================================
@@ -279,6 +284,7 @@ void update_model(float target_t, float target_h) {
     for (int j = 0; j < N_H2; j++) W3[j][i] += lr * out_err[i] * hidden2[j];
     B3[i] += lr * out_err[i];
   }
+#if UPDATE_SCOPE >= 2
 
   // --- Hidden Layer 2 (W2, B2) — ReLU derivative ---
   float h2_delta[N_H2];
@@ -291,6 +297,8 @@ void update_model(float target_t, float target_h) {
     for (int i = 0; i < N_H1; i++) W2[i][j] += lr * h2_delta[j] * hidden1[i];
     B2[j] += lr * h2_delta[j];
   }
+#endif
+#if UPDATE_SCOPE >= 3
 
   // --- Hidden Layer 1 (W1, B1) — ReLU derivative ---
   float h1_delta[N_H1];
@@ -303,6 +311,7 @@ void update_model(float target_t, float target_h) {
     for (int i = 0; i < N_IN; i++) W1[i][j] += lr * h1_delta[j] * last_in_scaled[i];
     B1[j] += lr * h1_delta[j];
   }
+#endif
 }
 
 float get_time_n() {
@@ -313,6 +322,22 @@ float get_time_n() {
   return (float)local_sec / 86400.0f;
 }
 
+// 게이트웨이 회신 "ts" 또는 "ts,beta_t,beta_h" (적응형 δ, GATEWAY_TX_BUDGET)
+void apply_sync_reply(String income) {
+  last_sync_unix = income.toInt();
+  sync_millis = millis();
+  int c1 = income.indexOf(',');
+  int c2 = c1 > 0 ? income.indexOf(',', c1 + 1) : -1;
+  if (c2 > c1) {
+    float bt = income.substring(c1 + 1, c2).toFloat();
+    float bh = income.substring(c2 + 1).toFloat();
+    if (bt > 0.0f && bh > 0.0f) {
+      beta_temp = bt;
+      beta_hum = bh;
+    }
+  }
+}
+
 void waitForTimeSync() {
   display.clear();
   display.drawString(0, 0, "Syncing Time...");
@@ -333,8 +358,7 @@ void waitForTimeSync() {
         while (LoRa.available()) income += (char)LoRa.read();
 
         if (income.length() > 8) {
-          last_sync_unix = income.toInt();
-          sync_millis = millis();
+          apply_sync_reply(income);
           received = true;
           break;
         }
@@ -408,10 +432,13 @@ void loop() {
 
     last_send_millis = millis();
 
-    unsigned long edge_timestamp_ms = last_sync_unix * 1000UL + (millis() - sync_millis);
+    // unix ms는 32비트를 넘으므로 64비트로 (unsigned long이면 49.7일 주기로 wrap → 서버 멱등 키·정렬이 깨짐)
+    uint64_t edge_timestamp_ms = (uint64_t)last_sync_unix * 1000ULL + (millis() - sync_millis);
+    char ts_buf[21];
+    snprintf(ts_buf, sizeof(ts_buf), "%llu", (unsigned long long)edge_timestamp_ms);
 
     LoRa.beginPacket();
-    LoRa.print(String(edge_timestamp_ms) + "," + String(cur_t) + "," + String(cur_h));
+    LoRa.print(String(ts_buf) + "," + String(cur_t) + "," + String(cur_h));
     LoRa.endPacket();
 
     long start = millis();
@@ -421,8 +448,7 @@ void loop() {
         String income = "";
         while (LoRa.available()) income += (char)LoRa.read();
         if (income.length() > 5) {
-          last_sync_unix = income.toInt();
-          sync_millis = millis();
+          apply_sync_reply(income);
         }
         break;
       }
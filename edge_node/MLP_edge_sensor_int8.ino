@@ -0,0 +1,392 @@
+#include <Wire.h>
+#include <Adafruit_AHTX0.h>
+#include "SSD1306Wire.h"
+#include <LoRa.h>
+#include <math.h>
+#include "esp_sleep.h"
+#include <Esp.h>
+
+// ==========================================
+// 하드웨어 설정 (Heltec V2 / Las Vegas)
+// ==========================================
+#define SCK     5
+#define MISO    19
+#define MOSI    27
+#define SS      18
+#define RST     14
+#define DI0     26
+#define BAND    433E6
+
+#define OLED_SDA 4
+#define OLED_SCL 15
+#define OLED_RST 16
+
+SSD1306Wire display(0x3c, OLED_SDA, OLED_SCL);
+Adafruit_AHTX0 aht;
+
+// ==========================================
+// Rolling Window MLP (12-64-32-2, ReLU, int8)
+// ==========================================
+#define WINDOW_SIZE 4
+#define N_FEATURES  3
+#define N_IN   (WINDOW_SIZE * N_FEATURES)  // 12
+#define N_H1   64
+#define N_H2   32
+#define N_OUT  2
+
+float window_buf[WINDOW_SIZE][N_FEATURES];
+
+// ==========================================
+// *** Pre_train.py 실행 후 아래 값을 교체할 것 (ESP32 Code — int8 출력) ***
+// ==========================================
+// Scalers
+float x_mean[12] = {11.9500837f, 34.8013382f, 0.518618107f, 11.9512787f, 34.7971535f, 0.518722713f, 11.9526062f, 34.7918968f, 0.51882261f, 11.9538012f, 34.7865181f, 0.518926501f};
+float x_std[12]  = {5.19325972f, 19.2560539f, 0.287623554f, 5.19306374f, 19.255249f, 0.287608176f, 5.19270563f, 19.2530079f, 0.287601173f, 5.19225597f, 19.2502937f, 0.287602007f};
+float y_mean[2] = {11.9549961f, 34.779583f};
+float y_std[2]  = {5.19155312f, 19.2437325f};
+
+// Quantization (Pre_train.py calibrate_scales)
+const float Q_A0 = 0.0266685411f;
+const float Q_OUT_SCALE = 0.000140444812f;
+const int32_t Q_FWD_M[2]  = {1116409263, 1839277535};
+const int32_t Q_FWD_SH[2] = {37, 38};
+// lr = 0.01, 순서: W1, B1, W2, B2, W3, B3
+const int32_t Q_UPD_M[6]  = {32032, 21992, 20984, 23218, 22117, 18228};
+const int32_t Q_UPD_SH[6] = {39, 28, 32, 21, 24, 13};
+
+int8_t W1_q[12][64] = {
+  {-4, 27, 20, 23, -16, -26, -34, 30, 17, 15, -21, 36, 38, -24, -26, -23, -14, 4, -14, -14, 8, -33, -24, -1, -17, 36, -28, 9, -4, -31, 4, -34, -21, 44, 34, 3, -5, -29, 20, -10, -46, -3, -26, 31, -10, 22, 4, -13, 10, -30, 33, 41, 49, 34, 18, 38, -38, -49, -36, -4, -2, -7, 45, -13},
+  {0, 0, -18, 11, -44, 33, 24, -22, -58, 28, 9, 21, 17, -34, -24, -46, 20, 10, -14, -39, -11, -15, 22, 14, 37, -4, -25, 25, 35, -2, 13, 0, -8, -5, -22, -27, -35, 5, -16, -3, 26, -9, -8, 24, -24, -29, -8, -19, 30, 26, 17, 27, 22, -29, 31, -7, 24, 27, -22, -29, -33, -8, 29, 34},
+  {-39, -9, -5, -38, -26, -18, 37, -19, 9, 16, -19, 42, 41, -16, 3, -22, -16, -47, 17, 3, -22, -28, 30, -18, -26, 7, 24, -22, 14, 27, -21, 28, -15, 7, 2, 5, -57, 26, -18, -30, -52, 3, 6, -45, 1, -5, 9, -28, 42, -10, 53, -29, -14, -15, 45, 29, -13, 3, 22, 15, 11, -43, -25, 39},
+  {32, 3, -5, -16, 16, 29, 37, 29, 1, -28, -29, 30, 12, -30, -43, 8, -32, -38, -17, 16, 20, -21, 20, -9, -10, 34, 10, 28, 9, 3, -45, -11, -15, -17, 43, -20, 25, 5, 24, 9, 14, -1, -31, -1, -11, -25, 33, -29, 38, 41, 24, -13, -33, 23, 1, 31, 38, 25, -16, -3, 25, -21, -19, 1},
+  {57, 21, 15, -39, 12, 47, -31, 11, 36, 21, 18, 23, -10, -11, 20, 31, 29, 34, 7, 2, 15, 13, 28, 29, 33, -6, -3, -28, 17, -48, -10, 1, -24, 17, -17, -27, 33, -17, -33, -6, 13, -37, 12, -34, -37, -8, 15, 14, 14, 39, 11, -17, 31, -6, -15, -54, -41, 30, 23, 18, -14, -27, -23, -11},
+  {9, 14, 10, -18, 33, 35, 0, -4, 9, -23, -20, 20, -33, -21, -26, -39, 25, 13, 12, -43, 9, 1, -34, -1, -10, 9, 6, -40, -19, 17, 4, 32, 14, -29, -41, 14, -56, 5, 33, 5, -18, 10, -12, -1, 41, -3, 25, 37, -12, -36, -28, -49, -25, 33, -31, -21, 34, -49, 13, -2, -29, 3, 21, 30},
+  {19, 27, -2, -20, 15, 24, 48, 0, -22, 32, -17, 42, 23, 6, 11, 17, -26, 19, -10, 41, -17, 39, -2, -25, 49, -18, -20, 38, 29, 0, 13, -11, -16, -14, 21, 20, 11, 18, -33, 11, -26, 3, -15, 22, -5, -27, -16, 21, 12, -30, -29, 12, -39, 14, 12, -50, -36, 38, -9, -8, 25, 34, 38, 17},
+  {8, -31, 26, 10, -17, 34, -32, 2, -41, -2, -44, -35, -30, 20, 27, 5, 38, -6, -4, 25, -34, 37, -33, 30, -48, 41, -2, 42, -25, -7, 40, 0, 21, 21, -1, 19, 20, 25, -53, -27, 28, 41, 0, 4, -13, -49, -5, -10, 1, -42, 41, 40, 25, -6, -17, 29, 12, -31, 33, 33, 33, 20, 19, -6},
+  {47, 30, -50, -46, -19, 23, 41, -21, 0, -13, 39, 21, 27, 4, -5, -19, -41, 37, 33, 34, 47, 0, 8, 31, 22, -18, -7, -30, 34, 23, -20, 18, 11, -15, -29, 9, 4, 21, -4, 31, -5, 10, 32, 6, -38, -36, 29, 12, 18, -31, -44, -46, -3, 11, 4, -13, 31, -20, 1, 37, -17, 8, 34, 31},
+  {-20, 52, -12, -44, -11, 40, 8, -32, 21, -52, -32, -21, -46, -25, -60, 17, -39, -9, 48, 17, -9, -10, -43, -62, -39, -32, -38, -27, -33, -21, -36, -27, 15, -8, -85, 2, 33, -65, 42, 44, -41, -38, 27, 39, -22, -37, -35, -13, 24, -30, 27, 38, -37, -49, 7, 23, -7, -12, -22, -9, 14, -12, -32, -23},
+  {-61, -41, -24, -5, -69, 38, 3, 42, -15, 9, -47, -8, 15, 19, -4, -42, -16, -9, 15, 27, -10, 50, 29, -23, -35, -20, -27, -43, -55, -33, -39, 44, -55, 11, 3, 71, -35, -21, 61, 22, 32, -30, -35, 30, 29, 7, 13, -18, 27, -25, -9, 5, 12, -38, -56, 6, -15, 17, -38, 3, -1, -38, -12, -22},
+  {-30, 36, -36, 13, -35, 10, 17, -14, -1, -21, -29, 30, 40, 41, -34, 12, 32, -23, -37, 16, 10, 21, -41, 23, -25, -36, -28, 35, 11, 14, -11, 35, -6, 18, -7, -26, -2, -16, 22, 1, -40, 33, -4, 3, 28, 12, -17, 40, 29, -20, -32, 11, 11, 8, 42, 17, -33, -25, -11, 32, -48, -17, 28, 16}
+};
+
+int8_t W2_q[64][32] = {
+  {-32, -30, -23, 28, 12, -5, 7, -15, -27, -13, -8, 42, -32, 0, -23, 22, 12, -1, -2, 4, 11, 18, -16, -21, -9, -9, -10, -33, 14, 16, -11, 19},
+  {-8, 4, -21, -18, 21, 30, -3, -18, 8, -2, -37, -16, 10, 13, -28, -30, -15, -1, 0, -37, 19, -25, 7, -26, -20, -35, 10, 20, 24, 1, 17, -19},
+  {-6, 37, -28, -4, -1, -44, -36, 20, -32, 11, 32, 8, -65, -34, 23, 2, -6, -12, 1, -25, -1, 7, 23, -7, 29, 27, 34, 0, -25, -12, -24, 5},
+  {1, -16, -31, 36, 30, 4, -19, -11, -26, 23, -24, -11, -9, -1, 13, 19, -20, -43, -17, 30, 5, 5, -5, 8, -18, 31, -25, -9, 3, -9, -17, 25},
+  {-30, -5, -32, 4, -10, -2, -17, -20, -4, 2, 15, 44, 20, -12, -21, -16, 11, -33, 0, -12, 16, 19, -24, -25, 19, 4, 13, -9, -15, 39, 20, 22},
+  {-10, 7, 0, -41, 27, -24, 31, 4, -19, 6, 21, 14, 25, 7, 10, 25, -22, 4, -8, 37, 28, -19, 17, 27, -17, -3, 28, -24, 14, -11, 36, 28},
+  {28, 4, 24, 16, -5, 20, -15, 7, -15, -51, -18, 12, -17, 11, -20, -10, -1, -6, 0, -8, 17, 13, -21, -32, 29, -48, 19, -3, 27, 20, 33, -14},
+  {24, -4, 6, 6, 33, 27, 32, 3, -9, 22, -15, -25, -27, -33, -2, 1, -72, -52, 0, -23, -30, 25, -11, 45, 1, -8, -6, 17, 23, -2, 12, -8},
+  {12, -24, 31, 27, -1, 10, -19, -24, -29, -2, 16, 1, -16, 41, 35, 11, 43, -36, 0, 29, 39, -10, 16, -20, -21, -13, 16, 5, -11, 28, 8, 7},
+  {26, 32, 30, 34, 13, 0, -27, -3, -11, -29, 17, 0, -36, -24, 19, -25, 20, 1, -2, 1, 15, -9, 13, 6, -11, 25, 26, 6, 17, 6, 17, 21},
+  {3, 13, 0, 19, -19, 25, 21, -31, 20, -27, -5, 15, -19, 19, 24, 0, -28, -32, 4, 33, 11, -11, 0, 4, 26, -20, 13, 18, 26, -5, 9, 37},
+  {-24, 32, 13, -30, -11, 7, -18, 3, -19, 17, -21, 24, 21, 27, 21, -23, 11, -39, 0, -6, -1, 8, 6, -7, -9, 45, -9, -6, -24, 26, 9, -13},
+  {-26, 20, 13, 0, 33, -30, 10, 25, -8, 9, 13, -18, 17, -13, 35, -14, -26, -16, 0, -13, 22, -14, 23, -14, 35, -9, 14, 17, 12, 11, -32, -12},
+  {16, 10, 12, -2, -23, -25, 14, 6, -16, -15, -25, 3, 1, 17, -9, 0, -37, 5, -7, 1, 17, -7, 2, 26, 21, -13, -2, -22, -19, 39, -3, 6},
+  {6, 16, 0, -26, -7, -2, -29, -4, -32, -29, -2, -26, 0, 5, 26, -17, -21, -34, 5, 15, -45, 14, -30, 6, 17, 35, 12, 0, -14, 24, -25, 27},
+  {10, 17, -7, 16, 2, 24, -43, -20, -10, -20, 27, -14, 34, -6, -24, 18, 23, 30, 1, 21, -15, 32, 41, 12, -21, 31, -23, -29, -15, 16, 25, 20},
+  {13, -4, -12, -3, 32, -30, 21, 7, -6, -19, 1, 22, 26, -8, -12, 5, 23, -26, 5, 9, 20, -11, 12, 27, -12, -16, 24, -19, 18, -12, -11, 25},
+  {-1, 5, 1, -2, -17, -9, 34, -9, 12, -11, 18, -21, 35, -4, -12, -25, -25, 2, -10, 32, -1, -18, 5, 18, -12, -21, -35, 5, 8, -16, 31, 17},
+  {25, 18, -6, -40, -17, -20, 9, 36, -13, -14, -29, 41, -2, 10, -36, -43, 24, 34, 0, 53, 8, 27, -9, -1, -8, -2, -7, -42, -5, 6, -3, 2},
+  {8, -25, 18, -17, 24, -29, 17, 19, 19, 25, 21, 10, 23, 5, -37, 37, 5, -31, -9, 8, 0, 13, -25, 20, 27, -1, 38, -6, 23, 10, 18, 19},
+  {31, -5, -10, 3, 14, 24, 26, -6, 24, -34, 6, -12, -20, -7, 0, 16, -4, -6, -15, -6, -9, -27, 2, 40, 13, -13, -7, 22, -1, 6, -28, 14},
+  {-6, -1, 13, -19, 12, 10, 26, 21, 24, -28, -15, -33, 9, 20, -11, 32, -33, 32, -9, -19, 1, -27, -14, -7, 25, 6, -16, 2, 8, -25, 0, -28},
+  {-18, 17, -14, 23, 18, -30, -8, -12, 22, -20, 27, 8, -53, -8, 39, 13, 24, 26, 0, -41, 0, -16, 26, 32, -5, -9, 30, 0, 14, -13, 20, -27},
+  {4, -1, 4, -14, 16, 24, -19, -21, -31, 7, 9, 2, -14, -10, 10, 0, 29, -16, 9, -6, 3, -1, 7, 32, -20, -25, 17, 6, -18, -28, -15, 28},
+  {-21, -13, -22, 26, -27, -2, -44, 21, -22, 0, 30, 2, -7, -17, -3, 9, 44, 38, 1, 0, 3, -38, 2, 31, -13, 13, -8, 0, -30, 6, 26, -3},
+  {8, 22, 15, 16, -5, -20, 24, 18, 2, 19, 7, 13, -54, 13, -15, 27, 12, 0, -26, -22, -59, -26, -36, 33, 15, -12, -14, -31, -6, 24, 7, 12},
+  {30, 25, -14, 38, -20, 12, -12, 23, 14, 13, 23, -10, -42, -14, -19, 18, -17, 37, 5, -2, -19, 23, 24, 7, 11, 2, -3, -1, -10, -17, -19, -15},
+  {-38, -21, 20, 28, 32, -11, 0, -6, -8, -47, 17, -12, -9, 5, -12, -22, 19, -9, 0, -1, -37, 2, 25, -8, 2, -34, -21, -37, 7, -5, -15, 34},
+  {12, 12, -22, 17, 3, -8, -19, 13, -3, -38, 14, -1, 7, 10, 25, -35, 1, -21, 0, -38, 14, -34, -3, -12, -19, -65, 19, 16, 24, 11, -40, 25},
+  {-6, 29, -26, -1, -19, -16, 26, 2, -11, -17, -3, 19, 26, 24, 23, -11, 7, 5, -13, 23, -30, 33, -6, 19, 15, -17, 8, 3, -30, 6, -12, 26},
+  {-2, 14, -34, -14, 17, -29, -26, -30, 29, -2, -6, -17, -12, 14, 16, -20, -22, -61, 7, 19, -15, -35, -31, 32, -2, 22, -4, 0, -23, -17, 6, 20},
+  {12, 6, -18, 30, 24, -19, 36, 14, 5, 12, 23, 10, -28, -15, 34, -16, -15, 11, -5, 5, 27, -18, -32, -18, 28, 2, -11, 8, 17, 10, 33, -16},
+  {11, -3, 12, 16, 15, 12, -18, -2, 33, 23, -30, -23, -15, 14, 18, -23, 3, 1, 11, 6, 2, 2, -18, 2, 18, 19, 3, 15, -25, 5, -30, -4},
+  {16, 32, -24, -14, 19, -1, 0, 14, 27, -13, -9, 18, 2, -42, 25, -30, 26, -21, 21, 5, -45, 11, -9, 24, 36, -14, -10, 7, 23, -4, -5, -1},
+  {16, -29, 1, 21, 26, -24, 18, -4, 16, -17, 16, 3, -2, -7, 34, 27, -14, 28, 0, -51, -60, -19, 11, 22, 21, -4, -12, -44, -6, 6, -35, -5},
+  {17, 26, 52, 13, 30, -29, 31, 25, -25, 6, 12, -8, 3, -4, -13, 8, -31, -16, 0, 39, -26, -1, -17, 47, -13, 20, 30, 7, -29, 12, 11, -11},
+  {-24, -34, 9, 9, -10, 23, 13, -28, 18, -43, 13, 11, 30, -15, -22, -20, -17, -3, 0, 10, -63, 23, -5, 15, -18, 3, -26, -36, 34, -4, 4, 5},
+  {-10, 32, -16, 17, 37, -2, 34, -23, -8, -26, 22, 31, -19, 2, -13, 10, -6, 40, 4, -25, -24, -21, -24, -10, 29, 2, 5, -30, 15, 11, -26, 13},
+  {6, -22, 12, -8, -11, 25, 42, 16, -2, -3, -6, 4, -26, -3, 29, -4, -34, 8, 0, 17, -23, -2, 14, 15, -17, 26, 27, 17, -15, -7, 52, 21},
+  {-22, -24, 15, -1, 9, -3, -15, 28, 27, -14, 9, 30, -12, -1, -13, 19, 5, 1, 0, -16, 18, 15, -19, 19, 21, -15, 26, 19, -11, 20, -4, -35},
+  {-20, 28, 14, -20, -2, 6, -27, 27, 18, -22, 32, -8, 30, 6, 12, -20, 22, -16, -20, -28, 2, 2, 15, 27, -22, 21, -32, 15, 19, 2, 18, -12},
+  {-12, 17, -13, -2, -18, 13, -16, -28, -10, 12, -31, -12, -27, -5, -7, 7, 15, 34, -9, 22, 16, 24, 5, -35, 10, 50, 15, -24, -24, 34, 13, 41},
+  {-17, 10, 13, -9, -12, -19, -20, 3, 18, 8, 17, 18, 31, 14, -16, 20, 12, 5, -23, 8, -7, 29, -3, -8, 35, -38, -7, -39, 14, 27, 7, 24},
+  {-10, 26, 24, 13, -29, 29, 26, -6, 22, -2, 18, -18, 17, 7, -9, -10, -38, -2, 0, -4, -18, -1, 18, -23, 35, 25, 17, 1, 34, -19, -14, -27},
+  {14, -24, -2, 35, 26, -9, -22, 15, -8, -20, -14, 19, 13, 15, 31, 15, -3, 12, 0, -20, 21, 7, 22, -1, 13, -6, 8, 23, -21, 1, 1, -6},
+  {-7, 15, 24, 13, 21, 3, 19, -12, -11, -8, 3, -32, -10, -18, 35, -6, -4, -5, 5, -12, -32, 1, -38, -27, -13, -15, -31, -21, 16, 15, -2, -4},
+  {26, 0, -22, 12, -17, -15, 11, 29, -5, 11, 37, -25, -22, -14, 1, 1, 19, 18, 4, -16, 20, 18, 16, -22, 16, -33, -17, -39, -2, 16, -27, -7},
+  {-2, -3, -21, -5, 19, -28, -19, -5, 28, 8, 23, 3, -2, -34, 16, 30, 3, 35, 11, -39, 33, -26, -3, -15, -26, -85, -14, -3, 0, -27, -22, 21},
+  {-3, 19, 22, 16, 16, -10, 16, -6, -21, 25, -4, 20, 21, 21, 29, 1, -16, 12, 0, 7, 11, 14, -7, -21, 2, -12, 28, -14, -22, -35, 16, 2},
+  {-7, -28, -3, 8, 11, 7, -17, -8, 34, -10, 12, -26, -2, -34, 3, 30, -4, -2, 0, -10, -36, -32, 15, -2, -21, 29, -12, 0, -11, 32, 13, 24},
+  {30, -17, 37, 11, -8, -6, -6, -23, 9, -6, 9, 29, -8, -7, -18, -15, -23, 7, 0, 32, -50, -3, 14, -25, -6, 5, 2, 2, 24, 10, 10, 12},
+  {4, -22, -2, -24, -4, 3, -16, 27, 34, -9, -3, 19, -24, 23, -22, 17, -19, 26, 0, 8, -47, 52, 6, 21, 15, -9, -10, -18, 25, -3, 7, 3},
+  {4, 26, 32, 9, 24, 18, 9, 33, -18, -25, 25, -6, 23, 22, -23, 25, -6, -7, 5, 32, -27, 6, 10, 16, 20, -25, -17, 4, 16, -22, -16, 33},
+  {-27, 23, 9, 23, -32, -22, 13, 14, 4, -40, 9, 27, 9, 28, 28, -19, -38, 5, 0, 6, 18, -25, -13, 0, 21, -4, -25, 30, 14, -5, -12, 30},
+  {18, 4, -32, -19, -22, 1, -23, -16, 20, 5, -6, 38, -17, 11, -18, -13, 46, -10, 0, -51, -21, 23, -6, -13, 11, -15, -32, 12, -11, 27, 25, 26},
+  {10, -5, -12, 12, -21, 3, -16, -20, 2, -7, -15, -6, -29, 15, -34, -16, 12, -48, 0, 9, -6, 15, -16, -22, -17, -27, 27, -15, 20, 25, 15, 29},
+  {-12, 27, -24, 12, -6, -5, 3, 6, -35, -30, 11, 13, 50, 17, 19, 11, -16, -31, 12, 3, -13, -8, 26, 2, -6, 11, -21, 5, -11, -23, 27, -1},
+  {25, 22, -5, 3, -1, 15, -23, 19, 3, -3, -28, 13, 17, -16, 9, -2, 15, 5, 0, -16, -4, -24, -18, 5, -22, 24, -21, -7, -9, -44, -11, -13},
+  {-6, -4, -11, 14, -30, -6, 29, 0, 6, -26, 21, 18, -1, 28, -21, -32, 15, 20, -23, -15, -23, -14, 7, 2, -7, -15, -24, -14, 5, 27, 24, -27},
+  {29, 20, 14, -6, -7, -18, -24, 0, -28, 16, 16, 0, -34, 28, 31, 20, 29, 41, 24, -37, 4, -23, -31, -20, 4, 62, 16, -29, 12, 9, 11, 11},
+  {3, -5, 43, -24, 11, 17, 23, -15, -22, -26, 8, 1, -24, 32, 12, -1, -5, 27, 0, -4, -21, 3, 7, 5, -35, 0, 2, -38, -33, 24, 35, 10},
+  {23, -19, 14, -14, 22, 36, 1, 22, 5, -17, 6, 8, -33, 4, 32, -23, 17, 22, 16, 19, 2, 23, 13, -15, 5, 10, -23, 6, 8, -12, -6, 26},
+  {6, -35, -27, -12, 18, -23, 6, -24, -28, 18, 18, -14, -18, -26, -6, 7, -52, 2, 0, 24, 45, -56, 5, -12, -8, -14, 26, 30, 2, 2, 12, 5},
+  {3, -5, 4, -23, -18, 22, -21, -4, -30, -51, -23, -22, 12, -18, 33, 5, -10, -1, 0, 23, -12, -23, 19, 22, 32, -12, 15, -3, -5, -16, -10, -12}
+};
+
+int8_t W3_q[32][2] = {
+  {21, 61},
+  {-46, 28},
+  {30, 52},
+  {-23, -38},
+  {-29, 28},
+  {45, -35},
+  {-36, 66},
+  {23, 76},
+  {34, -30},
+  {8, 64},
+  {-64, 9},
+  {39, -40},
+  {43, 13},
+  {63, -65},
+  {-44, 11},
+  {-19, 34},
+  {40, -67},
+  {20, 25},
+  {-2, 45},
+  {62, -35},
+  {38, -23},
+  {72, -11},
+  {35, 50},
+  {-34, 43},
+  {-53, -8},
+  {-54, 85},
+  {46, 35},
+  {45, -14},
+  {61, -2},
+  {-19, -45},
+  {54, 36},
+  {-17, -74}
+};
+
+int32_t B1_q[64] = {-924, 1085, -2226, 176, -383, -733, 598, -914, -1036, 691, 644, 320, 1152, 360, -871, -595, -535, 1908, 972, -327, 826, 1474, -1062, 358, -328, 374, -2040, 996, 896, 513, 506, 1637, 219, -1391, 853, 1568, -292, 1352, 1135, 964, 92, -1359, 1756, 971, -1439, 1718, 2084, 900, 632, -622, -1277, -203, 1773, -769, -183, -409, 473, 1138, -377, -754, 428, -248, -9, -528};
+
+int32_t B2_q[32] = {-607, 1394, -407, -1401, -967, 1113, 623, 214, 1083, 1128, -558, 608, 796, 322, -770, 1351, -135, -554, -313, -1239, -1523, 622, -1863, 27, 498, -1562, 1059, -1449, -862, -419, -787, -1655};
+
+int32_t B3_q[2] = {1783, -2576};
+// ==========================================
+// *** 가중치 끝 ***
+// ==========================================
+
+float lr = 0.01f;  // int8 학습 배율(Q_UPD_M/SH)에 반영됨 — 바꾸면 Pre_train.py EDGE_LR도 변경
+float beta_temp = 0.5f;
+float beta_hum  = 3.0f;
+const float epsilon = 0.001f;
+
+// int8 순전파·온라인 학습 (gateway/gateway_MLP_int8.py와 비트 단위 동일)
+#include "mlp_int8.h"
+
+unsigned long last_sync_unix = 0;
+unsigned long sync_millis = 0;
+
+unsigned long last_send_millis = 0;
+const unsigned long HEARTBEAT_INTERVAL = 600000;
+
+void init_window() {
+  for (int w = 0; w < WINDOW_SIZE; w++) {
+    window_buf[w][0] = y_mean[0];
+    window_buf[w][1] = y_mean[1];
+    window_buf[w][2] = 0.5f;
+  }
+}
+
+void shift_window(float t, float h, float tn) {
+  for (int w = 0; w < WINDOW_SIZE - 1; w++) {
+    for (int f = 0; f < N_FEATURES; f++) {
+      window_buf[w][f] = window_buf[w + 1][f];
+    }
+  }
+  window_buf[WINDOW_SIZE - 1][0] = t;
+  window_buf[WINDOW_SIZE - 1][1] = h;
+  window_buf[WINDOW_SIZE - 1][2] = tn;
+}
+
+
+float get_time_n() {
+  if (last_sync_unix == 0) return 0.5f;
+  unsigned long current_unix = last_sync_unix + (millis() - sync_millis) / 1000;
+  long local_sec = (current_unix - 28800) % 86400; // UTC-8
+  if (local_sec < 0) local_sec += 86400;
+  return (float)local_sec / 86400.0f;
+}
+
+// 게이트웨이 회신 "ts" 또는 "ts,beta_t,beta_h" (적응형 δ, GATEWAY_TX_BUDGET)
+void apply_sync_reply(String income) {
+  last_sync_unix = income.toInt();
+  sync_millis = millis();
+  int c1 = income.indexOf(',');
+  int c2 = c1 > 0 ? income.indexOf(',', c1 + 1) : -1;
+  if (c2 > c1) {
+    float bt = income.substring(c1 + 1, c2).toFloat();
+    float bh = income.substring(c2 + 1).toFloat();
+    if (bt > 0.0f && bh > 0.0f) {
+      beta_temp = bt;
+      beta_hum = bh;
+    }
+  }
+}
+
+void waitForTimeSync() {
+  display.clear();
+  display.drawString(0, 0, "Syncing Time...");
+  display.display();
+
+  int retries = 0;
+  while (last_sync_unix == 0) {
+    LoRa.beginPacket();
+    LoRa.print("0.0,0.0");
+    LoRa.endPacket();
+
+    long start = millis();
+    bool received = false;
+    while (millis() - start < 3000) {
+      int p_size = LoRa.parsePacket();
+      if (p_size) {
+        String income = "";
+        while (LoRa.available()) income += (char)LoRa.read();
+
+        if (income.length() > 8) {
+          apply_sync_reply(income);
+          received = true;
+          break;
+        }
+      }
+    }
+
+    if (received) {
+      display.drawString(0, 20, "Success!");
+      display.drawString(0, 40, "TS: " + String(last_sync_unix));
+      display.display();
+      delay(1000);
+      break;
+    } else {
+      retries++;
+      display.drawString(0, 20, "Retry: " + String(retries));
+      display.display();
+      delay(1000);
+    }
+  }
+}
+
+void setup() {
+  Serial.begin(115200);
+  pinMode(OLED_RST, OUTPUT); digitalWrite(OLED_RST, HIGH);
+  Wire.begin(OLED_SDA, OLED_SCL);
+  display.init(); display.flipScreenVertically();
+
+  if (!aht.begin()) { display.drawString(0, 0, "Sensor Error"); display.display(); while (1); }
+
+  SPI.begin(SCK, MISO, MOSI, SS);
+  LoRa.setPins(SS, RST, DI0);
+  if (!LoRa.begin(BAND)) { display.drawString(0, 0, "LoRa Error"); display.display(); while (1); }
+
+  display.drawString(0, 0, "Model: 12-64-32-2 int8");
+  display.display();
+  delay(1000);
+
+  init_window();
+  waitForTimeSync();
+  last_send_millis = millis();
+}
+
+void loop() {
+  sensors_event_t h_event, t_event;
+  aht.getEvent(&h_event, &t_event);
+  // 게이트웨이가 받는 값(소수 2자리)과 같은 값으로 학습해야 미러와 가중치가 일치
+  float cur_t = roundf(t_event.temperature * 100.0f) / 100.0f;
+  float cur_h = roundf(h_event.relative_humidity * 100.0f) / 100.0f;
+  float time_n = get_time_n();
+
+  unsigned long t_start = micros();
+
+  forward_int8();
+
+  float pred_t = (pred_scaled[0] * y_std[0]) + y_mean[0];
+  float pred_h = (pred_scaled[1] * y_std[1]) + y_mean[1];
+
+  float err_t = fabsf(cur_t - pred_t);
+  float err_h = fabsf(cur_h - pred_h);
+
+  bool is_heartbeat = (millis() - last_send_millis >= HEARTBEAT_INTERVAL);
+  bool send_data = (err_t >= beta_temp - epsilon) || (err_h >= beta_hum - epsilon) || (last_sync_unix == 0) || is_heartbeat;
+
+  String status = "SKIP";
+
+  if (send_data) {
+    if (is_heartbeat && err_t <= beta_temp && err_h <= beta_hum) {
+      status = "HEARTBEAT";
+    } else {
+      status = "SEND & TRAIN";
+    }
+
+    last_send_millis = millis();
+
+    // unix ms는 32비트를 넘으므로 64비트로 (unsigned long이면 49.7일 주기로 wrap → 서버 멱등 키·정렬이 깨짐)
+    uint64_t edge_timestamp_ms = (uint64_t)last_sync_unix * 1000ULL + (millis() - sync_millis);
+    char ts_buf[21];
+    snprintf(ts_buf, sizeof(ts_buf), "%llu", (unsigned long long)edge_timestamp_ms);
+
+    LoRa.beginPacket();
+    LoRa.print(String(ts_buf) + "," + String(cur_t) + "," + String(cur_h));
+    LoRa.endPacket();
+
+    long start = millis();
+    while (millis() - start < 1000) {
+      int p_size = LoRa.parsePacket();
+      if (p_size) {
+        String income = "";
+        while (LoRa.available()) income += (char)LoRa.read();
+        if (income.length() > 5) {
+          apply_sync_reply(income);
+        }
+        break;
+      }
+    }
+
+    update_model_int8(cur_t, cur_h);
+  }
+
+  shift_window(pred_t, pred_h, time_n);
+
+  unsigned long t_end = micros();
+  unsigned long inference_time_us = t_end - t_start;
+
+  uint32_t free_heap = ESP.getFreeHeap();
+  uint32_t total_heap = ESP.getHeapSize();
+
+  display.clear();
+  display.drawString(0, 0, "Err T:" + String(err_t, 3) + " H:" + String(err_h, 3));
+  display.drawString(0, 15, "P_T:" + String(pred_t, 1) + " P_H:" + String(pred_h, 1));
+  display.drawString(0, 30, "R_T:" + String(cur_t, 1) + " R_H:" + String(cur_h, 1));
+  display.drawString(0, 45, ">> " + status);
+  display.display();
+
+  Serial.println(
+    String(cur_t) + "," + String(cur_h) + "," +
+    String(pred_t) + "," + String(pred_h) + "," +
+    String(err_t, 3) + "," + String(err_h, 3) + "," +
+    status + "," +
+    String(inference_time_us) + "," + String(free_heap) + "," + String(total_heap)
+  );
+
+  Serial.flush();
+  LoRa.sleep();
+
+  uint64_t sleep_time_us = 60ULL * 1000ULL * 1000ULL;
+  esp_sleep_enable_timer_wakeup(sleep_time_us);
+  esp_light_sleep_start();
+
+  display.displayOn();
+}
@@ -0,0 +1,145 @@
+// edge_node/mlp_int8.h
+// ==========================================
+// int8 양자화 MLP (12-64-32-2, ReLU) 순전파·온라인 학습 참조 구현
+// gateway/gateway_MLP_int8.py 와 같은 입력이면 비트 단위로 같은 예측·가중치
+//
+// include 전에 스케치에서 정의할 것 (Pre_train.py int8 출력):
+//   WINDOW_SIZE, N_FEATURES, N_IN, N_H1, N_H2, N_OUT, window_buf,
+//   x_mean, x_std, y_mean, y_std, W1_q..W3_q (int8_t), B1_q..B3_q (int32_t),
+//   Q_A0, Q_OUT_SCALE, Q_FWD_M/Q_FWD_SH, Q_UPD_M/Q_UPD_SH
+// ==========================================
+#ifndef MLP_INT8_H
+#define MLP_INT8_H
+
+// float 곱셈·덧셈이 FMA(madd.s)로 합쳐지면 게이트웨이(numpy)와 반올림이 달라지므로 금지
+#pragma GCC optimize ("fp-contract=off")
+
+#include <stdint.h>
+#include <math.h>
+
+#define Q_MAX 127
+#define Q_ERR_SCALE (1.0f / 32.0f)  // 출력 오차 1 LSB (scaled 단위)
+
+enum { Q_W1, Q_B1, Q_W2, Q_B2, Q_W3, Q_B3 };
+// 확률적 반올림 난수용 파라미터 번호 시작 (순전파 순서, 행 우선)
+const uint32_t Q_PARAM_OFFSET[6] = {
+  0,
+  N_IN * N_H1,
+  N_IN * N_H1 + N_H1,
+  N_IN * N_H1 + N_H1 + N_H1 * N_H2,
+  N_IN * N_H1 + N_H1 + N_H1 * N_H2 + N_H2,
+  N_IN * N_H1 + N_H1 + N_H1 * N_H2 + N_H2 + N_H2 * N_OUT,
+};
+
+int32_t q_x[N_IN];
+int32_t q_acc1[N_H1], q_acc2[N_H2];  // ReLU 미분용 누적값
+int32_t q_h1[N_H1], q_h2[N_H2];
+float pred_scaled[N_OUT];
+uint32_t q_update_count = 0;          // 난수 시드: 재부팅 시 0 (게이트웨이 미러도 동기화 요청 시 리셋)
+
+static inline int32_t q_clamp(int64_t v, int32_t lo, int32_t hi) {
+  return v < lo ? lo : (v > hi ? hi : (int32_t)v);
+}
+
+static inline int32_t q_quantize(float v) {
+  float q = floorf(v + 0.5f);
+  return q < -Q_MAX ? -Q_MAX : (q > Q_MAX ? Q_MAX : (int32_t)q);
+}
+
+// 누적값 x 배율, 반올림 (+0.5 후 floor). >>는 부호 있는 산술 시프트 (GCC/xtensa)
+static inline int64_t q_requant(int64_t acc, int32_t m, int32_t sh) {
+  int64_t v = acc * m;
+  if (sh <= 0) return v << -sh;
+  return (v + (1LL << (sh - 1))) >> sh;
+}
+
+// murmur3 fmix32 — (업데이트 횟수, 파라미터 번호) → 난수
+static inline uint32_t q_mix32(uint32_t counter, uint32_t idx) {
+  uint32_t x = idx + counter * 0x9E3779B9u;
+  x ^= x >> 16;
+  x *= 0x85EBCA6Bu;
+  x ^= x >> 13;
+  x *= 0xC2B2AE35u;
+  x ^= x >> 16;
+  return x;
+}
+
+// 기울기 정수값 x 학습 배율, 확률적 반올림
+static inline int64_t q_sround(int64_t g, int p, uint32_t idx) {
+  int64_t v = g * Q_UPD_M[p];
+  int32_t sh = Q_UPD_SH[p];
+  if (sh <= 0) return v << -sh;
+  uint32_t r = q_mix32(q_update_count, Q_PARAM_OFFSET[p] + idx);
+  int64_t bits = sh <= 32 ? (int64_t)(r >> (32 - sh)) : ((int64_t)r << (sh - 32));
+  return (v + bits) >> sh;
+}
+
+void forward_int8() {
+  for (int w = 0; w < WINDOW_SIZE; w++) {
+    for (int f = 0; f < N_FEATURES; f++) {
+      int idx = w * N_FEATURES + f;
+      float s = (window_buf[w][f] - x_mean[idx]) / x_std[idx];
+      q_x[idx] = q_quantize(s / Q_A0);
+    }
+  }
+
+  for (int j = 0; j < N_H1; j++) {
+    int32_t acc = B1_q[j];
+    for (int i = 0; i < N_IN; i++) acc += q_x[i] * W1_q[i][j];
+    q_acc1[j] = acc;
+    q_h1[j] = q_clamp(q_requant(acc > 0 ? acc : 0, Q_FWD_M[0], Q_FWD_SH[0]), 0, Q_MAX);
+  }
+
+  for (int j = 0; j < N_H2; j++) {
+    int32_t acc = B2_q[j];
+    for (int i = 0; i < N_H1; i++) acc += q_h1[i] * W2_q[i][j];
+    q_acc2[j] = acc;
+    q_h2[j] = q_clamp(q_requant(acc > 0 ? acc : 0, Q_FWD_M[1], Q_FWD_SH[1]), 0, Q_MAX);
+  }
+
+  for (int j = 0; j < N_OUT; j++) {
+    int32_t acc = B3_q[j];
+    for (int i = 0; i < N_H2; i++) acc += q_h2[i] * W3_q[i][j];
+    pred_scaled[j] = (float)acc * Q_OUT_SCALE;
+  }
+}
+
+void update_model_int8(float target_t, float target_h) {
+  float target_s[2] = {(target_t - y_mean[0]) / y_std[0], (target_h - y_mean[1]) / y_std[1]};
+  int32_t e[N_OUT];
+  for (int k = 0; k < N_OUT; k++) e[k] = q_quantize((target_s[k] - pred_scaled[k]) / Q_ERR_SCALE);
+
+  // --- Output Layer (W3, B3) ---
+  for (int j = 0; j < N_H2; j++)
+    for (int k = 0; k < N_OUT; k++)
+      W3_q[j][k] = q_clamp(W3_q[j][k] + q_sround((int64_t)q_h2[j] * e[k], Q_W3, j * N_OUT + k), -Q_MAX, Q_MAX);
+  for (int k = 0; k < N_OUT; k++) B3_q[k] += (int32_t)q_sround(e[k], Q_B3, k);
+
+  // --- Hidden Layer 2 (W2, B2) — ReLU derivative ---
+  int32_t h2_err[N_H2];
+  for (int j = 0; j < N_H2; j++) {
+    int32_t sum = 0;
+    for (int k = 0; k < N_OUT; k++) sum += e[k] * W3_q[j][k];
+    h2_err[j] = q_acc2[j] > 0 ? sum : 0;
+  }
+  for (int i = 0; i < N_H1; i++)
+    for (int j = 0; j < N_H2; j++)
+      W2_q[i][j] = q_clamp(W2_q[i][j] + q_sround((int64_t)q_h1[i] * h2_err[j], Q_W2, i * N_H2 + j), -Q_MAX, Q_MAX);
+  for (int j = 0; j < N_H2; j++) B2_q[j] += (int32_t)q_sround(h2_err[j], Q_B2, j);
+
+  // --- Hidden Layer 1 (W1, B1) — ReLU derivative ---
+  int32_t h1_err[N_H1];
+  for (int i = 0; i < N_H1; i++) {
+    int32_t sum = 0;
+    for (int j = 0; j < N_H2; j++) sum += h2_err[j] * W2_q[i][j];
+    h1_err[i] = q_acc1[i] > 0 ? sum : 0;
+  }
+  for (int m = 0; m < N_IN; m++)
+    for (int i = 0; i < N_H1; i++)
+      W1_q[m][i] = q_clamp(W1_q[m][i] + q_sround((int64_t)q_x[m] * h1_err[i], Q_W1, m * N_H1 + i), -Q_MAX, Q_MAX);
+  for (int i = 0; i < N_H1; i++) B1_q[i] += (int32_t)q_sround(h1_err[i], Q_B1, i);
+
+  q_update_count++;
+}
+
+#endif
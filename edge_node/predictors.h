@@ -0,0 +1,187 @@
+// edge_node/predictors.h
+// ==========================================
+// 경량 예측기 (AR / Holt / Kalman) 참조 구현 — MLP 대신 쓰는 O(1) 상태·연산 모델
+// gateway/gateway_predictors.py 와 같은 float32 연산 순서 → 같은 입력이면 같은 예측
+// (게이트웨이는 GATEWAY_PREDICTOR=ar|holt|kalman 으로 같은 백엔드 미러를 실행)
+// 검증: python simulation/predictor_parity.py (호스트 gcc로 이 파일을 빌드해 세 백엔드의 예측을 비트 단위 비교)
+//
+// include 전에 스케치에서 정의할 것:
+//   PREDICTOR_AR / PREDICTOR_HOLT / PREDICTOR_KALMAN 중 하나, WINDOW_SIZE, y_mean[2], y_std[2]
+//
+// loop() 사용 순서 (MLP 스케치의 forward / update_model / shift_window 자리):
+//   float cur_t = roundf(t_event.temperature * 100.0f) / 100.0f;   // 전송값(소수 2자리)과 같은 값으로 학습
+//   float cur_h = roundf(h_event.relative_humidity * 100.0f) / 100.0f;  // (MLP_edge_sensor_int8.ino와 동일)
+//   predictor_forward(&pred_t, &pred_h);
+//   if (send_data) predictor_update(cur_t, cur_h);  // 반올림하지 않으면 게이트웨이(LoRa 2자리 수신) 미러와 어긋남
+//   predictor_shift(pred_t, pred_h);
+// setup()에서 predictor_init() (재부팅 시 게이트웨이 미러도 동기화 요청으로 초기화)
+// ==========================================
+#ifndef PREDICTORS_H
+#define PREDICTORS_H
+
+// float 곱셈·덧셈이 FMA로 합쳐지면 게이트웨이(numpy)와 반올림이 달라지므로 금지
+#pragma GCC optimize ("fp-contract=off")
+
+#include <math.h>
+
+static inline float p_scale(float v, int c) { return (v - y_mean[c]) / y_std[c]; }
+static inline float p_unscale(float s, int c) { return s * y_std[c] + y_mean[c]; }
+
+#if defined(PREDICTOR_AR)
+// ------------------------------------------
+// AR(WINDOW_SIZE) + bias, NLMS 학습. 윈도우 = 예측값 (MLP와 동일)
+// ------------------------------------------
+#define AR_N (WINDOW_SIZE + 1)
+const float ar_mu = 0.5f;
+const float ar_eps = 1e-3f;
+float ar_window[WINDOW_SIZE][2];
+float ar_coef[2][AR_N];
+float ar_x[2][AR_N];  // 마지막 forward 입력 (학습용)
+
+void predictor_init() {
+  for (int c = 0; c < 2; c++) {
+    for (int w = 0; w < WINDOW_SIZE; w++) ar_window[w][c] = y_mean[c];
+    for (int i = 0; i < AR_N; i++) { ar_coef[c][i] = 0.0f; ar_x[c][i] = 0.0f; }
+    ar_coef[c][WINDOW_SIZE - 1] = 1.0f;  // 직전값 유지
+  }
+}
+
+static float ar_dot(int c) {
+  float acc = ar_coef[c][0] * ar_x[c][0];
+  for (int i = 1; i < AR_N; i++) acc += ar_coef[c][i] * ar_x[c][i];
+  return acc;
+}
+
+void predictor_forward(float* pred_t, float* pred_h) {
+  float out[2];
+  for (int c = 0; c < 2; c++) {
+    for (int w = 0; w < WINDOW_SIZE; w++) ar_x[c][w] = p_scale(ar_window[w][c], c);
+    ar_x[c][WINDOW_SIZE] = 1.0f;
+    out[c] = p_unscale(ar_dot(c), c);
+  }
+  *pred_t = out[0];
+  *pred_h = out[1];
+}
+
+void predictor_update(float actual_t, float actual_h) {
+  float actual[2] = {actual_t, actual_h};
+  for (int c = 0; c < 2; c++) {
+    float err = p_scale(actual[c], c) - ar_dot(c);
+    float norm = ar_x[c][0] * ar_x[c][0];
+    for (int i = 1; i < AR_N; i++) norm += ar_x[c][i] * ar_x[c][i];
+    float gain = ar_mu * err / (ar_eps + norm);
+    for (int i = 0; i < AR_N; i++) ar_coef[c][i] += gain * ar_x[c][i];
+  }
+}
+
+void predictor_shift(float t, float h) {
+  for (int w = 0; w < WINDOW_SIZE - 1; w++) {
+    ar_window[w][0] = ar_window[w + 1][0];
+    ar_window[w][1] = ar_window[w + 1][1];
+  }
+  ar_window[WINDOW_SIZE - 1][0] = t;
+  ar_window[WINDOW_SIZE - 1][1] = h;
+}
+
+#elif defined(PREDICTOR_HOLT)
+// ------------------------------------------
+// 감쇠 추세 지수평활 (정규화 단위). 오차 보정은 TX 스텝에서만
+// ------------------------------------------
+const float holt_alpha = 0.8f;
+const float holt_beta = 0.3f;
+const float holt_phi = 0.98f;
+float holt_level[2], holt_trend[2], holt_forecast[2], holt_err[2];
+float holt_steps;  // 마지막 TX 이후 스텝 수
+
+void predictor_init() {
+  for (int c = 0; c < 2; c++) {
+    holt_level[c] = 0.0f; holt_trend[c] = 0.0f; holt_forecast[c] = 0.0f; holt_err[c] = 0.0f;
+  }
+  holt_steps = 0.0f;
+}
+
+void predictor_forward(float* pred_t, float* pred_h) {
+  for (int c = 0; c < 2; c++) {
+    holt_forecast[c] = holt_level[c] + holt_phi * holt_trend[c];
+    holt_err[c] = 0.0f;
+  }
+  *pred_t = p_unscale(holt_forecast[0], 0);
+  *pred_h = p_unscale(holt_forecast[1], 1);
+}
+
+void predictor_update(float actual_t, float actual_h) {
+  holt_err[0] = p_scale(actual_t, 0) - holt_forecast[0];
+  holt_err[1] = p_scale(actual_h, 1) - holt_forecast[1];
+}
+
+void predictor_shift(float t, float h) {
+  (void)t; (void)h;  // 보정된 내부 상태를 사용
+  holt_steps += 1.0f;
+  bool corrected = holt_err[0] != 0.0f || holt_err[1] != 0.0f;
+  for (int c = 0; c < 2; c++) {
+    holt_level[c] = holt_forecast[c] + holt_alpha * holt_err[c];
+    holt_trend[c] = corrected ? holt_phi * holt_trend[c] + holt_beta * holt_err[c] / holt_steps
+                              : holt_phi * holt_trend[c];
+  }
+  if (corrected) holt_steps = 0.0f;
+}
+
+#elif defined(PREDICTOR_KALMAN)
+// ------------------------------------------
+// 국소 선형 추세 칼만 필터 (정규화 단위). x = [수준, 기울기], P = (p00, p01, p11)
+// ------------------------------------------
+const float kf_q_level = 1e-3f;
+const float kf_q_slope = 1e-6f;
+const float kf_r = 1e-2f;
+float kf_x[2][2], kf_p[2][3];
+float kf_xn[2][2], kf_pn[2][3];  // 대기 상태 (forward: 사전, update: 사후) → shift에서 확정
+
+void predictor_init() {
+  for (int c = 0; c < 2; c++) {
+    kf_x[c][0] = 0.0f; kf_x[c][1] = 0.0f;
+    kf_p[c][0] = 1.0f; kf_p[c][1] = 0.0f; kf_p[c][2] = 1e-3f;
+    for (int i = 0; i < 2; i++) kf_xn[c][i] = kf_x[c][i];
+    for (int i = 0; i < 3; i++) kf_pn[c][i] = kf_p[c][i];
+  }
+}
+
+void predictor_forward(float* pred_t, float* pred_h) {
+  for (int c = 0; c < 2; c++) {
+    kf_xn[c][0] = kf_x[c][0] + kf_x[c][1];
+    kf_xn[c][1] = kf_x[c][1];
+    kf_pn[c][0] = kf_p[c][0] + kf_p[c][1] + kf_p[c][1] + kf_p[c][2] + kf_q_level;
+    kf_pn[c][1] = kf_p[c][1] + kf_p[c][2];
+    kf_pn[c][2] = kf_p[c][2] + kf_q_slope;
+  }
+  *pred_t = p_unscale(kf_xn[0][0], 0);
+  *pred_h = p_unscale(kf_xn[1][0], 1);
+}
+
+void predictor_update(float actual_t, float actual_h) {
+  float actual[2] = {actual_t, actual_h};
+  for (int c = 0; c < 2; c++) {
+    float err = p_scale(actual[c], c) - kf_xn[c][0];
+    float s = kf_pn[c][0] + kf_r;
+    float k0 = kf_pn[c][0] / s, k1 = kf_pn[c][1] / s;
+    kf_xn[c][0] += k0 * err;
+    kf_xn[c][1] += k1 * err;
+    float p00 = kf_pn[c][0], p01 = kf_pn[c][1], p11 = kf_pn[c][2];
+    kf_pn[c][0] = p00 - k0 * p00;
+    kf_pn[c][1] = p01 - k0 * p01;
+    kf_pn[c][2] = p11 - k1 * p01;
+  }
+}
+
+void predictor_shift(float t, float h) {
+  (void)t; (void)h;
+  for (int c = 0; c < 2; c++) {
+    for (int i = 0; i < 2; i++) kf_x[c][i] = kf_xn[c][i];
+    for (int i = 0; i < 3; i++) kf_p[c][i] = kf_pn[c][i];
+  }
+}
+
+#else
+#error "define PREDICTOR_AR, PREDICTOR_HOLT or PREDICTOR_KALMAN before including predictors.h"
+#endif
+
+#endif  // PREDICTORS_H
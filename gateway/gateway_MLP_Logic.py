@@ -1,19 +1,37 @@
+import copy
+
 import numpy as np
 
 WINDOW_SIZE = 4
 N_FEATURES = 3  # temp, hum, time_n
 
+# 온라인 학습 범위 → 학습하는 층 (출력층부터). 나머지 층은 고정 (노드 간 공유 가능)
+UPDATE_SCOPES = {
+    "last": ("w3", "b3"),
+    "last2": ("w3", "b3", "w2", "b2"),
+    "full": ("w3", "b3", "w2", "b2", "w1", "b1"),
+}
 
-class GatewayMLP:
-    """12-64-32-2 Rolling Window MLP (ReLU, 2 hidden layers)."""
 
-    def __init__(self, w1, b1, w2, b2, w3, b3, x_mean, x_std, y_mean, y_std):
-        self.w1 = np.array(w1, dtype=np.float32)  # 12 x 64
-        self.b1 = np.array(b1, dtype=np.float32)   # 64
-        self.w2 = np.array(w2, dtype=np.float32)  # 64 x 32
-        self.b2 = np.array(b2, dtype=np.float32)   # 32
-        self.w3 = np.array(w3, dtype=np.float32)  # 32 x 2
-        self.b3 = np.array(b3, dtype=np.float32)   # 2
+class GatewayMLP:
+    """
+    12-64-32-2 Rolling Window MLP (ReLU, 2 hidden layers).
+    update_scope: 온라인 학습 범위 (UPDATE_SCOPES). 고정 층은 넘겨받은 float32 배열을 복사하지 않고 그대로 참조하므로
+    new_model()이 모든 노드에 같은 배열을 넘기면 노드당 메모리·체크포인트에는 학습 층과 윈도우만 남는다.
+    """
+
+    def __init__(self, w1, b1, w2, b2, w3, b3, x_mean, x_std, y_mean, y_std, verbose=True, update_scope="full"):
+        if update_scope not in UPDATE_SCOPES:
+            raise ValueError(f"unknown update scope: {update_scope} ({', '.join(UPDATE_SCOPES)})")
+        self.verbose = verbose  # online_update 로그 출력 (가상 노드 수천 개 시뮬레이션 시 False)
+        self.update_scope = update_scope
+        self.trainable = UPDATE_SCOPES[update_scope]
+        params = {"w1": w1, "b1": b1, "w2": w2, "b2": b2, "w3": w3, "b3": b3}  # 12x64, 64, 64x32, 32, 32x2, 2
+        for name, value in params.items():
+            if name in self.trainable:
+                setattr(self, name, np.array(value, dtype=np.float32))
+            else:
+                setattr(self, name, np.asarray(value, dtype=np.float32))
 
         self.x_mean = np.array(x_mean, dtype=np.float32)
         self.x_std = np.array(x_std, dtype=np.float32)
@@ -34,6 +52,20 @@ class GatewayMLP:
         self.last_pred_t = y_mean[0]
         self.last_pred_h = y_mean[1]
 
+    @property
+    def nbytes(self):
+        """노드 1개 모델 메모리 (학습 층·윈도우. 고정 층은 노드 간 공유라 제외)."""
+        return int(sum(getattr(self, k).nbytes for k in self.trainable + ("window_buf",)))
+
+    def __deepcopy__(self, memo):
+        """체크포인트용 사본: 고정 층은 공유, 나머지 배열만 복사."""
+        clone = copy.copy(self)
+        frozen = set(UPDATE_SCOPES["full"]) - set(self.trainable)
+        for name, value in vars(self).items():
+            if isinstance(value, np.ndarray) and name not in frozen:
+                setattr(clone, name, value.copy())
+        return clone
+
     @staticmethod
     def relu(x):
         return np.maximum(0, x)
@@ -67,6 +99,8 @@ class GatewayMLP:
         delta_w3 = lr * np.outer(self.last_hidden2, out_error)
         self.w3 += delta_w3
         self.b3 += lr * out_error
+        if "w2" not in self.trainable:  # update_scope="last"
+            return self._log(lr)
 
         # --- Hidden Layer 2 (W2, B2) — ReLU derivative ---
         d_relu_h2 = (self.last_pre_h2 > 0).astype(np.float32)
@@ -74,6 +108,8 @@ class GatewayMLP:
         delta_w2 = lr * np.outer(self.last_hidden1, h2_error)
         self.w2 += delta_w2
         self.b2 += lr * h2_error
+        if "w1" not in self.trainable:  # update_scope="last2"
+            return self._log(lr)
 
         # --- Hidden Layer 1 (W1, B1) — ReLU derivative ---
         d_relu_h1 = (self.last_pre_h1 > 0).astype(np.float32)
@@ -81,5 +117,8 @@ class GatewayMLP:
         delta_w1 = lr * np.outer(self.last_in_scaled, h1_error)
         self.w1 += delta_w1
         self.b1 += lr * h1_error
+        self._log(lr)
 
-        print(f"[Sync] Weights Updated (LR={lr})")
+    def _log(self, lr):
+        if self.verbose:
+            print(f"[Sync] Weights Updated (LR={lr})")
@@ -0,0 +1,271 @@
+# gateway/gateway_MLP_int8.py
+"""
+int8 양자화 12-64-32-2 MLP (게이트웨이 미러). edge_node/mlp_int8.h 가 같은 연산을 C로 구현한다.
+
+- 가중치 int8 (층별 대칭 scale), bias int32 (scale = 입력 activation scale x 가중치 scale)
+- 은닉층 activation int8: 정수 누적 → 고정소수점 배율(mult, shift)로 재양자화 (반올림: +0.5 후 floor)
+- 온라인 학습도 정수 연산. 가중치 변화량은 확률적 반올림하되 난수는 (업데이트 횟수, 파라미터 번호)의
+  해시라서 엣지와 게이트웨이가 같은 입력에 대해 비트 단위로 같은 가중치를 얻는다.
+- float 연산은 입력 정규화·출력 역정규화·오차 양자화뿐이며 전부 원소별 float32 (누적 순서 무관)
+"""
+import math
+
+import numpy as np
+
+from gateway_MLP_Logic import WINDOW_SIZE, N_FEATURES
+
+Q_MAX = 127
+FWD_BITS = 31       # 순전파 재양자화 배율 정밀도 (Q31)
+UPD_BITS = 15       # 학습 배율 정밀도 (Q15 — W1 기울기가 int64를 넘지 않도록)
+ERR_SCALE = 1.0 / 32  # 출력 오차 양자화: scaled 단위 1/32 = 1 LSB (±127 → ±3.97σ)
+WEIGHT_HEADROOM = 1.5  # 온라인 학습으로 가중치가 커질 여유
+ACT_PERCENTILE = 99.9  # activation scale 보정 시 이상치 제외
+
+# 확률적 반올림 난수용 파라미터 번호 (순전파 순서, 행 우선)
+_PARAM_ORDER = (("w1", WINDOW_SIZE * N_FEATURES * 64), ("b1", 64), ("w2", 64 * 32), ("b2", 32), ("w3", 32 * 2), ("b3", 2))
+PARAM_OFFSETS = {}
+_pos = 0
+for _name, _size in _PARAM_ORDER:
+    PARAM_OFFSETS[_name] = _pos
+    _pos += _size
+N_PARAMS = _pos
+_PARAM_IDX = np.arange(N_PARAMS, dtype=np.uint32)
+del _pos, _name, _size
+
+_F32_HALF = np.float32(0.5)
+_U32 = 0xFFFFFFFF
+
+
+def quantize_multiplier(real, bits):
+    """양의 실수 배율 → (mult, shift), real ≈ mult * 2**-shift, mult ∈ [2**(bits-1), 2**bits)."""
+    if real <= 0:
+        return 0, 0
+    mant, exp = math.frexp(real)
+    mult = int(round(mant * (1 << bits)))
+    if mult == 1 << bits:
+        mult //= 2
+        exp += 1
+    return mult, bits - exp
+
+
+def requantize(acc, mult, shift):
+    """int64 누적값 x 배율, 반올림(+0.5 후 floor). C: (int64_t)acc * mult + (1LL << (shift - 1)) >> shift."""
+    v = acc.astype(np.int64) * mult
+    if shift <= 0:
+        return v << -shift
+    return (v + (1 << (shift - 1))) >> shift
+
+
+def mix32(counter, idx):
+    """(업데이트 횟수, 파라미터 번호 uint32 배열) → uint32 난수 (murmur3 fmix32). C의 uint32_t 오버플로 연산과 동일."""
+    x = idx + np.uint32((counter * 0x9E3779B9) & _U32)
+    x ^= x >> np.uint32(16)
+    x *= np.uint32(0x85EBCA6B)
+    x ^= x >> np.uint32(13)
+    x *= np.uint32(0xC2B2AE35)
+    x ^= x >> np.uint32(16)
+    return x.astype(np.int64)
+
+
+def stochastic_requantize(g, mult, shift, rnd):
+    """g x 배율을 확률적 반올림 (rnd: uint32 난수의 상위 shift비트를 더한 뒤 floor)."""
+    v = g.astype(np.int64) * mult
+    if shift <= 0:
+        return v << -shift
+    bits = rnd >> (32 - shift) if shift <= 32 else rnd << (shift - 32)
+    return (v + bits) >> shift
+
+
+def _clamp(a, lo, hi):
+    """np.clip보다 작은 배열에서 수 배 빠름."""
+    return np.minimum(np.maximum(a, lo), hi)
+
+
+def _imatmul(a, b, dtype=np.float32):
+    """정수 행렬곱을 float BLAS로 계산해 int64로 (호출부에서 부분합 범위가 dtype 가수 안임을 보장)."""
+    return np.rint(a.astype(dtype) @ b.astype(dtype)).astype(np.int64)
+
+
+def calibrate_scales(w1, b1, w2, b2, w3, b3, x_scaled):
+    """
+    층별 scale 산출 (Pre_train.py에서 호출). x_scaled: 정규화된 학습 입력 (N x 12).
+    가중치 scale = max|W| x WEIGHT_HEADROOM / 127, activation scale = |값|의 ACT_PERCENTILE 분위 / 127.
+    """
+    w1, b1, w2, b2, w3 = (np.asarray(a, dtype=np.float64) for a in (w1, b1, w2, b2, w3))
+    x = np.asarray(x_scaled, dtype=np.float64)
+    h1 = np.maximum(x @ w1 + b1, 0)
+    h2 = np.maximum(h1 @ w2 + np.asarray(b2, dtype=np.float64), 0)
+    act = lambda a: float(max(np.percentile(np.abs(a), ACT_PERCENTILE), 1e-6)) / Q_MAX
+    wgt = lambda w: float(np.abs(w).max()) * WEIGHT_HEADROOM / Q_MAX
+    return {
+        "a0": act(x), "a1": act(h1), "a2": act(h2),
+        "s1": wgt(w1), "s2": wgt(w2), "s3": wgt(w3),
+    }
+
+
+def quantize_params(w1, b1, w2, b2, w3, b3, scales):
+    """float 파라미터 → (W1q, B1q, W2q, B2q, W3q, B3q) int8/int32."""
+    s = scales
+    wq = lambda w, sw: np.clip(np.floor(np.asarray(w, dtype=np.float64) / sw + 0.5), -Q_MAX, Q_MAX).astype(np.int8)
+    bq = lambda b, sa, sw: np.floor(np.asarray(b, dtype=np.float64) / (sa * sw) + 0.5).astype(np.int32)
+    return (
+        wq(w1, s["s1"]), bq(b1, s["a0"], s["s1"]),
+        wq(w2, s["s2"]), bq(b2, s["a1"], s["s2"]),
+        wq(w3, s["s3"]), bq(b3, s["a2"], s["s3"]),
+    )
+
+
+def forward_multipliers(scales):
+    """순전파 재양자화 배율 {"h1": (mult, shift), "h2": ...}."""
+    s = scales
+    return {
+        "h1": quantize_multiplier(s["a0"] * s["s1"] / s["a1"], FWD_BITS),
+        "h2": quantize_multiplier(s["a1"] * s["s2"] / s["a2"], FWD_BITS),
+    }
+
+
+def update_multipliers(scales, lr):
+    """
+    학습률 lr의 정수 업데이트 배율. 기울기 정수값 x 배율 = 파라미터 정수 단위 변화량.
+    오차 scale: 출력 E, 은닉2 E*s3, 은닉1 E*s3*s2 (역전파에 양자화 가중치를 그대로 곱하므로).
+    """
+    s, e = scales, ERR_SCALE
+    e2, e1 = e * s["s3"], e * s["s3"] * s["s2"]
+    return {
+        "w3": quantize_multiplier(lr * s["a2"] * e / s["s3"], UPD_BITS),
+        "b3": quantize_multiplier(lr * e / (s["a2"] * s["s3"]), UPD_BITS),
+        "w2": quantize_multiplier(lr * s["a1"] * e2 / s["s2"], UPD_BITS),
+        "b2": quantize_multiplier(lr * e2 / (s["a1"] * s["s2"]), UPD_BITS),
+        "w1": quantize_multiplier(lr * s["a0"] * e1 / s["s1"], UPD_BITS),
+        "b1": quantize_multiplier(lr * e1 / (s["a0"] * s["s1"]), UPD_BITS),
+    }
+
+
+def int8_c_constants(w1, b1, w2, b2, w3, b3, x_mean, x_std, y_mean, y_std, scales, lr):
+    """
+    edge_node/mlp_int8.h가 스케치에 요구하는 상수 C 코드 (Pre_train.py int8 출력, simulation/int8_parity.py).
+    float 상수는 게이트웨이 float32와 같은 값이 되도록 유효숫자 9자리.
+    """
+    f9 = lambda v: f"{float(np.float32(v)):.9g}f"
+    w1q, b1q, w2q, b2q, w3q, b3q = quantize_params(w1, b1, w2, b2, w3, b3, scales)
+    fwd = forward_multipliers(scales)
+    upd = update_multipliers(scales, lr)
+    order = ("w1", "b1", "w2", "b2", "w3", "b3")
+
+    lines = [
+        "// Scalers",
+        f"float x_mean[{len(x_mean)}] = {{{', '.join(f9(v) for v in x_mean)}}};",
+        f"float x_std[{len(x_std)}]  = {{{', '.join(f9(v) for v in x_std)}}};",
+        f"float y_mean[2] = {{{', '.join(f9(v) for v in y_mean)}}};",
+        f"float y_std[2]  = {{{', '.join(f9(v) for v in y_std)}}};",
+        "",
+        "// Quantization (Pre_train.py calibrate_scales)",
+        f"const float Q_A0 = {f9(scales['a0'])};",
+        f"const float Q_OUT_SCALE = {f9(scales['a2'] * scales['s3'])};",
+        f"const int32_t Q_FWD_M[2]  = {{{fwd['h1'][0]}, {fwd['h2'][0]}}};",
+        f"const int32_t Q_FWD_SH[2] = {{{fwd['h1'][1]}, {fwd['h2'][1]}}};",
+        f"// lr = {lr}, 순서: W1, B1, W2, B2, W3, B3",
+        f"const int32_t Q_UPD_M[6]  = {{{', '.join(str(upd[k][0]) for k in order)}}};",
+        f"const int32_t Q_UPD_SH[6] = {{{', '.join(str(upd[k][1]) for k in order)}}};",
+    ]
+    for name, arr in (("W1_q", w1q), ("W2_q", w2q), ("W3_q", w3q)):
+        rows = [f"  {{{', '.join(str(v) for v in row)}}}" for row in arr]
+        lines += ["", f"int8_t {name}[{arr.shape[0]}][{arr.shape[1]}] = {{", ",\n".join(rows), "};"]
+    for name, arr in (("B1_q", b1q), ("B2_q", b2q), ("B3_q", b3q)):
+        lines += ["", f"int32_t {name}[{arr.size}] = {{{', '.join(str(v) for v in arr)}}};"]
+    return "\n".join(lines)
+
+
+class GatewayMLPInt8:
+    """GatewayMLP와 같은 인터페이스(predict / shift_window / online_update)의 int8 미러."""
+
+    def __init__(self, w1, b1, w2, b2, w3, b3, x_mean, x_std, y_mean, y_std, scales, verbose=True):
+        self.verbose = verbose
+        self.scales = dict(scales)
+        self.w1, self.b1, self.w2, self.b2, self.w3, self.b3 = quantize_params(w1, b1, w2, b2, w3, b3, scales)
+
+        self.x_mean = np.array(x_mean, dtype=np.float32)
+        self.x_std = np.array(x_std, dtype=np.float32)
+        self.y_mean = np.array(y_mean, dtype=np.float32)
+        self.y_std = np.array(y_std, dtype=np.float32)
+        self.a0 = np.float32(scales["a0"])
+        self.out_scale = np.float32(scales["a2"] * scales["s3"])
+        self.e_scale = np.float32(ERR_SCALE)
+        self._fwd = forward_multipliers(scales)
+        self._upd = {}
+
+        self.window_buf = np.zeros((WINDOW_SIZE, N_FEATURES), dtype=np.float32)
+        for w in range(WINDOW_SIZE):
+            self.window_buf[w] = [y_mean[0], y_mean[1], 0.5]
+
+        self.update_count = 0  # 확률적 반올림 난수 시드 (엣지와 같이 리셋 시 0부터)
+        self.last_x_q = np.zeros(WINDOW_SIZE * N_FEATURES, dtype=np.int64)
+        self.last_acc1 = np.zeros(self.w1.shape[1], dtype=np.int64)
+        self.last_acc2 = np.zeros(self.w2.shape[1], dtype=np.int64)
+        self.last_h1_q = np.zeros(self.w1.shape[1], dtype=np.int64)
+        self.last_h2_q = np.zeros(self.w2.shape[1], dtype=np.int64)
+        self.last_out_scaled = np.zeros(2, dtype=np.float32)
+        self.last_pred_t = y_mean[0]
+        self.last_pred_h = y_mean[1]
+
+    @property
+    def nbytes(self):
+        """노드 1개 모델 메모리 (가중치·bias·윈도우)."""
+        return sum(a.nbytes for a in (self.w1, self.b1, self.w2, self.b2, self.w3, self.b3, self.window_buf))
+
+    def predict(self):
+        in_scaled = (self.window_buf.flatten() - self.x_mean) / self.x_std
+        self.last_x_q = _clamp(np.floor(in_scaled / self.a0 + _F32_HALF), -Q_MAX, Q_MAX).astype(np.int64)
+
+        # 정수 행렬곱을 float32 BLAS로: 부분합이 전부 2**24 미만 정수라 합산 순서와 무관하게 정확
+        self.last_acc1 = _imatmul(self.last_x_q, self.w1) + self.b1
+        self.last_h1_q = _clamp(requantize(np.maximum(self.last_acc1, 0), *self._fwd["h1"]), 0, Q_MAX)
+
+        self.last_acc2 = _imatmul(self.last_h1_q, self.w2) + self.b2
+        self.last_h2_q = _clamp(requantize(np.maximum(self.last_acc2, 0), *self._fwd["h2"]), 0, Q_MAX)
+
+        acc3 = _imatmul(self.last_h2_q, self.w3) + self.b3
+        self.last_out_scaled = acc3.astype(np.float32) * self.out_scale
+        final_pred = (self.last_out_scaled * self.y_std) + self.y_mean
+
+        self.last_pred_t, self.last_pred_h = float(final_pred[0]), float(final_pred[1])
+        return final_pred
+
+    def shift_window(self, new_t, new_h, new_tn):
+        self.window_buf[:-1] = self.window_buf[1:]
+        self.window_buf[-1] = [new_t, new_h, new_tn]
+
+    def _step(self, name, g, rnd, clip):
+        mult, shift = self._mults[name]
+        param = getattr(self, name)
+        start = PARAM_OFFSETS[name]
+        rnd = rnd[start:start + g.size].reshape(g.shape)
+        new = param.astype(np.int64) + stochastic_requantize(g, mult, shift, rnd)
+        if clip:
+            new = _clamp(new, -Q_MAX, Q_MAX)
+        setattr(self, name, new.astype(param.dtype))
+
+    def online_update(self, actual_t, actual_h, lr=0.05):
+        self._mults = self._upd.get(lr) or self._upd.setdefault(lr, update_multipliers(self.scales, lr))
+        target_scaled = (np.array([actual_t, actual_h], dtype=np.float32) - self.y_mean) / self.y_std
+        out_error = target_scaled - self.last_out_scaled
+        e_q = _clamp(np.floor(out_error / self.e_scale + _F32_HALF), -Q_MAX, Q_MAX).astype(np.int64)
+        rnd = mix32(self.update_count, _PARAM_IDX)
+
+        # --- Output layer (W3, B3) ---
+        self._step("w3", np.outer(self.last_h2_q, e_q), rnd, clip=True)
+        self._step("b3", e_q, rnd, clip=False)
+
+        # --- Hidden Layer 2 (W2, B2) — ReLU derivative (갱신된 W3 사용, float 버전과 동일) ---
+        h2_error = (self.w3.astype(np.int64) @ e_q) * (self.last_acc2 > 0)
+        self._step("w2", np.outer(self.last_h1_q, h2_error), rnd, clip=True)
+        self._step("b2", h2_error, rnd, clip=False)
+
+        # --- Hidden Layer 1 (W1, B1) — 부분합이 2**24를 넘을 수 있어 float64 BLAS (2**53 미만이면 정확) ---
+        h1_error = _imatmul(self.w2, h2_error, np.float64) * (self.last_acc1 > 0)
+        self._step("w1", np.outer(self.last_x_q, h1_error), rnd, clip=True)
+        self._step("b1", h1_error, rnd, clip=False)
+
+        self.update_count += 1
+        if self.verbose:
+            print(f"[Sync] Weights Updated (int8, LR={lr})")
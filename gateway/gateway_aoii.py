@@ -0,0 +1,107 @@
+# gateway/gateway_aoii.py
+"""
+노드별 스트리밍 AoII (Age of Incorrect Information). 이벤트마다 O(1) (path가 있으면 구간 EST 수에 비례).
+
+- 모니터(MQTT 구독자)가 아는 값: 마지막 RX의 실측값 → 이후 EST 예측값. 실측은 다음 RX에서야 드러난다
+- RX 시각 t1에 드러난 오차 e1 = max(err_t/beta_t, err_h/beta_h) (δ 기준 정규화, 1 이상이면 틀린 정보).
+  직전 RX(t0, 교정 직후 오차 0)부터 오차가 선형으로 커졌다고 보면 틀리기 시작한 시각 tc = t0 + (t1 - t0)/e1
+- 구간 (t0, t1]: time-in-error = t1 - tc, AoII 최대 = t1 - tc, AoII 면적 = (t1 - tc)^2 / 2. RX 후 AoII = 0
+- path가 있으면 (구간 중 발행한 EST마다의 정규화 오차, NodeMirror.error_path) 오차 곡선을 (t0, 0) → path → (t1, e1)
+  꺾은선으로 보고 e ≥ 1인 구간마다 같은 식을 적용 (AoII 최대는 t1에서 끝나는 구간). path 없음 = 위 직선과 같음
+- 누적: 면적·틀린 시간·관측 시간 → 평균 AoII = 면적 / 관측 시간 (초)
+- 롤링: ROLLING_BUCKETS x BUCKET_SEC 링 버퍼 (구간 기여는 t1 버킷에 기록)
+"""
+BUCKET_SEC = 60
+ROLLING_BUCKETS = 60  # 1시간
+
+
+def _wrong_runs(points):
+    """
+    꺾은선 오차 곡선 [(t, e)] → (마지막 점에서 끝나는 틀린 구간 길이, 틀린 시간 합, AoII 면적 합).
+    e = 1 교차 시각은 선분 위 선형 보간. 틀린 구간 하나의 면적 = 길이^2 / 2 (그 구간 동안 AoII가 0부터 선형 증가).
+    """
+    wrong = area = run = 0.0
+    for (ta, ea), (tb, eb) in zip(points, points[1:]):
+        if tb <= ta:
+            continue
+        if ea >= 1.0 and eb >= 1.0:
+            run += tb - ta
+        elif eb >= 1.0:  # 선분 안에서 틀리기 시작
+            run = tb - (ta + (tb - ta) * (1.0 - ea) / (eb - ea))
+        elif ea >= 1.0:  # 선분 안에서 맞게 돌아옴 → 구간 종료
+            run += (tb - ta) * (ea - 1.0) / (ea - eb)
+            wrong += run
+            area += 0.5 * run * run
+            run = 0.0
+    return run, wrong + run, area + 0.5 * run * run
+
+
+class AoIITracker:
+    """노드 1개의 AoII 상태. on_rx()는 RX마다, snapshot()은 조회 시 호출."""
+
+    __slots__ = (
+        "start", "last_rx", "age", "area", "error_time",
+        "buckets_area", "buckets_error", "bucket_id", "rolling_area", "rolling_error",
+    )
+
+    def __init__(self, now):
+        self.start = now
+        self.last_rx = now
+        self.age = 0.0           # 마지막 RX 직전 AoII (교정 직전 최대값)
+        self.area = 0.0          # 누적 ∫AoII dt (s^2)
+        self.error_time = 0.0    # 누적 틀린 시간 (s)
+        self.buckets_area = [0.0] * ROLLING_BUCKETS
+        self.buckets_error = [0.0] * ROLLING_BUCKETS
+        self.bucket_id = int(now // BUCKET_SEC)
+        self.rolling_area = 0.0
+        self.rolling_error = 0.0
+
+    def _advance(self, now):
+        """롤링 링 버퍼를 now 버킷까지 진행 (지난 버킷은 합계에서 제외). 최대 ROLLING_BUCKETS회."""
+        target = int(now // BUCKET_SEC)
+        if target <= self.bucket_id:
+            return
+        for b in range(self.bucket_id + 1, min(target, self.bucket_id + ROLLING_BUCKETS) + 1):
+            i = b % ROLLING_BUCKETS
+            self.rolling_area -= self.buckets_area[i]
+            self.rolling_error -= self.buckets_error[i]
+            self.buckets_area[i] = self.buckets_error[i] = 0.0
+        if target - self.bucket_id >= ROLLING_BUCKETS:
+            self.rolling_area = self.rolling_error = 0.0  # 부동소수 잔차 제거
+        self.bucket_id = target
+
+    def on_rx(self, now, err_t, err_h, beta_t, beta_h, path=None):
+        """RX 1건으로 직전 구간의 AoII 확정. path: [(시각, 정규화 오차)] (구간 안 EST). 현재 snapshot 반환."""
+        e = max(err_t / beta_t, err_h / beta_h)
+        if path:
+            age, wrong, area = _wrong_runs([(self.last_rx, 0.0), *path, (now, e)])
+        else:
+            span = max(now - self.last_rx, 0.0)
+            age = wrong = span * (1.0 - 1.0 / e) if e >= 1.0 else 0.0
+            area = 0.5 * wrong * wrong
+
+        self.age = age
+        self.area += area
+        self.error_time += wrong
+        self._advance(now)
+        i = self.bucket_id % ROLLING_BUCKETS
+        self.buckets_area[i] += area
+        self.buckets_error[i] += wrong
+        self.rolling_area += area
+        self.rolling_error += wrong
+        self.last_rx = now
+        return self.snapshot(now)
+
+    def snapshot(self, now):
+        """누적·롤링 AoII (초 단위). 누적 관측 시간은 마지막 RX까지 (아직 드러나지 않은 구간 제외)."""
+        self._advance(now)
+        observed = self.last_rx - self.start
+        window = min(now - self.start, ROLLING_BUCKETS * BUCKET_SEC)
+        return {
+            "aoii_age_s": round(self.age, 3),
+            "aoii_avg_s": round(self.area / observed, 3) if observed > 0 else 0.0,
+            "aoii_rolling_s": round(max(self.rolling_area, 0.0) / window, 3) if window > 0 else 0.0,
+            "aoii_error_time_s": round(self.error_time, 3),
+            "aoii_error_frac": round(self.error_time / observed, 4) if observed > 0 else 0.0,
+            "aoii_rolling_error_frac": round(max(self.rolling_error, 0.0) / window, 4) if window > 0 else 0.0,
+        }
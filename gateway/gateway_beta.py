@@ -0,0 +1,98 @@
+# gateway/gateway_beta.py
+"""
+노드별 적응형 δ(beta_temp / beta_hum) 제어: 하루 전송 예산(TX/day, 하트비트 제외)에 맞춰 임계값을 조정.
+
+- RX마다 미러 오차로 δ 트리거 여부와 초과량(err - δ)을 집계 (하트비트는 오차가 δ 미만인 RX)
+- 제어 주기마다: 관측 TX율 r(EWMA), 목표 b에 대해 오차 꼬리를 지수분포로 보면 δ' = δ + m·ln(r/b)
+  (m: 채널별 평균 초과량 EWMA). 초과량 표본이 없으면 δ' = δ·(r/b)^GAIN, 한 주기 변화는 x1/MAX_STEP ~ xMAX_STEP
+- 제어 주기는 최소 CONTROL_INTERVAL_SEC, 목표 TX MIN_EVENTS건이 기대되는 길이 이상 (낮은 예산에서 잡음 억제)
+- 새 δ는 시간 동기화 회신 "ts,beta_t,beta_h"로 엣지에 전달 (기존 펌웨어는 toInt()로 ts만 읽음)
+"""
+import math
+
+DAY_SEC = 86400
+EPSILON = 0.001          # 엣지 펌웨어 epsilon
+CONTROL_INTERVAL_SEC = 3600
+MIN_EVENTS = 4
+GAIN = 0.5
+ALPHA = 0.5              # 주기별 TX율·초과량 EWMA
+MAX_STEP = 1.5
+BETA_TEMP_RANGE = (0.1, 3.0)
+BETA_HUM_RANGE = (0.5, 15.0)
+
+
+class _NodeBeta:
+    __slots__ = ("beta_t", "beta_h", "window_start", "n_tx", "n_rx", "excess_t", "n_t", "excess_h", "n_h",
+                 "rate", "mean_excess_t", "mean_excess_h")
+
+    def __init__(self, beta_t, beta_h, now):
+        self.beta_t, self.beta_h = beta_t, beta_h
+        self.rate = self.mean_excess_t = self.mean_excess_h = None
+        self.reset_window(now)
+
+    def reset_window(self, now):
+        self.window_start = now
+        self.n_tx = self.n_rx = self.n_t = self.n_h = 0
+        self.excess_t = self.excess_h = 0.0
+
+
+class BetaController:
+    """node_id별 δ 상태. observe()는 RX마다, betas()는 회신 직전에 호출."""
+
+    def __init__(self, tx_per_day, beta_temp, beta_hum, interval=CONTROL_INTERVAL_SEC):
+        self.target = float(tx_per_day)
+        self.default = (beta_temp, beta_hum)
+        self.interval = max(interval, MIN_EVENTS * DAY_SEC / self.target)
+        self.nodes = {}
+
+    def _state(self, node_id, now):
+        st = self.nodes.get(node_id)
+        if st is None:
+            st = self.nodes[node_id] = _NodeBeta(*self.default, now)
+        return st
+
+    def betas(self, node_id):
+        st = self.nodes.get(node_id)
+        return (st.beta_t, st.beta_h) if st is not None else self.default
+
+    def observe(self, node_id, now, err_t, err_h):
+        """RX 1건의 미러 오차 반영. 제어 주기가 지났으면 δ 갱신. 현재 (beta_t, beta_h) 반환."""
+        st = self._state(node_id, now)
+        st.n_rx += 1
+        hit_t = err_t >= st.beta_t - EPSILON
+        hit_h = err_h >= st.beta_h - EPSILON
+        if hit_t or hit_h:
+            st.n_tx += 1
+        if hit_t:
+            st.n_t += 1
+            st.excess_t += err_t - st.beta_t
+        if hit_h:
+            st.n_h += 1
+            st.excess_h += err_h - st.beta_h
+        if now - st.window_start >= self.interval:
+            self._control(st, now)
+        return st.beta_t, st.beta_h
+
+    def _control(self, st, now):
+        st.rate = _ewma(st.rate, st.n_tx * DAY_SEC / max(now - st.window_start, 1.0))
+        if st.n_t:
+            st.mean_excess_t = _ewma(st.mean_excess_t, st.excess_t / st.n_t)
+        if st.n_h:
+            st.mean_excess_h = _ewma(st.mean_excess_h, st.excess_h / st.n_h)
+        st.beta_t = self._next(st.beta_t, st.rate, st.mean_excess_t, BETA_TEMP_RANGE)
+        st.beta_h = self._next(st.beta_h, st.rate, st.mean_excess_h, BETA_HUM_RANGE)
+        st.reset_window(now)
+
+    def _next(self, beta, rate, mean_excess, bounds):
+        if rate <= 0:
+            new = beta / MAX_STEP  # 조용한 노드: 정확도 쪽으로
+        elif mean_excess is not None:
+            new = beta + max(mean_excess, 0.05 * beta) * math.log(rate / self.target)
+        else:
+            new = beta * (rate / self.target) ** GAIN
+        new = min(max(new, beta / MAX_STEP), beta * MAX_STEP)
+        return round(min(max(new, bounds[0]), bounds[1]), 3)
+
+
+def _ewma(prev, value):
+    return value if prev is None else prev + ALPHA * (value - prev)
@@ -0,0 +1,60 @@
+# gateway/gateway_est_batch.py
+"""
+EST 묶음 발행: 노드마다 60초 EST 메시지를 따로 내보내는 대신, 틱마다 모든 노드 예측을 ESTB 메시지 1개로.
+
+- 미러의 est_tick 시점은 그대로 (엣지 윈도우 이동과 정합), 발행만 interval초마다 모아서
+- deadband: 구독자가 마지막으로 받은 값(직전 EST 또는 RX 실측)에서 온도/습도 모두 deadband 미만으로
+  움직인 노드는 생략 (0이면 항상 포함)
+- RX가 오면 대기 중인 그 노드 EST는 버림 (RX가 더 새로운 정보)
+"""
+EST_BATCH_INTERVAL_SEC = 60
+
+
+def parse_deadband(value):
+    """"0.1" → (0.1, 0.1), "0.1,0.5" → (온도, 습도). 비었으면 (0, 0)."""
+    if not value:
+        return 0.0, 0.0
+    parts = [float(v) for v in str(value).split(",")]
+    return (parts[0], parts[0]) if len(parts) == 1 else (parts[0], parts[1])
+
+
+class EstBatcher:
+    """node_id → 대기 중 EST. add()는 est_tick마다, on_rx()는 RX마다, flush()는 due()일 때."""
+
+    def __init__(self, interval=EST_BATCH_INTERVAL_SEC, deadband=(0.0, 0.0), now=0.0):
+        self.interval = interval
+        self.deadband_t, self.deadband_h = deadband
+        self.pending = {}
+        self.sent = {}  # node_id → 구독자가 가진 마지막 (t, h)
+        self.last_flush = now
+        self.suppressed = 0
+
+    def add(self, node_id, pred_t, pred_h, total_tx):
+        last = self.sent.get(node_id)
+        if last is not None and abs(pred_t - last[0]) < self.deadband_t and abs(pred_h - last[1]) < self.deadband_h:
+            self.pending.pop(node_id, None)
+            self.suppressed += 1
+            return False
+        self.pending[node_id] = (node_id, float(pred_t), float(pred_h), total_tx)
+        return True
+
+    def on_rx(self, node_id, actual_t, actual_h):
+        self.pending.pop(node_id, None)
+        self.sent[node_id] = (actual_t, actual_h)
+
+    def forget(self, node_id):
+        """노드 재부팅: 구독자 기준값도 초기화."""
+        self.pending.pop(node_id, None)
+        self.sent.pop(node_id, None)
+
+    def due(self, now):
+        return now - self.last_flush >= self.interval
+
+    def flush(self, now):
+        """대기 중 EST rows를 꺼내고 기준값 갱신. 없으면 빈 목록."""
+        rows = list(self.pending.values())
+        for node_id, pred_t, pred_h, _ in rows:
+            self.sent[node_id] = (pred_t, pred_h)
+        self.pending = {}
+        self.last_flush = now
+        return rows
@@ -0,0 +1,236 @@
+# gateway/gateway_model_cache.py
+"""
+노드 모델 메모리 예산 (GATEWAY_MODEL_CACHE_MB): 최근 RX가 온 노드 모델만 RAM에 두고, 나머지는 디스크 memmap 파일로 내보냄.
+
+- 내보내는 대상: 모델의 노드별 numpy 배열 (학습 층, 윈도우, backprop 버퍼 last_*). 노드 간 공유 고정 층은 제외
+- 축출(evict): 배열을 memmap 슬롯에 복사하고 모델 속성을 슬롯 view로 교체 → RAM 사본 해제 (모델 객체·스칼라는 유지)
+- 적재(fault-in): 다음 RX의 on_rx 직전에 슬롯 view를 RAM 배열로 복사. 엣지는 회신을 1초만 기다리지만 회신은
+  모델 갱신 전에 보내고, 적재는 슬롯 1개 복사라 수십 µs (benchmarks/bench_model_cache.py)
+- LRU 순서는 RX 기준. 60초 EST 틱은 전체 노드를 훑으므로 적재하지 않고 memmap 위에서 바로 계산한 뒤
+  새로 할당된 배열만 슬롯에 되돌림 (cold_ticks) — 주기 스캔이 캐시를 밀어내지 않도록
+- 슬롯 파일은 레이아웃(배열 이름·dtype·shape)별 1개, 가득 차면 2배로 늘림. 캐시 용도라 종료 시 삭제
+  (GATEWAY_MODEL_SPILL_DIR, 기본 임시 디렉터리 — RAM을 아끼려면 tmpfs가 아닌 디스크)
+"""
+import os
+import time
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from gateway_MLP_Logic import UPDATE_SCOPES
+from gateway_node import NodeMirror, NodeRegistry
+
+SPILL_DIR = os.environ.get("GATEWAY_MODEL_SPILL_DIR") or tempfile.gettempdir()
+INITIAL_SLOTS = 64
+ALIGN = 8
+
+
+def private_arrays(model):
+    """모델의 노드별 배열 {이름: ndarray}. GatewayMLP의 학습하지 않는 층은 노드 간 공유라 제외."""
+    frozen = set(UPDATE_SCOPES["full"]) - set(getattr(model, "trainable", UPDATE_SCOPES["full"]))
+    return {k: v for k, v in vars(model).items() if isinstance(v, np.ndarray) and k not in frozen}
+
+
+def layout_of(arrays):
+    return tuple((name, a.dtype.str, a.shape) for name, a in sorted(arrays.items()))
+
+
+class SpillArena:
+    """레이아웃 1개의 memmap 슬롯 파일. 슬롯 = 배열들을 ALIGN 경계로 이어 붙인 바이트 열."""
+
+    def __init__(self, layout, directory=SPILL_DIR):
+        self.layout = layout
+        self.offsets, pos = [], 0
+        for name, dtype, shape in layout:
+            size = np.dtype(dtype).itemsize * int(np.prod(shape))
+            self.offsets.append((name, np.dtype(dtype), shape, pos, size))
+            pos += -(-size // ALIGN) * ALIGN
+        self.slot_bytes = pos
+        fd, self.path = tempfile.mkstemp(prefix="aoii-models-", suffix=".bin", dir=directory)
+        os.close(fd)
+        self.capacity = 0
+        self.mm = self.buf = None
+        self.free = []
+        self.grows = 0
+        self._grow(INITIAL_SLOTS)
+
+    def _grow(self, capacity):
+        # 기존 memmap은 축출된 모델의 view가 참조하므로 닫지 않는다 (같은 파일의 공유 매핑이라 새 매핑과 내용이 같음)
+        with open(self.path, "r+b") as f:
+            f.truncate(capacity * self.slot_bytes)
+        self.mm = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(capacity * self.slot_bytes,))
+        self.buf = self.mm.view(np.ndarray)  # 슬롯 view는 memmap 하위 클래스가 아닌 일반 ndarray로 (연산 결과 타입 유지)
+        self.free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+        self.grows += 1
+
+    def allocate(self):
+        if not self.free:
+            self._grow(self.capacity * 2)
+        return self.free.pop()
+
+    def release(self, slot):
+        self.free.append(slot)
+
+    def views(self, slot):
+        """슬롯의 배열별 view (복사 없음)."""
+        base = slot * self.slot_bytes
+        return {
+            name: self.buf[base + off:base + off + size].view(dtype).reshape(shape)
+            for name, dtype, shape, off, size in self.offsets
+        }
+
+    def close(self):
+        self.mm = self.buf = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class ModelCache:
+    """
+    LRU 상주 노드 (node_id → CachedNodeMirror)와 memmap 슬롯 관리. budget_bytes를 넘으면 가장 오래 RX가 없던 노드부터 축출.
+    게이트웨이 루프 스레드 1개에서만 호출 (잠금 없음).
+    """
+
+    def __init__(self, budget_bytes, directory=SPILL_DIR):
+        self.budget_bytes = budget_bytes
+        self.directory = directory
+        self.resident = OrderedDict()  # node_id → mirror (끝이 최근)
+        self.resident_bytes = 0
+        self.arenas = {}   # layout → SpillArena
+        self.slots = {}    # node_id → (SpillArena, slot) — 노드가 재부팅돼도 같은 슬롯 재사용
+        self.spilled = set()
+        self.hits = self.misses = self.evictions = self.cold_ticks = 0
+        self.fault_in_sec = 0.0
+        self.fault_in_max_sec = 0.0
+
+    def add(self, node):
+        """새 미러 (생성·재부팅): 상주로 등록. 같은 node_id의 이전 미러는 버림."""
+        old = self.resident.pop(node.node_id, None)
+        if old is not None:
+            self.resident_bytes -= old.model_bytes
+        self.spilled.discard(node.node_id)
+        node.model_bytes = sum(a.nbytes for a in private_arrays(node.model).values())
+        node.resident = True
+        self.resident[node.node_id] = node
+        self.resident_bytes += node.model_bytes
+        self._evict_over_budget(node.node_id)
+
+    def load(self, node):
+        """RX 직전: 상주면 LRU 갱신(hit), 축출돼 있으면 슬롯에서 RAM으로 복사(miss)."""
+        if node.resident:
+            self.hits += 1
+            self.resident.move_to_end(node.node_id)
+            return
+        t0 = time.perf_counter()
+        model = node.model
+        arena, slot = self.slots[node.node_id]
+        for name, view in arena.views(slot).items():
+            if np.may_share_memory(getattr(model, name), view):
+                setattr(model, name, np.array(view))
+        node.resident = True
+        self.spilled.discard(node.node_id)
+        self.resident[node.node_id] = node
+        self.resident_bytes += node.model_bytes
+        self.misses += 1
+        elapsed = time.perf_counter() - t0
+        self.fault_in_sec += elapsed
+        self.fault_in_max_sec = max(self.fault_in_max_sec, elapsed)
+        self._evict_over_budget(node.node_id)
+
+    def respill(self, node):
+        """축출된 노드의 EST 틱 후: 모델이 새로 할당한 배열(last_* 등)을 슬롯에 복사하고 view로 되돌림."""
+        self.cold_ticks += 1
+        self._spill(node)
+
+    def evict(self, node):
+        self.resident.pop(node.node_id, None)
+        self.resident_bytes -= node.model_bytes
+        node.resident = False
+        self.spilled.add(node.node_id)
+        self._spill(node)
+        self.evictions += 1
+
+    def _spill(self, node):
+        model = node.model
+        arrays = private_arrays(model)
+        layout = layout_of(arrays)
+        arena, slot = self.slots.get(node.node_id, (None, None))
+        if arena is None or arena.layout != layout:
+            if arena is not None:
+                arena.release(slot)
+            arena = self.arenas.get(layout)
+            if arena is None:
+                arena = self.arenas[layout] = SpillArena(layout, self.directory)
+            slot = arena.allocate()
+            self.slots[node.node_id] = (arena, slot)
+        for name, view in arena.views(slot).items():
+            current = arrays[name]
+            if not np.may_share_memory(current, view):
+                view[...] = current
+            setattr(model, name, view)
+
+    def _evict_over_budget(self, keep):
+        while self.resident_bytes > self.budget_bytes and len(self.resident) > 1:
+            node_id, node = next(iter(self.resident.items()))
+            if node_id == keep:
+                self.resident.move_to_end(node_id)
+                continue
+            self.evict(node)
+
+    def close(self):
+        for arena in self.arenas.values():
+            arena.close()
+        self.arenas.clear()
+        self.slots.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "budget_bytes": self.budget_bytes, "resident_nodes": len(self.resident),
+            "resident_bytes": self.resident_bytes, "spilled_nodes": len(self.spilled),
+            "spill_file_bytes": sum(a.capacity * a.slot_bytes for a in self.arenas.values()),
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions, "cold_ticks": self.cold_ticks,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "fault_in_avg_ms": self.fault_in_sec / self.misses * 1000 if self.misses else None,
+            "fault_in_max_ms": self.fault_in_max_sec * 1000,
+        }
+
+
+class CachedNodeMirror(NodeMirror):
+    """NodeMirror + RX 전 모델 적재, 축출 상태의 EST 틱 후 슬롯 되돌림."""
+
+    def __init__(self, node_id, model, cache, now=None, rollout_steps=0):
+        self.cache = cache
+        self.resident = True
+        self.model_bytes = 0
+        super().__init__(node_id, model, now=now, rollout_steps=rollout_steps)
+        cache.add(self)
+
+    def est_tick(self, time_n, now):
+        pred = super().est_tick(time_n, now)
+        if not self.resident:
+            self.cache.respill(self)
+        return pred
+
+    def on_rx(self, actual_t, actual_h, time_n, now, **kwargs):
+        self.cache.load(self)
+        return super().on_rx(actual_t, actual_h, time_n, now, **kwargs)
+
+
+class CachedNodeRegistry(NodeRegistry):
+    """NodeRegistry + 모델 메모리 예산 (budget_bytes). 미러는 전부 유지하고 모델 배열만 디스크로 내보냄."""
+
+    def __init__(self, model_factory, budget_bytes, per_node=False, directory=SPILL_DIR, rollout_steps=0):
+        super().__init__(model_factory, per_node=per_node, rollout_steps=rollout_steps)
+        self.cache = ModelCache(budget_bytes, directory)
+
+    def _mirror(self, node_id, now):
+        return CachedNodeMirror(node_id, self._new_model(node_id), self.cache, now=now,
+                                rollout_steps=self.rollout_steps)
+
+    def close(self):
+        self.cache.close()
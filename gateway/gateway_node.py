@@ -0,0 +1,188 @@
+# gateway/gateway_node.py
+"""노드별 게이트웨이 미러 상태: 엣지와 동일한 모델, 최근 예측, TX 카운트, AoII, EST 궤적(gateway_rollout.py)."""
+import time
+from collections import deque
+
+from gateway_protocol import DEFAULT_NODE_ID
+from gateway_aoii import AoIITracker
+from gateway_rollout import Trajectory, rollout, restore_state, time_n_after, SLACK_SEC, DAY_SEC
+
+EST_INTERVAL_SEC = 60
+ONLINE_LR = 0.01  # 엣지 펌웨어 lr과 동일
+EST_PATH_MAX = 60  # AoII 구간 계산에 쓰는 RX 사이 EST 최대 개수 (조용한 노드도 메모리 일정)
+
+
+def parse_update_scopes(value, default="full"):
+    """
+    노드별 온라인 학습 범위 설정 → (기본 범위, {node_id: 범위}).
+    "last" → 모든 노드 / "full,node_a=last,node_b=last2" → '=' 없는 항목이 기본값, 나머지는 노드별.
+    """
+    scopes = {}
+    for item in str(value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if "=" in item:
+            node_id, scope = (v.strip() for v in item.split("=", 1))
+            scopes[node_id] = scope
+        else:
+            default = item
+    return default, scopes
+
+
+class NodeMirror:
+    """
+    엣지 노드 1개의 미러. 엣지 loop()와 같은 순서(update → shift → forward)로 모델을 갱신.
+    rollout_steps > 0이면 RX마다 다음 rollout_steps개 EST를 미리 전개하고 est_tick은 궤적에서 꺼냄 (gateway_rollout.py).
+    """
+
+    def __init__(self, node_id, model, now=None, rollout_steps=0):
+        self.node_id = node_id
+        self.model = model
+        self.pred = model.predict()
+        self.total_tx = 0
+        self.last_est_time = time.time() if now is None else now
+        self.last_rx_time = None
+        self.last_actual = None
+        self.aoii = AoIITracker(self.last_est_time)
+        self.generation = 0  # 재부팅(reset)마다 +1 — 조회 API 모델 버전
+        self.rollout_steps = rollout_steps
+        self.trajectory = None
+        self.stale = False  # 궤적에서 꺼낸 틱 뒤: 윈도우 모델의 backprop 버퍼가 이전 predict 것
+        self.est_path = deque(maxlen=EST_PATH_MAX)  # 마지막 RX 이후 EST (시각, pred_t, pred_h)
+        self.rx_interval = None  # 직전 RX 구간 (t0, actual_t0, actual_h0, EST 목록) — error_path()용
+
+    def est_due(self, now):
+        return now - self.last_est_time >= EST_INTERVAL_SEC
+
+    def _rollout(self, first_time_n, origin):
+        preds, time_ns, states = rollout(self.model, self.pred, first_time_n, self.rollout_steps, EST_INTERVAL_SEC)
+        self.trajectory = Trajectory(origin, EST_INTERVAL_SEC, preds, time_ns, states)
+        return self.trajectory
+
+    def _tick_from_trajectory(self, time_n, now):
+        """궤적 다음 스텝으로 틱. 궤적 time_n이 실제 틱과 SLACK_SEC 넘게 다르면 False (궤적 버림)."""
+        traj = self.trajectory
+        if traj is None or traj.exhausted:
+            traj = self._rollout(time_n, now - EST_INTERVAL_SEC)
+        j = traj.next
+        tn = float(traj.time_ns[j])
+        drift = abs(tn - time_n) % 1.0
+        if min(drift, 1.0 - drift) * DAY_SEC > SLACK_SEC:
+            self.trajectory = None
+            return False
+        if traj.states is None:
+            self.model.shift_window(self.pred[0], self.pred[1], tn)
+            self.stale = True
+        else:
+            restore_state(self.model, traj.states[j])
+        self.pred = traj.preds[j]
+        self.model.last_pred_t, self.model.last_pred_h = float(self.pred[0]), float(self.pred[1])
+        traj.next = j + 1
+        return True
+
+    def est_tick(self, time_n, now):
+        """수신 없는 1분: 예측값을 그대로 윈도우에 넣고 재예측 (엣지 SKIP과 동일)."""
+        if not (self.rollout_steps and self._tick_from_trajectory(time_n, now)):
+            self.model.shift_window(self.pred[0], self.pred[1], time_n)
+            self.pred = self.model.predict()
+            self.stale = False
+        self.last_est_time = now
+        self.est_path.append((now, float(self.pred[0]), float(self.pred[1])))
+        return self.pred
+
+    def on_rx(self, actual_t, actual_h, time_n, now, lr=ONLINE_LR):
+        """RX 1건: 갱신 전 예측·오차 (pred_t, pred_h, err_t, err_h) 반환 후 온라인 학습·윈도우 이동·재예측."""
+        pred_t, pred_h = float(self.pred[0]), float(self.pred[1])
+        err_t = abs(actual_t - pred_t)
+        err_h = abs(actual_h - pred_h)
+        self.total_tx += 1
+
+        if self.stale:
+            self.model.predict()  # 같은 윈도우로 backprop 버퍼 복원 (값은 궤적의 현재 예측과 같음)
+            self.stale = False
+        self.model.online_update(actual_t, actual_h, lr=lr)
+        self.model.shift_window(pred_t, pred_h, time_n)
+        self.pred = self.model.predict()
+        if self.last_actual is not None:
+            self.rx_interval = (self.last_rx_time, *self.last_actual, list(self.est_path))
+        self.est_path.clear()
+        self.last_est_time = now
+        self.last_rx_time = now
+        self.last_actual = (actual_t, actual_h)
+        if self.rollout_steps:
+            self._rollout(time_n_after(time_n, EST_INTERVAL_SEC), now)
+        return pred_t, pred_h, err_t, err_h
+
+    def error_path(self, beta_t, beta_h):
+        """
+        on_rx 직후: 직전 RX 구간에 발행한 EST마다 δ 정규화 오차 [(시각, e)]. 실측은 두 RX 실측의 선형 보간.
+        첫 RX(직전 실측 없음)면 None → AoIITracker는 오차가 0부터 선형으로 커졌다고 본다.
+        """
+        if self.rx_interval is None or not self.rx_interval[3]:
+            return None
+        t0, a0_t, a0_h, path = self.rx_interval
+        t1 = self.last_rx_time
+        a1_t, a1_h = self.last_actual
+        span = t1 - t0
+        out = []
+        for ts, p_t, p_h in path:
+            w = (ts - t0) / span if span > 0 else 1.0
+            out.append((ts, max(abs(a0_t + (a1_t - a0_t) * w - p_t) / beta_t,
+                                abs(a0_h + (a1_h - a0_h) * w - p_h) / beta_h)))
+        return out
+
+    def estimate_at(self, ts):
+        """시각 ts의 EST 추정값 [t, h] (궤적 밖이면 None, 궤적이 없으면 다음 틱 전까지만 현재 예측)."""
+        if self.trajectory is not None:
+            return self.trajectory.estimate_at(ts, self.pred)
+        return self.pred if ts < self.last_est_time + EST_INTERVAL_SEC else None
+
+    def forecast(self):
+        """아직 발행하지 않은 궤적 스텝 [(시각, t, h)]. 궤적이 없으면 빈 목록."""
+        traj = self.trajectory
+        if traj is None:
+            return []
+        return [(traj.step_time(j), float(traj.preds[j, 0]), float(traj.preds[j, 1]))
+                for j in range(traj.next, len(traj))]
+
+
+class NodeRegistry:
+    """
+    node_id → NodeMirror. 처음 수신한 노드는 model_factory()로 초기 가중치 미러를 생성.
+    per_node=True면 model_factory(node_id) (노드별 학습 범위 등 노드마다 다른 모델).
+    rollout_steps: NodeMirror EST 궤적 길이 (0이면 틱마다 직접 계산).
+    """
+
+    def __init__(self, model_factory, per_node=False, rollout_steps=0):
+        self._model_factory = model_factory
+        self._per_node = per_node
+        self.rollout_steps = rollout_steps
+        self.nodes = {}
+
+    def _new_model(self, node_id):
+        return self._model_factory(node_id) if self._per_node else self._model_factory()
+
+    def _mirror(self, node_id, now):
+        return NodeMirror(node_id, self._new_model(node_id), now=now, rollout_steps=self.rollout_steps)
+
+    def get(self, node_id=DEFAULT_NODE_ID, now=None):
+        node = self.nodes.get(node_id)
+        if node is None:
+            node = self.nodes[node_id] = self._mirror(node_id, now)
+        return node
+
+    def reset(self, node_id, now=None):
+        """엣지 재부팅(시간 동기화 요청) 시: 엣지도 초기 가중치로 시작하므로 미러를 새로 만든다 (AoII 누적은 유지)."""
+        old = self.nodes.get(node_id)
+        node = self.nodes[node_id] = self._mirror(node_id, now)
+        if old is not None:
+            node.aoii = old.aoii
+            node.generation = old.generation + 1
+        return node
+
+    def values(self):
+        return list(self.nodes.values())
+
+    def __len__(self):
+        return len(self.nodes)
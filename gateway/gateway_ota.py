@@ -0,0 +1,282 @@
+# gateway/gateway_ota.py
+"""
+OTA 가중치 델타 전송: .ino 재플래시 없이 새 기본 가중치(재학습 결과 등)를 LoRa로 엣지에 반영.
+
+1. diff  : 노드 미러 가중치 vs 목표 가중치, |δ| >= threshold 인 항목만 선택
+2. encode: 층별 int8 양자화 델타 (scale float32) + 인덱스 간격 varint → 희소 페이로드
+3. chunk : LoRa 프레임 크기로 분할, 프레임마다 순번·CRC16, 커밋 프레임에 전체 CRC32
+4. 전송  : 청크마다 ACK 확인 (stop-and-wait, 재전송). 전부 ACK 후 COMMIT
+5. 전환  : 엣지는 COMMIT에서 전체 CRC32 확인 후 복사본에 적용해 한 번에 교체, 게이트웨이는 커밋 ACK 후
+           같은 디코딩 델타를 미러에 적용 → 양단 가중치 동일 (목표와의 잔차는 다음 OTA에서 다시 줄어듦)
+
+프레임 (리틀 엔디언):
+  DATA   'O' 'D' update_id:u16 seq:u16 total:u16 payload... crc16:u16
+  COMMIT 'O' 'C' update_id:u16 total:u16 crc32:u32 crc16:u16
+  ACK    'O' 'A' update_id:u16 seq:u16 status:u8 crc16:u16     (COMMIT ACK의 seq = 0xFFFF)
+EdgeOtaReceiver는 엣지 펌웨어 수신부의 참조 구현 (시뮬레이션에서 엣지 역할).
+"""
+import struct
+import zlib
+
+import numpy as np
+
+PARAM_NAMES = ("w1", "b1", "w2", "b2", "w3", "b3")
+DEFAULT_THRESHOLD = 1e-3
+LORA_MAX_PAYLOAD = 255        # SX1276 FIFO
+CHUNK_SIZE = LORA_MAX_PAYLOAD - 10  # DATA 헤더 8 + CRC 2
+MAX_RETRIES = 8
+COMMIT_SEQ = 0xFFFF
+
+FRAME_DATA, FRAME_COMMIT, FRAME_ACK = b"D", b"C", b"A"
+ACK_OK, ACK_BAD, ACK_COMMITTED, ACK_COMMIT_FAILED = 0, 1, 2, 3
+
+_DATA_HDR = struct.Struct("<2sHHH")
+_COMMIT = struct.Struct("<2sHHI")
+_ACK = struct.Struct("<2sHHB")
+_CRC = struct.Struct("<H")
+_LAYER_HDR = struct.Struct("<BHf")  # param 번호, 항목 수, scale
+
+
+def crc16(data):
+    """CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF)."""
+    crc = 0xFFFF
+    for b in data:
+        crc ^= b << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+    return crc
+
+
+def _seal(body):
+    return body + _CRC.pack(crc16(body))
+
+
+def _unseal(frame):
+    """CRC 확인 후 본문. 깨졌으면 None."""
+    if len(frame) < 4:
+        return None
+    body, (crc,) = frame[:-2], _CRC.unpack(frame[-2:])
+    return body if crc16(body) == crc else None
+
+
+# =========================================================
+# 1~2. diff / 희소 양자화 인코딩
+# =========================================================
+def _varint(n):
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _read_varint(buf, pos):
+    n = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return n, pos
+        shift += 7
+
+
+def encode_delta(model, target, threshold=DEFAULT_THRESHOLD):
+    """
+    미러(model) → 목표(target: {"w1": ..., "b3": ...}) 희소 양자화 델타 페이로드.
+    반환: (payload bytes, 항목 수). 변경 없으면 (b"", 0).
+    """
+    out = bytearray()
+    entries = 0
+    for pid, name in enumerate(PARAM_NAMES):
+        cur = getattr(model, name)
+        delta = (np.asarray(target[name], dtype=np.float64) - cur.astype(np.float64)).ravel()
+        idx = np.flatnonzero(np.abs(delta) >= threshold)
+        if not idx.size:
+            continue
+        d = delta[idx]
+        if np.issubdtype(cur.dtype, np.integer):
+            scale = float(max(1, int(np.ceil(np.abs(d).max() / 127))))  # int8 미러: 정수 단위
+        else:
+            scale = float(np.float32(np.abs(d).max() / 127))
+        q = np.clip(np.floor(d / scale + 0.5), -127, 127).astype(np.int8)
+        keep = q != 0
+        idx, q = idx[keep], q[keep]
+        if not idx.size:
+            continue
+        for start in range(0, idx.size, 0xFFFF):
+            part_idx, part_q = idx[start:start + 0xFFFF], q[start:start + 0xFFFF]
+            out += _LAYER_HDR.pack(pid, part_idx.size, scale)
+            prev = -1
+            for i in part_idx:
+                out += _varint(int(i) - prev - 1)  # 인덱스 간격
+                prev = int(i)
+            out += part_q.tobytes()
+        entries += idx.size
+    return bytes(out), entries
+
+
+def decode_delta(payload):
+    """페이로드 → [(param 이름, 인덱스 배열, int8 배열, scale)]."""
+    layers, pos = [], 0
+    while pos < len(payload):
+        pid, count, scale = _LAYER_HDR.unpack_from(payload, pos)
+        pos += _LAYER_HDR.size
+        idx = np.empty(count, dtype=np.int64)
+        prev = -1
+        for k in range(count):
+            gap, pos = _read_varint(payload, pos)
+            prev += gap + 1
+            idx[k] = prev
+        q = np.frombuffer(payload, dtype=np.int8, count=count, offset=pos)
+        pos += count
+        layers.append((PARAM_NAMES[pid], idx, q, scale))
+    return layers
+
+
+def apply_delta(model, layers):
+    """
+    디코딩한 델타를 복사본에 적용한 뒤 파라미터를 한 번에 교체 (중간 상태가 보이지 않도록).
+    float 미러: w += float32(q) * float32(scale) — 엣지 C 구현과 같은 float32 연산 순서.
+    """
+    staged = {}
+    for name, idx, q, scale in layers:
+        arr = staged.get(name)
+        if arr is None:
+            arr = staged[name] = getattr(model, name).copy()
+        flat = arr.reshape(-1)
+        if np.issubdtype(arr.dtype, np.integer):
+            step = q.astype(np.int64) * int(scale)
+            if arr.dtype == np.int8:
+                step = np.clip(flat[idx].astype(np.int64) + step, -127, 127) - flat[idx]
+            flat[idx] += step.astype(arr.dtype)
+        else:
+            flat[idx] += q.astype(np.float32) * np.float32(scale)
+    for name, arr in staged.items():
+        current = getattr(model, name)
+        if current.base is not None and current.flags.writeable:
+            current[...] = arr  # 공유 메모리 슬롯 등 view에 묶인 미러는 제자리 교체
+        else:
+            setattr(model, name, arr)
+
+
+def model_params(model):
+    return {name: getattr(model, name) for name in PARAM_NAMES}
+
+
+def dense_size(model):
+    """비교용: 전체 파라미터를 그대로 보낼 때의 바이트 수."""
+    return sum(getattr(model, name).nbytes for name in PARAM_NAMES)
+
+
+# =========================================================
+# 3. 프레임
+# =========================================================
+def chunk_frames(update_id, payload, chunk_size=CHUNK_SIZE):
+    """페이로드 → DATA 프레임 목록."""
+    chunks = [payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)] or [b""]
+    total = len(chunks)
+    return [_seal(_DATA_HDR.pack(b"O" + FRAME_DATA, update_id, seq, total) + c) for seq, c in enumerate(chunks)]
+
+
+def commit_frame(update_id, total, payload):
+    return _seal(_COMMIT.pack(b"O" + FRAME_COMMIT, update_id, total, zlib.crc32(payload)))
+
+
+def ack_frame(update_id, seq, status):
+    return _seal(_ACK.pack(b"O" + FRAME_ACK, update_id, seq, status))
+
+
+def parse_ack(frame):
+    """ACK 프레임 → (update_id, seq, status). 깨졌거나 ACK가 아니면 None."""
+    body = _unseal(frame) if frame else None
+    if body is None or len(body) != _ACK.size or body[:2] != b"O" + FRAME_ACK:
+        return None
+    _, update_id, seq, status = _ACK.unpack(body)
+    return update_id, seq, status
+
+
+# =========================================================
+# 4. 게이트웨이 송신
+# =========================================================
+def push_update(link, model, target, update_id, threshold=DEFAULT_THRESHOLD,
+                chunk_size=CHUNK_SIZE, max_retries=MAX_RETRIES):
+    """
+    link.exchange(frame) → 회신 프레임 또는 None(타임아웃)으로 OTA 1회 수행.
+    커밋 ACK를 받으면 미러에 같은 델타 적용. 통계 dict 반환 (committed, entries, payload_bytes, frames, retries ...).
+    """
+    payload, entries = encode_delta(model, target, threshold)
+    stats = {
+        "update_id": update_id, "entries": entries, "payload_bytes": len(payload),
+        "dense_bytes": dense_size(model), "frames": 0, "retries": 0, "committed": False,
+    }
+    if not entries:
+        stats["committed"] = True
+        return stats
+    frames = chunk_frames(update_id, payload, chunk_size)
+    stats["chunks"] = len(frames)
+
+    def send(frame, seq, ok_status):
+        for attempt in range(max_retries + 1):
+            stats["frames"] += 1
+            stats["retries"] += attempt > 0
+            ack = parse_ack(link.exchange(frame))
+            if ack is not None and ack[0] == update_id and ack[1] == seq and ack[2] in ok_status:
+                return ack[2]
+        return None
+
+    for seq, frame in enumerate(frames):
+        if send(frame, seq, (ACK_OK,)) is None:
+            stats["failed_at"] = seq
+            return stats
+    if send(commit_frame(update_id, len(frames), payload), COMMIT_SEQ, (ACK_COMMITTED,)) is None:
+        stats["failed_at"] = "commit"  # 엣지 적용 여부 불명: 다음 OTA 전에 미러 재동기화 필요
+        return stats
+
+    apply_delta(model, decode_delta(payload))
+    stats["committed"] = True
+    return stats
+
+
+# =========================================================
+# 5. 엣지 수신 (펌웨어 참조 구현)
+# =========================================================
+class EdgeOtaReceiver:
+    """엣지 쪽 OTA 수신기: 청크 보관 → COMMIT 시 CRC32 확인 → 복사본 적용 후 원자적 교체."""
+
+    def __init__(self, model):
+        self.model = model
+        self.update_id = None
+        self.chunks = {}
+        self.total = None
+        self.applied_id = None
+
+    def on_frame(self, frame):
+        """수신 프레임 1개 → 회신 ACK 프레임 (CRC 오류 프레임은 무응답)."""
+        body = _unseal(frame)
+        if body is None or body[:1] != b"O":
+            return None
+        kind = body[1:2]
+        if kind == FRAME_DATA and len(body) >= _DATA_HDR.size:
+            _, update_id, seq, total = _DATA_HDR.unpack_from(body)
+            if update_id != self.update_id:
+                self.update_id, self.chunks, self.total = update_id, {}, total
+            self.chunks[seq] = body[_DATA_HDR.size:]
+            return ack_frame(update_id, seq, ACK_OK)
+        if kind == FRAME_COMMIT and len(body) == _COMMIT.size:
+            _, update_id, total, crc = _COMMIT.unpack(body)
+            if update_id == self.applied_id:
+                return ack_frame(update_id, COMMIT_SEQ, ACK_COMMITTED)  # 커밋 ACK 유실 후 재전송
+            if update_id != self.update_id or len(self.chunks) != total:
+                return ack_frame(update_id, COMMIT_SEQ, ACK_COMMIT_FAILED)
+            payload = b"".join(self.chunks[s] for s in range(total))
+            if zlib.crc32(payload) != crc:
+                return ack_frame(update_id, COMMIT_SEQ, ACK_COMMIT_FAILED)
+            apply_delta(self.model, decode_delta(payload))
+            self.applied_id, self.chunks = update_id, {}
+            return ack_frame(update_id, COMMIT_SEQ, ACK_COMMITTED)
+        return None
@@ -0,0 +1,202 @@
+# gateway/gateway_predictors.py
+"""
+경량 예측기 백엔드: GatewayMLP와 같은 인터페이스(predict / shift_window / online_update)로 교체 가능한 O(1) 모델.
+edge_node/predictors.h 가 같은 연산을 C(float32)로 구현한다 — 엣지와 게이트웨이가 같은 백엔드를 써야 미러가 맞는다.
+
+인터페이스 (NodeMirror·replay가 쓰는 것만):
+- predict() → [temp, hum] (다음 1분 측정값 예측). last_pred_t / last_pred_h 갱신
+- online_update(actual_t, actual_h, lr): 마지막 predict()에 대한 실측값으로 학습 (TX 스텝에서만 호출)
+- shift_window(t, h, tn): 1스텝 진행. 엣지는 항상 예측값을 넘긴다 (실측값은 online_update로만 들어옴)
+
+백엔드 (온도·습도 채널 독립, 상태·연산량 고정):
+- ar:     AR(4) + bias, 정규화된 윈도우에 NLMS 학습 (윈도우는 MLP와 같이 예측값)
+- holt:   감쇠 추세 지수평활. 오차 보정은 TX 스텝에서만, 추세는 마지막 TX 이후 스텝 수로 나눈 기울기
+- kalman: 국소 선형 추세 칼만 필터 (상태 [수준, 기울기], 공분산 3원소). 미관측 스텝은 사전 분포만 전파
+
+holt·kalman은 predict()가 "대기 상태"(사전 예측)를 만들고 online_update가 보정, shift_window가 확정한다.
+shift_window에 넘어온 예측값 대신 보정된 내부 상태를 쓰므로 on_rx 순서(update → shift → predict)와 맞다.
+lr 인자는 인터페이스 호환용이며 경량 백엔드는 자체 이득(mu, alpha, q/r)을 쓴다.
+연산은 모두 float32 원소별 (C float와 같은 반올림, FMA 금지 시).
+"""
+import numpy as np
+
+from gateway_MLP_Logic import WINDOW_SIZE
+
+_F32 = np.float32
+
+
+class Predictor:
+    """경량 백엔드 공통: y_mean/y_std 정규화 (채널별), 예측 캐시, 메모리·FLOPs 보고."""
+
+    # 노드 1개 상태 배열 이름 (nbytes 보고용)
+    STATE = ()
+    # 스텝당 부동소수점 연산 수 (덧셈·곱셈·나눗셈·비교 각 1)
+    FLOPS = {"predict": 0, "update": 0, "shift": 0}
+
+    def __init__(self, y_mean, y_std):
+        self.y_mean = np.array(y_mean, dtype=_F32)
+        self.y_std = np.array(y_std, dtype=_F32)
+        self.last_pred_t = float(self.y_mean[0])
+        self.last_pred_h = float(self.y_mean[1])
+
+    def _scale(self, values):
+        return (np.array(values, dtype=_F32) - self.y_mean) / self.y_std
+
+    def _output(self, scaled):
+        pred = scaled * self.y_std + self.y_mean
+        self.last_pred_t, self.last_pred_h = float(pred[0]), float(pred[1])
+        return pred
+
+    @property
+    def nbytes(self):
+        """노드 1개 모델 메모리 (상태 배열)."""
+        return int(sum(getattr(self, k).nbytes for k in self.STATE))
+
+    def flops(self):
+        return dict(self.FLOPS)
+
+
+class ARPredictor(Predictor):
+    """
+    채널별 AR(WINDOW_SIZE) + bias: pred = a · [윈도우(정규화), 1]. 초기 a = 직전값 유지 (마지막 계수 1).
+    NLMS: a += mu · e · x / (eps + x·x) — 입력 크기와 무관한 안정 조건 0 < mu < 2.
+    """
+
+    STATE = ("window", "coef", "last_x")
+    # predict: 정규화 2x4x2 + 내적 2x(5곱+4합) + 역정규화 2x2
+    # update: 정규화 2x2 + 내적 18 + 오차 2 + 노름 2x(5곱+5합) + 배율 2x2 + 갱신 2x5x2
+    FLOPS = {"predict": 38, "update": 68, "shift": 0}
+
+    def __init__(self, y_mean, y_std, mu=0.5, eps=1e-3):
+        super().__init__(y_mean, y_std)
+        self.mu = _F32(mu)
+        self.eps = _F32(eps)
+        self.window = np.tile(self.y_mean, (WINDOW_SIZE, 1)).astype(_F32)  # [스텝, 채널], 예측값 윈도우
+        self.coef = np.zeros((2, WINDOW_SIZE + 1), dtype=_F32)
+        self.coef[:, WINDOW_SIZE - 1] = 1.0
+        self.last_x = np.zeros((2, WINDOW_SIZE + 1), dtype=_F32)
+
+    def predict(self):
+        x = self.last_x
+        x[:, :WINDOW_SIZE] = ((self.window - self.y_mean) / self.y_std).T
+        x[:, WINDOW_SIZE] = 1.0
+        return self._output((self.coef * x).sum(axis=1, dtype=_F32))
+
+    def shift_window(self, new_t, new_h, new_tn):
+        self.window[:-1] = self.window[1:]
+        self.window[-1] = new_t, new_h
+
+    def online_update(self, actual_t, actual_h, lr=None):
+        x = self.last_x
+        err = self._scale([actual_t, actual_h]) - (self.coef * x).sum(axis=1, dtype=_F32)
+        gain = self.mu * err / (self.eps + (x * x).sum(axis=1, dtype=_F32))
+        self.coef += gain[:, None] * x
+
+
+class HoltPredictor(Predictor):
+    """
+    감쇠 추세 지수평활 (정규화 단위). 상태: 수준 level, 추세 trend (스텝당), 마지막 TX 이후 스텝 수.
+    predict: f = level + phi·trend / update: e = 실측 - f / shift: level = f + alpha·e,
+    trend = phi·trend + beta·e / steps (TX 간격이 길수록 기울기 보정을 작게).
+    """
+
+    STATE = ("level", "trend", "forecast", "err", "steps")
+    # predict: 2x2 + 역정규화 2x2 / update: 정규화 2x2 + 오차 2 / shift: 수준 2x2 + 추세 2x4
+    FLOPS = {"predict": 8, "update": 6, "shift": 12}
+
+    def __init__(self, y_mean, y_std, alpha=0.8, beta=0.3, phi=0.98):
+        super().__init__(y_mean, y_std)
+        self.alpha, self.beta, self.phi = _F32(alpha), _F32(beta), _F32(phi)
+        self.level = np.zeros(2, dtype=_F32)
+        self.trend = np.zeros(2, dtype=_F32)
+        self.forecast = np.zeros(2, dtype=_F32)
+        self.err = np.zeros(2, dtype=_F32)
+        self.steps = np.zeros(1, dtype=_F32)  # 마지막 TX 이후 스텝 수 (float: C와 같은 나눗셈)
+
+    def predict(self):
+        self.forecast = self.level + self.phi * self.trend
+        self.err[:] = 0.0
+        return self._output(self.forecast)
+
+    def shift_window(self, new_t, new_h, new_tn):
+        self.steps += 1.0
+        self.level = self.forecast + self.alpha * self.err
+        if self.err.any():
+            self.trend = self.phi * self.trend + self.beta * self.err / self.steps
+            self.steps[:] = 0.0
+        else:
+            self.trend = self.phi * self.trend
+
+    def online_update(self, actual_t, actual_h, lr=None):
+        self.err = self._scale([actual_t, actual_h]) - self.forecast
+
+
+class KalmanPredictor(Predictor):
+    """
+    채널별 국소 선형 추세 칼만 필터 (정규화 단위). x = [수준, 기울기], F = [[1, 1], [0, 1]], H = [1, 0].
+    공분산은 대칭이라 (p00, p01, p11)만 저장. predict가 사전 분포, update가 사후 분포를 대기 상태에 두고 shift가 확정.
+    """
+
+    STATE = ("x", "p", "x_next", "p_next")
+    # predict: 상태 2 + 공분산 2x(4합+2합) + 역정규화 2x2 / update: 정규화 2x2 + 이득 2x3 + 상태 2x4 + 공분산 2x6
+    FLOPS = {"predict": 18, "update": 30, "shift": 0}
+
+    def __init__(self, y_mean, y_std, q_level=1e-3, q_slope=1e-6, r=1e-2, p0=1.0):
+        super().__init__(y_mean, y_std)
+        self.q_level, self.q_slope, self.r = _F32(q_level), _F32(q_slope), _F32(r)
+        self.x = np.zeros((2, 2), dtype=_F32)         # [채널, (수준, 기울기)]
+        self.p = np.zeros((2, 3), dtype=_F32)         # [채널, (p00, p01, p11)]
+        self.p[:, 0] = p0
+        self.p[:, 2] = p0 * 1e-3
+        self.x_next = self.x.copy()
+        self.p_next = self.p.copy()
+
+    def predict(self):
+        x, p = self.x, self.p
+        xn, pn = self.x_next, self.p_next
+        xn[:, 0] = x[:, 0] + x[:, 1]
+        xn[:, 1] = x[:, 1]
+        # F P Fᵀ + Q
+        pn[:, 0] = p[:, 0] + p[:, 1] + p[:, 1] + p[:, 2] + self.q_level
+        pn[:, 1] = p[:, 1] + p[:, 2]
+        pn[:, 2] = p[:, 2] + self.q_slope
+        return self._output(xn[:, 0])
+
+    def shift_window(self, new_t, new_h, new_tn):
+        self.x[:] = self.x_next
+        self.p[:] = self.p_next
+
+    def online_update(self, actual_t, actual_h, lr=None):
+        xn, pn = self.x_next, self.p_next
+        err = self._scale([actual_t, actual_h]) - xn[:, 0]
+        s = pn[:, 0] + self.r
+        k0, k1 = pn[:, 0] / s, pn[:, 1] / s
+        xn[:, 0] += k0 * err
+        xn[:, 1] += k1 * err
+        p00, p01, p11 = pn[:, 0].copy(), pn[:, 1].copy(), pn[:, 2].copy()
+        pn[:, 0] = p00 - k0 * p00
+        pn[:, 1] = p01 - k0 * p01
+        pn[:, 2] = p11 - k1 * p01
+
+
+BACKENDS = {
+    "ar": ARPredictor,
+    "holt": HoltPredictor,
+    "kalman": KalmanPredictor,
+}
+
+
+def mlp_flops(model):
+    """GatewayMLP 스텝당 FLOPs (경량 백엔드 FLOPS와 같은 집계). 층 크기는 가중치 shape, 학습 범위는 model.trainable."""
+    n_in, n_h1 = model.w1.shape
+    n_h2, n_out = model.w3.shape
+    trainable = getattr(model, "trainable", ("w1", "w2", "w3"))
+    layers = ((n_in, n_h1), (n_h1, n_h2), (n_h2, n_out))
+    forward = 2 * n_in + sum(2 * a * b for a, b in layers) + n_h1 + n_h2 + 2 * n_out  # 정규화·곱합·ReLU·역정규화
+    # 목표 정규화·오차, 출력층 재계산(내적), W3·B3 갱신
+    backward = 3 * n_out + 2 * n_h2 * n_out + 2 * n_h2 * n_out + 2 * n_out
+    if "w2" in trainable:  # h2 오차 역전파(내적·ReLU 미분), W2·B2 갱신
+        backward += 2 * n_h2 * n_out + n_h2 + 2 * n_h1 * n_h2 + 2 * n_h2
+    if "w1" in trainable:  # h1 오차 역전파, W1·B1 갱신
+        backward += 2 * n_h1 * n_h2 + n_h1 + 2 * n_in * n_h1 + 2 * n_h1
+    return {"predict": forward, "update": backward, "shift": 0}
@@ -0,0 +1,152 @@
+# gateway/gateway_protocol.py
+"""게이트웨이 시리얼 라인 파싱 및 MQTT 페이로드 인코딩 (gateway_edge.ino ↔ gateway.py ↔ 구독자)."""
+import json
+
+RECEIVED_PREFIX = "Received: "
+DEFAULT_NODE_ID = "edge0"  # 노드 ID 없는 프레임(기존 펌웨어)의 노드
+READINGS_TOPIC = "aoii/readings"
+
+
+def readings_topic(gateway_id=None):
+    """게이트웨이 발행 토픽. GATEWAY_ID가 있으면 aoii/readings/<gateway_id> (구독자는 aoii/readings/#)."""
+    return f"{READINGS_TOPIC}/{gateway_id}" if gateway_id else READINGS_TOPIC
+
+
+def parse_received_line(line):
+    """
+    gateway_edge.ino가 출력한 "Received: ..." 라인 → (node_id, edge_timestamp_ms, actual_t, actual_h).
+    - "Received: [<node_id>,]<edge_ts_ms>,<t>,<h>" : edge_timestamp_ms 포함
+    - "Received: [<node_id>,]<t>,<h>"              : 구버전 포맷, edge_timestamp_ms=None
+    node_id는 영문자로 시작하는 첫 필드 (없으면 DEFAULT_NODE_ID).
+    "Received:"가 없는 라인은 None. 숫자 변환 실패 시 ValueError/IndexError 전파.
+    """
+    if "Received:" not in line:
+        return None
+    payload = line.split(RECEIVED_PREFIX)[1]
+    parts = [p.strip() for p in payload.split(",")]
+    node_id = DEFAULT_NODE_ID
+    if parts[0][:1].isalpha():
+        node_id = parts.pop(0)
+    if len(parts) >= 3:
+        return node_id, int(parts[0]), float(parts[1]), float(parts[2])
+    return node_id, None, float(parts[0]), float(parts[1])
+
+
+def is_sync_ping(actual_t, actual_h):
+    """엣지 waitForTimeSync()의 "0.0,0.0" 시간 동기화 요청."""
+    return actual_t == 0.0 and actual_h == 0.0
+
+
+def sync_reply(unix_ts, betas=None):
+    """
+    엣지로 회신할 시간 동기화 라인 (gateway_edge.ino가 그대로 LoRa 전송).
+    betas=(beta_t, beta_h)면 "ts,beta_t,beta_h" — 기존 펌웨어는 toInt()로 ts만 읽으므로 호환.
+    """
+    if betas is None:
+        return f"{int(unix_ts)}\n".encode()
+    return f"{int(unix_ts)},{betas[0]:g},{betas[1]:g}\n".encode()
+
+
+def build_est_payload(timestamp, time_n, pred_t, pred_h, total_tx, node_id=DEFAULT_NODE_ID):
+    """60초 주기 예측(EST) 이벤트."""
+    return {
+        "event": "EST",
+        "node_id": node_id,
+        "timestamp": timestamp,
+        "time_n": round(time_n, 4),
+        "actual_t": None,
+        "actual_h": None,
+        "pred_t": round(float(pred_t), 2),
+        "pred_h": round(float(pred_h), 2),
+        "error_t": None,
+        "error_h": None,
+        "total_tx": total_tx,
+    }
+
+
+# 묶음 EST: 노드별 값은 열(column) 배열로, 공통 필드(timestamp, time_n)는 1번만
+EST_BATCH_COLUMNS = ("node_id", "pred_t", "pred_h", "total_tx")
+
+
+def build_est_batch_payload(timestamp, time_n, rows):
+    """
+    여러 노드 EST를 메시지 1개로 (event "ESTB"). rows: (node_id, pred_t, pred_h, total_tx) 시퀀스.
+    {"event": "ESTB", "timestamp", "time_n", "node_id": [...], "pred_t": [...], "pred_h": [...], "total_tx": [...]}
+    """
+    payload = {"event": "ESTB", "timestamp": timestamp, "time_n": round(time_n, 4)}
+    cols = list(zip(*rows)) if rows else [()] * len(EST_BATCH_COLUMNS)
+    for name, col in zip(EST_BATCH_COLUMNS, cols):
+        payload[name] = [round(float(v), 2) for v in col] if name in ("pred_t", "pred_h") else list(col)
+    return payload
+
+
+def decode_est_batch(payload):
+    """ESTB 페이로드 → 노드별 EST 이벤트 dict 목록 (build_est_payload와 같은 형태)."""
+    timestamp, time_n = payload["timestamp"], payload["time_n"]
+    return [
+        {
+            "event": "EST", "node_id": node_id, "timestamp": timestamp, "time_n": time_n,
+            "actual_t": None, "actual_h": None, "pred_t": pred_t, "pred_h": pred_h,
+            "error_t": None, "error_h": None, "total_tx": total_tx,
+        }
+        for node_id, pred_t, pred_h, total_tx in zip(*(payload[c] for c in EST_BATCH_COLUMNS))
+    ]
+
+
+def iter_events(payload):
+    """구독자용: 수신 페이로드 1개 → 이벤트 dict 목록 (ESTB는 노드별 EST로 풀고, 나머지는 그대로)."""
+    if payload.get("event") == "ESTB":
+        return decode_est_batch(payload)
+    return [payload]
+
+
+def build_rx_payload(timestamp, time_n, actual_t, actual_h, pred_t, pred_h, err_t, err_h, total_tx,
+                     transmission_delay_ms=None, node_id=DEFAULT_NODE_ID, betas=None, aoii=None,
+                     edge_ts_ms=None, rx_ts_ms=None):
+    """
+    엣지 수신(RX) 이벤트. transmission_delay_ms는 엣지 타임스탬프가 있을 때만, betas는 적응형 δ 사용 시만 포함.
+    aoii: AoIITracker snapshot (aoii_age_s, aoii_avg_s, ...) 필드를 그대로 추가.
+    edge_ts_ms·rx_ts_ms: 서버 멱등 저장 키 (node_id, edge_ts_ms) — server/dedup.py. rx_ts_ms는 게이트웨이 수신 시각(ms).
+    """
+    payload = {
+        "event": "RX",
+        "node_id": node_id,
+        "timestamp": timestamp,
+        "time_n": round(time_n, 4),
+        "actual_t": round(actual_t, 2),
+        "actual_h": round(actual_h, 2),
+        "pred_t": round(float(pred_t), 2),
+        "pred_h": round(float(pred_h), 2),
+        "error_t": round(err_t, 2),
+        "error_h": round(err_h, 2),
+        "total_tx": total_tx,
+    }
+    if transmission_delay_ms is not None:
+        payload["transmission_delay_ms"] = transmission_delay_ms
+    if edge_ts_ms is not None:
+        payload["edge_ts_ms"] = edge_ts_ms
+    if rx_ts_ms is not None:
+        payload["rx_ts_ms"] = rx_ts_ms
+    if betas is not None:
+        payload["beta_t"], payload["beta_h"] = betas
+    if aoii is not None:
+        payload.update(aoii)
+    return payload
+
+
+def build_silent_payload(timestamp, node_id, last_rx_unix, silent_s, total_tx):
+    """생존 이벤트 (event "SILENT"): 노드가 하트비트 기한(엣지 HEARTBEAT_INTERVAL + 여유)을 넘겨 조용함. 다음 RX가 해제."""
+    return {
+        "event": "SILENT",
+        "node_id": node_id,
+        "timestamp": timestamp,
+        "last_rx": round(last_rx_unix, 3) if last_rx_unix else None,
+        "silent_s": round(silent_s, 1),
+        "total_tx": total_tx,
+    }
+
+
+def encode_payload(payload_dict):
+    if payload_dict.get("event") == "ESTB":
+        return json.dumps(payload_dict, separators=(",", ":"))  # 노드 수에 비례하는 배열: 공백 제거
+    return json.dumps(payload_dict)
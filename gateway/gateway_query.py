@@ -0,0 +1,236 @@
+# gateway/gateway_query.py
+"""
+게이트웨이 로컬 조회 API: 노드별 현재 추정값·마지막 RX·오차·모델 버전·윈도우·EST 궤적을 HTTP (TCP 또는 Unix 소켓)로.
+실행: GATEWAY_QUERY_ADDR=127.0.0.1:8081 python gateway/gateway.py   (또는 unix:/tmp/aoii-gateway.sock)
+      curl localhost:8081/nodes/edge0   /   curl --unix-socket /tmp/aoii-gateway.sock http://gw/nodes
+
+- 시리얼 루프가 RX·EST·재부팅마다 노드 스냅샷(불변 객체)을 새로 만들어 참조만 교체 (publish). 조회 스레드는 참조를 읽기만 → 잠금 없음
+  - 기존 노드 갱신은 dict 항목 대입 1번 (GIL 아래 원자적), 노드 추가 때만 dict를 복사해 통째로 교체 (copy-on-write)
+  - 윈도우는 publish 때 복사, 궤적은 불변 배열을 참조만 (NodeMirror가 다음 RX에 새 궤적으로 교체)
+- 스냅샷 JSON은 처음 조회될 때 1번 직렬화해 캐시 → 같은 스냅샷 반복 조회는 바이트 전송만
+- ThreadingHTTPServer + HTTP/1.1 keep-alive (연결당 스레드 1개), 요청 로그 없음. 조회는 GIL을 시리얼 루프와 나눠 쓰므로
+  외부 공개용이 아니라 같은 Pi의 로컬 도구·대시보드용 (기본 127.0.0.1)
+
+엔드포인트: GET /nodes · /nodes/<id> · /nodes/<id>/estimate?at=<unix초> · /stats
+모델 버전 = g<재부팅 세대>.u<온라인 학습 횟수> (엣지와 같은 초기 가중치에서 출발해 같은 RX를 반영했으면 같은 버전)
+"""
+import os
+import json
+import time
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from gateway_node import EST_INTERVAL_SEC
+
+DEFAULT_ADDR = "127.0.0.1:8081"
+
+
+def model_info(node):
+    """모델 종류·학습 범위·버전."""
+    model = node.model
+    generation = getattr(node, "generation", 0)
+    return {
+        "kind": type(model).__name__, "update_scope": getattr(model, "update_scope", None),
+        "generation": generation, "updates": node.total_tx, "version": f"g{generation}.u{node.total_tx}",
+    }
+
+
+def window_of(model):
+    """입력 윈도우 복사본 (MLP window_buf [t, h, time_n] / ar window [t, h]). 윈도우 없는 백엔드는 None."""
+    window = getattr(model, "window_buf", None)
+    if window is None:
+        window = getattr(model, "window", None)
+    return window.tolist() if window is not None else None
+
+
+class NodeSnapshot:
+    """publish 시점의 노드 상태 (불변). JSON은 첫 조회 때 직렬화해 캐시 (경합해도 같은 결과라 잠금 없음)."""
+
+    __slots__ = ("node_id", "updated_at", "estimate", "est_time", "rx", "aoii", "total_tx", "model", "window",
+                 "trajectory", "traj_next", "_json", "_summary")
+
+    def __init__(self, node, now, rx, aoii):
+        self.node_id = node.node_id
+        self.updated_at = now
+        self.estimate = (float(node.pred[0]), float(node.pred[1]))
+        self.est_time = node.last_est_time
+        self.rx = rx
+        self.aoii = aoii
+        self.total_tx = node.total_tx
+        self.model = model_info(node)
+        self.window = window_of(node.model)
+        self.trajectory = getattr(node, "trajectory", None)
+        self.traj_next = self.trajectory.next if self.trajectory is not None else 0
+        self._json = self._summary = None
+
+    def estimate_at(self, ts):
+        """시각 ts의 EST 추정값 (t, h). 궤적 범위 밖이면 None."""
+        traj = self.trajectory
+        if traj is None:
+            return self.estimate if ts < self.est_time + EST_INTERVAL_SEC else None
+        pred = traj.estimate_at(ts, self.estimate, next_step=self.traj_next)
+        return None if pred is None else (float(pred[0]), float(pred[1]))
+
+    def forecast(self):
+        traj = self.trajectory
+        if traj is None:
+            return []
+        return [[traj.step_time(j), float(traj.preds[j, 0]), float(traj.preds[j, 1])]
+                for j in range(self.traj_next, len(traj))]
+
+    def summary(self):
+        return {
+            "node_id": self.node_id, "temp": self.estimate[0], "hum": self.estimate[1], "est_time": self.est_time,
+            "last_rx_time": self.rx["time"] if self.rx else None, "total_tx": self.total_tx,
+            "version": self.model["version"],
+        }
+
+    def summary_json(self):
+        if self._summary is None:
+            self._summary = json.dumps(self.summary()).encode()
+        return self._summary
+
+    def to_json(self):
+        if self._json is None:
+            self._json = json.dumps({
+                "node_id": self.node_id, "updated_at": self.updated_at,
+                "estimate": {"temp": self.estimate[0], "hum": self.estimate[1], "time": self.est_time},
+                "last_rx": self.rx, "aoii": self.aoii, "total_tx": self.total_tx, "model": self.model,
+                "window": self.window, "forecast": self.forecast(),
+            }).encode()
+        return self._json
+
+
+class SnapshotBoard:
+    """node_id → NodeSnapshot. publish()는 시리얼 루프 스레드 1개, get()/snapshots()는 조회 스레드 여러 개."""
+
+    def __init__(self):
+        self._nodes = {}
+        self.published = 0
+        self.queries = 0  # 조회 스레드들이 잠금 없이 더하므로 근사값
+
+    def publish(self, node, now, rx=None, aoii=None):
+        """RX면 rx(마지막 RX 정보)·aoii, EST·재부팅이면 생략 → 직전 스냅샷 값 유지."""
+        nodes = self._nodes
+        prev = nodes.get(node.node_id)
+        if prev is not None:
+            rx = rx if rx is not None else prev.rx
+            aoii = aoii if aoii is not None else prev.aoii
+        snap = NodeSnapshot(node, now, rx, aoii)
+        if prev is None:
+            nodes = dict(nodes)
+            nodes[node.node_id] = snap
+            self._nodes = nodes
+        else:
+            nodes[node.node_id] = snap
+        self.published += 1
+        return snap
+
+    def get(self, node_id):
+        return self._nodes.get(node_id)
+
+    def snapshots(self):
+        return list(self._nodes.values())
+
+    def stats(self):
+        return {"nodes": len(self._nodes), "published": self.published, "queries": self.queries}
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: 연결 1개로 여러 조회
+    wbufsize = -1  # 헤더·본문을 한 번에 전송 (따로 보내면 Nagle + 지연 ACK로 왕복마다 ~40 ms)
+
+    def do_GET(self):
+        board = self.server.board
+        board.queries += 1
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        if parts == ["nodes"]:
+            return self._send(200, b'{"nodes":[' + b",".join(s.summary_json() for s in board.snapshots()) + b"]}")
+        if parts == ["stats"]:
+            stats = board.stats()
+            if self.server.extra_stats is not None:
+                stats.update(self.server.extra_stats())
+            return self._send(200, json.dumps(stats).encode())
+        if len(parts) in (2, 3) and parts[0] == "nodes":
+            snap = board.get(parts[1])
+            if snap is None:
+                return self._send(404, json.dumps({"error": f"unknown node: {parts[1]}"}).encode())
+            if len(parts) == 2:
+                return self._send(200, snap.to_json())
+            if parts[2] == "estimate":
+                try:
+                    at = float(parse_qs(url.query).get("at", [time.time()])[0])
+                except ValueError:
+                    return self._send(400, b'{"error": "at must be unix seconds"}')
+                est = snap.estimate_at(at)
+                return self._send(200, json.dumps({
+                    "node_id": snap.node_id, "at": at, "temp": est[0] if est else None, "hum": est[1] if est else None,
+                }).encode())
+        self._send(404, b'{"error": "not found"}')
+
+    def _send(self, code, body):
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class QueryServer:
+    """addr: "host:port" 또는 "unix:<경로>". start()는 데몬 스레드에서 serve_forever. extra_stats: /stats에 합칠 dict 함수."""
+
+    def __init__(self, board, addr=DEFAULT_ADDR, extra_stats=None):
+        self.board = board
+        self.addr = addr
+        self.extra_stats = extra_stats
+        self.server = None
+        self._thread = None
+
+    def start(self):
+        if self.addr.startswith("unix:"):
+            path = self.addr[len("unix:"):]
+            if os.path.exists(path):
+                os.remove(path)  # 이전 실행이 남긴 소켓 파일
+            server = _UnixHTTPServer(path, QueryHandler)
+        else:
+            host, _, port = self.addr.rpartition(":")
+            server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), QueryHandler)
+            server.daemon_threads = True
+        server.board = self.board
+        server.extra_stats = self.extra_stats
+        self.server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="gateway-query", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def address(self):
+        """실제 바인딩 주소 (포트 0으로 열었을 때 확인용)."""
+        if self.addr.startswith("unix:"):
+            return self.addr
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            if self.addr.startswith("unix:"):
+                try:
+                    os.remove(self.addr[len("unix:"):])
+                except OSError:
+                    pass
+            self.server = None
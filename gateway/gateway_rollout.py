@@ -0,0 +1,104 @@
+# gateway/gateway_rollout.py
+"""
+RX 뒤 자유 실행(free-run) 궤적을 K스텝 미리 계산: 다음 RX 전까지 미러는 예측값을 윈도우에 넣고 재예측할 뿐이라 결정적.
+
+- RX(on_rx) 직후 모델 사본으로 K스텝(GATEWAY_ROLLOUT_STEPS)을 한 번에 전개 → 스텝별 예측·time_n을 (K, 2)·(K,) 배열로 캐시
+- EST 틱은 궤적에서 꺼냄 (재예측 없음). 다음 RX가 궤적을 버리고 새로 전개. K스텝을 다 쓰면 틱 시점 상태에서 다시 전개
+- 틱 time_n은 RX 시각 + 60·j의 시각 (엣지 loop처럼 정확히 60초 간격). 실제 틱의 time_n과 SLACK_SEC 넘게 어긋나면
+  (게이트웨이 지연·시계 변경) 궤적을 버리고 그 틱은 직접 계산
+- 미러 상태 진행:
+  - 윈도우 모델(GatewayMLP, int8): 틱마다 shift_window만 (in-place). predict의 backprop 버퍼는 다음 RX의
+    online_update 직전에 predict 1회로 다시 채움 (같은 윈도우라 궤적 값과 같음)
+  - 경량 백엔드(STATE가 있는 ar/holt/kalman): predict가 내부 상태를 바꾸므로 스텝별 상태를 (K, S) 배열로 저장해 복원
+- estimate_at(ts): 궤적 범위(K스텝) 안의 임의 시각 추정값 (조회 API용)
+"""
+import os
+import copy
+
+import numpy as np
+
+ROLLOUT_STEPS = int(os.environ.get("GATEWAY_ROLLOUT_STEPS", "10"))  # 엣지 HEARTBEAT_INTERVAL 600초 / 60초
+SLACK_SEC = 5.0
+DAY_SEC = 86400
+
+
+def time_n_after(time_n, seconds):
+    """게이트웨이 time_n(초 단위 / 86400) + seconds초 뒤의 time_n (자정 넘김 포함)."""
+    return ((int(round(time_n * DAY_SEC)) + int(seconds)) % DAY_SEC) / DAY_SEC
+
+
+def state_arrays(model):
+    """경량 백엔드 상태 배열 (STATE). 윈도우 모델은 빈 tuple."""
+    return tuple(getattr(model, "STATE", ()))
+
+
+class Trajectory:
+    """
+    스텝 j(0부터)는 시각 origin + (j+1)·interval의 EST. preds (K, 2) float32, time_ns (K,), states (K, S) 또는 None.
+    next: 다음 틱이 꺼낼 스텝.
+    """
+
+    __slots__ = ("origin", "interval", "preds", "time_ns", "states", "next")
+
+    def __init__(self, origin, interval, preds, time_ns, states=None):
+        self.origin = origin
+        self.interval = interval
+        self.preds = preds
+        self.time_ns = time_ns
+        self.states = states
+        self.next = 0
+
+    def __len__(self):
+        return len(self.preds)
+
+    @property
+    def exhausted(self):
+        return self.next >= len(self.preds)
+
+    def step_time(self, j):
+        return self.origin + (j + 1) * self.interval
+
+    def estimate_at(self, ts, current, next_step=None):
+        """
+        시각 ts의 EST 추정값 (current: 지금 미러 예측). ts가 궤적 끝을 넘으면 None.
+        next_step: 조회 스레드가 스냅샷 시점의 next로 볼 때 (궤적 배열은 불변이라 잠금 없이 읽음).
+        """
+        j = int((ts - self.origin) // self.interval) - 1  # ts 이전 마지막 틱
+        if j < (self.next if next_step is None else next_step):
+            return current
+        return self.preds[j] if j < len(self.preds) else None
+
+
+def rollout(model, pred, first_time_n, steps, interval):
+    """
+    model 사본으로 steps스텝 자유 실행 (원본은 그대로). 스텝 j는 shift_window(직전 예측, first_time_n + j·interval) → predict.
+    (preds, time_ns, states) 반환. 자유 실행은 스텝마다 직전 출력이 입력이라 순차 — 한 번의 호출로 모아서 계산.
+    """
+    scratch = copy.deepcopy(model)
+    names = state_arrays(model)
+    preds = np.empty((steps, 2), dtype=np.float32)
+    time_ns = (int(round(first_time_n * DAY_SEC)) + int(interval) * np.arange(steps)) % DAY_SEC / DAY_SEC
+    states = None
+    if names:
+        layout = [(name, getattr(model, name).shape, getattr(model, name).size) for name in names]
+        states = np.empty((steps, sum(size for _, _, size in layout)), dtype=np.float32)
+    p = pred
+    for j, tn in enumerate(time_ns.tolist()):
+        scratch.shift_window(p[0], p[1], tn)
+        p = scratch.predict()
+        preds[j] = p
+        if states is not None:
+            pos = 0
+            for name, _, size in layout:
+                states[j, pos:pos + size] = getattr(scratch, name).ravel()
+                pos += size
+    return preds, time_ns, states
+
+
+def restore_state(model, row):
+    """rollout()의 states 행 → 경량 백엔드 상태 배열 (복사)."""
+    pos = 0
+    for name in state_arrays(model):
+        current = getattr(model, name)
+        setattr(model, name, row[pos:pos + current.size].reshape(current.shape).astype(current.dtype))
+        pos += current.size
@@ -0,0 +1,355 @@
+# gateway/gateway_sharded.py
+"""
+멀티 프로세스 샤딩 게이트웨이: gateway.py의 모델 연산·발행을 node_id별 워커 프로세스로 나누고 노드 상태를 공유 메모리에 둔다.
+지금 보장하는 것은 격리(워커별 노드 집합, 다른 프로세스의 무복사 조회)뿐 — 처리량 향상은 측정되지 않았다
+(1코어에서 1/2/4 워커 프레임당 시간은 같거나 느림, benchmarks/bench_sharded.py).
+
+  acceptor (메인 프로세스) : 시리얼 수신 → 즉시 시간 동기화 회신 → node_id 해시로 워커 큐에 배치 전달
+  worker x N              : 담당 노드의 미러 검증·온라인 학습·RX/EST 발행. 모델은 shared_memory 슬롯에 보관
+  조회 (--query)           : 다른 프로세스에서 공유 메모리에 attach해 아무 노드 상태나 복사 없이 조회
+
+실행: python gateway/gateway_sharded.py [--workers 4] [--capacity 1024]
+      python gateway/gateway_sharded.py --query [--workers 4]
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import queue
+import argparse
+import multiprocessing as mp
+
+import gateway
+from gateway import (
+    DEFAULT_NODE_ID, SERIAL_PORT, POLL_INTERVAL, MAX_LINES_PER_POLL,
+    parse_received_line, is_sync_ping, sync_reply, process_frame, publish_due_estimates,
+)
+from gateway_params import new_model
+from gateway_node import NodeMirror, NodeRegistry, EST_INTERVAL_SEC
+from gateway_timer_wheel import TimerWheel, EST
+from gateway_shared_state import SharedModelStore, TOTAL_TX, LAST_RX_MS, LAST_EST_MS, GENERATION
+
+SHM_PREFIX = os.environ.get("GATEWAY_SHM_PREFIX", "aoii_gw")
+DEFAULT_WORKERS = int(os.environ.get("GATEWAY_WORKERS", str(min(4, os.cpu_count() or 1))))
+DEFAULT_CAPACITY = int(os.environ.get("GATEWAY_SHARD_CAPACITY", "1024"))  # 샤드당 노드 수
+WORKER_POLL_SEC = 0.5  # 큐가 비어 있을 때 EST 주기 확인 간격
+
+PING, DATA = 0, 1
+
+
+def shard_name(index, prefix=SHM_PREFIX):
+    return f"{prefix}_{index}"
+
+
+def shard_of(node_id, n_workers):
+    """node_id → 워커 번호. 프로세스 간에 같아야 하므로 hash() 대신 crc32."""
+    return zlib.crc32(node_id.encode("utf-8")) % n_workers
+
+
+# =========================================================
+# 1. 워커: 공유 메모리 슬롯에 묶인 노드 미러
+# =========================================================
+class SharedNodeMirror(NodeMirror):
+    """
+    NodeMirror + 갱신 구간을 seqlock으로 감싸고 예측·TX 카운트·재부팅 세대를 슬롯 meta에 기록.
+    생성(재부팅 포함)은 초기 가중치 복사와 meta 기록이 한 쓰기 구간 — 조회 쪽이 새 가중치 + 이전 세대를 보지 않는다.
+    """
+
+    def __init__(self, node_id, model, store, slot, now=None, generation=0):
+        self.store, self.slot = store, slot
+        store.begin_write(slot)
+        try:
+            self._views = store.bind(model, slot)
+            super().__init__(node_id, model, now=now)
+            self.generation = generation
+            self._write_state()
+        finally:
+            store.end_write(slot)
+
+    def _write_state(self):
+        self._views["pred"][:] = self.pred
+        meta = self.store.meta[self.slot]
+        meta[TOTAL_TX] = self.total_tx
+        meta[LAST_RX_MS] = int(self.last_rx_time * 1000) if self.last_rx_time else 0
+        meta[LAST_EST_MS] = int(self.last_est_time * 1000)
+        meta[GENERATION] = self.generation
+
+    # 가중치·윈도우 갱신과 pred·meta 기록을 한 쓰기 구간으로 (사이에 읽으면 새 윈도우 + 이전 예측이 보임)
+    def est_tick(self, time_n, now):
+        self.store.begin_write(self.slot)
+        try:
+            return super().est_tick(time_n, now)
+        finally:
+            self._write_state()
+            self.store.end_write(self.slot)
+
+    def on_rx(self, actual_t, actual_h, time_n, now, **kwargs):
+        self.store.begin_write(self.slot)
+        try:
+            return super().on_rx(actual_t, actual_h, time_n, now, **kwargs)
+        finally:
+            self._write_state()
+            self.store.end_write(self.slot)
+
+
+class SharedNodeRegistry(NodeRegistry):
+    """샤드 1개의 node_id → SharedNodeMirror. 노드 재부팅(reset) 시 같은 슬롯을 초기 가중치로 덮어쓴다."""
+
+    def __init__(self, model_factory, store):
+        super().__init__(model_factory)
+        self.store = store
+        self.slots = {}
+
+    def _new(self, node_id, now, generation=0):
+        slot = self.slots.get(node_id)
+        if slot is None:
+            slot = self.slots[node_id] = self.store.allocate(node_id)
+        node = self.nodes[node_id] = SharedNodeMirror(node_id, self._model_factory(), self.store, slot, now=now,
+                                                      generation=generation)
+        return node
+
+    def get(self, node_id=DEFAULT_NODE_ID, now=None):
+        node = self.nodes.get(node_id)
+        return node if node is not None else self._new(node_id, now)
+
+    def reset(self, node_id, now=None):
+        old = self.nodes.get(node_id)
+        node = self._new(node_id, now, generation=old.generation + 1 if old is not None else 0)
+        if old is not None:
+            node.aoii = old.aoii  # AoII 누적은 워커 프로세스 메모리에 유지
+        return node
+
+
+class NullMqttClient:
+    """--no-mqtt / 벤치마크용: 발행 건수만 센다."""
+
+    def __init__(self):
+        self.published = 0
+
+    def publish(self, topic, payload, qos=0):
+        self.published += 1
+
+    def reconnect(self):
+        pass
+
+
+def _worker_main(index, store_name, inbox, processed, use_mqtt, quiet):
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+    store = SharedModelStore(store_name)
+    registry = SharedNodeRegistry(lambda: new_model(verbose=False), store)  # 공유 메모리 슬롯은 float32 모델 전용
+    mqtt_client = gateway.connect_mqtt() if use_mqtt else NullMqttClient()
+    wheel = TimerWheel(time.time())
+    try:
+        while True:
+            try:
+                batch = inbox.get(timeout=WORKER_POLL_SEC)
+            except queue.Empty:
+                batch = ()
+            if batch is None:
+                break
+            for kind, node_id, edge_ts_ms, t, h, recv_time in batch:
+                try:
+                    if kind == PING:
+                        registry.reset(node_id, now=recv_time)
+                        wheel.schedule(node_id, EST, recv_time + EST_INTERVAL_SEC)
+                    else:
+                        process_frame(mqtt_client, registry, node_id, edge_ts_ms, t, h, recv_time, wheel=wheel)
+                except Exception as e:
+                    print(f"[worker {index}] {node_id}: {e}")
+            if batch:
+                with processed.get_lock():
+                    processed.value += len(batch)
+            publish_due_estimates(mqtt_client, registry, time.time(), wheel=wheel)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"[worker {index}] stopped ({len(registry)} nodes)")
+        store.close()
+
+
+# =========================================================
+# 2. acceptor: 시리얼 수신·동기화 회신·노드 분배
+# =========================================================
+class ShardedGateway:
+    """워커 프로세스 N개와 샤드별 공유 메모리 블록을 소유. start() → run()/dispatch_line() → stop()."""
+
+    def __init__(self, n_workers=DEFAULT_WORKERS, capacity=DEFAULT_CAPACITY,
+                 use_mqtt=True, quiet=False, prefix=SHM_PREFIX):
+        self.n_workers = n_workers
+        self.capacity = capacity
+        self.use_mqtt = use_mqtt
+        self.quiet = quiet
+        self.prefix = prefix
+        self.stores, self.queues, self.workers = [], [], []
+        self.processed = mp.Value("q", 0)  # 워커가 처리 완료한 메시지 수 (벤치마크 완료 판정용)
+        self._pending = [[] for _ in range(n_workers)]
+        self.dispatched = 0
+
+    def start(self):
+        for i in range(self.n_workers):
+            name = shard_name(i, self.prefix)
+            _unlink_stale(name)
+            self.stores.append(SharedModelStore(name, self.capacity, create=True))
+            q = mp.Queue()
+            p = mp.Process(
+                target=_worker_main, name=f"gateway-worker-{i}",
+                args=(i, name, q, self.processed, self.use_mqtt, self.quiet), daemon=True,
+            )
+            p.start()
+            self.queues.append(q)
+            self.workers.append(p)
+        return self
+
+    def dispatch_line(self, line, ser):
+        """
+        시리얼 1라인: 회신은 여기서 바로, 모델 처리는 담당 워커 배치에 추가. 데이터 RX면 1 반환.
+        회신은 시각만 (노드별 δ 없음 — 적응형 δ는 gateway.py 전용).
+        """
+        if "Received:" not in line:
+            return 0
+        try:
+            now = time.time()
+            node_id, edge_ts_ms, t, h = parse_received_line(line)
+            ser.write(sync_reply(now))
+        except Exception as e:
+            print(f"Error parsing: {e}")
+            return 0
+        kind = PING if is_sync_ping(t, h) else DATA
+        self._pending[shard_of(node_id, self.n_workers)].append((kind, node_id, edge_ts_ms, t, h, now))
+        self.dispatched += 1
+        return kind
+
+    def register(self, node_id, now=None):
+        """수신 전에 노드 미러를 만들어 두기 (노드 ID 없는 기존 펌웨어 노드의 기동 시점 EST 발행)."""
+        now = time.time() if now is None else now
+        self._pending[shard_of(node_id, self.n_workers)].append((PING, node_id, None, 0.0, 0.0, now))
+        self.dispatched += 1
+
+    def flush(self):
+        """쌓인 배치를 워커 큐로 전송 (poll 1회당 워커별 put 1번 → pickle·파이프 비용 분산)."""
+        for q, batch in zip(self.queues, self._pending):
+            if batch:
+                q.put(batch)
+        self._pending = [[] for _ in range(self.n_workers)]
+
+    def run(self, ser, poll_interval=POLL_INTERVAL, should_stop=None):
+        """gateway.run_gateway와 같은 폴링 루프. EST 발행은 각 워커가 담당."""
+        total_tx_count = 0
+        try:
+            while should_stop is None or not should_stop():
+                handled = 0
+                while handled < MAX_LINES_PER_POLL and ser.in_waiting > 0:
+                    line = ser.readline().decode('utf-8', errors='ignore').strip()
+                    handled += 1
+                    total_tx_count += self.dispatch_line(line, ser)
+                self.flush()
+                if not handled:
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            print(f"\nSharded Gateway Stopped. Total TX: {total_tx_count} ({self.n_workers} workers)")
+        self.flush()
+        return total_tx_count
+
+    def wait_idle(self, timeout=30.0):
+        """전달한 메시지를 워커가 모두 처리할 때까지 대기."""
+        deadline = time.time() + timeout
+        while self.processed.value < self.dispatched:
+            if time.time() > deadline:
+                raise TimeoutError(f"{self.processed.value}/{self.dispatched} processed")
+            time.sleep(0.001)
+
+    def stop(self):
+        for q in self.queues:
+            q.put(None)
+        for p in self.workers:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        for store in self.stores:
+            store.close()
+        self.stores, self.queues, self.workers = [], [], []
+
+
+def _unlink_stale(name):
+    """이전 실행이 비정상 종료해 남은 블록 제거."""
+    try:
+        from multiprocessing import shared_memory
+        stale = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    stale.close()
+    stale.unlink()
+
+
+# =========================================================
+# 3. 조회: 다른 프로세스에서 노드 상태 읽기
+# =========================================================
+def query_nodes(n_workers=DEFAULT_WORKERS, prefix=SHM_PREFIX, node_ids=None):
+    """실행 중인 샤딩 게이트웨이의 노드 상태 {node_id: {...}}. 쓰기는 하지 않는다."""
+    out = {}
+    for i in range(n_workers):
+        store = SharedModelStore(shard_name(i, prefix), track=False)
+        try:
+            for node_id, slot in store.node_slots().items():
+                if node_ids and node_id not in node_ids:
+                    continue
+                state = store.read(slot)
+                out[node_id] = {
+                    "shard": i,
+                    "pred_temp": round(float(state["pred"][0]), 4),
+                    "pred_humidity": round(float(state["pred"][1]), 4),
+                    "total_tx": state["total_tx"],
+                    "last_rx_ms": state["last_rx_ms"],
+                    "last_est_ms": state["last_est_ms"],
+                    "generation": state["generation"],
+                    "window": state["window_buf"].astype(float).round(4).tolist(),
+                }
+        finally:
+            store.close()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded multi-process gateway")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="워커 프로세스 수 (기본: 코어 수, 최대 4)")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="샤드당 최대 노드 수")
+    parser.add_argument("--no-mqtt", action="store_true", help="MQTT 발행 없이 실행")
+    parser.add_argument("--query", action="store_true", help="실행 중인 게이트웨이의 노드 상태를 JSON으로 출력")
+    parser.add_argument("--node", action="append", help="--query 대상 node_id (반복 가능)")
+    args = parser.parse_args()
+
+    if args.query:
+        print(json.dumps(query_nodes(args.workers, node_ids=args.node), indent=2, ensure_ascii=False))
+        return
+
+    try:
+        ser = gateway.serial.Serial(SERIAL_PORT, 115200, timeout=1)
+        ser.flush()
+    except Exception as e:
+        print(f"Error: Serial Port not found (tried {SERIAL_PORT}). Check USB connection and .env SERIAL_PORT. {e}")
+        exit()
+
+    if gateway.QUANTIZED:
+        print("Warning: GATEWAY_QUANTIZED는 gateway.py 전용 — 샤딩 게이트웨이는 float32 미러로 실행")
+    if gateway.PREDICTOR != "mlp":
+        print("Warning: GATEWAY_PREDICTOR는 gateway.py 전용 — 샤딩 게이트웨이는 float32 MLP 미러로 실행")
+    if gateway.UPDATE_SCOPE != "full" or gateway.NODE_UPDATE_SCOPES:
+        print("Warning: GATEWAY_UPDATE_SCOPE는 gateway.py 전용 — 샤딩 게이트웨이는 전체 층 학습")
+    if gateway.TX_BUDGET:
+        # δ는 acceptor의 동기화 회신에 실리는데 오차 통계는 워커에 있음 → 샤딩 게이트웨이는 엣지 기본 δ 그대로
+        print("Warning: GATEWAY_TX_BUDGET(적응형 δ)는 gateway.py 전용 — 샤딩 게이트웨이는 고정 δ로 실행")
+    sharded = ShardedGateway(args.workers, args.capacity, use_mqtt=not args.no_mqtt).start()
+    sharded.register(DEFAULT_NODE_ID)
+    print(f"=== Sharded Gateway ({args.workers} workers x {args.capacity} nodes) Started ===")
+    print("=== Logging via MQTT topic:", gateway.MQTT_TOPIC_READINGS, "===")
+    try:
+        sharded.run(ser)
+    finally:
+        sharded.stop()
+        ser.close()
+
+
+if __name__ == "__main__":
+    main()
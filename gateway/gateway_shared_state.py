@@ -0,0 +1,169 @@
+# gateway/gateway_shared_state.py
+"""
+노드 모델 상태를 multiprocessing.shared_memory 슬롯에 두는 저장소 (샤딩 게이트웨이용).
+
+샤드 1개 = 공유 메모리 블록 1개 = 노드 슬롯 capacity개.
+  [헤더 int64 x4][meta int64 (capacity x META_FIELDS)][data float32 (capacity x SLOT_FLOATS)][names S32 x capacity]
+data 슬롯 = w1 | b1 | w2 | b2 | w3 | b3 | window_buf | pred(2)
+
+쓰기는 샤드 워커 1개만 하고, 조회 프로세스는 seqlock(meta[:, SEQ] 홀수 = 쓰는 중)으로
+일관된 스냅샷을 읽거나 views()로 복사 없이 바로 읽는다.
+"""
+import numpy as np
+from multiprocessing import shared_memory
+
+from gateway_MLP_Logic import WINDOW_SIZE, N_FEATURES
+
+MAGIC = 0x414F4949  # "AOII"
+HEADER_FIELDS = 4   # magic, capacity, slot_floats, meta_fields
+NAME_BYTES = 32
+
+# meta 컬럼 (GENERATION: 노드 재부팅(reset)마다 +1 — 조회 쪽에서 미러가 초기 가중치로 다시 시작했는지 판별)
+SEQ, USED, TOTAL_TX, LAST_RX_MS, LAST_EST_MS, GENERATION = range(6)
+META_FIELDS = 6
+
+# (속성 이름, shape) — GatewayMLP 12-64-32-2와 동일
+PARAM_SHAPES = (
+    ("w1", (WINDOW_SIZE * N_FEATURES, 64)),
+    ("b1", (64,)),
+    ("w2", (64, 32)),
+    ("b2", (32,)),
+    ("w3", (32, 2)),
+    ("b3", (2,)),
+    ("window_buf", (WINDOW_SIZE, N_FEATURES)),
+)
+
+
+def _layout():
+    offsets, pos = {}, 0
+    for name, shape in PARAM_SHAPES:
+        size = int(np.prod(shape))
+        offsets[name] = (pos, pos + size, shape)
+        pos += size
+    offsets["pred"] = (pos, pos + 2, (2,))
+    return offsets, pos + 2
+
+
+SLOT_OFFSETS, SLOT_FLOATS = _layout()
+
+
+def _block_size(capacity):
+    return HEADER_FIELDS * 8 + capacity * META_FIELDS * 8 + capacity * SLOT_FLOATS * 4 + capacity * NAME_BYTES
+
+
+def _attach(name, track):
+    """
+    이름으로 attach. 게이트웨이 워커는 acceptor와 resource_tracker를 공유하므로 그대로 두고(track=True),
+    별도 조회 프로세스는 종료 시 tracker가 블록을 지우지 않도록 추적에서 뺀다(track=False).
+    """
+    if track:
+        return shared_memory.SharedMemory(name=name)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+
+class SharedModelStore:
+    """샤드 1개의 노드 슬롯 저장소. create=True는 acceptor(소유자), 나머지는 이름으로 attach (조회 프로세스는 track=False)."""
+
+    def __init__(self, name, capacity=None, create=False, track=True):
+        self.name = name
+        self.owner = create
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=_block_size(capacity))
+        else:
+            self.shm = _attach(name, track)
+
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=self.shm.buf)
+        if create:
+            header[:] = (MAGIC, capacity, SLOT_FLOATS, META_FIELDS)
+        elif header[0] != MAGIC or header[2] != SLOT_FLOATS or header[3] != META_FIELDS:
+            raise ValueError(f"shared model store layout mismatch: {name}")
+        self.capacity = capacity = int(header[1])
+
+        pos = HEADER_FIELDS * 8
+        self.meta = np.ndarray((capacity, META_FIELDS), dtype=np.int64, buffer=self.shm.buf, offset=pos)
+        pos += capacity * META_FIELDS * 8
+        self.data = np.ndarray((capacity, SLOT_FLOATS), dtype=np.float32, buffer=self.shm.buf, offset=pos)
+        pos += capacity * SLOT_FLOATS * 4
+        self.names = np.ndarray((capacity,), dtype=f"S{NAME_BYTES}", buffer=self.shm.buf, offset=pos)
+        self._header = header
+        if create:
+            self.meta[:] = 0
+            self.names[:] = b""
+
+    # ---------- 쓰기 (샤드 워커 전용) ----------
+    def allocate(self, node_id):
+        """
+        빈 슬롯에 node_id 등록. 가득 차면 RuntimeError.
+        UTF-8로 NAME_BYTES를 넘는 ID는 ValueError — 잘라 저장하면 멀티바이트 문자가 깨지고 앞부분이 같은 ID끼리 겹친다.
+        """
+        name = node_id.encode("utf-8")
+        if len(name) > NAME_BYTES:
+            raise ValueError(f"node_id longer than {NAME_BYTES} bytes: {node_id!r}")
+        free = np.flatnonzero(self.meta[:, USED] == 0)
+        if not len(free):
+            raise RuntimeError(f"shard {self.name} full ({self.capacity} nodes)")
+        slot = int(free[0])
+        self.names[slot] = name
+        self.meta[slot, USED] = 1
+        return slot
+
+    def begin_write(self, slot):
+        self.meta[slot, SEQ] += 1  # 홀수: 쓰는 중
+
+    def end_write(self, slot):
+        self.meta[slot, SEQ] += 1
+
+    def views(self, slot):
+        """슬롯의 파라미터별 numpy view (복사 없음)."""
+        row = self.data[slot]
+        return {name: row[a:b].reshape(shape) for name, (a, b, shape) in SLOT_OFFSETS.items()}
+
+    def bind(self, model, slot):
+        """
+        GatewayMLP 파라미터·윈도우를 슬롯으로 복사하고 속성을 슬롯 view로 교체. 이후 in-place 갱신이 곧 공유 상태.
+        호출자가 begin_write/end_write로 감싼다 (재부팅 시 가중치와 meta를 한 쓰기 구간에서 바꾸도록).
+        """
+        views = self.views(slot)
+        for name, _ in PARAM_SHAPES:
+            views[name][...] = getattr(model, name)
+            setattr(model, name, views[name])
+        views["pred"][:] = (model.last_pred_t, model.last_pred_h)
+        return views
+
+    # ---------- 읽기 (조회 프로세스) ----------
+    def node_slots(self):
+        """{node_id: slot} (사용 중인 슬롯만)."""
+        used = np.flatnonzero(self.meta[:, USED])
+        return {self.names[s].decode("utf-8"): int(s) for s in used}
+
+    def read(self, slot, fields=("pred", "window_buf"), retries=100):
+        """seqlock 스냅샷: 쓰는 중이 아닐 때 읽고, 읽는 사이 seq가 바뀌었으면 재시도. dict(복사본) 반환."""
+        for _ in range(retries):
+            seq = int(self.meta[slot, SEQ])
+            if seq & 1:
+                continue
+            views = self.views(slot)
+            out = {name: views[name].copy() for name in fields}
+            meta = self.meta[slot].copy()
+            if int(self.meta[slot, SEQ]) == seq:
+                out["total_tx"] = int(meta[TOTAL_TX])
+                out["last_rx_ms"] = int(meta[LAST_RX_MS]) or None
+                out["last_est_ms"] = int(meta[LAST_EST_MS]) or None
+                out["generation"] = int(meta[GENERATION])
+                return out
+        raise TimeoutError(f"slot {slot} busy")
+
+    def close(self):
+        self.meta = self.data = self.names = self._header = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
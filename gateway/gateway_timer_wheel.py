@@ -0,0 +1,68 @@
+# gateway/gateway_timer_wheel.py
+"""
+해시 타이머 휠: 노드별 EST 틱·생존(liveness) 기한을 노드 수와 무관한 비용으로 관리.
+
+- 슬롯 SLOTS개 x TICK_SEC. 기한 d → 슬롯 (d // TICK) % SLOTS. 한 바퀴(기본 4096초)보다 먼 기한은
+  슬롯에 남아 있다가 해당 바퀴에 만료
+- schedule/cancel O(1): (key, kind) → 현재 기한 틱을 dict에 두고, 슬롯 항목은 지연 삭제 (만료 시 dict와 다르면 버림)
+- advance(now): 지난 틱의 슬롯만 방문 → 비용은 경과 틱 수 + 만료(또는 폐기) 항목 수. 전체 노드 순회 없음
+"""
+TICK_SEC = 1.0
+SLOTS = 4096
+
+EST = "est"
+SILENT = "silent"
+
+
+class TimerWheel:
+    def __init__(self, now, tick=TICK_SEC, slots=SLOTS):
+        self.tick = float(tick)
+        self.n_slots = slots
+        self.slots = [[] for _ in range(slots)]
+        self.timers = {}  # (key, kind) → (기한 틱, 기한)
+        self.cursor = int(now // self.tick)  # 처리 완료한 마지막 틱
+
+    def __len__(self):
+        return len(self.timers)
+
+    def schedule(self, key, kind, deadline):
+        """(key, kind) 타이머를 deadline(초)으로 설정. 기존 타이머는 교체."""
+        t = max(int(deadline // self.tick), self.cursor + 1)  # 이미 지난 기한은 다음 advance에 만료
+        self.timers[(key, kind)] = (t, deadline)
+        self.slots[t % self.n_slots].append((key, kind, t))
+
+    def cancel(self, key, kind):
+        self.timers.pop((key, kind), None)
+
+    def deadline(self, key, kind):
+        entry = self.timers.get((key, kind))
+        return entry[1] if entry else None
+
+    def advance(self, now):
+        """now까지 지난 틱의 만료 타이머 [(key, kind, deadline)] (기한 순). 만료된 타이머는 제거."""
+        target = int(now // self.tick)
+        if target <= self.cursor:
+            return []
+        fired = []
+        # 한 바퀴 이상 밀렸으면 모든 슬롯을 1번씩만 방문
+        first = max(self.cursor + 1, target - self.n_slots + 1)
+        for t in range(first, target + 1):
+            slot = self.slots[t % self.n_slots]
+            if not slot:
+                continue
+            keep = []
+            for entry in slot:
+                key, kind, due = entry
+                current = self.timers.get((key, kind))
+                if current is None or current[0] != due:
+                    continue  # 취소·재설정된 항목
+                if due > target:
+                    keep.append(entry)  # 다음 바퀴
+                    continue
+                del self.timers[(key, kind)]
+                fired.append((key, kind, current[1]))
+            self.slots[t % self.n_slots] = keep
+        self.cursor = target
+        if len(fired) > 1:
+            fired.sort(key=lambda f: f[2])
+        return fired
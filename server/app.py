@@ -5,7 +5,8 @@
 """
 import os
 import sys
-from datetime import datetime, timezone
+import threading
+from datetime import datetime, timezone, timedelta
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, ROOT)
@@ -19,19 +20,46 @@ if os.path.isfile(_env_path):
             if _line and not _line.startswith("#") and "=" in _line:
                 _k, _v = _line.split("=", 1)
                 _k, _v = _k.strip(), _v.strip()
-                if _k.startswith("MYSQL_"):
+                if _k.startswith(("MYSQL_", "DB_", "SQLITE_", "MQTT_", "STREAM_", "RETENTION_", "RECONSTRUCT_")):
                     os.environ[_k] = _v
 
-from flask import Flask, render_template_string, jsonify, request, Response
-from server.db import get_recent, get_stats
+from flask import Flask, render_template_string, jsonify, request, Response, stream_with_context
+from server.db import get_recent, get_stats, get_aoii, get_sketches, get_series, iter_readings
+from server.export import FORMATS, encode, parse_after
+from server.rollup import pick_resolution
+from server.quantile_sketch import METRICS, DEFAULT_QUANTILES, merged, summarize
+from server.stream_hub import StreamHub
+from server.reconstruct import Reconstructor, rx_from_db
 
 try:
-    from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST
+    from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST, REGISTRY
+    from prometheus_client.metrics_core import Metric, CounterMetricFamily
     PROMETHEUS_AVAILABLE = True
 except ImportError:
     PROMETHEUS_AVAILABLE = False
 
+RECENT_MAX = 5000  # /api/recent 상한 (대량 조회는 /api/export)
+# Prometheus summary 창 (분): 최근 시간 버킷 스케치를 병합해 분위수 계산
+PERCENTILE_WINDOW_MIN = int(os.environ.get("PERCENTILE_WINDOW_MIN", "60"))
+SUMMARY_NAMES = {
+    "delay_ms": ("aoii_transmission_delay_ms", "Edge-to-gateway transmission delay (ms)"),
+    "abs_error_t": ("aoii_abs_error_temp", "Absolute prediction error, temperature (C)"),
+    "abs_error_h": ("aoii_abs_error_humidity", "Absolute prediction error, humidity (%)"),
+}
+
+
+def get_percentiles(metrics=METRICS, minutes=PERCENTILE_WINDOW_MIN, quantiles=DEFAULT_QUANTILES):
+    """최근 minutes분 시간 버킷 스케치를 (모든 출처) 병합 → 지표별 count/mean/분위수."""
+    since = datetime.now() - timedelta(minutes=minutes)
+    return {m: summarize(merged(get_sketches(m, since)), quantiles) for m in metrics}
+
 app = Flask(__name__)
+hub = StreamHub()
+# /api/estimated: readings RX로 게이트웨이 EST 재생. 노드마다 Reconstructor 1개 (체크포인트는 요청 간 유지, 새 RX만 이어 붙임)
+# 첫 조회는 최근 RECONSTRUCT_HISTORY_DAYS일 RX부터 (그 이전 학습은 빠지므로 시작 직후 추정은 초기 가중치에 가깝다)
+RECONSTRUCT_HISTORY_DAYS = float(os.environ.get("RECONSTRUCT_HISTORY_DAYS", "7"))
+_reconstructors = {}  # node_id → (Reconstructor, 마지막으로 읽은 행 키)
+_reconstructor_lock = threading.Lock()
 
 # Prometheus 메트릭 (스크래핑 시 DB 값으로 갱신)
 if PROMETHEUS_AVAILABLE:
@@ -42,6 +70,48 @@ if PROMETHEUS_AVAILABLE:
     METRIC_AVG_HUMIDITY = Gauge("aoii_avg_humidity_percent", "Average actual humidity")
     METRIC_LAST_RECEIVED = Gauge("aoii_last_received_timestamp_seconds", "Unix timestamp of last reading")
 
+    class SketchSummaryCollector:
+        """스크래핑 시 스케치 병합 결과를 summary(quantile 라벨 + _count/_sum)로 노출."""
+
+        def collect(self):
+            try:
+                stats = get_percentiles()
+            except Exception:
+                return  # DB 오류 시 summary만 생략
+            for key, (name, doc) in SUMMARY_NAMES.items():
+                s = stats[key]
+                metric = Metric(name, doc, "summary")
+                for q in DEFAULT_QUANTILES:
+                    value = s["quantiles"][f"p{q * 100:g}"]
+                    if value is not None:
+                        metric.add_sample(name, {"quantile": f"{q:g}"}, value)
+                metric.add_sample(name + "_count", {}, s["count"])
+                metric.add_sample(name + "_sum", {}, s["sum"])
+                yield metric
+
+    REGISTRY.register(SketchSummaryCollector())
+
+    # 게이트웨이 스트리밍 AoII (노드별 최신값)
+    METRIC_AOII = {
+        "age_s": Gauge("aoii_age_seconds", "AoII just before the last RX correction", ["node_id"]),
+        "avg_s": Gauge("aoii_average_seconds", "Cumulative time-average AoII", ["node_id"]),
+        "rolling_s": Gauge("aoii_rolling_average_seconds", "Time-average AoII over the last hour", ["node_id"]),
+        "error_time_s": Gauge("aoii_time_in_error_seconds", "Cumulative time the estimate was incorrect", ["node_id"]),
+        "error_frac": Gauge("aoii_error_fraction", "Fraction of observed time the estimate was incorrect", ["node_id"]),
+        "rolling_error_frac": Gauge("aoii_rolling_error_fraction", "Incorrect fraction over the last hour", ["node_id"]),
+    }
+    # 게이트웨이 생존 이벤트 (SILENT: 하트비트 기한 초과, 다음 RX에 0)
+    METRIC_NODE_SILENT = Gauge("aoii_node_silent", "1 while the node is silent past its heartbeat deadline", ["node_id"])
+
+    class SilentEventsCollector:
+        """SILENT 이벤트 누적 수를 counter로 노출 (앱 재시작 시 0부터 — rate()가 리셋으로 처리)."""
+
+        def collect(self):
+            yield CounterMetricFamily("aoii_silent_events", "SILENT liveness events received since app start",
+                                      value=hub.silent_events)
+
+    REGISTRY.register(SilentEventsCollector())
+
 
 def _update_prometheus_metrics():
     if not PROMETHEUS_AVAILABLE:
@@ -67,6 +137,15 @@ def _update_prometheus_metrics():
                     pass
     except Exception:
         pass  # DB 등 오류 시 메트릭만 갱신 생략, 500 내지 않음
+    try:
+        for row in get_aoii():
+            for key, gauge in METRIC_AOII.items():
+                gauge.labels(node_id=row["node_id"]).set(row[key])
+    except Exception:
+        pass
+    if hub.start_mqtt():
+        for node_id, silent in list(hub.silent.items()):
+            METRIC_NODE_SILENT.labels(node_id=node_id).set(1 if silent else 0)
 
 
 HTML = """
@@ -113,6 +192,8 @@ HTML = """
         document.getElementById('first_at').textContent = s.first_at || '-';
         document.getElementById('last_at').textContent = s.last_at || '-';
       });
+    }
+    function loadRecent() {
       fetch('/api/recent?limit=200').then(r=>r.json()).then(data=>{
         const labels = data.map(d=> d.created_at ? d.created_at.replace('T',' ').slice(0,19) : '');
         window.chartObj.data.labels = labels;
@@ -123,6 +204,35 @@ HTML = """
         window.chartObj.update();
       });
     }
+    // 실시간: /api/stream (SSE)의 RX 이벤트를 바로 차트에 추가. 스트림 불가 시 10초 폴링
+    const MAX_POINTS = 200;
+    function pushPoint(d) {
+      const c = window.chartObj;
+      c.data.labels.push(d.timestamp || '');
+      [d.actual_t, d.pred_t, d.actual_h, d.pred_h].forEach((v, i) => c.data.datasets[i].data.push(v));
+      if (c.data.labels.length > MAX_POINTS) {
+        c.data.labels.shift();
+        c.data.datasets.forEach(ds => ds.data.shift());
+      }
+      c.update('none');
+      const total = document.getElementById('total');
+      if (/^[0-9]+$/.test(total.textContent)) total.textContent = Number(total.textContent) + 1;
+      document.getElementById('last_at').textContent = d.timestamp || '-';
+    }
+    let pollTimer = null;
+    function startPolling() {
+      if (!pollTimer) pollTimer = setInterval(() => { refresh(); loadRecent(); }, 10000);
+    }
+    if (window.EventSource) {
+      const es = new EventSource('/api/stream');
+      es.addEventListener('RX', e => pushPoint(JSON.parse(e.data)));
+      es.addEventListener('dropped', () => loadRecent());  // 느린 클라이언트로 끊김: 재접속 후 다시 채움
+      es.onopen = () => loadRecent();
+      es.onerror = () => { if (es.readyState === EventSource.CLOSED) startPolling(); };
+      setInterval(refresh, 60000);  // 평균·MAE 카드는 DB 통계
+    } else {
+      startPolling();
+    }
     const ctx = document.getElementById('chart').getContext('2d');
     window.chartObj = new Chart(ctx, {
       type: 'line',
@@ -144,7 +254,7 @@ HTML = """
       }
     });
     refresh();
-    setInterval(refresh, 10000);
+    loadRecent();
   </script>
 </body>
 </html>
@@ -163,10 +273,128 @@ def api_stats():
 
 @app.route("/api/recent")
 def api_recent():
-    limit = int(request.args.get("limit", 500))
+    limit = min(max(int(request.args.get("limit", 500)), 1), RECENT_MAX)
     return jsonify(get_recent(limit=limit))
 
 
+@app.route("/api/export")
+def api_export():
+    """
+    ?format=csv|ndjson [&since=ISO&until=ISO] [&after=<created_at>,<id>] → readings 전체를 (created_at, id) 순 스트리밍.
+    행 수와 무관하게 메모리 일정 (키셋 페이지 + 제너레이터). 끊기면 마지막 행으로 after= 이어받기.
+    """
+    fmt = request.args.get("format", "csv")
+    if fmt not in FORMATS:
+        return jsonify({"error": "format must be csv | ndjson"}), 400
+    try:
+        since = datetime.fromisoformat(request.args["since"]) if request.args.get("since") else None
+        until = datetime.fromisoformat(request.args["until"]) if request.args.get("until") else None
+        after = parse_after(request.args.get("after"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    body = encode(iter_readings(since=since, until=until, after=after), fmt)
+    return Response(
+        stream_with_context(body), mimetype=FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename=readings.{fmt}", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/series")
+def api_series():
+    """?minutes=1440 또는 ?since=ISO&until=ISO [&resolution=raw|1m|1h] → 구간 길이에 맞는 해상도의 시계열."""
+    until = datetime.fromisoformat(request.args["until"]) if request.args.get("until") else datetime.now()
+    if request.args.get("since"):
+        since = datetime.fromisoformat(request.args["since"])
+    else:
+        since = until - timedelta(minutes=int(request.args.get("minutes", 60)))
+    resolution = request.args.get("resolution") or pick_resolution(since, until)
+    if resolution not in ("raw", "1m", "1h"):
+        return jsonify({"error": "resolution must be raw | 1m | 1h"}), 400
+    return jsonify({"resolution": resolution, "rows": get_series(since, until, resolution)})
+
+
+@app.route("/api/estimated")
+def api_estimated():
+    """
+    ?node=ID&minutes=60 또는 ?node=ID&since=ISO&until=ISO → 그 구간에 노드 미러가 가졌던 EST/RX 시계열
+    (RX만 저장돼 있어도 복원).
+    """
+    node_id = request.args.get("node")
+    if not node_id:
+        return jsonify({"error": "node is required"}), 400
+    try:
+        until = datetime.fromisoformat(request.args["until"]) if request.args.get("until") else datetime.now()
+        if request.args.get("since"):
+            since = datetime.fromisoformat(request.args["since"])
+        else:
+            since = until - timedelta(minutes=int(request.args.get("minutes", 60)))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    with _reconstructor_lock:
+        if node_id in _reconstructors:
+            reconstructor, after = _reconstructors[node_id]
+            ts, at, ah, after = rx_from_db(node_id=node_id, after=after)
+        else:
+            reconstructor = Reconstructor()
+            history = datetime.now() - timedelta(days=RECONSTRUCT_HISTORY_DAYS)
+            ts, at, ah, after = rx_from_db(node_id=node_id, since=history)
+        reconstructor.extend(ts, at, ah)
+        _reconstructors[node_id] = (reconstructor, after)
+    s = reconstructor.series(since.timestamp(), until.timestamp())
+    rows = [
+        {
+            "created_at": datetime.fromtimestamp(s["ts"][i]).isoformat(),
+            "event": "RX" if s["event"][i] else "EST",
+            "pred_temp": s["pred_t"][i], "pred_humidity": s["pred_h"][i],
+            "actual_temp": None if not s["event"][i] else s["actual_t"][i],
+            "actual_humidity": None if not s["event"][i] else s["actual_h"][i],
+        }
+        for i in range(s["ts"].size)
+    ]
+    return jsonify(rows)
+
+
+@app.route("/api/aoii")
+def api_aoii():
+    """노드별 최신 스트리밍 AoII."""
+    return jsonify(get_aoii())
+
+
+@app.route("/api/percentiles")
+def api_percentiles():
+    """?metric=delay_ms,abs_error_t&minutes=60&q=0.5,0.95,0.99 → 지표별 분위수 (스케치 병합, 상대 오차 1%)."""
+    metrics = [m for m in request.args.get("metric", ",".join(METRICS)).split(",") if m in METRICS]
+    try:
+        minutes = int(request.args.get("minutes", PERCENTILE_WINDOW_MIN))
+        quantiles = tuple(float(q) for q in request.args.get("q", ",".join(map(str, DEFAULT_QUANTILES))).split(","))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if minutes <= 0:
+        return jsonify({"error": "minutes must be positive"}), 400
+    if not all(0.0 <= q <= 1.0 for q in quantiles):
+        return jsonify({"error": "q must be in [0, 1]"}), 400
+    return jsonify(get_percentiles(metrics, minutes, quantiles))
+
+
+@app.route("/api/stream")
+def api_stream():
+    """SSE: aoii/readings 이벤트를 그대로 전달 (event: RX/EST/ESTB, data: 페이로드 JSON)."""
+    if not hub.start_mqtt():
+        return jsonify({"error": "MQTT subscription unavailable (paho-mqtt / broker)"}), 503
+    client = hub.subscribe()
+    if client is None:
+        return jsonify({"error": "too many stream clients"}), 503
+    return Response(
+        hub.events(client), mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/stream/stats")
+def api_stream_stats():
+    return jsonify(hub.stats())
+
+
 @app.route("/metrics")
 def metrics():
     """Prometheus가 스크래핑하는 엔드포인트. DB 통계를 메트릭으로 노출."""
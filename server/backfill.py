@@ -0,0 +1,299 @@
+# server/backfill.py
+"""
+과거 CSV 로그 대량 적재: 파일을 청크 단위로 읽어 다중 행 INSERT(또는 MySQL LOAD DATA LOCAL INFILE)로 DB에 넣는다.
+실행: python server/backfill.py                         (기본 로그 전부: edge_node/edge_log_*.csv, 비교군 로그, 사전학습 데이터셋)
+      python server/backfill.py experiment_log_online.csv --node-id edge0 [--method load-data] [--chunk 50000]
+
+- 헤더로 형식 판별 (analysis/experiment_analytics.py와 같은 로그 종류):
+  edge(edge_serial_logger) → edge_log / event(mqtt_to_csv, threshold 비교군)의 RX → readings /
+  periodic(주기 전송 비교군)·dataset(Pre_Train_Dataset) → sensor_log (예측 없는 센서 기록, source = 파일 이름)
+- 청크마다 1트랜잭션. 끝나면 바이트 오프셋을 상태 파일(--state)에 기록 → 중단 후 같은 명령으로 이어서 적재
+  (readings는 멱등 키 (node_id, 타임스탬프 ms)라 마지막 청크가 다시 들어가도 1행, edge_log·sensor_log는 키가 없음)
+- 적재 동안 보조 인덱스를 지웠다가 끝에 한 번에 재생성 (--keep-indexes로 끔). 중단돼도 다음 실행 끝에서 복구
+- 롤업 워터마크 이전 시각의 행(늦은 데이터)은 적재 후 1m·1h 버킷에 병합 (merge_late_rows). 적재 중에는 보존 작업
+  (server/retention.py)을 멈출 것 — 보존 기간이 지난 적재분 원본이 롤업 전에 삭제될 수 있다
+- CSV 타임스탬프(게이트웨이·엣지 시각)를 그대로 created_at으로 저장
+"""
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import argparse
+from datetime import datetime
+from itertools import islice
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _project_root)
+
+# .env 로드
+_env_path = os.path.join(_project_root, ".env")
+if os.path.isfile(_env_path):
+    with open(_env_path, "r", encoding="utf-8") as _f:
+        for _line in _f:
+            _line = _line.strip()
+            if _line and not _line.startswith("#") and "=" in _line:
+                _k, _v = _line.split("=", 1)
+                _k, _v = _k.strip(), _v.strip()
+                if _k.startswith(("MYSQL_", "DB_", "SQLITE_", "BACKFILL_")):
+                    os.environ[_k] = _v
+
+from server.db import (
+    init_db, bulk_insert, defer_indexes, restore_indexes, late_data_mark, merge_late_rows, DB_BACKEND,
+)
+
+BACKFILL_CHUNK = int(os.environ.get("BACKFILL_CHUNK", "50000"))  # 청크(트랜잭션)당 CSV 행 수
+STATE_PATH = os.path.join(_project_root, ".backfill_state.json")
+DEFAULT_NODE_ID = "edge0"  # gateway_protocol.DEFAULT_NODE_ID (구 펌웨어 단일 노드)
+
+# 인자 없이 실행 시 적재할 로그 (없는 파일은 건너뜀)
+DEFAULT_PATTERNS = [
+    "edge_node/edge_log_*.csv",
+    "experiment_log_online.csv",
+    "experiment_log_threshold.csv",
+    "raw_24h_dataset.csv",
+    "compare_group_logging/experiment_log_threshold.csv",
+    "compare_group_logging/raw_24h_dataset.csv",
+    "dataset/Pre_Train_Dataset.csv",
+]
+
+EDGE_LOG_COLUMNS = (
+    "created_at", "actual_temp", "actual_humidity", "pred_temp", "pred_humidity", "error_temp", "error_humidity",
+    "triggered", "status", "inference_time_us", "free_heap", "total_heap",
+)
+READINGS_COLUMNS = (
+    "created_at", "actual_temp", "actual_humidity", "pred_temp", "pred_humidity", "error_temp", "error_humidity",
+    "transmission_delay_ms", "node_id", "edge_ts_ms",
+)
+SENSOR_LOG_COLUMNS = ("created_at", "source", "temperature", "humidity")
+
+
+def _int(value):
+    return int(float(value)) if value not in ("", None) else None
+
+
+def _columns(header, names):
+    return [header.index(n) for n in names]
+
+
+def _edge_rows(header):
+    """edge_serial_logger 헤더 → 행 변환 (CSV 행 list → edge_log 튜플). 열 위치는 헤더에서 한 번만 찾음."""
+    ts, at, ah, pt, ph, et, eh, st, us, fh, th = _columns(header, (
+        "timestamp", "actual_t", "actual_h", "pred_t", "pred_h", "error_t", "error_h",
+        "status", "inference_time_us", "free_heap", "total_heap",
+    ))
+
+    def row(r, ctx):
+        status = r[st].strip()
+        return (
+            datetime.fromisoformat(r[ts].strip()),
+            float(r[at]), float(r[ah]), float(r[pt]), float(r[ph]),
+            float(r[et]), float(r[eh]) if r[eh] else None,
+            0 if status == "SKIP" else 1, status,
+            _int(r[us]), _int(r[fh]), _int(r[th]),
+        )
+    return row
+
+
+def _event_rows(header):
+    """RX만 (EST는 readings에 저장하지 않음). 멱등 키 타임스탬프 = CSV 시각(ms)."""
+    ts, ev, at, ah, pt, ph = _columns(header, ("Timestamp", "Event", "Actual_T", "Actual_H", "Pred_T", "Pred_H"))
+    dl = header.index("Transmission_Delay_Ms") if "Transmission_Delay_Ms" in header else None
+
+    def row(r, ctx):
+        if r[ev].strip() != "RX":
+            return None
+        created = datetime.fromisoformat(r[ts].strip())
+        actual_t, actual_h, pred_t, pred_h = float(r[at]), float(r[ah]), float(r[pt]), float(r[ph])
+        return (
+            created, actual_t, actual_h, pred_t, pred_h, actual_t - pred_t, actual_h - pred_h,
+            _int(r[dl]) if dl is not None else None, ctx["node_id"], int(created.timestamp() * 1000),
+        )
+    return row
+
+
+def _sensor_rows(ts_key, t_key, h_key):
+    def factory(header):
+        ts, t, h = _columns(header, (ts_key, t_key, h_key))
+
+        def row(r, ctx):
+            return datetime.fromisoformat(r[ts].strip()), ctx["source"], float(r[t]), float(r[h])
+        return row
+    return factory
+
+
+# 형식 → (판별 헤더, 대상 테이블, 컬럼, 행 변환 팩토리(header)). 변환이 None을 반환하면 건너뜀
+FORMATS = {
+    "edge": (("timestamp", "actual_t", "pred_t", "status", "free_heap"), "edge_log", EDGE_LOG_COLUMNS, _edge_rows),
+    "event": (("Timestamp", "Event", "Actual_T", "Pred_T"), "readings", READINGS_COLUMNS, _event_rows),
+    "periodic": (("Timestamp", "Temperature", "Humidity"), "sensor_log", SENSOR_LOG_COLUMNS,
+                 _sensor_rows("Timestamp", "Temperature", "Humidity")),
+    "dataset": (("timestamp", "temperature", "humidity"), "sensor_log", SENSOR_LOG_COLUMNS,
+                _sensor_rows("timestamp", "temperature", "humidity")),
+}
+
+
+def detect_format(header):
+    cols = set(header)
+    for kind, (required, *_rest) in FORMATS.items():
+        if cols.issuperset(required):
+            return kind
+    return None
+
+
+def find_files(root=_project_root):
+    paths = []
+    for pattern in DEFAULT_PATTERNS:
+        paths.extend(sorted(glob.glob(os.path.join(root, pattern))))
+    return paths
+
+
+def load_state(path):
+    if os.path.isfile(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp, path)  # 중간에 죽어도 이전 상태 파일이 남음
+
+
+def read_chunks(path, offset, chunk):
+    """
+    (header, 청크 제너레이터). 청크 = (CSV 행 list 목록, 청크 끝 바이트 오프셋).
+    바이너리로 읽어 청크 경계마다 tell() → 재개 시 seek (줄 단위 기록이라 따옴표 안 줄바꿈은 없음).
+    """
+    f = open(path, "rb")
+    header = [h.strip() for h in next(csv.reader([f.readline().decode("utf-8-sig")]), [])]
+    if offset:
+        f.seek(offset)
+
+    def chunks():
+        with f:
+            while True:
+                lines = list(islice(f, chunk))
+                if not lines:
+                    return
+                n = len(header)
+                rows = [r for r in csv.reader(ln.decode("utf-8") for ln in lines) if len(r) == n]
+                yield rows, f.tell()
+
+    return header, chunks()
+
+
+def load_file(path, state, method, chunk, node_id, state_path, deferred, defer=True):
+    """
+    CSV 1개 적재 (state[절대경로]에서 이어서). 대상 테이블 이름 (형식을 모르면 None).
+    deferred: 테이블 → defer_indexes 결과 (테이블마다 처음 한 번만 지움, defer=False면 지우지 않음).
+    """
+    key = os.path.abspath(path)
+    entry = state.get(key, {})
+    size = os.path.getsize(path)
+    if entry.get("done") and entry.get("size") == size:
+        print(f"backfill: {path}: already loaded ({entry['inserted']} rows), skip")
+        return entry.get("table")  # 롤업 보정 전에 중단됐으면 이번 실행에서 보정
+    if entry.get("done"):  # 적재 후 파일이 자랐음 → 추가된 부분만, 롤업 보정 기준점은 새로
+        entry.pop("mark", None)
+        entry.update(done=False, merged=False)
+    offset = entry.get("offset", 0)
+    if offset > size:
+        print(f"backfill: {path}: file shrank below saved offset, restarting")
+        entry, offset = {}, 0
+
+    header, chunks = read_chunks(path, offset, chunk)
+    kind = detect_format(header)
+    if kind is None:
+        print(f"backfill: {path}: unknown header, skip")
+        return None
+    _, table, columns, factory = FORMATS[kind]
+    convert = factory(header)
+    if table not in deferred:
+        deferred[table] = defer_indexes(table) if defer else []
+    if "mark" not in entry:  # 첫 청크 전 기준점 (중단 후 재개해도 처음 값 사용)
+        entry.update(mark=late_data_mark(table), table=table)
+        for k in ("offset", "rows", "inserted", "skipped"):
+            entry.setdefault(k, 0)
+        state[key] = entry
+        save_state(state_path, state)
+    ctx = {"node_id": node_id, "source": os.path.basename(path)[:64]}
+
+    start = time.perf_counter()
+    for rows, end in chunks:
+        out = []
+        for r in rows:
+            try:
+                row = convert(r, ctx)
+            except (KeyError, TypeError, ValueError):
+                entry["skipped"] += 1
+                continue
+            if row is not None:
+                out.append(row)
+        entry["inserted"] += bulk_insert(table, columns, out, method) if out else 0
+        entry["rows"] += len(rows)
+        entry["offset"] = end
+        save_state(state_path, state)  # 청크 커밋 후 기록 → 재개 시 최대 1청크 재전송
+    elapsed = time.perf_counter() - start
+    entry.update(done=True, size=size)
+    save_state(state_path, state)
+    print(f"backfill: {path} ({kind} → {table}): {entry['rows']} rows, {entry['inserted']} inserted, "
+          f"{entry['skipped']} skipped, {elapsed:.2f}s this run")
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load historical CSV logs into the database (resumable)")
+    parser.add_argument("files", nargs="*", help="CSV 파일 (기본: DEFAULT_PATTERNS 중 있는 파일)")
+    parser.add_argument("--method", default="insert", choices=("insert", "load-data"),
+                        help="insert: 다중 행 INSERT / load-data: MySQL LOAD DATA LOCAL INFILE")
+    parser.add_argument("--chunk", type=int, default=BACKFILL_CHUNK, help="청크(트랜잭션)당 CSV 행 수")
+    parser.add_argument("--node-id", default=DEFAULT_NODE_ID, help="readings 행의 node_id (RX 로그)")
+    parser.add_argument("--state", default=STATE_PATH, help="재개용 오프셋 상태 파일")
+    parser.add_argument("--restart", action="store_true", help="상태 파일을 무시하고 처음부터")
+    parser.add_argument("--keep-indexes", action="store_true", help="보조 인덱스를 지우지 않음 (운영 중 조회가 있을 때)")
+    args = parser.parse_args()
+
+    files = args.files or find_files()
+    if not files:
+        sys.exit("no CSV files")
+    init_db()
+    state = {} if args.restart else load_state(args.state)
+    deferred = {}
+    tables = set()
+    try:
+        for path in files:
+            table = load_file(path, state, args.method, args.chunk, args.node_id, args.state, deferred,
+                              defer=not args.keep_indexes)
+            if table:
+                tables.add(table)
+    finally:
+        # 중단(예외·Ctrl+C)돼도 인덱스는 복구. 이전 실행에서 빠진 인덱스도 여기서 생성
+        for table in sorted(set(deferred) | tables):
+            start = time.perf_counter()
+            created = restore_indexes(table)
+            if created:
+                print(f"backfill: {table}: indexes {', '.join(created)} rebuilt in {time.perf_counter() - start:.2f}s")
+    # 늦은 데이터 롤업 보정: 테이블별로 가장 이른 기준점(첫 파일)부터
+    marks = {}
+    for entry in state.values():
+        if entry.get("table") in tables and not entry.get("merged"):
+            mark = marks.setdefault(entry["table"], entry["mark"])
+            if entry["mark"]["max_id"] < mark["max_id"]:
+                marks[entry["table"]] = entry["mark"]
+    for table, mark in marks.items():
+        report = merge_late_rows(table, mark)
+        for entry in state.values():
+            if entry.get("table") == table:
+                entry["merged"] = True
+        save_state(args.state, state)
+        if report:
+            print(f"backfill: {table} rollup: {json.dumps(report)}")
+    print(f"backfill ({DB_BACKEND}): done")
+
+
+if __name__ == "__main__":
+    main()
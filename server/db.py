@@ -1,9 +1,22 @@
 # server/db.py
-"""MySQL: 엣지 수신 데이터 및 게이트웨이 예측 저장. AoII/모니터링용."""
+"""
+MySQL: 엣지 수신 데이터 및 게이트웨이 예측 저장. AoII/모니터링용.
+DB_BACKEND=sqlite 이면 같은 함수(BACKEND_API)를 server/db_sqlite.py 구현으로 교체 (라즈베리파이 단독 배포).
+"""
 import os
-from datetime import datetime
+import tempfile
+from types import SimpleNamespace
+from datetime import datetime, timedelta
 from contextlib import contextmanager
 
+from server.rollup import (
+    ROLLUP_SPEC, TABLES, RESOLUTIONS, PARTITION_DAYS_AHEAD, RETENTION_RAW_DAYS, RETENTION_MINUTE_DAYS,
+    SERIES_MAX_ROWS, floor_hour, floor_day, rollup_ranges, rollup_end, raw_cutoff, aggregate_select, rollup_insert,
+    late_rollup_insert, rollup_merge, rollup_columns, pick_resolution, stats_select, combine_stats, series_row,
+)
+from server.dedup import full_rows
+from server.export import EXPORT_PAGE, EXPORT_COLUMNS, keyset_where
+
 try:
     import pymysql
 except ImportError:
@@ -35,15 +48,26 @@ def get_connection():
 
 
 def _add_readings_columns_if_missing(conn):
-    """기존 readings 테이블에 transmission_delay_ms 등 컬럼이 없으면 추가."""
+    """기존 readings 테이블에 transmission_delay_ms·멱등 키(node_id, edge_ts_ms) 컬럼·UNIQUE 인덱스가 없으면 추가."""
     with conn.cursor() as cur:
         cur.execute(
             "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'readings'"
         )
         existing = {row["COLUMN_NAME"] for row in cur.fetchall()}
-    if "transmission_delay_ms" not in existing:
+        cur.execute(
+            """SELECT 1 FROM INFORMATION_SCHEMA.STATISTICS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'readings' AND INDEX_NAME = 'uq_readings_key' LIMIT 1"""
+        )
+        has_key = cur.fetchone() is not None
+    for col_name, col_def in (("transmission_delay_ms", "INT NULL"), ("node_id", "VARCHAR(32) NULL"),
+                              ("edge_ts_ms", "BIGINT NULL")):
+        if col_name not in existing:
+            with conn.cursor() as cur:
+                cur.execute(f"ALTER TABLE readings ADD COLUMN {col_name} {col_def}")
+            conn.commit()
+    if not has_key:
         with conn.cursor() as cur:
-            cur.execute("ALTER TABLE readings ADD COLUMN transmission_delay_ms INT NULL")
+            cur.execute("ALTER TABLE readings ADD UNIQUE KEY uq_readings_key (node_id, edge_ts_ms, created_at)")
         conn.commit()
 
 
@@ -68,13 +92,71 @@ def _add_edge_log_columns_if_missing(conn):
             conn.commit()
 
 
+def _day_partitions(first_day, last_day):
+    """[first_day, last_day] 일 파티션 정의. pYYYYMMDD = 그 날 하루."""
+    defs = []
+    day = first_day
+    while day <= last_day:
+        nxt = day + timedelta(days=1)
+        defs.append(f"PARTITION p{day:%Y%m%d} VALUES LESS THAN ('{nxt:%Y-%m-%d}')")
+        day = nxt
+    return defs
+
+
+def _partition_clause(now=None):
+    """created_at 일 단위 RANGE 파티션: p_old(어제 이전) + 어제~오늘+PARTITION_DAYS_AHEAD + pmax."""
+    today = floor_day(now or datetime.now())
+    first = today - timedelta(days=1)
+    defs = [f"PARTITION p_old VALUES LESS THAN ('{first:%Y-%m-%d}')"]
+    defs += _day_partitions(first, today + timedelta(days=PARTITION_DAYS_AHEAD))
+    defs.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+    return " PARTITION BY RANGE COLUMNS(created_at) (" + ", ".join(defs) + ")"
+
+
+def _partitions(conn, table):
+    """[(파티션 이름, 상한 datetime | None(MAXVALUE))]. 파티션이 없는 테이블은 []."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM INFORMATION_SCHEMA.PARTITIONS
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+               ORDER BY PARTITION_ORDINAL_POSITION""",
+            (table,),
+        )
+        rows = cur.fetchall()
+    out = []
+    for r in rows:
+        desc = r["PARTITION_DESCRIPTION"]
+        upper = None if desc == "MAXVALUE" else datetime.fromisoformat(desc.strip("'"))
+        out.append((r["PARTITION_NAME"], upper))
+    return out
+
+
+def _partition_if_missing(conn, table):
+    """기존(파티션 없는) 테이블 마이그레이션: PK를 (id, created_at)로 바꾸고 파티션 적용. 테이블 전체 복사가 일어남."""
+    if _partitions(conn, table):
+        return
+    with conn.cursor() as cur:
+        cur.execute(
+            """SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY'""",
+            (table,),
+        )
+        if {r["COLUMN_NAME"] for r in cur.fetchall()} != {"id", "created_at"}:
+            cur.execute(
+                f"ALTER TABLE {table} MODIFY id INT NOT NULL AUTO_INCREMENT, "
+                "DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)"
+            )
+        cur.execute(f"ALTER TABLE {table}" + _partition_clause())
+    conn.commit()
+
+
 def init_db():
-    """테이블 생성 (최초 1회)."""
+    """테이블 생성 (최초 1회). readings/edge_log는 일 단위 파티션 + 1m/1h 롤업 테이블."""
     with get_connection() as conn:
         with conn.cursor() as cur:
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS readings (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    id INT NOT NULL AUTO_INCREMENT,
                     created_at DATETIME(6) NOT NULL,
                     actual_temp DOUBLE NOT NULL,
                     actual_humidity DOUBLE NOT NULL,
@@ -83,13 +165,17 @@ def init_db():
                     error_temp DOUBLE NOT NULL,
                     error_humidity DOUBLE NOT NULL,
                     transmission_delay_ms INT NULL,
-                    INDEX idx_created_at (created_at)
+                    node_id VARCHAR(32) NULL,
+                    edge_ts_ms BIGINT NULL COMMENT '엣지 타임스탬프 (없으면 게이트웨이 수신 ms) — 멱등 키',
+                    PRIMARY KEY (id, created_at),
+                    INDEX idx_created_at (created_at),
+                    UNIQUE KEY uq_readings_key (node_id, edge_ts_ms, created_at)
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """)
+            """ + _partition_clause())
             _add_readings_columns_if_missing(conn)
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS edge_log (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    id INT NOT NULL AUTO_INCREMENT,
                     created_at DATETIME(6) NOT NULL,
                     actual_temp DOUBLE NOT NULL,
                     actual_humidity DOUBLE NOT NULL,
@@ -102,12 +188,62 @@ def init_db():
                     inference_time_us BIGINT UNSIGNED NULL,
                     free_heap INT UNSIGNED NULL,
                     total_heap INT UNSIGNED NULL,
+                    PRIMARY KEY (id, created_at),
                     INDEX idx_created_at (created_at),
                     INDEX idx_triggered (triggered),
                     INDEX idx_status (status)
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """)
+            """ + _partition_clause())
             _add_edge_log_columns_if_missing(conn)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS aoii (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    created_at DATETIME(6) NOT NULL,
+                    node_id VARCHAR(32) NOT NULL,
+                    age_s DOUBLE NOT NULL COMMENT 'RX 직전 AoII',
+                    avg_s DOUBLE NOT NULL COMMENT '누적 평균 AoII',
+                    rolling_s DOUBLE NOT NULL COMMENT '최근 1시간 평균 AoII',
+                    error_time_s DOUBLE NOT NULL,
+                    error_frac DOUBLE NOT NULL,
+                    rolling_error_frac DOUBLE NOT NULL,
+                    INDEX idx_node_created (node_id, created_at)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS sensor_log (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    created_at DATETIME(6) NOT NULL,
+                    source VARCHAR(64) NOT NULL COMMENT '원본 CSV 파일 이름 (server/backfill.py)',
+                    temperature DOUBLE NOT NULL,
+                    humidity DOUBLE NOT NULL,
+                    INDEX idx_source_created (source, created_at)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT '예측 없는 센서 기록 (주기 전송 비교군, 사전학습 데이터셋)'
+            """)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS sketches (
+                    bucket_start DATETIME NOT NULL,
+                    metric VARCHAR(32) NOT NULL,
+                    source VARCHAR(64) NOT NULL COMMENT '구독자 인스턴스 (조회 시 출처 간 병합)',
+                    data MEDIUMTEXT NOT NULL COMMENT 'DDSketch JSON',
+                    count BIGINT UNSIGNED NOT NULL,
+                    updated_at DATETIME(6) NOT NULL,
+                    PRIMARY KEY (metric, bucket_start, source)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+            for table in TABLES:
+                _partition_if_missing(conn, table)
+                cols = ", ".join(f"{c} {t} NULL" for c, t, _, _ in ROLLUP_SPEC[table])
+                for res in RESOLUTIONS:
+                    cur.execute(
+                        f"CREATE TABLE IF NOT EXISTS {table}_{res} (bucket_start DATETIME NOT NULL PRIMARY KEY, {cols}) "
+                        "ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+                    )
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS rollup_state (
+                    name VARCHAR(32) NOT NULL PRIMARY KEY COMMENT '원본 테이블',
+                    upto DATETIME(6) NOT NULL COMMENT '롤업 완료 시각 (워터마크)'
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
 
 
 def insert_edge_log(
@@ -149,21 +285,108 @@ def insert_edge_log(
             )
 
 
-def insert_reading(actual_temp, actual_humidity, pred_temp, pred_humidity, transmission_delay_ms=None):
-    """수신된 한 건 + 그 시점 게이트웨이 예측값 저장. transmission_delay_ms: 엣지→게이트웨이 전송 지연(ms)."""
-    created_at = datetime.now()
-    error_temp = actual_temp - pred_temp
-    error_humidity = actual_humidity - pred_humidity
+def insert_reading(actual_temp, actual_humidity, pred_temp, pred_humidity, transmission_delay_ms=None,
+                   node_id=None, edge_ts_ms=None, created_at=None):
+    """
+    수신된 한 건 + 그 시점 게이트웨이 예측값 저장. transmission_delay_ms: 엣지→게이트웨이 전송 지연(ms).
+    node_id·edge_ts_ms·created_at: 멱등 키 (server/dedup.reading_row). 같은 키가 이미 있으면 무시. 저장 건수(0/1) 반환.
+    """
+    return insert_readings([(actual_temp, actual_humidity, pred_temp, pred_humidity, transmission_delay_ms,
+                             node_id, edge_ts_ms, created_at)])
+
+
+def insert_readings(rows, aoii=()):
+    """
+    여러 건을 한 커넥션·한 트랜잭션으로 저장 (멱등: 같은 키는 ON DUPLICATE KEY로 무시). 새로 저장된 건수 반환.
+    rows: (actual_t, actual_h, pred_t, pred_h, transmission_delay_ms[, node_id, edge_ts_ms, created_at]) 시퀀스.
+    aoii: 같은 트랜잭션에 저장할 insert_aoii 인자 튜플들. 새로 저장된 readings가 없으면(배치 전체 중복) 건너뜀
+    — 둘이 함께 커밋되므로 전체 중복이면 aoii도 앞서 저장된 것.
+    """
+    values = [
+        (created_at, at, ah, pt, ph, at - pt, ah - ph, delay, node_id, edge_ts_ms)
+        for at, ah, pt, ph, delay, node_id, edge_ts_ms, created_at in full_rows(rows, datetime.now())
+    ]
     with get_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(
+            cur.executemany(
                 """INSERT INTO readings
-                   (created_at, actual_temp, actual_humidity, pred_temp, pred_humidity, error_temp, error_humidity, transmission_delay_ms)
+                   (created_at, actual_temp, actual_humidity, pred_temp, pred_humidity, error_temp, error_humidity,
+                    transmission_delay_ms, node_id, edge_ts_ms)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                   ON DUPLICATE KEY UPDATE id = id""",
+                values,
+            )
+            # 영향 행: 새 행 1, 값이 그대로인 중복 0 (CLIENT.FOUND_ROWS 미설정 기본값 기준)
+            inserted = cur.rowcount
+            if inserted and aoii:
+                now = datetime.now()
+                cur.executemany(
+                    """INSERT INTO aoii
+                       (created_at, node_id, age_s, avg_s, rolling_s, error_time_s, error_frac, rolling_error_frac)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+                    [(now, *row) for row in aoii],
+                )
+            return inserted
+
+
+def insert_aoii(node_id, age_s, avg_s, rolling_s, error_time_s, error_frac, rolling_error_frac):
+    """게이트웨이 스트리밍 AoII (RX 이벤트의 aoii_* 필드) 1건 저장."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """INSERT INTO aoii
+                   (created_at, node_id, age_s, avg_s, rolling_s, error_time_s, error_frac, rolling_error_frac)
                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
-                (created_at, actual_temp, actual_humidity, pred_temp, pred_humidity, error_temp, error_humidity, transmission_delay_ms),
+                (datetime.now(), node_id, age_s, avg_s, rolling_s, error_time_s, error_frac, rolling_error_frac),
+            )
+
+
+def get_aoii():
+    """노드별 최신 AoII (node_id 순)."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT a.node_id, a.created_at, a.age_s, a.avg_s, a.rolling_s,
+                          a.error_time_s, a.error_frac, a.rolling_error_frac
+                   FROM aoii a JOIN (SELECT MAX(id) AS id FROM aoii GROUP BY node_id) m ON a.id = m.id
+                   ORDER BY a.node_id"""
+            )
+            rows = cur.fetchall()
+    out = []
+    for r in rows:
+        d = dict(r)
+        if hasattr(d.get("created_at"), "isoformat"):
+            d["created_at"] = d["created_at"].isoformat()
+        out.append(d)
+    return out
+
+
+def upsert_sketch(bucket_start, metric, source, data, count):
+    """(시간 버킷, 지표, 출처) 스케치 저장. 같은 키는 덮어씀 (구독자가 버킷 전체 상태를 보유)."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """INSERT INTO sketches (bucket_start, metric, source, data, count, updated_at)
+                   VALUES (%s, %s, %s, %s, %s, %s)
+                   ON DUPLICATE KEY UPDATE data = VALUES(data), count = VALUES(count), updated_at = VALUES(updated_at)""",
+                (bucket_start, metric, source, data, count, datetime.now()),
             )
 
 
+def get_sketches(metric, since, until=None):
+    """[since, until) 시간 버킷의 스케치 JSON 목록 (모든 출처)."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            if until is None:
+                cur.execute("SELECT data FROM sketches WHERE metric = %s AND bucket_start >= %s", (metric, since))
+            else:
+                cur.execute(
+                    "SELECT data FROM sketches WHERE metric = %s AND bucket_start >= %s AND bucket_start < %s",
+                    (metric, since, until),
+                )
+            return [row["data"] for row in cur.fetchall()]
+
+
 def get_recent(limit=500, since_iso=None):
     """모니터링/차트용 최근 데이터 (시간순)."""
     with get_connection() as conn:
@@ -193,31 +416,349 @@ def get_recent(limit=500, since_iso=None):
     return list(reversed(out))
 
 
+def iter_readings(since=None, until=None, after=None, page=EXPORT_PAGE, node_id=None):
+    """
+    readings를 (created_at, id) 순으로 스트리밍 (내보내기용). after=(created_at, id): 그 행 다음부터. node_id: 그 노드만.
+    페이지마다 키셋 조건으로 새 쿼리 + 서버 측 커서(SSDictCursor) → 드라이버가 결과를 메모리에 모으지 않음.
+    InnoDB 일반 SELECT(일관 읽기)라 수집 쪽 INSERT를 막지 않는다.
+    """
+    cols = ", ".join(EXPORT_COLUMNS)
+    with get_connection() as conn:
+        while True:
+            where, args = keyset_where(since, until, after, node_id=node_id)
+            n = 0
+            with conn.cursor(pymysql.cursors.SSDictCursor) as cur:
+                cur.execute(f"SELECT {cols} FROM readings{where} ORDER BY created_at, id LIMIT %s", args + [page])
+                for row in cur:
+                    n += 1
+                    after = (row["created_at"], row["id"])
+                    row["created_at"] = row["created_at"].isoformat()
+                    yield row
+            if n < page:
+                return
+
+
+def _iso(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return datetime.fromisoformat(value).isoformat() if value else value
+
+
+def _watermark(cur, table):
+    cur.execute("SELECT upto FROM rollup_state WHERE name = %s", (table,))
+    row = cur.fetchone()
+    return row["upto"] if row else None
+
+
 def get_stats():
-    """대시보드용 요약 통계."""
+    """대시보드용 요약 통계. 롤업이 끝난 구간은 readings_1h 합계, 나머지만 원본 스캔."""
     with get_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) AS total FROM readings")
-            total = cur.fetchone()["total"]
-            if total == 0:
-                return {"total": 0}
+            wm = _watermark(cur, "readings")
+            rolled = None
+            if wm is not None:
+                cur.execute(stats_select(from_rollup=True) + " WHERE bucket_start < %s", (wm,))
+                rolled = cur.fetchone()
+                cur.execute(stats_select(from_rollup=False) + " WHERE created_at >= %s", (wm,))
+            else:
+                cur.execute(stats_select(from_rollup=False))
+            raw = cur.fetchone()
+    stats = combine_stats(rolled, raw)
+    if stats["total"]:
+        stats["first_at"], stats["last_at"] = _iso(stats["first_at"]), _iso(stats["last_at"])
+    return stats
+
+
+# =========================================================
+# 파티션·롤업·보존 (server/rollup.py, server/retention.py)
+# =========================================================
+# DATE_FORMAT의 %는 PyMySQL 인자 치환 때문에 %%
+_BUCKET_EXPR = {
+    "1m": "DATE_FORMAT({col}, '%%Y-%%m-%%d %%H:%%i:00')",
+    "1h": "DATE_FORMAT({col}, '%%Y-%%m-%%d %%H:00:00')",
+}
+
+
+def _upsert_clause(table):
+    return " ON DUPLICATE KEY UPDATE " + ", ".join(f"{c} = VALUES({c})" for c in rollup_columns(table))
+
+
+def _ensure_partitions(conn, table, now):
+    """pmax를 쪼개 오늘+PARTITION_DAYS_AHEAD까지 일 파티션 확보. 추가한 파티션 수."""
+    parts = _partitions(conn, table)
+    uppers = [u for _, u in parts if u is not None]
+    if not uppers:
+        return 0
+    last = max(uppers)  # 마지막 일 파티션의 상한 = 아직 파티션이 없는 첫 날
+    target = floor_day(now) + timedelta(days=PARTITION_DAYS_AHEAD)
+    if last > target:
+        return 0
+    defs = _day_partitions(last, target)
+    with conn.cursor() as cur:
+        cur.execute(
+            f"ALTER TABLE {table} REORGANIZE PARTITION pmax INTO ("
+            + ", ".join(defs + ["PARTITION pmax VALUES LESS THAN (MAXVALUE)"]) + ")"
+        )
+    conn.commit()
+    return len(defs)
+
+
+def _rollup_chunk(cur, table, start, stop):
+    """[start, stop) 1m(원본) → 1h(1m) 롤업 (버킷 덮어씀)."""
+    for res in RESOLUTIONS:
+        cur.execute(
+            rollup_insert(table, res, _BUCKET_EXPR[res]).format(ph="%s") + _upsert_clause(table),
+            (start, stop),
+        )
+
+
+def _rollup(conn, table, now):
+    """워터마크 ~ rollup_end(now)를 ROLLUP_CHUNK씩 1m(원본) → 1h(1m) 롤업. 청크마다 커밋. 새 워터마크."""
+    with conn.cursor() as cur:
+        wm = _watermark(cur, table)
+        if wm is None:
+            cur.execute(f"SELECT MIN(created_at) AS t FROM {table}")
+            first = cur.fetchone()["t"]
+            if first is None:
+                return None
+            wm = first.replace(minute=0, second=0, microsecond=0)
+        for start, stop in rollup_ranges(wm, rollup_end(now)):
+            _rollup_chunk(cur, table, start, stop)
             cur.execute(
-                """SELECT
-                     AVG(actual_temp) AS avg_temp,
-                     AVG(actual_humidity) AS avg_humidity,
-                     AVG(ABS(error_temp)) AS mae_temp,
-                     AVG(ABS(error_humidity)) AS mae_humidity,
-                     MIN(created_at) AS first_at,
-                     MAX(created_at) AS last_at
-                   FROM readings"""
+                "INSERT INTO rollup_state (name, upto) VALUES (%s, %s) ON DUPLICATE KEY UPDATE upto = VALUES(upto)",
+                (table, stop),
             )
-            row = cur.fetchone()
-    return {
-        "total": total,
-        "avg_temp": round(float(row["avg_temp"]), 2),
-        "avg_humidity": round(float(row["avg_humidity"]), 2),
-        "mae_temp": round(float(row["mae_temp"]), 4),
-        "mae_humidity": round(float(row["mae_humidity"]), 4),
-        "first_at": row["first_at"].isoformat() if hasattr(row["first_at"], "isoformat") else row["first_at"],
-        "last_at": row["last_at"].isoformat() if hasattr(row["last_at"], "isoformat") else row["last_at"],
-    }
+            conn.commit()
+            wm = stop
+    return wm
+
+
+def run_maintenance(now=None, raw_days=RETENTION_RAW_DAYS, minute_days=RETENTION_MINUTE_DAYS):
+    """
+    보존 작업 1회: 파티션 확보 → 롤업 → 롤업이 끝났고 raw_days가 지난 일 파티션 DROP
+    → minute_days가 지난 1m 롤업 삭제 (1h는 보관). 반복 실행해도 안전.
+    """
+    now = now or datetime.now()
+    report = {}
+    with get_connection() as conn:
+        for table in TABLES:
+            added = _ensure_partitions(conn, table, now)
+            wm = _rollup(conn, table, now)
+            cutoff = raw_cutoff(now, wm, raw_days)
+            dropped = []
+            if cutoff is not None:
+                dropped = [name for name, upper in _partitions(conn, table) if upper is not None and upper <= cutoff]
+            with conn.cursor() as cur:
+                if dropped:
+                    cur.execute(f"ALTER TABLE {table} DROP PARTITION {', '.join(dropped)}")
+                cur.execute(
+                    f"DELETE FROM {table}_1m WHERE bucket_start < %s",
+                    (floor_day(now - timedelta(days=minute_days)),),
+                )
+                minute_deleted = cur.rowcount
+            conn.commit()
+            report[table] = {
+                "watermark": _iso(wm), "partitions_added": added,
+                "partitions_dropped": dropped, "minute_rows_deleted": minute_deleted,
+            }
+    return report
+
+
+def get_series(since, until=None, resolution=None):
+    """
+    readings 시계열 [since, until). resolution(None이면 pick_resolution): raw = 원본 행,
+    1m/1h = 버킷 평균 (롤업 테이블 + 워터마크 이후는 원본에서 즉석 집계). 최대 SERIES_MAX_ROWS행.
+    """
+    until = until or datetime.now()
+    resolution = resolution or pick_resolution(since, until)
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            if resolution == "raw":
+                cur.execute(
+                    """SELECT id, created_at, actual_temp, actual_humidity,
+                              pred_temp, pred_humidity, error_temp, error_humidity
+                       FROM readings WHERE created_at >= %s AND created_at < %s ORDER BY created_at LIMIT %s""",
+                    (since, until, SERIES_MAX_ROWS),
+                )
+                rows = cur.fetchall()
+                for r in rows:
+                    r["created_at"] = _iso(r["created_at"])
+                return rows
+            wm = _watermark(cur, "readings")
+            split = min(max(wm, since), until) if wm is not None else since
+            cols = ", ".join(rollup_columns("readings"))
+            cur.execute(
+                f"""SELECT bucket_start AS b, {cols} FROM readings_{resolution}
+                    WHERE bucket_start >= %s AND bucket_start < %s ORDER BY bucket_start LIMIT %s""",
+                (since, split, SERIES_MAX_ROWS),
+            )
+            rows = list(cur.fetchall())
+            if split < until:
+                cur.execute(
+                    aggregate_select("readings", _BUCKET_EXPR[resolution]).format(ph="%s") + " ORDER BY b LIMIT %s",
+                    (split, until, SERIES_MAX_ROWS),
+                )
+                rows += cur.fetchall()
+    return [series_row(_iso(r["b"]), r) for r in rows[:SERIES_MAX_ROWS] if r["n"]]
+
+
+# =========================================================
+# 대량 적재 (server/backfill.py)
+# =========================================================
+# 적재 중 지웠다가 마지막에 한 번에 만드는 보조 인덱스 (PK·멱등 UNIQUE 키는 유지)
+_DEFERRABLE_INDEXES = {
+    "readings": {"idx_created_at": "(created_at)"},
+    "edge_log": {"idx_created_at": "(created_at)", "idx_triggered": "(triggered)", "idx_status": "(status)"},
+    "sensor_log": {"idx_source_created": "(source, created_at)"},
+}
+
+
+def _index_names(cur, table):
+    cur.execute(
+        "SELECT DISTINCT INDEX_NAME FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,),
+    )
+    return {r["INDEX_NAME"] for r in cur.fetchall()}
+
+
+def defer_indexes(table):
+    """적재 전 보조 인덱스 DROP (행마다 B-tree 갱신 대신 restore_indexes에서 정렬 1번). 지운 인덱스 이름 목록."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            names = sorted(set(_DEFERRABLE_INDEXES.get(table, ())) & _index_names(cur, table))
+            if names:
+                cur.execute(f"ALTER TABLE {table} " + ", ".join(f"DROP INDEX {n}" for n in names))
+    return names
+
+
+def restore_indexes(table):
+    """빠진 보조 인덱스 재생성 (적재 종료·중단 후 재실행 모두). 만든 인덱스 이름 목록."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            defs = _DEFERRABLE_INDEXES.get(table, {})
+            names = sorted(set(defs) - _index_names(cur, table))
+            if names:
+                cur.execute(f"ALTER TABLE {table} " + ", ".join(f"ADD INDEX {n} {defs[n]}" for n in names))
+    return names
+
+
+def bulk_insert(table, columns, rows, method="insert"):
+    """
+    대량 적재 1청크 (1트랜잭션). 멱등 키가 이미 있는 행은 무시하고 새로 저장된 건수 반환.
+    method="insert": 다중 행 INSERT (PyMySQL executemany가 VALUES를 max_allowed_packet 안에서 묶음)
+    method="load-data": 청크를 임시 TSV로 써서 LOAD DATA LOCAL INFILE (서버 local_infile=ON 필요)
+    """
+    cols = ", ".join(columns)
+    if method == "insert":
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.executemany(
+                    f"INSERT INTO {table} ({cols}) VALUES ({', '.join(['%s'] * len(columns))}) ON DUPLICATE KEY UPDATE id = id",
+                    rows,
+                )
+                return cur.rowcount
+    if method != "load-data":
+        raise ValueError(f"unknown bulk method: {method} (insert | load-data)")
+    if not pymysql:
+        raise RuntimeError("PyMySQL not installed. Run: pip install pymysql")
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", encoding="utf-8", newline="", delete=False) as f:
+        for row in rows:
+            f.write("\t".join("\\N" if v is None else str(v) for v in row) + "\n")
+        path = f.name
+    try:
+        conn = pymysql.connect(local_infile=True, **_config())
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE {table} "
+                    f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({cols})",
+                    (path,),
+                )
+                inserted = cur.rowcount
+            conn.commit()
+        finally:
+            conn.close()
+    finally:
+        os.unlink(path)
+    return inserted
+
+
+def late_data_mark(table):
+    """적재 시작 기준점 {"max_id", "watermark"} (JSON으로 저장해 재개 시에도 같은 값으로 merge_late_rows)."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT COALESCE(MAX(id), 0) AS m FROM {table}")
+            max_id = int(cur.fetchone()["m"])
+            wm = _watermark(cur, table) if table in TABLES else None
+    return {"max_id": max_id, "watermark": _iso(wm)}
+
+
+def merge_late_rows(table, mark):
+    """
+    적재 후 롤업 보정 (롤업 테이블이 없는 테이블은 None).
+    - 시작 워터마크 이전 created_at의 새 행(id > max_id): 그 행만 집계해 1m·1h 버킷에 병합 (원본이 이미 삭제된 날도 정확)
+    - [시작 워터마크, 현재 워터마크): 적재 중 보존 작업이 롤업한 구간 → 원본에서 다시 롤업 (덮어씀)
+    """
+    if table not in TABLES:
+        return None
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            wm = _watermark(cur, table)
+            if wm is None:
+                return {"late_rows": 0, "rerolled": None}  # 첫 롤업이 적재분까지 포함
+            max_id = mark["max_id"]
+            start = datetime.fromisoformat(mark["watermark"]) if mark["watermark"] else None
+            late = 0
+            if start is not None:
+                cur.execute(
+                    f"SELECT COUNT(*) AS n, MIN(created_at) AS t FROM {table} WHERE id > %s AND created_at < %s",
+                    (max_id, start),
+                )
+                row = cur.fetchone()
+                late = int(row["n"])
+                if late:
+                    merge = " ON DUPLICATE KEY UPDATE " + rollup_merge(table, "VALUES({c})", "GREATEST", "LEAST")
+                    for res in RESOLUTIONS:
+                        cur.execute(
+                            late_rollup_insert(table, res, _BUCKET_EXPR[res]).format(ph="%s") + merge,
+                            (row["t"], start, max_id),
+                        )
+            else:
+                # 시작 때 워터마크가 없었음 → 적재 중 첫 롤업이 만든 구간을 적재분 처음부터 다시
+                cur.execute(f"SELECT MIN(created_at) AS t FROM {table} WHERE id > %s", (max_id,))
+                first = cur.fetchone()["t"]
+                start = floor_hour(first) if first is not None else wm
+            rerolled = None
+            if start < wm:
+                for a, b in rollup_ranges(start, wm):
+                    _rollup_chunk(cur, table, a, b)
+                rerolled = [_iso(start), _iso(wm)]
+    return {"late_rows": late, "rerolled": rerolled}
+
+
+# =========================================================
+# 백엔드 선택 (DB_BACKEND=mysql | sqlite)
+# =========================================================
+BACKEND_API = (
+    "init_db", "insert_edge_log", "insert_reading", "insert_readings", "insert_aoii", "upsert_sketch",
+    "get_recent", "get_stats", "get_aoii", "get_sketches", "get_series", "run_maintenance",
+    "iter_readings", "bulk_insert", "defer_indexes", "restore_indexes", "late_data_mark", "merge_late_rows",
+)
+DB_BACKEND = os.environ.get("DB_BACKEND", "mysql").strip().lower()
+
+mysql_backend = SimpleNamespace(**{name: globals()[name] for name in BACKEND_API})
+
+
+def load_backend(name):
+    """이름 → BACKEND_API 함수들을 가진 백엔드 객체."""
+    if name == "mysql":
+        return mysql_backend
+    if name == "sqlite":
+        from server import db_sqlite
+        return db_sqlite
+    raise ValueError(f"unknown DB_BACKEND: {name} (mysql | sqlite)")
+
+
+if DB_BACKEND != "mysql":
+    _backend = load_backend(DB_BACKEND)
+    globals().update({name: getattr(_backend, name) for name in BACKEND_API})
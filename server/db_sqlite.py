@@ -0,0 +1,535 @@
+# server/db_sqlite.py
+"""SQLite 백엔드: 라즈베리파이 단독 배포용. server/db.py(MySQL)와 같은 스키마·함수 (DB_BACKEND=sqlite)."""
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+
+from server.rollup import (
+    ROLLUP_SPEC, TABLES, RESOLUTIONS, RETENTION_RAW_DAYS, RETENTION_MINUTE_DAYS, SERIES_MAX_ROWS,
+    floor_hour, floor_day, rollup_ranges, rollup_end, raw_cutoff, aggregate_select, rollup_insert,
+    late_rollup_insert, rollup_merge, rollup_columns, pick_resolution, stats_select, combine_stats, series_row,
+)
+from server.dedup import full_rows
+from server.export import EXPORT_PAGE, EXPORT_COLUMNS, keyset_where
+
+_SQLITE_TYPES = {"BIGINT": "INTEGER", "DOUBLE": "REAL", "DATETIME": "TEXT"}
+# 버킷 키는 _ts()와 같은 형식이어야 문자열 비교가 시각 순서와 일치
+_BUCKET_EXPR = {
+    "1m": "strftime('%Y-%m-%d %H:%M:00.000000', {col})",
+    "1h": "strftime('%Y-%m-%d %H:00:00.000000', {col})",
+}
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_local = threading.local()
+
+
+def _path():
+    return os.environ.get("SQLITE_PATH", os.path.join(_ROOT, "aoii.sqlite3"))
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")      # 읽기(Flask)와 쓰기(구독자) 동시 진행
+    conn.execute("PRAGMA synchronous=NORMAL")    # WAL에서는 커밋마다 fsync 불필요
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+@contextmanager
+def get_connection():
+    """스레드별 커넥션 재사용. 블록 전체가 한 트랜잭션 (예외 시 롤백)."""
+    path = _path()
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != path:
+        conn = _local.conn = _connect(path)
+        _local.path = path
+    conn.execute("BEGIN")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _ts(dt):
+    return dt.isoformat(sep=" ", timespec="microseconds")
+
+
+def _iso(value):
+    """저장된 'YYYY-MM-DD HH:MM:SS.ffffff' → MySQL 경로와 같은 datetime.isoformat() 문자열."""
+    return datetime.fromisoformat(value).isoformat() if value else value
+
+
+def init_db():
+    """테이블·인덱스 생성 (최초 1회). 컬럼은 MySQL readings/edge_log와 동일."""
+    with get_connection() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS readings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                actual_temp REAL NOT NULL,
+                actual_humidity REAL NOT NULL,
+                pred_temp REAL NOT NULL,
+                pred_humidity REAL NOT NULL,
+                error_temp REAL NOT NULL,
+                error_humidity REAL NOT NULL,
+                transmission_delay_ms INTEGER NULL,
+                node_id TEXT NULL,
+                edge_ts_ms INTEGER NULL  -- 엣지 타임스탬프 (없으면 게이트웨이 수신 ms) — 멱등 키
+            )
+        """)
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(readings)")}
+        for col_name, col_def in (("node_id", "TEXT NULL"), ("edge_ts_ms", "INTEGER NULL")):
+            if col_name not in existing:
+                conn.execute(f"ALTER TABLE readings ADD COLUMN {col_name} {col_def}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_readings_created_at ON readings (created_at)")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_readings_key ON readings (node_id, edge_ts_ms)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS edge_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                actual_temp REAL NOT NULL,
+                actual_humidity REAL NOT NULL,
+                pred_temp REAL NOT NULL,
+                pred_humidity REAL NOT NULL,
+                error_temp REAL NOT NULL,
+                error_humidity REAL NULL,
+                triggered INTEGER NOT NULL,  -- 1=SEND, 0=SKIP
+                status TEXT NULL,
+                inference_time_us INTEGER NULL,
+                free_heap INTEGER NULL,
+                total_heap INTEGER NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_edge_log_created_at ON edge_log (created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_edge_log_triggered ON edge_log (triggered)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_edge_log_status ON edge_log (status)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS aoii (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                node_id TEXT NOT NULL,
+                age_s REAL NOT NULL,
+                avg_s REAL NOT NULL,
+                rolling_s REAL NOT NULL,
+                error_time_s REAL NOT NULL,
+                error_frac REAL NOT NULL,
+                rolling_error_frac REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_aoii_node_created ON aoii (node_id, created_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sensor_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                source TEXT NOT NULL,  -- 원본 CSV 파일 이름 (server/backfill.py)
+                temperature REAL NOT NULL,
+                humidity REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sensor_log_source_created ON sensor_log (source, created_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sketches (
+                bucket_start TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                source TEXT NOT NULL,
+                data TEXT NOT NULL,   -- DDSketch JSON
+                count INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (metric, bucket_start, source)
+            )
+        """)
+        # 롤업 (파티션 대신 보존 기간이 지난 원본은 DELETE)
+        for table in TABLES:
+            cols = ", ".join(f"{c} {_SQLITE_TYPES[t]} NULL" for c, t, _, _ in ROLLUP_SPEC[table])
+            for res in RESOLUTIONS:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table}_{res} (bucket_start TEXT NOT NULL PRIMARY KEY, {cols})")
+        conn.execute("CREATE TABLE IF NOT EXISTS rollup_state (name TEXT NOT NULL PRIMARY KEY, upto TEXT NOT NULL)")
+
+
+def insert_edge_log(
+    actual_temp,
+    actual_humidity,
+    pred_temp,
+    pred_humidity,
+    error_temp,
+    triggered,
+    error_humidity=None,
+    status=None,
+    inference_time_us=None,
+    free_heap=None,
+    total_heap=None,
+):
+    """엣지 시리얼 로그용: SEND/SKIP 전부 저장. triggered: 1=SEND, 0=SKIP."""
+    with get_connection() as conn:
+        conn.execute(
+            """INSERT INTO edge_log
+               (created_at, actual_temp, actual_humidity, pred_temp, pred_humidity,
+                error_temp, error_humidity, triggered, status, inference_time_us, free_heap, total_heap)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                _ts(datetime.now()),
+                actual_temp,
+                actual_humidity,
+                pred_temp,
+                pred_humidity,
+                error_temp,
+                error_humidity if error_humidity is not None else 0.0,
+                1 if triggered else 0,
+                status,
+                inference_time_us,
+                free_heap,
+                total_heap,
+            ),
+        )
+
+
+def insert_reading(actual_temp, actual_humidity, pred_temp, pred_humidity, transmission_delay_ms=None,
+                   node_id=None, edge_ts_ms=None, created_at=None):
+    """수신된 한 건 + 그 시점 게이트웨이 예측값 저장 (멱등 키는 server/db.py와 동일). 저장 건수(0/1) 반환."""
+    return insert_readings([(actual_temp, actual_humidity, pred_temp, pred_humidity, transmission_delay_ms,
+                             node_id, edge_ts_ms, created_at)])
+
+
+def insert_readings(rows, aoii=()):
+    """
+    여러 건을 한 트랜잭션으로 저장 (같은 (node_id, edge_ts_ms)는 무시). 새로 저장된 건수 반환.
+    rows: (actual_t, actual_h, pred_t, pred_h, transmission_delay_ms[, node_id, edge_ts_ms, created_at]) 시퀀스.
+    aoii: 같은 트랜잭션에 저장할 insert_aoii 인자 튜플들 (새 readings가 없으면 건너뜀 — server/db.py와 동일).
+    """
+    values = [
+        (_ts(created_at), at, ah, pt, ph, at - pt, ah - ph, delay, node_id, edge_ts_ms)
+        for at, ah, pt, ph, delay, node_id, edge_ts_ms, created_at in full_rows(rows, datetime.now())
+    ]
+    with get_connection() as conn:
+        before = conn.total_changes
+        conn.executemany(
+            """INSERT INTO readings
+               (created_at, actual_temp, actual_humidity, pred_temp, pred_humidity, error_temp, error_humidity,
+                transmission_delay_ms, node_id, edge_ts_ms)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (node_id, edge_ts_ms) DO NOTHING""",
+            values,
+        )
+        inserted = conn.total_changes - before
+        if inserted and aoii:
+            now = _ts(datetime.now())
+            conn.executemany(
+                """INSERT INTO aoii
+                   (created_at, node_id, age_s, avg_s, rolling_s, error_time_s, error_frac, rolling_error_frac)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(now, *row) for row in aoii],
+            )
+        return inserted
+
+
+def insert_aoii(node_id, age_s, avg_s, rolling_s, error_time_s, error_frac, rolling_error_frac):
+    """게이트웨이 스트리밍 AoII (RX 이벤트의 aoii_* 필드) 1건 저장."""
+    with get_connection() as conn:
+        conn.execute(
+            """INSERT INTO aoii
+               (created_at, node_id, age_s, avg_s, rolling_s, error_time_s, error_frac, rolling_error_frac)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (_ts(datetime.now()), node_id, age_s, avg_s, rolling_s, error_time_s, error_frac, rolling_error_frac),
+        )
+
+
+def get_aoii():
+    """노드별 최신 AoII (node_id 순)."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            """SELECT a.node_id, a.created_at, a.age_s, a.avg_s, a.rolling_s,
+                      a.error_time_s, a.error_frac, a.rolling_error_frac
+               FROM aoii a JOIN (SELECT MAX(id) AS id FROM aoii GROUP BY node_id) m ON a.id = m.id
+               ORDER BY a.node_id"""
+        ).fetchall()
+    out = []
+    for r in rows:
+        d = dict(r)
+        d["created_at"] = _iso(d["created_at"])
+        out.append(d)
+    return out
+
+
+def upsert_sketch(bucket_start, metric, source, data, count):
+    """(시간 버킷, 지표, 출처) 스케치 저장. 같은 키는 덮어씀."""
+    with get_connection() as conn:
+        conn.execute(
+            """INSERT INTO sketches (bucket_start, metric, source, data, count, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT (metric, bucket_start, source)
+               DO UPDATE SET data = excluded.data, count = excluded.count, updated_at = excluded.updated_at""",
+            (_ts(bucket_start), metric, source, data, count, _ts(datetime.now())),
+        )
+
+
+def get_sketches(metric, since, until=None):
+    """[since, until) 시간 버킷의 스케치 JSON 목록 (모든 출처)."""
+    with get_connection() as conn:
+        if until is None:
+            rows = conn.execute(
+                "SELECT data FROM sketches WHERE metric = ? AND bucket_start >= ?", (metric, _ts(since))
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT data FROM sketches WHERE metric = ? AND bucket_start >= ? AND bucket_start < ?",
+                (metric, _ts(since), _ts(until)),
+            ).fetchall()
+    return [r["data"] for r in rows]
+
+
+def get_recent(limit=500, since_iso=None):
+    """모니터링/차트용 최근 데이터 (시간순)."""
+    cols = """id, created_at, actual_temp, actual_humidity,
+              pred_temp, pred_humidity, error_temp, error_humidity"""
+    with get_connection() as conn:
+        if since_iso:
+            rows = conn.execute(
+                f"SELECT {cols} FROM readings WHERE created_at >= ? ORDER BY created_at DESC LIMIT ?",
+                (since_iso.replace("T", " "), limit),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                f"SELECT {cols} FROM readings ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+    out = []
+    for r in rows:
+        d = dict(r)
+        d["created_at"] = _iso(d["created_at"])
+        out.append(d)
+    return list(reversed(out))
+
+
+def iter_readings(since=None, until=None, after=None, page=EXPORT_PAGE, node_id=None):
+    """
+    readings를 (created_at, id) 순으로 스트리밍 (내보내기용). after=(created_at, id): 그 행 다음부터. node_id: 그 노드만.
+    페이지(최대 page행)마다 짧은 읽기 트랜잭션 → 긴 스냅샷이 WAL 체크포인트를 막지 않음.
+    """
+    cols = ", ".join(EXPORT_COLUMNS)
+    since, until = (_ts(t) if t is not None else None for t in (since, until))
+    while True:
+        where, args = keyset_where(since, until, (_ts(after[0]), after[1]) if after else None, ph="?", node_id=node_id)
+        with get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {cols} FROM readings{where} ORDER BY created_at, id LIMIT ?", args + [page]
+            ).fetchall()
+        for r in rows:
+            row = dict(r)
+            after = (datetime.fromisoformat(row["created_at"]), row["id"])
+            row["created_at"] = _iso(row["created_at"])
+            yield row
+        if len(rows) < page:
+            return
+
+
+def _watermark(conn, table):
+    row = conn.execute("SELECT upto FROM rollup_state WHERE name = ?", (table,)).fetchone()
+    return datetime.fromisoformat(row["upto"]) if row else None
+
+
+def get_stats():
+    """대시보드용 요약 통계. 롤업이 끝난 구간은 readings_1h 합계, 나머지만 원본 스캔."""
+    with get_connection() as conn:
+        wm = _watermark(conn, "readings")
+        rolled = None
+        if wm is not None:
+            rolled = conn.execute(stats_select(from_rollup=True) + " WHERE bucket_start < ?", (_ts(wm),)).fetchone()
+            raw = conn.execute(stats_select(from_rollup=False) + " WHERE created_at >= ?", (_ts(wm),)).fetchone()
+        else:
+            raw = conn.execute(stats_select(from_rollup=False)).fetchone()
+    stats = combine_stats(dict(rolled) if rolled else None, dict(raw))
+    if stats["total"]:
+        stats["first_at"], stats["last_at"] = _iso(stats["first_at"]), _iso(stats["last_at"])
+    return stats
+
+
+def _upsert_clause(table):
+    return " ON CONFLICT (bucket_start) DO UPDATE SET " + ", ".join(f"{c} = excluded.{c}" for c in rollup_columns(table))
+
+
+def _rollup_chunk(conn, table, start, stop):
+    """[start, stop) 1m(원본) → 1h(1m) 롤업 (버킷 덮어씀)."""
+    for res in RESOLUTIONS:
+        conn.execute(rollup_insert(table, res, _BUCKET_EXPR[res]).format(ph="?") + _upsert_clause(table),
+                     (_ts(start), _ts(stop)))
+
+
+def _rollup(table, now):
+    """워터마크 ~ rollup_end(now)를 ROLLUP_CHUNK씩 1m(원본) → 1h(1m) 롤업. 청크마다 커밋. 새 워터마크."""
+    with get_connection() as conn:
+        wm = _watermark(conn, table)
+        if wm is None:
+            first = conn.execute(f"SELECT MIN(created_at) AS t FROM {table}").fetchone()["t"]
+            if first is None:
+                return None
+            wm = floor_hour(datetime.fromisoformat(first))
+    for start, stop in rollup_ranges(wm, rollup_end(now)):
+        with get_connection() as conn:
+            _rollup_chunk(conn, table, start, stop)
+            conn.execute(
+                "INSERT INTO rollup_state (name, upto) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET upto = excluded.upto",
+                (table, _ts(stop)),
+            )
+        wm = stop
+    return wm
+
+
+def run_maintenance(now=None, raw_days=RETENTION_RAW_DAYS, minute_days=RETENTION_MINUTE_DAYS):
+    """
+    보존 작업 1회: 롤업 → 롤업이 끝났고 raw_days가 지난 원본 DELETE (SQLite는 파티션 없음)
+    → minute_days가 지난 1m 롤업 삭제 (1h는 보관). 반복 실행해도 안전.
+    """
+    now = now or datetime.now()
+    report = {}
+    for table in TABLES:
+        wm = _rollup(table, now)
+        cutoff = raw_cutoff(now, wm, raw_days)
+        with get_connection() as conn:
+            raw_deleted = 0
+            if cutoff is not None:
+                raw_deleted = conn.execute(f"DELETE FROM {table} WHERE created_at < ?", (_ts(cutoff),)).rowcount
+            minute_deleted = conn.execute(
+                f"DELETE FROM {table}_1m WHERE bucket_start < ?", (_ts(floor_day(now - timedelta(days=minute_days))),)
+            ).rowcount
+        report[table] = {
+            "watermark": wm.isoformat() if wm else None,
+            "raw_rows_deleted": raw_deleted, "minute_rows_deleted": minute_deleted,
+        }
+    return report
+
+
+def get_series(since, until=None, resolution=None):
+    """
+    readings 시계열 [since, until). resolution(None이면 pick_resolution): raw = 원본 행,
+    1m/1h = 버킷 평균 (롤업 테이블 + 워터마크 이후는 원본에서 즉석 집계). 최대 SERIES_MAX_ROWS행.
+    """
+    until = until or datetime.now()
+    resolution = resolution or pick_resolution(since, until)
+    with get_connection() as conn:
+        if resolution == "raw":
+            rows = conn.execute(
+                """SELECT id, created_at, actual_temp, actual_humidity,
+                          pred_temp, pred_humidity, error_temp, error_humidity
+                   FROM readings WHERE created_at >= ? AND created_at < ? ORDER BY created_at LIMIT ?""",
+                (_ts(since), _ts(until), SERIES_MAX_ROWS),
+            ).fetchall()
+            return [dict(r, created_at=_iso(r["created_at"])) for r in rows]
+        wm = _watermark(conn, "readings")
+        split = min(max(wm, since), until) if wm is not None else since
+        cols = ", ".join(rollup_columns("readings"))
+        rows = conn.execute(
+            f"""SELECT bucket_start AS b, {cols} FROM readings_{resolution}
+                WHERE bucket_start >= ? AND bucket_start < ? ORDER BY bucket_start LIMIT ?""",
+            (_ts(since), _ts(split), SERIES_MAX_ROWS),
+        ).fetchall()
+        if split < until:
+            rows += conn.execute(
+                aggregate_select("readings", _BUCKET_EXPR[resolution]).format(ph="?") + " ORDER BY b LIMIT ?",
+                (_ts(split), _ts(until), SERIES_MAX_ROWS),
+            ).fetchall()
+    return [series_row(_iso(r["b"]), r) for r in rows[:SERIES_MAX_ROWS] if r["n"]]
+
+
+# =========================================================
+# 대량 적재 (server/backfill.py) — server/db.py와 같은 함수
+# =========================================================
+# 적재 중 지웠다가 마지막에 한 번에 만드는 보조 인덱스 (멱등 UNIQUE 인덱스는 유지)
+_DEFERRABLE_INDEXES = {
+    "readings": {"idx_readings_created_at": "(created_at)"},
+    "edge_log": {
+        "idx_edge_log_created_at": "(created_at)", "idx_edge_log_triggered": "(triggered)",
+        "idx_edge_log_status": "(status)",
+    },
+    "sensor_log": {"idx_sensor_log_source_created": "(source, created_at)"},
+}
+
+
+def _index_names(conn, table):
+    return {r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,))}
+
+
+def defer_indexes(table):
+    """적재 전 보조 인덱스 DROP. 지운 인덱스 이름 목록."""
+    with get_connection() as conn:
+        names = sorted(set(_DEFERRABLE_INDEXES.get(table, ())) & _index_names(conn, table))
+        for name in names:
+            conn.execute(f"DROP INDEX {name}")
+    return names
+
+
+def restore_indexes(table):
+    """빠진 보조 인덱스 재생성 (적재 종료·중단 후 재실행 모두). 만든 인덱스 이름 목록."""
+    with get_connection() as conn:
+        defs = _DEFERRABLE_INDEXES.get(table, {})
+        names = sorted(set(defs) - _index_names(conn, table))
+        for name in names:
+            conn.execute(f"CREATE INDEX {name} ON {table} {defs[name]}")
+    return names
+
+
+def bulk_insert(table, columns, rows, method="insert"):
+    """대량 적재 1청크 (1트랜잭션, executemany). 멱등 키가 이미 있는 행은 무시. 새로 저장된 건수. load-data는 MySQL 전용."""
+    if method != "insert":
+        raise ValueError(f"bulk method {method} is not supported by the sqlite backend (insert)")
+    if not rows:
+        return 0
+    dt_cols = [i for i, v in enumerate(rows[0]) if isinstance(v, datetime)]
+    if dt_cols:  # 저장 형식을 _ts()와 맞춤 (문자열 비교 = 시각 순서)
+        rows = [list(r) for r in rows]
+        for r in rows:
+            for i in dt_cols:
+                r[i] = _ts(r[i])
+    with get_connection() as conn:
+        before = conn.total_changes
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))}) ON CONFLICT DO NOTHING",
+            rows,
+        )
+        return conn.total_changes - before
+
+
+def late_data_mark(table):
+    """적재 시작 기준점 {"max_id", "watermark"} (JSON 직렬화 가능)."""
+    with get_connection() as conn:
+        max_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) AS m FROM {table}").fetchone()["m"]
+        wm = _watermark(conn, table) if table in TABLES else None
+    return {"max_id": int(max_id), "watermark": wm.isoformat() if wm else None}
+
+
+def merge_late_rows(table, mark):
+    """
+    적재 후 롤업 보정 (server/db.py merge_late_rows와 같음): 시작 워터마크 이전의 새 행은 1m·1h 버킷에 병합,
+    적재 중 워터마크가 옮겨간 구간은 원본에서 다시 롤업.
+    """
+    if table not in TABLES:
+        return None
+    with get_connection() as conn:
+        wm = _watermark(conn, table)
+        if wm is None:
+            return {"late_rows": 0, "rerolled": None}
+        max_id = mark["max_id"]
+        start = datetime.fromisoformat(mark["watermark"]) if mark["watermark"] else None
+        late = 0
+        if start is not None:
+            row = conn.execute(
+                f"SELECT COUNT(*) AS n, MIN(created_at) AS t FROM {table} WHERE id > ? AND created_at < ?",
+                (max_id, _ts(start)),
+            ).fetchone()
+            late = int(row["n"])
+            if late:
+                merge = " ON CONFLICT (bucket_start) DO UPDATE SET " + rollup_merge(table, "excluded.{c}", "max", "min")
+                for res in RESOLUTIONS:
+                    conn.execute(late_rollup_insert(table, res, _BUCKET_EXPR[res]).format(ph="?") + merge,
+                                 (row["t"], _ts(start), max_id))
+        else:
+            first = conn.execute(f"SELECT MIN(created_at) AS t FROM {table} WHERE id > ?", (max_id,)).fetchone()["t"]
+            start = floor_hour(datetime.fromisoformat(first)) if first is not None else wm
+        rerolled = None
+        if start < wm:
+            for a, b in rollup_ranges(start, wm):
+                _rollup_chunk(conn, table, a, b)
+            rerolled = [start.isoformat(), wm.isoformat()]
+    return {"late_rows": late, "rerolled": rerolled}
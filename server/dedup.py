@@ -0,0 +1,78 @@
+# server/dedup.py
+"""
+readings 멱등 저장 키: (node_id, edge_ts_ms). QoS 1 재전송·공유 구독 재배정으로 같은 RX가 두 번 와도 1행.
+
+- edge_ts_ms: 엣지 타임스탬프 (프레임 2번째 필드). 없으면(구 펌웨어) 게이트웨이 수신 ms(rx_ts_ms)로 대신
+  — 재전송 메시지는 페이로드가 같으므로 어느 쪽이든 같은 키
+- rx_ts_ms와 EDGE_SKEW_MS보다 먼 edge_ts_ms는 없는 것으로 본다 (edge_ts_ms()): 32비트 unsigned long으로 만든
+  펌웨어 값은 49.7일마다 wrap → 1970년 created_at, 게이트웨이 간 키 충돌, 정렬 버퍼 late 처리. 그 행은 rx_ts_ms를 키로 쓰고
+  그 값으로 계산한 transmission_delay_ms도 버린다 (게이트웨이 간 중복 수신은 걸러지지 않음, 재전송은 걸러짐)
+- created_at도 페이로드의 키 시각(edge_ts_ms, 없으면 rx_ts_ms)에서 만든다 (구독자·게이트웨이 수신 시각이 아니라).
+  MySQL 파티션 테이블의 UNIQUE 키는 파티션 컬럼(created_at)을 포함해야 하므로, 재전송 행과 다른 게이트웨이가
+  같은 프레임을 받은 행(server/federation.py)의 created_at이 같아야 중복이 걸러진다
+- 키 필드가 없는 옛 페이로드는 키 NULL → 중복 검사 없이 저장 (UNIQUE 인덱스는 NULL끼리 겹쳐도 허용)
+- 두 백엔드가 같은 중복을 거르도록 키가 있는 행의 created_at은 항상 key_time(edge_ts_ms) (full_rows):
+  MySQL uq_readings_key (node_id, edge_ts_ms, created_at)의 created_at이 edge_ts_ms로 정해지므로
+  SQLite uq_readings_key (node_id, edge_ts_ms)와 같은 행을 중복으로 본다
+"""
+import os
+from datetime import datetime
+
+EDGE_SKEW_MS = int(os.environ.get("INGEST_EDGE_SKEW_MS", "3600000"))  # edge_ts_ms와 rx_ts_ms 허용 차이
+
+# insert_readings 행: (actual_t, actual_h, pred_t, pred_h, transmission_delay_ms[, node_id, edge_ts_ms, created_at])
+ROW_FIELDS = 8
+
+
+def key_time(ts_ms):
+    """키 시각(ms) → created_at (서버 로컬 시각)."""
+    return datetime.fromtimestamp(int(ts_ms) / 1000.0)
+
+
+def edge_ts_ms(data):
+    """페이로드의 엣지 타임스탬프 (ms). 없거나 rx_ts_ms와 EDGE_SKEW_MS보다 멀면(32비트 wrap 등) None."""
+    ts = data.get("edge_ts_ms")
+    if ts is None:
+        return None
+    rx_ms = data.get("rx_ts_ms")
+    if rx_ms is not None and abs(int(ts) - int(rx_ms)) > EDGE_SKEW_MS:
+        return None
+    return int(ts)
+
+
+def reading_key(data):
+    """RX 페이로드 → (node_id, edge_ts_ms, created_at). 키 필드가 없으면 (node_id, None, None)."""
+    node_id = data.get("node_id")
+    ts_ms = edge_ts_ms(data)
+    if ts_ms is None:
+        ts_ms = data.get("rx_ts_ms")
+    if node_id is None or ts_ms is None:
+        return node_id, None, None
+    return node_id, int(ts_ms), key_time(ts_ms)
+
+
+def reading_row(data):
+    """RX 페이로드 → insert_readings 행 (키 포함). 필드 누락·형식 오류는 KeyError/TypeError/ValueError."""
+    delay = data.get("transmission_delay_ms")
+    if data.get("edge_ts_ms") is not None and edge_ts_ms(data) is None:
+        delay = None  # 잘못된 엣지 타임스탬프로 계산한 지연
+    return (
+        float(data["actual_t"]), float(data["actual_h"]), float(data["pred_t"]), float(data["pred_h"]),
+        int(delay) if delay is not None else None,
+        *reading_key(data),
+    )
+
+
+def full_rows(rows, now):
+    """
+    insert_readings 입력 → 8필드 행. 키(node_id, edge_ts_ms)가 있으면 created_at = key_time(edge_ts_ms) (넘긴 값 무시),
+    없으면 넘긴 created_at, 그것도 없으면 now. 키 없는 5필드 행은 node_id·edge_ts_ms NULL.
+    """
+    for row in rows:
+        if len(row) < ROW_FIELDS:
+            row = tuple(row) + (None,) * (ROW_FIELDS - len(row))
+        if row[5] is not None and row[6] is not None:
+            row = row[:7] + (key_time(row[6]),)
+        elif row[7] is None:
+            row = row[:7] + (now,)
+        yield row
@@ -0,0 +1,84 @@
+# server/export.py
+"""
+readings 대량 내보내기 (/api/export): CSV / NDJSON 스트리밍.
+
+- 키셋 페이지네이션: (created_at, id) 순서, 다음 페이지 조건 = 마지막 행 이후 (OFFSET 없음 → 페이지당 인덱스 범위 스캔)
+- 백엔드(iter_readings)가 페이지 단위로 행을 넘기고 여기서 한 줄씩 직렬화 → 메모리는 전체 행 수와 무관
+- 이어받기: 응답이 끊기면 마지막 행의 created_at,id 를 ?after= 로 다시 요청
+"""
+import io
+import csv
+import json
+import os
+from datetime import datetime
+
+EXPORT_PAGE = int(os.environ.get("EXPORT_PAGE", "5000"))
+CHUNK_BYTES = 64 * 1024
+EXPORT_COLUMNS = (
+    "id", "created_at", "actual_temp", "actual_humidity", "pred_temp", "pred_humidity",
+    "error_temp", "error_humidity", "transmission_delay_ms",
+)
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def keyset_where(since=None, until=None, after=None, ph="%s", node_id=None):
+    """(WHERE 절, 인자). after=(created_at, id): 그 행 다음부터. node_id: 그 노드 행만. 시각 인자는 호출 측 형식 그대로."""
+    conds, args = [], []
+    if node_id is not None:
+        conds.append(f"node_id = {ph}")
+        args.append(node_id)
+    if since is not None:
+        conds.append(f"created_at >= {ph}")
+        args.append(since)
+    if until is not None:
+        conds.append(f"created_at < {ph}")
+        args.append(until)
+    if after is not None:
+        conds.append(f"(created_at > {ph} OR (created_at = {ph} AND id > {ph}))")
+        args += [after[0], after[0], after[1]]
+    return (" WHERE " + " AND ".join(conds)) if conds else "", args
+
+
+def parse_after(text):
+    """'2026-10-19T12:00:00.123456,42' → (datetime, 42). 비었으면 None."""
+    if not text:
+        return None
+    ts, _, row_id = text.rpartition(",")
+    return datetime.fromisoformat(ts), int(row_id)
+
+
+def csv_lines(rows):
+    """헤더 + 행. CHUNK_BYTES 단위로 묶어 yield (행마다 소켓 쓰기 방지)."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([row[c] for c in EXPORT_COLUMNS])
+        if buf.tell() >= CHUNK_BYTES:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def ndjson_lines(rows):
+    chunk, size = [], 0
+    for row in rows:
+        line = json.dumps({c: row[c] for c in EXPORT_COLUMNS}, separators=(",", ":")) + "\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield "".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield "".join(chunk)
+
+
+def encode(rows, fmt):
+    """행 이터레이터 → 응답 본문 청크 제너레이터."""
+    if fmt == "csv":
+        return csv_lines(rows)
+    if fmt == "ndjson":
+        return ndjson_lines(rows)
+    raise ValueError(f"unknown export format: {fmt} (csv | ndjson)")
@@ -0,0 +1,137 @@
+# server/federation.py
+"""
+다중 게이트웨이 병합 단계: 여러 게이트웨이(aoii/readings/<gateway_id>)의 RX를 엣지 시각 순으로 정렬하고,
+같은 프레임을 두 게이트웨이가 들은 중복 수신을 버린다. server/ingest.py Ingestor가 싱크 앞에서 사용 (--reorder-ms).
+
+- 이벤트 시각: edge_ts_ms (없거나 wrap 등으로 rx_ts_ms와 멀면 rx_ts_ms — server/dedup.edge_ts_ms,
+  둘 다 없으면 구독자 수신 시각). RX만 정렬·중복 검사,
+  EST/ESTB/SILENT 등 게이트웨이 자체 이벤트는 바로 통과
+- 워터마크 = 지금까지 본 최대 이벤트 시각 - lateness_ms. 버퍼(힙)에서 워터마크 이하인 이벤트를 시각 순으로 내보냄
+- 지연 상한: 버퍼에서 max_wait초를 넘긴 이벤트가 있으면 그 시각까지 워터마크를 당김 (새 이벤트가 끊겨도 배출)
+- 메모리 상한: 버퍼가 max_events를 넘으면 가장 이른 이벤트부터 내보냄. 중복 검사 키는 워터마크보다
+  dedup_ms 이상 오래되면 버림
+- 이미 내보낸 시각보다 이른 RX(late)는 순서를 지킬 수 없으므로 바로 내보내고 late로 센다 (DB는 created_at = 엣지 시각)
+- 엣지 타임스탬프가 없는 구 펌웨어 프레임은 게이트웨이마다 수신 시각이 달라 중복 검사가 되지 않음
+"""
+import os
+import heapq
+import threading
+from collections import deque
+
+from server.dedup import edge_ts_ms
+
+REORDER_LATENESS_MS = int(os.environ.get("INGEST_REORDER_MS", "2000"))  # 게이트웨이 간 전달 지연 허용치
+REORDER_MAX_WAIT_SEC = float(os.environ.get("INGEST_REORDER_MAX_WAIT_SEC", "5"))
+REORDER_MAX_EVENTS = int(os.environ.get("INGEST_REORDER_MAX_EVENTS", "10000"))
+DEDUP_MS = int(os.environ.get("INGEST_DEDUP_MS", "60000"))  # 내보낸 뒤에도 중복 수신을 버리는 기간
+
+
+def event_time_ms(data, received_at):
+    """페이로드 → 정렬 기준 시각(ms)."""
+    ts = edge_ts_ms(data)
+    if ts is None:
+        ts = data.get("rx_ts_ms")
+    return int(ts) if ts is not None else int(received_at * 1000)
+
+
+class ReorderBuffer:
+    """
+    push(msg, now)·poll(now)는 준비된 Message 목록(시각 순)을 반환. paho 콜백 스레드와 틱 스레드가 함께 호출 (lock).
+    msg: server/ingest.Message (data, received_at).
+    """
+
+    def __init__(self, lateness_ms=REORDER_LATENESS_MS, max_wait=REORDER_MAX_WAIT_SEC, max_events=REORDER_MAX_EVENTS,
+                 dedup_ms=DEDUP_MS):
+        self.lateness_ms = lateness_ms
+        self.max_wait = max_wait
+        self.max_events = max_events
+        self.dedup_ms = dedup_ms
+        self.lock = threading.Lock()
+        self._heap = []        # (이벤트 시각, 순번, msg)
+        self._seq = 0
+        self._arrivals = deque()  # (도착 시각, 이벤트 시각) — 도착 순, max_wait 판정용
+        self._wait_ts = None   # max_wait를 넘긴 이벤트 중 최대 시각
+        self._max_ts = None    # 지금까지 본 최대 이벤트 시각
+        self._emitted_ts = None  # 마지막으로 내보낸 이벤트 시각 (late 판정)
+        self._seen = {}        # (node_id, 시각) → 시각 (중복 수신 검사)
+        self._seen_heap = []   # (시각, 키) — 오래된 키 정리용
+        self.pushed = self.emitted = self.duplicates = self.late = self.forced = self.passed = 0
+        self.max_buffered = 0
+
+    def push(self, msg, now):
+        data = msg.data
+        if msg.event != "RX":
+            self.passed += 1
+            return [msg]
+        ts = event_time_ms(data, msg.received_at)
+        with self.lock:
+            self.pushed += 1
+            if edge_ts_ms(data) is not None:
+                key = (data.get("node_id"), ts)
+                if key in self._seen:
+                    self.duplicates += 1
+                    return []
+                self._seen[key] = ts
+                heapq.heappush(self._seen_heap, (ts, key))
+            if self._emitted_ts is not None and ts < self._emitted_ts:
+                self.late += 1
+                self.emitted += 1
+                return [msg]
+            heapq.heappush(self._heap, (ts, self._seq, msg))
+            self._arrivals.append((now, ts))
+            self._seq += 1
+            if self._max_ts is None or ts > self._max_ts:
+                self._max_ts = ts
+            self.max_buffered = max(self.max_buffered, len(self._heap))
+            return self._drain(now)
+
+    def poll(self, now):
+        """틱 스레드: 새 이벤트가 없어도 max_wait를 넘긴 이벤트 배출."""
+        with self.lock:
+            return self._drain(now) if self._heap else []
+
+    def flush(self):
+        """종료 시 버퍼 전체 (시각 순)."""
+        with self.lock:
+            out = [heapq.heappop(self._heap)[2] for _ in range(len(self._heap))]
+            self._arrivals.clear()
+            self.emitted += len(out)
+            return out
+
+    def _drain(self, now):
+        heap = self._heap
+        # 오래 기다린 이벤트: 도착 순 큐에서 max_wait를 넘긴 것들의 시각까지 워터마크를 당김
+        arrivals = self._arrivals
+        while arrivals and now - arrivals[0][0] >= self.max_wait:
+            ts = arrivals.popleft()[1]
+            if self._wait_ts is None or ts > self._wait_ts:
+                self._wait_ts = ts
+        watermark = self._max_ts - self.lateness_ms
+        if self._wait_ts is not None and self._wait_ts > watermark:
+            watermark = self._wait_ts
+        out = []
+        while heap and (heap[0][0] <= watermark or len(heap) > self.max_events):
+            if heap[0][0] > watermark:
+                self.forced += 1
+            ts, _, msg = heapq.heappop(heap)
+            self._emitted_ts = ts
+            out.append(msg)
+        self.emitted += len(out)
+        self._prune(watermark)
+        return out
+
+    def _prune(self, watermark):
+        horizon = watermark - self.dedup_ms
+        seen, seen_heap = self._seen, self._seen_heap
+        while seen_heap and seen_heap[0][0] < horizon:
+            _, key = heapq.heappop(seen_heap)
+            seen.pop(key, None)
+
+    def stats(self):
+        with self.lock:
+            buffered, seen = len(self._heap), len(self._seen)
+        return {
+            "buffered": buffered, "max_buffered": self.max_buffered, "pushed": self.pushed, "emitted": self.emitted,
+            "duplicates": self.duplicates, "late": self.late, "forced": self.forced, "passed": self.passed,
+            "dedup_keys": seen, "lateness_ms": self.lateness_ms,
+        }
@@ -0,0 +1,466 @@
+# server/ingest.py
+"""
+MQTT 수집 데몬: aoii/readings를 한 번 구독·한 번 디코딩해 싱크(MySQL/SQLite, CSV, 지표 스케치, 실시간 스트림)로 fan-out.
+실행: python server/ingest.py [--sinks db,csv,metrics] [--stats-every 60] [--workers N]
+
+- paho 콜백 스레드는 json.loads 1회 + 싱크별 큐 put만 (블로킹 I/O 없음)
+- 싱크마다 제한 크기 큐 + 워커 스레드 1개: 최대 batch건을 linger초까지 모아 한 번에 처리 (DB는 insert_readings 1트랜잭션)
+- 배압: 큐가 가득 차면
+  - 손실 허용 싱크(metrics, stream): 그 싱크의 새 메시지만 버리고 dropped로 집계 → 다른 싱크·브로커 세션을 막지 않음
+  - 영속 싱크(db, csv): 콜백 스레드가 자리가 날 때까지 최대 INGEST_BLOCK_SEC 대기. 그동안 paho가 소켓을 읽지 않고
+    QoS 1 PUBACK도 보내지 않으므로 배압이 브로커까지 전달 (paho는 on_message가 끝난 뒤 PUBACK — 대기 중 끊기면 브로커가 재전달).
+    대기 시간을 넘기면 버리고 건마다 로그
+- 처리 실패는 싱크 스레드에서 지수 백오프 재시도 (그동안 큐가 차면 위 규칙대로 대기·버림)
+- 실시간 스트림 싱크는 SSE 클라이언트가 있는 Flask 프로세스(server/stream_hub.py)에서 같은 Ingestor로 실행
+- 수평 확장: MQTT v5 공유 구독($share/<그룹>/aoii/readings/#, MQTT_SHARE_GROUP 또는 --workers). 브로커가 메시지를
+  그룹 내 구독자 하나에만 배정. QoS 1 재전송·재배정 중복은 readings 멱등 키로 1행 (server/dedup.py)
+- 다중 게이트웨이: aoii/readings/<gateway_id>를 모두 구독(#)하고, 싱크 앞 ReorderBuffer(server/federation.py)가
+  엣지 시각 순 정렬·게이트웨이 간 중복 수신 제거 (--reorder-ms, 0이면 끔)
+"""
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+
+if __name__ == "__main__":
+    # 단독 실행: 프로젝트 루트를 import 경로·작업 디렉터리로 (CSV는 루트에 생성), .env 로드
+    _project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, _project_root)
+    os.chdir(_project_root)
+    _env_path = os.path.join(_project_root, ".env")
+    if os.path.isfile(_env_path):
+        with open(_env_path, "r", encoding="utf-8") as _f:
+            for _line in _f:
+                _line = _line.strip()
+                if _line and not _line.startswith("#") and "=" in _line:
+                    _k, _v = _line.split("=", 1)
+                    _k, _v = _k.strip(), _v.strip()
+                    if _k.startswith(("MYSQL_", "MQTT_", "DB_", "SQLITE_", "SKETCH_", "INGEST_")):
+                        os.environ[_k] = _v
+
+try:
+    import paho.mqtt.client as mqtt
+except ImportError:
+    mqtt = None
+
+MQTT_BROKER = os.environ.get("MQTT_BROKER", "localhost")
+MQTT_PORT = int(os.environ.get("MQTT_PORT", "1883"))
+MQTT_TOPIC = "aoii/readings/#"  # 게이트웨이별 aoii/readings/<gateway_id> + GATEWAY_ID 없는 aoii/readings
+MQTT_SHARE_GROUP = os.environ.get("MQTT_SHARE_GROUP") or None  # 공유 구독 그룹 (없으면 일반 구독)
+DEFAULT_SHARE_GROUP = "aoii-ingest"  # --workers > 1 이고 MQTT_SHARE_GROUP이 없을 때
+
+INGEST_QUEUE = int(os.environ.get("INGEST_QUEUE", "10000"))     # 싱크별 큐 최대 메시지 수
+INGEST_BATCH = int(os.environ.get("INGEST_BATCH", "200"))       # 싱크 1회 처리 최대 건수
+INGEST_LINGER_SEC = float(os.environ.get("INGEST_LINGER_SEC", "0.2"))  # 배치를 모으는 최대 대기
+INGEST_BLOCK_SEC = float(os.environ.get("INGEST_BLOCK_SEC", "60"))  # 영속 싱크 큐가 가득 찼을 때 콜백 대기 상한
+IDLE_SEC = 1.0          # 메시지가 없을 때 싱크 handle([]) 호출 간격 (주기 flush용)
+RETRY_MAX = 5
+RETRY_BASE_DELAY = 1.0  # 1s, 2s, 4s, 8s
+REORDER_TICK_SEC = 0.5  # 정렬 버퍼 max_wait 점검 간격
+
+# RX 페이로드 → aoii 테이블 컬럼 순서 (gateway/gateway_aoii.py snapshot)
+AOII_FIELDS = ("aoii_age_s", "aoii_avg_s", "aoii_rolling_s", "aoii_error_time_s", "aoii_error_frac", "aoii_rolling_error_frac")
+
+
+class Message:
+    """디코딩된 MQTT 메시지 1건 (모든 싱크가 공유, 수정 금지)."""
+
+    __slots__ = ("text", "data", "event", "received_at")
+
+    def __init__(self, text, data, received_at):
+        self.text = text
+        self.data = data
+        self.event = data.get("event", "message")
+        self.received_at = received_at
+
+
+class Sink:
+    """
+    싱크 1개: handle(batch)는 전용 스레드에서만 호출 (batch = Message 목록, 유휴 시 빈 목록).
+    events: 받을 event 집합 (None이면 전부). retries: handle 실패 시 시도 횟수 (1이면 재시도 없음).
+    close: 종료 시 남은 큐 처리 후 1번 호출.
+    durable: True면 큐가 가득 찰 때 버리지 않고 block초까지 대기 (db, csv). False면 즉시 버림 (metrics, stream).
+    """
+
+    def __init__(self, name, handle, events=None, maxsize=INGEST_QUEUE, batch=INGEST_BATCH,
+                 linger=INGEST_LINGER_SEC, retries=RETRY_MAX, close=None, durable=False, block=INGEST_BLOCK_SEC):
+        self.name = name
+        self.durable = durable
+        self.block = block
+        self.handle = handle
+        self.events = frozenset(events) if events else None
+        self.queue = queue.Queue(maxsize)
+        self.batch = batch
+        self.linger = linger
+        self.retries = retries
+        self.close = close
+        self.enqueued = self.processed = self.dropped = self.failed = self.batches = 0
+        self.blocked = 0  # 영속 싱크: 큐가 가득 차 콜백이 기다린 횟수
+        self.duplicates = 0  # 멱등 저장에서 이미 있던 키라 무시된 건수 (db 싱크만 집계)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def accepts(self, msg):
+        return self.events is None or msg.event in self.events
+
+    def offer(self, msg):
+        """콜백 스레드에서 호출. 큐가 가득 차면 영속 싱크는 block초까지 대기, 그 외는 즉시 버림."""
+        try:
+            self.queue.put_nowait(msg)
+            self.enqueued += 1
+            return
+        except queue.Full:
+            pass
+        if self.durable:
+            self.blocked += 1
+            try:
+                self.queue.put(msg, timeout=self.block)
+                self.enqueued += 1
+                return
+            except queue.Full:
+                pass
+        self.dropped += 1
+        d = msg.data
+        if self.durable:
+            print(f"ingest[{self.name}]: queue full for {self.block:g}s, DROPPED {msg.event} "
+                  f"node={d.get('node_id')} edge_ts_ms={d.get('edge_ts_ms')} ts={d.get('timestamp')}")
+        elif self.dropped & (self.dropped - 1) == 0:  # 손실 허용 싱크: 1, 2, 4, 8, ...번째만 (로그 폭주 방지)
+            print(f"ingest[{self.name}]: queue full, dropped {self.dropped} messages so far")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"ingest-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=10.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _next_batch(self):
+        """첫 메시지를 IDLE_SEC까지 기다린 뒤 batch건 또는 linger초까지 모음."""
+        try:
+            first = self.queue.get(timeout=IDLE_SEC)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _process(self, batch):
+        for attempt in range(self.retries):
+            try:
+                self.handle(batch)
+                break
+            except Exception as e:
+                if attempt == self.retries - 1:
+                    self.failed += len(batch)
+                    print(f"ingest[{self.name}]: batch of {len(batch)} FAILED after {self.retries} attempts: {e}")
+                    return
+                delay = RETRY_BASE_DELAY * (2 ** attempt)
+                print(f"ingest[{self.name}]: retry {attempt + 1}/{self.retries} in {delay:.1f}s: {e}")
+                self._stop.wait(delay)  # 종료 중이면 대기 없이 재시도
+        if batch:
+            self.processed += len(batch)
+            self.batches += 1
+
+    def _run(self):
+        while not (self._stop.is_set() and self.queue.empty()):
+            self._process(self._next_batch())
+        if self.close is not None:
+            try:
+                self.close()
+            except Exception as e:
+                print(f"ingest[{self.name}]: close error: {e}")
+
+    def stats(self):
+        return {
+            "queued": self.queue.qsize(), "enqueued": self.enqueued, "processed": self.processed,
+            "dropped": self.dropped, "blocked": self.blocked, "failed": self.failed, "batches": self.batches,
+            "duplicates": self.duplicates,
+        }
+
+
+def shared_topic(topic, group):
+    """MQTT v5 공유 구독 토픽. group이 없으면 topic 그대로."""
+    return f"$share/{group}/{topic}" if group else topic
+
+
+class Ingestor:
+    """
+    MQTT 구독 1개 → 싱크 fan-out. on_message는 paho 콜백 (또는 테스트·리플레이에서 dispatch 직접 호출).
+    share_group: 공유 구독 그룹 (같은 그룹의 Ingestor끼리 메시지를 나눠 받음). 스트림처럼 전부 받아야 하면 None.
+    reorder: server/federation.ReorderBuffer (None이면 도착 순 그대로). 설정 시 틱 스레드가 오래 기다린 이벤트를 배출.
+    """
+
+    def __init__(self, sinks, topic=MQTT_TOPIC, share_group=None, reorder=None):
+        self.sinks = list(sinks)
+        self.topic = shared_topic(topic, share_group)
+        self.share_group = share_group
+        self.reorder = reorder
+        self.received = 0
+        self.decode_errors = 0
+        self.client = None
+        self._stop = threading.Event()
+        self._ticker = None
+
+    def start(self):
+        for sink in self.sinks:
+            sink.start()
+        if self.reorder is not None:
+            self._ticker = threading.Thread(target=self._tick, name="ingest-reorder", daemon=True)
+            self._ticker.start()
+        return self
+
+    def _tick(self):
+        while not self._stop.wait(REORDER_TICK_SEC):
+            self._offer(self.reorder.poll(time.time()))
+
+    def _offer(self, msgs):
+        for msg in msgs:
+            for sink in self.sinks:
+                if sink.accepts(msg):
+                    sink.offer(msg)
+
+    def dispatch(self, text, now=None):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            self.decode_errors += 1
+            return None
+        if not isinstance(data, dict):
+            self.decode_errors += 1
+            return None
+        now = time.time() if now is None else now
+        msg = Message(text, data, now)
+        self.received += 1
+        self._offer(self.reorder.push(msg, now) if self.reorder is not None else (msg,))
+        return msg
+
+    def on_message(self, client, userdata, msg):
+        try:
+            text = msg.payload.decode("utf-8")
+        except UnicodeDecodeError:
+            self.decode_errors += 1
+            return
+        self.dispatch(text)
+
+    def on_connect(self, client, userdata, flags, rc, properties=None):
+        if rc == 0:
+            print(f"ingest: MQTT connected, subscribing {self.topic}")
+            client.subscribe(self.topic, qos=1)
+        else:
+            print(f"ingest: MQTT connect failed rc={rc}")
+
+    def connect(self, broker=MQTT_BROKER, port=MQTT_PORT):
+        """MQTT 연결 후 네트워크 스레드 시작 (loop_start). 연결 실패 시 예외."""
+        if mqtt is None:
+            raise RuntimeError("paho-mqtt is not installed")
+        # 공유 구독은 MQTT v5 (v3.1.1 브로커 다수도 $share 접두사를 지원하지만 표준은 v5)
+        client = mqtt.Client(protocol=mqtt.MQTTv5) if self.share_group else mqtt.Client()
+        client.on_connect = self.on_connect
+        client.on_message = self.on_message
+        client.connect(broker, port, 60)
+        client.loop_start()
+        self.client = client
+        return client
+
+    def stop(self, timeout=10.0):
+        """구독 중단 → 정렬 버퍼 비움 → 싱크별 남은 큐 처리·close."""
+        if self.client is not None:
+            self.client.loop_stop()
+            self.client.disconnect()
+            self.client = None
+        self._stop.set()
+        if self._ticker is not None:
+            self._ticker.join(timeout)
+        if self.reorder is not None:
+            self._offer(self.reorder.flush())
+        for sink in self.sinks:
+            sink.stop(timeout)
+
+    def stats(self):
+        out = {
+            "received": self.received, "decode_errors": self.decode_errors, "pid": os.getpid(),
+            "sinks": {sink.name: sink.stats() for sink in self.sinks},
+        }
+        if self.reorder is not None:
+            out["reorder"] = self.reorder.stats()
+        return out
+
+
+# =========================================================
+# 싱크 구현
+# =========================================================
+def db_sink(**kwargs):
+    """
+    RX → readings + aoii (aoii_* 필드가 있는 RX)를 배치 1트랜잭션으로 (멱등 키로 중복 무시).
+    배치 전체가 중복이면(재전달) aoii도 건너뜀 — 같은 트랜잭션이었으므로 이미 저장됨. 실패하면 둘 다 롤백 후 재시도.
+    새 행·중복이 섞인 배치의 aoii는 그대로 저장 (보조 통계).
+    """
+    from server.db import insert_readings
+    from server.dedup import reading_row
+
+    def handle(batch):
+        rows, aoii = [], []
+        for msg in batch:
+            d = msg.data
+            try:
+                rows.append(reading_row(d))
+                if "aoii_avg_s" in d:
+                    aoii.append((d.get("node_id", "edge0"), *(float(d[k]) for k in AOII_FIELDS)))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"ingest[db]: skipped malformed RX: {e}")  # 배치 재시도로 고쳐지지 않으므로 건너뜀
+        if rows:
+            inserted = insert_readings(rows, aoii=aoii)
+            sink.duplicates += len(rows) - inserted
+
+    kwargs.setdefault("durable", True)
+    sink = Sink("db", handle, events=("RX",), **kwargs)
+    return sink
+
+
+def csv_sink(path=None, **kwargs):
+    """RX → experiment_log_online.csv (mqtt_to_csv와 같은 형식). 배치마다 파일을 1번 열어 추가."""
+    import csv
+    from server.mqtt_to_csv import HEADER, CSV_FILENAME, row_from_payload
+    path = path or CSV_FILENAME
+
+    def handle(batch):
+        if not batch:
+            return
+        new = not os.path.exists(path)
+        with open(path, mode="a", newline="") as f:
+            writer = csv.writer(f)
+            if new:
+                writer.writerow(HEADER)
+            writer.writerows(row_from_payload(msg.data) for msg in batch)
+
+    kwargs.setdefault("durable", True)
+    return Sink("csv", handle, events=("RX",), **kwargs)
+
+
+def metrics_sink(**kwargs):
+    """RX → 지연·오차 분위수 스케치 (SketchAggregator, SKETCH_FLUSH_SEC마다 sketches 테이블 upsert). 손실 허용."""
+    from server.db import upsert_sketch
+    from server.quantile_sketch import SketchAggregator
+    sketches = SketchAggregator(upsert_sketch)
+
+    def handle(batch):
+        for msg in batch:
+            sketches.add_payload(msg.received_at, msg.data)
+        sketches.maybe_flush(time.time())
+
+    kwargs.setdefault("retries", 1)
+    return Sink("metrics", handle, events=("RX",),
+                close=lambda: sketches.maybe_flush(time.time(), force=True), **kwargs)
+
+
+def stream_sink(hub, **kwargs):
+    """전 이벤트 → StreamHub (SSE 클라이언트 버퍼). 지연 최소화: linger 0, 재시도 없음."""
+
+    def handle(batch):
+        for msg in batch:
+            hub.ingest(msg.data, msg.text)
+
+    kwargs.setdefault("linger", 0.0)
+    kwargs.setdefault("retries", 1)
+    kwargs.setdefault("maxsize", 1024)
+    return Sink("stream", handle, **kwargs)
+
+
+SINKS = {"db": db_sink, "csv": csv_sink, "metrics": metrics_sink}
+
+
+def run(names, share_group=None, stats_every=60.0, label="ingest", reorder_ms=0):
+    """싱크 names로 Ingestor 1개 실행 (KeyboardInterrupt까지). --workers 자식 프로세스도 이 함수."""
+    reorder = None
+    if reorder_ms > 0:
+        from server.federation import ReorderBuffer
+        reorder = ReorderBuffer(lateness_ms=reorder_ms)
+    ingestor = Ingestor([SINKS[name]() for name in names], share_group=share_group, reorder=reorder).start()
+    try:
+        ingestor.connect()
+    except Exception as e:
+        print(f"{label}: MQTT connect error: {e}")
+        ingestor.stop()
+        sys.exit(1)
+    print(f"{label}: sinks {', '.join(names)}, topic {ingestor.topic}")
+    try:
+        while True:
+            time.sleep(stats_every or 3600)
+            if stats_every:
+                print(f"{label}: {json.dumps(ingestor.stats())}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ingestor.stop()
+        print(f"{label}: stopped {json.dumps(ingestor.stats())}")
+
+
+def _worker(index, names, share_group, stats_every, reorder_ms):
+    if os.environ.get("SKETCH_SOURCE"):
+        # 스케치 행은 출처별로 덮어쓰므로 워커마다 다른 출처 (기본 출처는 pid 포함이라 이미 다름)
+        os.environ["SKETCH_SOURCE"] = f"{os.environ['SKETCH_SOURCE']}-w{index}"
+    run(names, share_group, stats_every, label=f"ingest[w{index}]", reorder_ms=reorder_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="aoii/readings ingest daemon (one subscription, per-sink queues)")
+    parser.add_argument("--sinks", default="db,csv,metrics", help=f"쉼표 구분 ({', '.join(SINKS)})")
+    parser.add_argument("--stats-every", type=float, default=60.0, help="싱크 통계 출력 간격(초), 0이면 끔")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"공유 구독 워커 프로세스 수 (>1이면 그룹 MQTT_SHARE_GROUP 또는 {DEFAULT_SHARE_GROUP})")
+    parser.add_argument("--share-group", default=MQTT_SHARE_GROUP, help="MQTT v5 공유 구독 그룹 (기본 MQTT_SHARE_GROUP)")
+    parser.add_argument("--reorder-ms", type=int, default=int(os.environ.get("INGEST_REORDER_MS", "2000")),
+                        help="다중 게이트웨이 정렬 허용 지연(ms, 기본 INGEST_REORDER_MS), 0이면 도착 순 그대로")
+    args = parser.parse_args()
+
+    names = [s.strip() for s in args.sinks.split(",") if s.strip()]
+    unknown = [s for s in names if s not in SINKS]
+    if unknown:
+        sys.exit(f"unknown sinks: {', '.join(unknown)}")
+    share_group = args.share_group
+    if args.workers > 1 or share_group:
+        if "csv" in names:
+            # 메시지가 인스턴스별로 나뉘어 CSV 한 파일에 모이지 않음 (여러 프로세스가 같은 파일에 추가하는 것도 안전하지 않음)
+            sys.exit("csv sink cannot run in a shared subscription (use a separate --sinks csv instance)")
+        share_group = share_group or DEFAULT_SHARE_GROUP
+    if "db" in names or "metrics" in names:
+        from server.db import init_db, DB_BACKEND
+        try:
+            init_db()
+            print(f"DB ({DB_BACKEND}) init OK.")
+        except Exception as e:
+            print(f"DB init warning: {e}")
+
+    if args.workers <= 1:
+        run(names, share_group, args.stats_every, reorder_ms=args.reorder_ms)
+        return
+    import multiprocessing
+    procs = [
+        multiprocessing.Process(target=_worker, args=(i, names, share_group, args.stats_every, args.reorder_ms), name=f"ingest-w{i}")
+        for i in range(args.workers)
+    ]
+    for p in procs:
+        p.start()
+    print(f"ingest: {args.workers} workers in share group {share_group}")
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:  # 자식도 같은 SIGINT를 받아 남은 큐를 처리하고 종료
+            p.join()
+
+
+if __name__ == "__main__":
+    main()
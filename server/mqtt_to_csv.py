@@ -26,7 +26,7 @@ import paho.mqtt.client as mqtt
 
 MQTT_BROKER = os.environ.get("MQTT_BROKER", "localhost")
 MQTT_PORT = int(os.environ.get("MQTT_PORT", "1883"))
-MQTT_TOPIC = "aoii/readings"
+MQTT_TOPIC = "aoii/readings/#"  # 게이트웨이별 aoii/readings/<gateway_id> 포함
 CSV_FILENAME = "experiment_log_online.csv"
 
 # CSV 헤더 (transmission_delay_ms: 엣지→게이트웨이 전송 지연 ms)
@@ -1,5 +1,9 @@
 # server/mqtt_to_mysql.py
-"""MQTT 구독: aoii/readings 수신 시 RX 이벤트만 MySQL readings 테이블에 저장. insert 실패 시 지수 백오프 재시도."""
+"""
+MQTT 구독: aoii/readings 수신 시 RX 이벤트만 MySQL readings 테이블에 저장. insert 실패 시 지수 백오프 재시도.
+멱등 저장 (node_id, edge_ts_ms 키 — server/dedup.py): QoS 1 재전송·재시도로 같은 RX가 다시 와도 1행.
+MQTT_SHARE_GROUP이 있으면 MQTT v5 공유 구독 (여러 인스턴스가 메시지를 나눠 받음).
+"""
 import os
 import sys
 import json
@@ -19,28 +23,39 @@ if os.path.isfile(_env_path):
             if _line and not _line.startswith("#") and "=" in _line:
                 _k, _v = _line.split("=", 1)
                 _k, _v = _k.strip(), _v.strip()
-                if _k.startswith("MYSQL_") or _k.startswith("MQTT_"):
+                if _k.startswith(("MYSQL_", "MQTT_", "DB_", "SQLITE_")):
                     os.environ[_k] = _v
 
 import paho.mqtt.client as mqtt
-from server.db import init_db, insert_reading
+from server.db import init_db, insert_readings, upsert_sketch, DB_BACKEND
+from server.dedup import reading_row
+from server.quantile_sketch import SketchAggregator
 
 MQTT_BROKER = os.environ.get("MQTT_BROKER", "localhost")
 MQTT_PORT = int(os.environ.get("MQTT_PORT", "1883"))
-MQTT_TOPIC = "aoii/readings"
+MQTT_TOPIC = "aoii/readings/#"  # 게이트웨이별 aoii/readings/<gateway_id> 포함
+MQTT_SHARE_GROUP = os.environ.get("MQTT_SHARE_GROUP") or None
 
 # insert 재시도: 최대 횟수, 지수 백오프 초 단위
 INSERT_MAX_RETRIES = 5
 INSERT_BASE_DELAY = 1.0  # 1s, 2s, 4s, 8s, 16s
 
+# 지연·오차 분위수 스케치 (SKETCH_BUCKET_SEC 버킷, SKETCH_FLUSH_SEC마다 sketches 테이블에 저장)
+sketches = SketchAggregator(upsert_sketch)
 
-def insert_reading_with_retry(actual_t, actual_h, pred_t, pred_h):
-    """MySQL insert 실패 시 지수 백오프 재시도. 전부 실패 시 로그 후 예외 전파."""
+# RX 페이로드 → aoii 테이블 컬럼 순서 (gateway/gateway_aoii.py snapshot)
+AOII_FIELDS = ("aoii_age_s", "aoii_avg_s", "aoii_rolling_s", "aoii_error_time_s", "aoii_error_frac", "aoii_rolling_error_frac")
+
+
+def insert_reading_with_retry(row, aoii=()):
+    """
+    MySQL insert 실패 시 지수 백오프 재시도 (멱등이라 커밋 후 실패한 재시도도 1행). 저장 건수(0: 중복) 반환.
+    aoii 행은 reading과 한 트랜잭션 (insert_readings) — 중간 실패로 reading만 남고 aoii가 빠지지 않음.
+    """
     last_err = None
     for attempt in range(INSERT_MAX_RETRIES):
         try:
-            insert_reading(actual_t, actual_h, pred_t, pred_h)
-            return
+            return insert_readings([row], aoii=aoii)
         except Exception as e:
             last_err = e
             if attempt < INSERT_MAX_RETRIES - 1:
@@ -52,10 +67,11 @@ def insert_reading_with_retry(actual_t, actual_h, pred_t, pred_h):
                 raise last_err
 
 
-def on_connect(client, userdata, flags, rc):
+def on_connect(client, userdata, flags, rc, properties=None):
     if rc == 0:
         print("mqtt_to_mysql: MQTT connected.")
-        client.subscribe(MQTT_TOPIC)
+        topic = f"$share/{MQTT_SHARE_GROUP}/{MQTT_TOPIC}" if MQTT_SHARE_GROUP else MQTT_TOPIC
+        client.subscribe(topic, qos=1)
     else:
         print(f"mqtt_to_mysql: MQTT connect failed rc={rc}")
 
@@ -65,18 +81,17 @@ def on_message(client, userdata, msg):
         data = json.loads(msg.payload.decode("utf-8"))
         if data.get("event") != "RX":
             return
-        actual_t = float(data["actual_t"])
-        actual_h = float(data["actual_h"])
-        pred_t = float(data["pred_t"])
-        pred_h = float(data["pred_h"])
-        insert_reading_with_retry(actual_t, actual_h, pred_t, pred_h)
-        print(f"mqtt_to_mysql: saved 1 reading (T={actual_t:.2f}, H={actual_h:.2f})")
-        transmission_delay_ms = data.get("transmission_delay_ms")
-        if transmission_delay_ms is not None:
-            transmission_delay_ms = int(transmission_delay_ms)
-        insert_reading(actual_t, actual_h, pred_t, pred_h, transmission_delay_ms=transmission_delay_ms)
+        row = reading_row(data)
+        actual_t, actual_h, transmission_delay_ms = row[0], row[1], row[4]
+        aoii = [(data.get("node_id", "edge0"), *(float(data[k]) for k in AOII_FIELDS))] if "aoii_avg_s" in data else ()
+        if not insert_reading_with_retry(row, aoii):
+            print(f"mqtt_to_mysql: duplicate RX ignored ({row[5]}, {row[6]})")
+            return
         delay_str = f", delay={transmission_delay_ms}ms" if transmission_delay_ms is not None else ""
         print(f"mqtt_to_mysql: saved 1 reading (T={actual_t:.2f}, H={actual_h:.2f}{delay_str})")
+        now = time.time()
+        sketches.add_payload(now, data)
+        sketches.maybe_flush(now)
     except Exception as e:
         print(f"mqtt_to_mysql: on_message error: {e}")
 
@@ -84,11 +99,11 @@ def on_message(client, userdata, msg):
 def main():
     try:
         init_db()
-        print("DB (MySQL) init OK.")
+        print(f"DB ({DB_BACKEND}) init OK.")
     except Exception as e:
         print(f"DB init warning: {e}")
 
-    client = mqtt.Client()
+    client = mqtt.Client(protocol=mqtt.MQTTv5) if MQTT_SHARE_GROUP else mqtt.Client()
     client.on_connect = on_connect
     client.on_message = on_message
     try:
@@ -96,7 +111,10 @@ def main():
     except Exception as e:
         print(f"MQTT connect error: {e}")
         sys.exit(1)
-    client.loop_forever()
+    try:
+        client.loop_forever()
+    finally:
+        sketches.maybe_flush(time.time(), force=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,223 @@
+# server/quantile_sketch.py
+"""
+스트리밍 분위수 스케치 (DDSketch): transmission_delay_ms·예측 오차의 p50/p95/p99를 전체 정렬 없이.
+
+- 상대 오차 보장: 반환 분위수 x'에 대해 |x' - x| <= alpha·|x| (기본 alpha 1%)
+- 버킷 인덱스 i = ceil(log_gamma |v|), gamma = (1+alpha)/(1-alpha). 음수는 별도 저장소, |v| < MIN_VALUE는 0 버킷
+- 병합: 같은 alpha끼리 버킷 카운트 합 → 시간 버킷·게이트웨이(구독자) 간 합산이 정확히 결합 가능
+- 저장: SketchAggregator가 (시간 버킷, 지표)별 스케치를 메모리에 두고 주기적으로 sketches 테이블에 upsert
+"""
+import os
+import json
+import math
+import socket
+from datetime import datetime
+
+from server.dedup import edge_ts_ms
+
+DEFAULT_ALPHA = 0.01
+MAX_BINS = 2048         # 저장소별 최대 버킷 수 (초과 시 가장 작은 |v| 쪽 버킷을 합침)
+MIN_VALUE = 1e-9
+BUCKET_SEC = int(os.environ.get("SKETCH_BUCKET_SEC", "300"))
+FLUSH_SEC = float(os.environ.get("SKETCH_FLUSH_SEC", "10"))
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+# 수집 지표 (metric_values()가 RX 페이로드에서 추출)
+METRICS = ("delay_ms", "abs_error_t", "abs_error_h")
+
+
+class DDSketch:
+    def __init__(self, alpha=DEFAULT_ALPHA, max_bins=MAX_BINS):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.pos = {}
+        self.neg = {}
+        self.zero = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _index(self, v):
+        return math.ceil(math.log(v) / self._log_gamma)
+
+    def _value(self, i):
+        return 2.0 * self.gamma ** i / (self.gamma + 1)
+
+    def add(self, v, count=1):
+        v = float(v)
+        if v > MIN_VALUE:
+            store = self.pos
+        elif v < -MIN_VALUE:
+            store = self.neg
+        else:
+            store = None
+            self.zero += count
+        if store is not None:
+            i = self._index(abs(v))
+            store[i] = store.get(i, 0) + count
+            if len(store) > self.max_bins:
+                self._collapse(store, self.max_bins)
+        self.count += count
+        self.sum += v * count
+        self.min = min(self.min, v)
+        self.max = max(self.max, v)
+
+    @staticmethod
+    def _collapse(store, max_bins):
+        """버킷 수 초과: 인덱스가 가장 작은(|v| 최소) 버킷들을 그 위 버킷으로 합침 — 상위 분위수 정확도 유지."""
+        extra = len(store) - max_bins
+        if extra <= 0:
+            return
+        keys = sorted(store)
+        target = keys[extra]
+        store[target] += sum(store.pop(k) for k in keys[:extra])
+
+    def merge(self, other):
+        if abs(other.alpha - self.alpha) > 1e-12:
+            raise ValueError(f"cannot merge sketches with different alpha ({self.alpha} vs {other.alpha})")
+        for src, dst in ((other.pos, self.pos), (other.neg, self.neg)):
+            for i, c in src.items():
+                dst[i] = dst.get(i, 0) + c
+            if len(dst) > self.max_bins:
+                self._collapse(dst, self.max_bins)
+        self.zero += other.zero
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """q∈[0,1] 분위수. 비었으면 None."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = 0
+        for i in sorted(self.neg, reverse=True):  # 가장 작은 음수(큰 |v|)부터
+            seen += self.neg[i]
+            if seen > rank:
+                return -self._value(i)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for i in sorted(self.pos):
+            seen += self.pos[i]
+            if seen > rank:
+                return min(self._value(i), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "alpha": self.alpha, "count": self.count, "sum": self.sum, "zero": self.zero,
+            "min": self.min if self.count else None, "max": self.max if self.count else None,
+            "pos": {str(i): c for i, c in self.pos.items()}, "neg": {str(i): c for i, c in self.neg.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        sk = cls(alpha=d["alpha"])
+        sk.pos = {int(i): c for i, c in d["pos"].items()}
+        sk.neg = {int(i): c for i, c in d["neg"].items()}
+        sk.zero, sk.count, sk.sum = d["zero"], d["count"], d["sum"]
+        if sk.count:
+            sk.min, sk.max = d["min"], d["max"]
+        return sk
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+
+def metric_values(data):
+    """RX 페이로드 → (지표, 값) 목록. 지연은 엣지 타임스탬프가 있을 때만 (wrap 등 잘못된 값이면 제외 — server/dedup)."""
+    out = []
+    delay = data.get("transmission_delay_ms")
+    if delay is not None and (data.get("edge_ts_ms") is None or edge_ts_ms(data) is not None):
+        out.append(("delay_ms", float(delay)))
+    if data.get("actual_t") is not None and data.get("pred_t") is not None:
+        out.append(("abs_error_t", abs(float(data["actual_t"]) - float(data["pred_t"]))))
+    if data.get("actual_h") is not None and data.get("pred_h") is not None:
+        out.append(("abs_error_h", abs(float(data["actual_h"]) - float(data["pred_h"]))))
+    return out
+
+
+def bucket_start(ts, bucket_sec=BUCKET_SEC):
+    return datetime.fromtimestamp(int(ts // bucket_sec) * bucket_sec)
+
+
+def default_source():
+    """스케치 출처 (구독자 인스턴스). 게이트웨이·구독자가 여럿이면 출처별 행을 조회 시 병합."""
+    return os.environ.get("SKETCH_SOURCE") or f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SketchAggregator:
+    """
+    수집 경로용: (bucket_start, metric) → DDSketch. add()는 RX마다 O(1),
+    maybe_flush()는 FLUSH_SEC마다 변경된 버킷만 upsert_sketch로 저장 (같은 출처·버킷 행은 덮어씀).
+    지난 시간 버킷은 저장 후 메모리에서 제거.
+    """
+
+    def __init__(self, upsert_sketch, source=None, bucket_sec=BUCKET_SEC, flush_sec=FLUSH_SEC, alpha=DEFAULT_ALPHA):
+        self.upsert_sketch = upsert_sketch
+        self.source = source or default_source()
+        self.bucket_sec = bucket_sec
+        self.flush_sec = flush_sec
+        self.alpha = alpha
+        self.sketches = {}
+        self.dirty = set()
+        self.last_flush = 0.0
+
+    def add(self, now, metric, value):
+        key = (bucket_start(now, self.bucket_sec), metric)
+        sk = self.sketches.get(key)
+        if sk is None:
+            sk = self.sketches[key] = DDSketch(self.alpha)
+        sk.add(value)
+        self.dirty.add(key)
+
+    def add_payload(self, now, data):
+        for metric, value in metric_values(data):
+            self.add(now, metric, value)
+
+    def maybe_flush(self, now, force=False):
+        if not force and now - self.last_flush < self.flush_sec:
+            return 0
+        current = bucket_start(now, self.bucket_sec)
+        for key in sorted(self.dirty):
+            sk = self.sketches[key]
+            self.upsert_sketch(key[0], key[1], self.source, sk.to_json(), sk.count)
+        flushed = len(self.dirty)
+        self.dirty.clear()
+        for key in [k for k in self.sketches if k[0] < current]:
+            del self.sketches[key]
+        self.last_flush = now
+        return flushed
+
+
+def merged(rows, alpha=DEFAULT_ALPHA):
+    """저장된 스케치 JSON 목록 → 병합 DDSketch."""
+    out = DDSketch(alpha)
+    for text in rows:
+        out.merge(DDSketch.from_json(text))
+    return out
+
+
+def summarize(sketch, quantiles=DEFAULT_QUANTILES):
+    return {
+        "count": sketch.count,
+        "sum": sketch.sum,
+        "mean": round(sketch.sum / sketch.count, 4) if sketch.count else None,
+        "min": sketch.min if sketch.count else None,
+        "max": sketch.max if sketch.count else None,
+        "quantiles": {f"p{q * 100:g}": (round(v, 4) if v is not None else None)
+                      for q, v in ((q, sketch.quantile(q)) for q in quantiles)},
+    }
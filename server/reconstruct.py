@@ -0,0 +1,241 @@
+# server/reconstruct.py
+"""
+EST 시계열 복원: 저장된 RX 이벤트(실측값)만으로 게이트웨이 미러를 재생해 분 단위 추정값을 다시 만든다.
+실행: python server/reconstruct.py --csv experiment_log_online.csv --from 2026-02-25T13:00 --to 2026-02-25T18:00
+      python server/reconstruct.py --db --node node-01 --from ... --to ... [--out est.csv]
+
+- 재생 규칙은 게이트웨이와 같음: RX k-1 처리 후 EST_INTERVAL_SEC마다 est_tick, 다음 RX에서 on_rx (gateway_node.NodeMirror)
+  틱 시각은 이상적인 60초 간격 (t_{k-1} + 60·j < t_k). 실제 게이트웨이의 폴링 지터는 재현하지 않음
+- 같은 초기 가중치·RX 순서면 결과는 항상 같다 (GatewayMLP 그대로 사용, int8 미러도 가능)
+- 체크포인트: RX CHECKPOINT_EVERY건마다 미러 상태(가중치·윈도우·예측) 사본 → 임의 구간 조회는 가까운 체크포인트부터 재생
+  (--update-scope last/last2면 고정 층은 공유하고 학습 층만 복사)
+- 틱 일정·time_n은 RX 간격 배열에서 한 번에 계산 (루프는 모델 갱신 자체만)
+- 엣지 재부팅(동기화 요청)에 따른 미러 초기화는 저장되지 않으므로 반영하지 않음
+"""
+import os
+import sys
+import csv
+import copy
+import argparse
+import threading
+from datetime import datetime, timezone, timedelta
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _p in (ROOT, os.path.join(ROOT, "gateway"), os.path.join(ROOT, "analysis")):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+from gateway_params import new_model
+from gateway_node import NodeMirror, EST_INTERVAL_SEC, ONLINE_LR
+
+CHECKPOINT_EVERY = int(os.environ.get("RECONSTRUCT_CHECKPOINT_EVERY", "256"))
+LV_TIMEZONE = timezone(timedelta(hours=-8))  # gateway.LV_TIMEZONE
+LV_OFFSET_SEC = -8 * 3600
+DAY_SEC = 86400
+EVENT_EST, EVENT_RX = 0, 1
+
+
+def time_of_day(ts):
+    """unix 초 배열 → 게이트웨이 time_n (LV 시각의 초 단위 절사 / 86400)."""
+    return np.floor(np.mod(np.asarray(ts, dtype=np.float64) + LV_OFFSET_SEC, DAY_SEC)) / DAY_SEC
+
+
+class Reconstructor:
+    """
+    노드 1개의 RX 이벤트 → EST 시계열. extend()로 RX를 뒤에 이어 붙일 수 있고 (기존 체크포인트 유지),
+    series()는 스레드 안전 (재생 1개씩).
+    """
+
+    def __init__(self, model_factory=None, checkpoint_every=CHECKPOINT_EVERY, est_interval=EST_INTERVAL_SEC,
+                 lr=ONLINE_LR):
+        self.model_factory = model_factory or (lambda: new_model(verbose=False))
+        self.checkpoint_every = checkpoint_every
+        self.est_interval = float(est_interval)
+        self.lr = lr
+        self.ts = np.empty(0, dtype=np.float64)
+        self.actual = np.empty((0, 2), dtype=np.float64)
+        self.checkpoints = {}  # RX 인덱스 k → RX k 직전(앞 EST 틱까지 반영) 미러 상태
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.ts.size
+
+    def extend(self, ts, actual_t, actual_h):
+        """RX 이벤트 추가 (unix 초, 시간순. 기존 마지막 RX 이후여야 함)."""
+        ts = np.asarray(ts, dtype=np.float64)
+        if ts.size == 0:
+            return
+        if np.any(np.diff(ts) < 0) or (self.ts.size and ts[0] < self.ts[-1]):
+            raise ValueError("RX events must be appended in time order")
+        with self.lock:
+            self.ts = np.concatenate([self.ts, ts])
+            self.actual = np.concatenate([self.actual, np.column_stack([actual_t, actual_h])])
+
+    # -----------------------------------------------------
+    # 체크포인트
+    # -----------------------------------------------------
+    def _new_mirror(self):
+        return NodeMirror("replay", self.model_factory(), now=0.0)
+
+    def _save(self, k, node):
+        self.checkpoints[k] = (copy.deepcopy(node.model), node.pred.copy(), node.total_tx)
+
+    def _restore(self, k):
+        """RX k 직전 상태의 미러. 체크포인트 k가 없으면 초기 가중치 (k == 0)."""
+        node = self._new_mirror()
+        if k in self.checkpoints:
+            model, pred, total_tx = self.checkpoints[k]
+            node.model, node.pred, node.total_tx = copy.deepcopy(model), pred.copy(), total_tx
+        return node
+
+    def _ticks(self, k, until):
+        """RX k-1 이후 RX k 전까지의 EST 틱 시각 (마지막 RX 이후면 until 전까지)."""
+        start = self.ts[k - 1]
+        stop = self.ts[k] if k < self.ts.size else max(until, start)
+        n = int(np.ceil((stop - start) / self.est_interval)) - 1
+        return start + self.est_interval * np.arange(1, max(n, 0) + 1)
+
+    # -----------------------------------------------------
+    # 조회
+    # -----------------------------------------------------
+    def series(self, since, until):
+        """
+        [since, until) (unix 초)의 시계열. 반환 dict of ndarray:
+        ts, event(0=EST, 1=RX), pred_t, pred_h (RX 행은 갱신 전 예측 = RX 페이로드 pred), actual_t, actual_h (EST 행 NaN).
+        """
+        with self.lock:
+            return self._series(float(since), float(until))
+
+    def _series(self, since, until):
+        n_rx = self.ts.size
+        out_ts, out_ev, out_pred, out_act = [], [], [], []
+        if n_rx == 0 or until <= self.ts[0]:
+            return _pack(out_ts, out_ev, out_pred, out_act)
+        # since 직전 RX(또는 첫 RX)부터 재생 → 그 이하 가장 가까운 체크포인트
+        first = max(int(np.searchsorted(self.ts, since, side="right")) - 1, 0)
+        k0 = max((k for k in self.checkpoints if k <= first), default=0)
+        node = self._restore(k0)
+        every = self.checkpoint_every
+
+        for k in range(k0, n_rx + 1):
+            if k > k0:  # 체크포인트 k0는 이미 틱 반영 (틱은 since 이전이라 출력 없음)
+                ticks = self._ticks(k, until)
+                if ticks.size:
+                    tn = time_of_day(ticks)
+                    emit = (ticks >= since) & (ticks < until)
+                    for t, time_n, e in zip(ticks, tn, emit):
+                        pred = node.est_tick(float(time_n), float(t))
+                        if e:
+                            out_ts.append(t)
+                            out_ev.append(EVENT_EST)
+                            out_pred.append((float(pred[0]), float(pred[1])))
+                            out_act.append((np.nan, np.nan))
+            if k == n_rx or self.ts[k] >= until:
+                break
+            if k % every == 0 and k not in self.checkpoints:
+                self._save(k, node)
+            t = float(self.ts[k])
+            at, ah = float(self.actual[k, 0]), float(self.actual[k, 1])
+            pred_t, pred_h, _, _ = node.on_rx(at, ah, float(time_of_day(t)), t, lr=self.lr)
+            if t >= since:
+                out_ts.append(t)
+                out_ev.append(EVENT_RX)
+                out_pred.append((pred_t, pred_h))
+                out_act.append((at, ah))
+        return _pack(out_ts, out_ev, out_pred, out_act)
+
+
+def _pack(ts, ev, pred, act):
+    pred = np.array(pred, dtype=np.float64).reshape(-1, 2)
+    act = np.array(act, dtype=np.float64).reshape(-1, 2)
+    return {
+        "ts": np.array(ts, dtype=np.float64), "event": np.array(ev, dtype=np.int8),
+        "pred_t": pred[:, 0], "pred_h": pred[:, 1], "actual_t": act[:, 0], "actual_h": act[:, 1],
+    }
+
+
+# =========================================================
+# RX 이벤트 로드
+# =========================================================
+def rx_from_csv(path):
+    """mqtt_to_csv / 엣지 시리얼 로그 CSV → (ts, actual_t, actual_h). 타임스탬프는 LV 시각."""
+    from experiment_analytics import parse_log, STATUS_SKIP
+    cols = parse_log(path)
+    if cols is None:
+        raise ValueError(f"unknown log format: {path}")
+    rx = cols["status"] != STATUS_SKIP
+    return cols["ts"][rx].astype(np.float64) - LV_OFFSET_SEC, cols["actual_t"][rx], cols["actual_h"][rx]
+
+
+def rx_from_db(node_id=None, after=None, since=None):
+    """
+    readings 테이블 → (ts, actual_t, actual_h, 마지막 행 키). created_at은 서버 로컬 시각 (iter_readings 키셋 순서).
+    node_id: 그 노드 행만 (Reconstructor는 노드 1개 — 여러 노드가 섞이면 윈도우가 뒤섞임). None이면 전체 (단일 노드 DB).
+    """
+    from server.db import iter_readings
+    ts, at, ah = [], [], []
+    for row in iter_readings(since=since, after=after, node_id=node_id):
+        created = datetime.fromisoformat(row["created_at"])
+        ts.append(created.timestamp())
+        at.append(row["actual_temp"])
+        ah.append(row["actual_humidity"])
+        after = (created, row["id"])
+    return np.array(ts), np.array(at), np.array(ah), after
+
+
+def write_csv(series, f):
+    """mqtt_to_csv와 같은 컬럼 (Timestamp는 LV 시각)."""
+    writer = csv.writer(f)
+    writer.writerow(["Timestamp", "Time_n", "Event", "Actual_T", "Actual_H", "Pred_T", "Pred_H"])
+    tn = time_of_day(series["ts"])
+    for i in range(series["ts"].size):
+        wall = datetime.fromtimestamp(series["ts"][i], LV_TIMEZONE).strftime("%Y-%m-%d %H:%M:%S")
+        rx = series["event"][i] == EVENT_RX
+        writer.writerow([
+            wall, f"{tn[i]:.6f}", "RX" if rx else "EST",
+            f"{series['actual_t'][i]:.2f}" if rx else "", f"{series['actual_h'][i]:.2f}" if rx else "",
+            f"{series['pred_t'][i]:.2f}", f"{series['pred_h'][i]:.2f}",
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruct the gateway EST series from stored RX events")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--csv", help="RX 로그 CSV (mqtt_to_csv / edge_log)")
+    src.add_argument("--db", action="store_true", help="readings 테이블 (DB_BACKEND)")
+    parser.add_argument("--node", help="--db: 이 node_id의 RX만 (여러 노드가 저장된 DB는 필수)")
+    parser.add_argument("--from", dest="since", help="시작 (ISO, CSV는 LV 시각 / DB는 서버 시각). 기본: 첫 RX")
+    parser.add_argument("--to", dest="until", help="끝 (ISO). 기본: 마지막 RX")
+    parser.add_argument("--quantized", action="store_true", help="int8 미러")
+    parser.add_argument("--predictor", default="mlp", help="미러 예측기 (mlp / ar / holt / kalman, GATEWAY_PREDICTOR)")
+    parser.add_argument("--update-scope", default="full", help="온라인 학습 범위 (last / last2 / full, GATEWAY_UPDATE_SCOPE)")
+    parser.add_argument("--out", help="출력 CSV (기본 stdout)")
+    args = parser.parse_args()
+
+    if args.csv:
+        ts, at, ah = rx_from_csv(args.csv)
+        to_unix = lambda s: datetime.fromisoformat(s).replace(tzinfo=LV_TIMEZONE).timestamp()  # noqa: E731
+    else:
+        ts, at, ah, _ = rx_from_db(node_id=args.node)
+        to_unix = lambda s: datetime.fromisoformat(s).timestamp()  # noqa: E731
+    engine = Reconstructor(lambda: new_model(verbose=False, quantized=args.quantized, predictor=args.predictor,
+                                           update_scope=args.update_scope))
+    engine.extend(ts, at, ah)
+    if not len(engine):
+        sys.exit("no RX events")
+    since = to_unix(args.since) if args.since else engine.ts[0]
+    until = to_unix(args.until) if args.until else engine.ts[-1] + 1
+    series = engine.series(since, until)
+    if args.out:
+        with open(args.out, "w", newline="") as f:
+            write_csv(series, f)
+    else:
+        write_csv(series, sys.stdout)
+    n_rx = int(series["event"].sum())
+    print(f"{series['ts'].size} rows ({n_rx} RX, {series['ts'].size - n_rx} EST)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
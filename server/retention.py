@@ -0,0 +1,54 @@
+# server/retention.py
+"""
+readings / edge_log 보존 작업: 롤업(1m/1h) → 보존 기간이 지난 원본 파티션 DROP(SQLite는 DELETE) → 오래된 1m 롤업 삭제.
+실행: python server/retention.py            (1회, cron용)
+      python server/retention.py --every 3600 (루프)
+"""
+import os
+import sys
+import time
+import json
+import argparse
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _project_root)
+
+# .env 로드
+_env_path = os.path.join(_project_root, ".env")
+if os.path.isfile(_env_path):
+    with open(_env_path, "r", encoding="utf-8") as _f:
+        for _line in _f:
+            _line = _line.strip()
+            if _line and not _line.startswith("#") and "=" in _line:
+                _k, _v = _line.split("=", 1)
+                _k, _v = _k.strip(), _v.strip()
+                if _k.startswith(("MYSQL_", "DB_", "SQLITE_", "RETENTION_", "PARTITION_")):
+                    os.environ[_k] = _v
+
+from server.db import init_db, run_maintenance, DB_BACKEND
+from server.rollup import RETENTION_RAW_DAYS, RETENTION_MINUTE_DAYS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="readings/edge_log rollup + retention")
+    parser.add_argument("--raw-days", type=int, default=RETENTION_RAW_DAYS, help="원본 보존 일수")
+    parser.add_argument("--minute-days", type=int, default=RETENTION_MINUTE_DAYS, help="1m 롤업 보존 일수")
+    parser.add_argument("--every", type=float, default=0, help="반복 주기 (초, 0=1회)")
+    args = parser.parse_args()
+
+    init_db()
+    while True:
+        try:
+            report = run_maintenance(raw_days=args.raw_days, minute_days=args.minute_days)
+            print(f"retention ({DB_BACKEND}): {json.dumps(report, ensure_ascii=False)}")
+        except Exception as e:
+            print(f"retention: error: {e}")
+            if not args.every:
+                sys.exit(1)
+        if not args.every:
+            return
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
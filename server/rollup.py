@@ -0,0 +1,200 @@
+# server/rollup.py
+"""
+readings / edge_log 보존(retention)·롤업 공통 정의. server/db.py(MySQL)와 server/db_sqlite.py가 같이 사용.
+
+- 원본: MySQL은 created_at 일 단위 RANGE 파티션 (SQLite는 파티션이 없어 created_at 범위 DELETE)
+- 롤업: <table>_1m, <table>_1h. 합계·최대·최소만 저장 → 버킷끼리 다시 합칠 수 있음 (1h는 1m에서 계산)
+- 워터마크(rollup_state): 롤업이 끝난 시각. 그 이전 원본만 삭제 대상, 통계 = 1h 롤업(워터마크 전) + 원본(워터마크 후)
+- 조회 해상도: 구간 길이·원본 보존 기간에 따라 raw / 1m / 1h 선택 (pick_resolution)
+- 늦은 데이터(백필 등 워터마크 이전 created_at): 새 행만 집계해 기존 버킷에 병합 (late_rollup_insert + rollup_merge)
+"""
+import os
+from datetime import datetime, timedelta
+
+RETENTION_RAW_DAYS = int(os.environ.get("RETENTION_RAW_DAYS", "30"))
+RETENTION_MINUTE_DAYS = int(os.environ.get("RETENTION_MINUTE_DAYS", "180"))
+PARTITION_DAYS_AHEAD = int(os.environ.get("PARTITION_DAYS_AHEAD", "7"))
+ROLLUP_CHUNK = timedelta(days=1)   # 롤업 1회 처리 구간 (트랜잭션 크기 제한)
+RAW_SERIES_MAX = timedelta(hours=6)
+MINUTE_SERIES_MAX = timedelta(days=7)
+SERIES_MAX_ROWS = 5000
+ROLLUP_GRACE = timedelta(minutes=5)  # 커밋이 늦은 행을 위해 롤업은 (now - GRACE)의 정시까지만
+RESOLUTIONS = ("1m", "1h")
+
+# 테이블 → [(롤업 컬럼, 타입, 원본 집계식, 롤업 재집계식)]
+ROLLUP_SPEC = {
+    "readings": [
+        ("n", "BIGINT", "COUNT(*)", "SUM(n)"),
+        ("sum_actual_temp", "DOUBLE", "SUM(actual_temp)", "SUM(sum_actual_temp)"),
+        ("sum_actual_humidity", "DOUBLE", "SUM(actual_humidity)", "SUM(sum_actual_humidity)"),
+        ("sum_pred_temp", "DOUBLE", "SUM(pred_temp)", "SUM(sum_pred_temp)"),
+        ("sum_pred_humidity", "DOUBLE", "SUM(pred_humidity)", "SUM(sum_pred_humidity)"),
+        ("sum_abs_error_temp", "DOUBLE", "SUM(ABS(error_temp))", "SUM(sum_abs_error_temp)"),
+        ("sum_abs_error_humidity", "DOUBLE", "SUM(ABS(error_humidity))", "SUM(sum_abs_error_humidity)"),
+        ("max_abs_error_temp", "DOUBLE", "MAX(ABS(error_temp))", "MAX(max_abs_error_temp)"),
+        ("max_abs_error_humidity", "DOUBLE", "MAX(ABS(error_humidity))", "MAX(max_abs_error_humidity)"),
+        ("delay_n", "BIGINT", "COUNT(transmission_delay_ms)", "SUM(delay_n)"),
+        ("sum_delay_ms", "DOUBLE", "COALESCE(SUM(transmission_delay_ms), 0)", "SUM(sum_delay_ms)"),
+        ("first_at", "DATETIME", "MIN(created_at)", "MIN(first_at)"),
+        ("last_at", "DATETIME", "MAX(created_at)", "MAX(last_at)"),
+    ],
+    "edge_log": [
+        ("n", "BIGINT", "COUNT(*)", "SUM(n)"),
+        ("n_triggered", "BIGINT", "SUM(triggered)", "SUM(n_triggered)"),
+        ("sum_abs_error_temp", "DOUBLE", "SUM(ABS(error_temp))", "SUM(sum_abs_error_temp)"),
+        ("sum_abs_error_humidity", "DOUBLE", "COALESCE(SUM(ABS(error_humidity)), 0)", "SUM(sum_abs_error_humidity)"),
+        ("inference_n", "BIGINT", "COUNT(inference_time_us)", "SUM(inference_n)"),
+        ("sum_inference_time_us", "DOUBLE", "COALESCE(SUM(inference_time_us), 0)", "SUM(sum_inference_time_us)"),
+        ("min_free_heap", "BIGINT", "MIN(free_heap)", "MIN(min_free_heap)"),
+        ("first_at", "DATETIME", "MIN(created_at)", "MIN(first_at)"),
+        ("last_at", "DATETIME", "MAX(created_at)", "MAX(last_at)"),
+    ],
+}
+TABLES = tuple(ROLLUP_SPEC)
+# get_stats에 필요한 readings 합계
+STATS_COLUMNS = (
+    "n", "sum_actual_temp", "sum_actual_humidity", "sum_abs_error_temp", "sum_abs_error_humidity", "first_at", "last_at",
+)
+
+
+def floor_hour(dt):
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def floor_day(dt):
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def rollup_ranges(start, end, chunk=ROLLUP_CHUNK):
+    """[start, end)를 chunk 단위 구간으로 (정시 경계만 넘겨받음)."""
+    while start < end:
+        stop = min(start + chunk, end)
+        yield start, stop
+        start = stop
+
+
+def aggregate_select(table, bucket_expr, from_rollup=False, after_id=False):
+    """
+    버킷별 집계 SELECT (자리표시자 {ph} 2개: 구간 시작·끝). 컬럼 순서: b, ROLLUP_SPEC[table].
+    from_rollup=False: 원본 테이블에서 / True: <table>_1m 롤업을 재집계 (1h 생성용).
+    after_id=True: 원본 중 id > {ph}(3번째 자리표시자)인 행만 (늦은 데이터 병합용).
+    bucket_expr: 백엔드별 시각 버킷 식 ({col} = 시각 컬럼).
+    """
+    spec = ROLLUP_SPEC[table]
+    if from_rollup:
+        exprs, source, time_col = [s[3] for s in spec], f"{table}_1m", "bucket_start"
+    else:
+        exprs, source, time_col = [s[2] for s in spec], table, "created_at"
+    cols = ", ".join(f"{e} AS {s[0]}" for e, s in zip(exprs, spec))
+    return (
+        f"SELECT {bucket_expr.format(col=time_col)} AS b, {cols} FROM {source} "
+        f"WHERE {time_col} >= {{ph}} AND {time_col} < {{ph}}{' AND id > {ph}' if after_id else ''} GROUP BY b"
+    )
+
+
+def rollup_insert(table, resolution, bucket_expr):
+    """<table>_<resolution> 롤업 INSERT ... SELECT (1m은 원본, 1h는 1m에서). upsert 절은 백엔드가 붙인다."""
+    cols = ", ".join(rollup_columns(table))
+    select = aggregate_select(table, bucket_expr, from_rollup=resolution != "1m")
+    return f"INSERT INTO {table}_{resolution} (bucket_start, {cols}) {select}"
+
+
+def late_rollup_insert(table, resolution, bucket_expr):
+    """늦은 원본 행(id > 기준)만 <table>_<resolution>으로 집계하는 INSERT ... SELECT. 1h도 원본에서 바로 (병합 절은 백엔드)."""
+    cols = ", ".join(rollup_columns(table))
+    select = aggregate_select(table, bucket_expr, after_id=True)
+    return f"INSERT INTO {table}_{resolution} (bucket_start, {cols}) {select}"
+
+
+def rollup_merge(table, new, greatest, least):
+    """
+    기존 롤업 행에 새 집계를 더하는 upsert SET 목록. new: 새 값 참조 형식 ("VALUES({c})" / "excluded.{c}"),
+    greatest/least: 백엔드의 2항 최대·최소 함수. 재집계식이 SUM이면 합, MAX/MIN이면 큰/작은 값 (NULL은 값 없음).
+    """
+    out = []
+    for c, _, _, reagg in ROLLUP_SPEC[table]:
+        v = new.format(c=c)
+        kind = reagg.split("(", 1)[0]
+        if kind == "SUM":
+            expr = f"COALESCE({c}, 0) + COALESCE({v}, 0)"
+        else:
+            expr = f"{greatest if kind == 'MAX' else least}(COALESCE({c}, {v}), COALESCE({v}, {c}))"
+        out.append(f"{c} = {expr}")
+    return ", ".join(out)
+
+
+def rollup_columns(table):
+    return [s[0] for s in ROLLUP_SPEC[table]]
+
+
+def rollup_end(now):
+    """이번 실행에서 롤업할 끝 시각 (정시)."""
+    return floor_hour(now - ROLLUP_GRACE)
+
+
+def raw_cutoff(now, watermark, raw_days=RETENTION_RAW_DAYS):
+    """원본 삭제 경계 (일 단위): 보존 기간이 지났고 롤업도 끝난 날까지만. 워터마크가 없으면 None."""
+    if watermark is None:
+        return None
+    return min(floor_day(now - timedelta(days=raw_days)), floor_day(watermark))
+
+
+def stats_select(from_rollup):
+    """get_stats용 readings 합계 SELECT (컬럼 STATS_COLUMNS). 롤업은 readings_1h, WHERE는 호출 측."""
+    spec = {s[0]: s for s in ROLLUP_SPEC["readings"]}
+    i, source = (3, "readings_1h") if from_rollup else (2, "readings")
+    return f"SELECT {', '.join(f'{spec[c][i]} AS {c}' for c in STATS_COLUMNS)} FROM {source}"
+
+
+def pick_resolution(since, until, now=None, raw_days=RETENTION_RAW_DAYS, minute_days=RETENTION_MINUTE_DAYS):
+    """구간 [since, until) → "raw" | "1m" | "1h". 원본이 이미 삭제됐거나 구간이 길면 롤업."""
+    now = now or datetime.now()
+    span = until - since
+    if span <= RAW_SERIES_MAX and since >= now - timedelta(days=raw_days):
+        return "raw"
+    if span <= MINUTE_SERIES_MAX and since >= now - timedelta(days=minute_days):
+        return "1m"
+    return "1h"
+
+
+def combine_stats(rollup_row, raw_row):
+    """
+    1h 롤업 합계(워터마크 이전) + 원본 집계(이후) → get_stats() 형식 (first_at/last_at은 백엔드 값 그대로).
+    두 행 모두 키 = STATS_COLUMNS (stats_select 결과).
+    """
+    rows = [r for r in (rollup_row, raw_row) if r and r.get("n")]
+    total = int(sum(r["n"] for r in rows))
+    if total == 0:
+        return {"total": 0}
+
+    def s(key):
+        return float(sum(r[key] for r in rows))
+
+    return {
+        "total": total,
+        "avg_temp": round(s("sum_actual_temp") / total, 2),
+        "avg_humidity": round(s("sum_actual_humidity") / total, 2),
+        "mae_temp": round(s("sum_abs_error_temp") / total, 4),
+        "mae_humidity": round(s("sum_abs_error_humidity") / total, 4),
+        "first_at": min(r["first_at"] for r in rows),
+        "last_at": max(r["last_at"] for r in rows),
+    }
+
+
+def series_row(bucket_start, row):
+    """롤업 버킷 1개 → get_recent()와 같은 키 (버킷 평균, 오차는 |오차| 평균)."""
+    n = int(row["n"])
+
+    def mean(key):
+        return float(row[key]) / n
+
+    return {
+        "created_at": bucket_start,
+        "n": n,
+        "actual_temp": mean("sum_actual_temp"),
+        "actual_humidity": mean("sum_actual_humidity"),
+        "pred_temp": mean("sum_pred_temp"),
+        "pred_humidity": mean("sum_pred_humidity"),
+        "error_temp": mean("sum_abs_error_temp"),
+        "error_humidity": mean("sum_abs_error_humidity"),
+    }
@@ -0,0 +1,160 @@
+# server/stream_hub.py
+"""
+대시보드 실시간 스트림 (SSE): 프로세스 내 MQTT 구독(aoii/readings) → 접속 클라이언트별 링 버퍼로 fan-out.
+
+- 메시지 1건당 비용은 접속 클라이언트 수에만 비례 (DB 조회 없음)
+- 클라이언트마다 크기 STREAM_BUFFER의 deque. 가득 찬 상태에서 새 이벤트가 오면 느린 클라이언트로 보고 끊는다
+  (브라우저 EventSource는 재접속 후 /api/recent로 다시 채움)
+- MQTT 구독은 첫 스트림 요청(또는 /metrics 스크래핑) 때 시작 (paho-mqtt 미설치 시 스트림만 비활성).
+  구독·디코딩은 server/ingest.py Ingestor의 stream 싱크로: paho 콜백 스레드는 큐에 넣기만 하고 fan-out은 싱크 스레드
+- 게이트웨이 생존 이벤트(SILENT)도 여기서 노드별 상태로 유지 → Prometheus aoii_node_silent (다음 RX가 해제)
+"""
+import os
+import time
+import threading
+from collections import deque
+
+from server.ingest import Ingestor, stream_sink, mqtt
+
+STREAM_BUFFER = int(os.environ.get("STREAM_BUFFER", "256"))
+STREAM_MAX_CLIENTS = int(os.environ.get("STREAM_MAX_CLIENTS", "100"))
+KEEPALIVE_SEC = 15.0
+CONNECT_RETRY_SEC = float(os.environ.get("STREAM_CONNECT_RETRY_SEC", "30"))  # 연결 실패 후 재시도 간격
+
+
+class StreamClient:
+    __slots__ = ("buffer", "cond", "dropped", "closed")
+
+    def __init__(self, maxlen):
+        self.buffer = deque(maxlen=maxlen)
+        self.cond = threading.Condition()
+        self.dropped = False
+        self.closed = False
+
+
+class StreamHub:
+    """publish()는 MQTT 스레드, events()는 요청 스레드(클라이언트당 1개)에서 호출."""
+
+    def __init__(self, buffer_size=STREAM_BUFFER, max_clients=STREAM_MAX_CLIENTS):
+        self.buffer_size = buffer_size
+        self.max_clients = max_clients
+        self.clients = set()
+        self.lock = threading.Lock()
+        self.published = 0
+        self.dropped_clients = 0
+        self.silent = {}  # node_id → 조용함 여부 (SILENT를 한 번이라도 받은 노드만)
+        self.silent_events = 0
+        self._ingestor = None
+        self._starting = False  # 한 스레드가 브로커에 연결 중
+        self._retry_at = 0.0
+
+    def subscribe(self):
+        """새 클라이언트. 최대 접속 수 초과 시 None."""
+        with self.lock:
+            if len(self.clients) >= self.max_clients:
+                return None
+            client = StreamClient(self.buffer_size)
+            self.clients.add(client)
+            return client
+
+    def unsubscribe(self, client):
+        with self.lock:
+            self.clients.discard(client)
+        with client.cond:
+            client.closed = True
+            client.cond.notify()
+
+    def publish(self, event, data):
+        """SSE 프레임을 1번만 직렬화해 모든 클라이언트 버퍼에 넣음. 버퍼가 찬 클라이언트는 끊는다."""
+        frame = f"event: {event}\ndata: {data}\n\n"
+        with self.lock:
+            clients = list(self.clients)
+        self.published += 1
+        for client in clients:
+            with client.cond:
+                if len(client.buffer) >= self.buffer_size:
+                    client.dropped = True
+                else:
+                    client.buffer.append(frame)
+                client.cond.notify()
+            if client.dropped:
+                self.dropped_clients += 1
+                with self.lock:
+                    self.clients.discard(client)
+
+    def events(self, client, keepalive=KEEPALIVE_SEC):
+        """SSE 응답 본문 제너레이터. 연결이 끊기면(GeneratorExit) 구독 해제."""
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                with client.cond:
+                    if not client.buffer and not client.dropped and not client.closed:
+                        client.cond.wait(keepalive)
+                    frames = list(client.buffer)
+                    client.buffer.clear()
+                    dropped, closed = client.dropped, client.closed
+                if frames:
+                    yield "".join(frames)
+                elif dropped:
+                    yield "event: dropped\ndata: {}\n\n"
+                    return
+                elif closed:
+                    return
+                else:
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe(client)
+
+    # -----------------------------------------------------
+    # MQTT 입력
+    # -----------------------------------------------------
+    def ingest(self, data, text):
+        """디코딩된 메시지 1건 (Ingestor stream 싱크 스레드)."""
+        event = data.get("event", "message")
+        node_id = data.get("node_id")
+        if event == "SILENT":
+            self.silent[node_id] = True
+            self.silent_events += 1
+        elif event == "RX" and node_id in self.silent:
+            self.silent[node_id] = False
+        self.publish(event, text)
+
+    def start_mqtt(self):
+        """
+        MQTT 구독 스레드 시작 (1회). 성공/이미 실행 중이면 True.
+        연결(블로킹)은 lock 밖에서 한 스레드만 — 그동안 subscribe/publish는 막히지 않고, 다른 호출은 바로 False.
+        실패 후 CONNECT_RETRY_SEC 동안은 다시 시도하지 않음 (/metrics 스크래핑마다 연결 대기 방지).
+        """
+        with self.lock:
+            if self._ingestor is not None:
+                return True
+            if mqtt is None or self._starting or time.monotonic() < self._retry_at:
+                return False
+            self._starting = True
+        ingestor = None
+        try:
+            ingestor = Ingestor([stream_sink(self)]).start()
+            ingestor.connect()
+        except Exception as e:
+            print(f"stream: MQTT connect error: {e}")
+            if ingestor is not None:
+                ingestor.stop()
+            with self.lock:
+                self._starting = False
+                self._retry_at = time.monotonic() + CONNECT_RETRY_SEC
+            return False
+        with self.lock:
+            self._ingestor = ingestor
+            self._starting = False
+        return True
+
+    def stats(self):
+        with self.lock:
+            clients = len(self.clients)
+        out = {
+            "clients": clients, "published": self.published, "dropped_clients": self.dropped_clients,
+            "silent_nodes": sorted(n for n, v in self.silent.items() if v), "silent_events": self.silent_events,
+        }
+        if self._ingestor is not None:
+            out["ingest"] = self._ingestor.stats()
+        return out
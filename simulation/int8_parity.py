@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+int8 미러 양단 일치 검증: edge_node/mlp_int8.h(C)와 gateway/gateway_MLP_int8.py(numpy)를 같은 입력으로 돌려
+스텝별 예측과 최종 가중치·bias가 비트 단위로 같은지 비교. 엣지 대신 호스트 C 컴파일러(gcc)로 빌드.
+실행: python simulation/int8_parity.py [--steps 300] [--cc gcc] [--keep]
+
+- 상수: gateway_params.py 값으로 int8_c_constants() (Pre_train.py int8 출력과 같은 코드)
+- 입력: 센서값은 전송처럼 소수 2자리(정수/100, float32 나눗셈), 2스텝마다 online_update (δ 초과 전송 흉내),
+  매 스텝 예측값 + time_n을 윈도우에 shift (MLP_edge_sensor_int8.ino loop와 같은 순서)
+- 일치하면 0, 어긋나면 첫 불일치 위치를 출력하고 1로 종료
+"""
+import os
+import sys
+import math
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "gateway"))
+
+import gateway_params as P
+from gateway_MLP_Logic import WINDOW_SIZE, N_FEATURES
+from gateway_MLP_int8 import int8_c_constants
+
+LR = 0.01  # MLP_edge_sensor_int8.ino lr (Pre_train.py EDGE_LR)
+UPDATE_EVERY = 2
+
+_DRIVER = r"""
+#include <stdio.h>
+#include <stdint.h>
+#include <math.h>
+#define WINDOW_SIZE %(window)d
+#define N_FEATURES %(features)d
+#define N_IN (WINDOW_SIZE * N_FEATURES)
+#define N_H1 64
+#define N_H2 32
+#define N_OUT 2
+float window_buf[WINDOW_SIZE][N_FEATURES];
+#include "consts.h"
+#include "%(header)s"
+
+int main(void) {
+  for (int w = 0; w < WINDOW_SIZE; w++) {
+    window_buf[w][0] = y_mean[0]; window_buf[w][1] = y_mean[1]; window_buf[w][2] = 0.5f;
+  }
+  for (int i = 0; i < %(steps)d; i++) {
+    forward_int8();
+    float pt = pred_scaled[0] * y_std[0] + y_mean[0], ph = pred_scaled[1] * y_std[1] + y_mean[1];
+    int t100 = 2400 + (int)(80 * sin(i / 9.0)), h100 = 3500 + (int)(400 * cos(i / 13.0));
+    if (i %% %(every)d == 0) update_model_int8((float)t100 / 100.0f, (float)h100 / 100.0f);
+    float tn = (float)((i * 60) %% 86400) / 86400.0f;
+    for (int w = 0; w < WINDOW_SIZE - 1; w++)
+      for (int f = 0; f < N_FEATURES; f++) window_buf[w][f] = window_buf[w + 1][f];
+    window_buf[WINDOW_SIZE - 1][0] = pt; window_buf[WINDOW_SIZE - 1][1] = ph; window_buf[WINDOW_SIZE - 1][2] = tn;
+    printf("pred %%a %%a\n", pt, ph);
+  }
+  for (int i = 0; i < N_IN; i++) for (int j = 0; j < N_H1; j++) printf("w1 %%d\n", W1_q[i][j]);
+  for (int j = 0; j < N_H1; j++) printf("b1 %%d\n", (int)B1_q[j]);
+  for (int i = 0; i < N_H1; i++) for (int j = 0; j < N_H2; j++) printf("w2 %%d\n", W2_q[i][j]);
+  for (int j = 0; j < N_H2; j++) printf("b2 %%d\n", (int)B2_q[j]);
+  for (int i = 0; i < N_H2; i++) for (int j = 0; j < N_OUT; j++) printf("w3 %%d\n", W3_q[i][j]);
+  for (int j = 0; j < N_OUT; j++) printf("b3 %%d\n", (int)B3_q[j]);
+  return 0;
+}
+"""
+
+
+def _parse(lines):
+    """"pred <hex> <hex>" → float 튜플, "<이름> <정수>" → 정수 (출력 형식 차이 없이 값으로 비교)."""
+    out = []
+    for line in lines:
+        kind, *vals = line.split()
+        if kind == "pred":
+            out.append((kind, tuple(float.fromhex(v) for v in vals)))
+        else:
+            out.append((kind, int(vals[0])))
+    return out
+
+
+def run_c(steps, cc, workdir):
+    a = lambda v: np.asarray(v)
+    consts = int8_c_constants(a(P.W1), a(P.B1), a(P.W2), a(P.B2), a(P.W3), a(P.B3),
+                              a(P.X_MEAN), a(P.X_STD), a(P.Y_MEAN), a(P.Y_STD), P.QUANT_SCALES, LR)
+    with open(os.path.join(workdir, "consts.h"), "w") as f:
+        f.write(consts + "\n")
+    src, exe = os.path.join(workdir, "parity.c"), os.path.join(workdir, "parity")
+    with open(src, "w") as f:
+        f.write(_DRIVER % {
+            "window": WINDOW_SIZE, "features": N_FEATURES, "steps": steps, "every": UPDATE_EVERY,
+            "header": os.path.join(ROOT, "edge_node", "mlp_int8.h"),
+        })
+    subprocess.run([cc, "-O2", "-std=c99", "-o", exe, src, "-lm"], check=True)
+    return _parse(subprocess.run([exe], check=True, capture_output=True, text=True).stdout.splitlines())
+
+
+def run_python(steps):
+    m = P.new_model(verbose=False, quantized=True)
+    m.window_buf[:] = [m.y_mean[0], m.y_mean[1], np.float32(0.5)]
+    hundred, day = np.float32(100), np.float32(86400)
+    lines = []
+    for i in range(steps):
+        p = m.predict()
+        pt, ph = np.float32(p[0]), np.float32(p[1])
+        t100 = 2400 + int(80 * math.sin(i / 9.0))
+        h100 = 3500 + int(400 * math.cos(i / 13.0))
+        if i % UPDATE_EVERY == 0:
+            m.online_update(np.float32(t100) / hundred, np.float32(h100) / hundred, lr=LR)
+        m.shift_window(pt, ph, np.float32((i * 60) % 86400) / day)
+        lines.append(f"pred {float(pt).hex()} {float(ph).hex()}")
+    for name in ("w1", "b1", "w2", "b2", "w3", "b3"):
+        lines += [f"{name} {int(v)}" for v in getattr(m, name).ravel()]
+    return _parse(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="int8 미러 C/Python 비트 단위 일치 검증")
+    parser.add_argument("--steps", type=int, default=300, help="예측 스텝 수 (절반은 online_update)")
+    parser.add_argument("--cc", default=os.environ.get("CC", "gcc"), help="C 컴파일러")
+    parser.add_argument("--keep", action="store_true", help="생성한 C 소스·바이너리 디렉터리 유지")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="aoii-int8-parity-")
+    try:
+        c_out = run_c(args.steps, args.cc, workdir)
+        py_out = run_python(args.steps)
+    finally:
+        if args.keep:
+            print(f"(C 소스: {workdir})")
+        else:
+            for name in os.listdir(workdir):
+                os.remove(os.path.join(workdir, name))
+            os.rmdir(workdir)
+
+    if len(c_out) != len(py_out):
+        print(f"MISMATCH: C {len(c_out)} values vs Python {len(py_out)}")
+        return 1
+    for i, (c, py) in enumerate(zip(c_out, py_out)):
+        if c != py:
+            print(f"MISMATCH at #{i}: C {c} vs Python {py}")
+            return 1
+    n_params = sum(1 for kind, _ in c_out if kind != "pred")
+    print(f"OK: {args.steps} predictions ({args.steps // UPDATE_EVERY} updates) and {n_params} int8/int32 params "
+          f"bit-identical (C: {args.cc}, edge_node/mlp_int8.h)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+OTA 가중치 델타 전송 시뮬레이션: 게이트웨이 미러 → (모의 LoRa) → 엣지 수신기.
+실행: python simulation/ota_push.py [--threshold 1e-3,5e-3,1e-2] [--loss 0.05] [--ber 1e-4] [--int8]
+
+- 목표 가중치: 기본 가중치를 데이터셋 트레이스로 --finetune-steps 만큼 온라인 학습한 결과 (재학습 대용)
+  또는 --target <npz> (w1, b1, w2, b2, w3, b3 배열)
+- 임계값마다: 페이로드·청크 수, 양방향 바이트(bytes on air), 에어타임, 재전송, 목표와의 잔차,
+  커밋 후 미러 == 엣지 여부, 전체 float32 파라미터를 그대로 보낼 때(dense)와 비교
+"""
+import os
+import sys
+import json
+import copy
+import argparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "gateway"))
+sys.path.insert(0, os.path.join(ROOT, "simulation"))
+
+from gateway_params import new_model
+from gateway_ota import (
+    PARAM_NAMES, CHUNK_SIZE, EdgeOtaReceiver, push_update, chunk_frames,
+)
+from lora_link import SimulatedLoRaLink, lora_airtime_ms
+from virtual_fleet import load_trace
+
+FINETUNE_LR = 0.01
+
+
+def finetuned_target(steps, quantized=False, seed=0):
+    """기본 모델을 트레이스 구간으로 온라인 학습한 가중치 (엣지 재학습 결과 대용)."""
+    temp, hum = load_trace()
+    start = np.random.default_rng(seed).integers(0, max(1, temp.size - steps))
+    model = new_model(verbose=False, quantized=quantized)
+    for i in range(start, start + steps):
+        pred = model.predict()
+        model.online_update(float(temp[i]), float(hum[i]), lr=FINETUNE_LR)
+        model.shift_window(float(pred[0]), float(pred[1]), (i % 1440) / 1440.0)
+    return {name: getattr(model, name).copy() for name in PARAM_NAMES}
+
+
+def dense_baseline(model):
+    """전체 파라미터 전송 시 DATA 프레임 바이트·에어타임 (ACK 제외)."""
+    payload = b"".join(getattr(model, name).tobytes() for name in PARAM_NAMES)
+    frames = chunk_frames(0, payload, CHUNK_SIZE)
+    return {
+        "payload_bytes": len(payload),
+        "frames": len(frames),
+        "down_bytes": sum(len(f) for f in frames),
+        "airtime_ms": round(sum(lora_airtime_ms(len(f)) for f in frames), 1),
+    }
+
+
+def residual(model, target):
+    return max(float(np.abs(np.asarray(target[n], dtype=np.float64) - getattr(model, n)).max()) for n in PARAM_NAMES)
+
+
+def run_once(target, threshold, loss, ber, quantized, rounds, seed):
+    mirror = new_model(verbose=False, quantized=quantized)
+    edge = copy.deepcopy(mirror)
+    link = SimulatedLoRaLink(EdgeOtaReceiver(edge), loss=loss, ber=ber, seed=seed)
+    pushes = []
+    for r in range(rounds):
+        stats = push_update(link, mirror, target, update_id=r + 1, threshold=threshold)
+        pushes.append(stats)
+        if not stats["committed"] or not stats["entries"]:
+            break
+    in_sync = all(np.array_equal(getattr(mirror, n), getattr(edge, n)) for n in PARAM_NAMES)
+    return {
+        "threshold": threshold,
+        "committed": all(p["committed"] for p in pushes),
+        "entries": sum(p["entries"] for p in pushes),
+        "payload_bytes": sum(p["payload_bytes"] for p in pushes),
+        "chunks": sum(p.get("chunks", 0) for p in pushes),
+        "frames": sum(p["frames"] for p in pushes),
+        "retries": sum(p["retries"] for p in pushes),
+        "bytes_on_air": link.bytes_on_air,
+        "airtime_ms": round(link.stats["airtime_ms"], 1),
+        "lost": link.stats["lost"],
+        "corrupted": link.stats["corrupted"],
+        "residual_max": round(residual(mirror, target), 6),
+        "mirror_equals_edge": in_sync,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OTA 가중치 델타 전송 시뮬레이션 (모의 LoRa)")
+    parser.add_argument("--threshold", default="1e-3,5e-3,1e-2", help="델타 선택 임계값 (쉼표 구분)")
+    parser.add_argument("--loss", type=float, default=0.05, help="프레임 유실 확률 (양방향)")
+    parser.add_argument("--ber", type=float, default=0.0, help="비트 오류율")
+    parser.add_argument("--rounds", type=int, default=1, help="같은 목표로 반복 전송 (잔차 축소)")
+    parser.add_argument("--finetune-steps", type=int, default=720, help="목표 가중치 생성용 온라인 학습 스텝")
+    parser.add_argument("--target", default=None, help="목표 가중치 .npz (w1..b3)")
+    parser.add_argument("--int8", action="store_true", help="int8 미러 (MLP_edge_sensor_int8.ino)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.target:
+        with np.load(args.target) as z:
+            target = {name: z[name] for name in PARAM_NAMES}
+    else:
+        target = finetuned_target(args.finetune_steps, quantized=args.int8, seed=args.seed)
+
+    base = new_model(verbose=False, quantized=args.int8)
+    result = {
+        "dense": dense_baseline(base),
+        "initial_residual_max": round(residual(base, target), 6),
+        "runs": [
+            run_once(target, float(t), args.loss, args.ber, args.int8, args.rounds, args.seed)
+            for t in args.threshold.split(",")
+        ],
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    d = result["dense"]
+    print(f"dense: {d['payload_bytes']:,} B payload, {d['frames']} frames, {d['down_bytes']:,} B on air, {d['airtime_ms']:,} ms")
+    print(f"initial max |target - mirror| = {result['initial_residual_max']}")
+    print("| threshold | entries | payload B | frames (retry) | bytes on air | airtime ms | residual max | synced |")
+    print("|---|---|---|---|---|---|---|---|")
+    for r in result["runs"]:
+        print(f"| {r['threshold']:g} | {r['entries']:,} | {r['payload_bytes']:,} | {r['frames']} ({r['retries']}) "
+              f"| {r['bytes_on_air']:,} | {r['airtime_ms']:,} | {r['residual_max']} "
+              f"| {'yes' if r['mirror_equals_edge'] and r['committed'] else 'NO'} |")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
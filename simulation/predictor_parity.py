@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+경량 예측기 양단 일치 검증: edge_node/predictors.h(C)와 gateway/gateway_predictors.py(numpy)를 같은 입력으로 돌려
+백엔드(AR / Holt / Kalman)별 스텝 예측이 비트 단위로 같은지 비교. 엣지 대신 호스트 C 컴파일러(gcc)로 빌드.
+실행: python simulation/predictor_parity.py [--steps 2000] [--backend ar,holt,kalman] [--cc gcc] [--keep]
+
+- 상수: gateway_params.py Y_MEAN / Y_STD (float32 값을 16진 리터럴로 넘김), WINDOW_SIZE
+- 입력: int8_parity.py와 같은 센서 트레이스 (전송처럼 소수 2자리 = 정수/100, float32 나눗셈),
+  UPDATE_EVERY 스텝마다 predictor_update (δ 초과 전송 흉내), 매 스텝 예측값으로 predictor_shift (predictors.h 사용 순서)
+- 일치하면 0, 어긋나면 백엔드·스텝·값을 출력하고 1로 종료
+"""
+import os
+import sys
+import math
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "gateway"))
+
+import gateway_params as P
+from gateway_MLP_Logic import WINDOW_SIZE
+from gateway_predictors import BACKENDS
+
+UPDATE_EVERY = 2
+
+_DRIVER = r"""
+#include <stdio.h>
+#include <stdbool.h>
+#include <math.h>
+#define %(define)s
+#define WINDOW_SIZE %(window)d
+float y_mean[2] = {%(y_mean)s};
+float y_std[2] = {%(y_std)s};
+#include "%(header)s"
+
+int main(void) {
+  predictor_init();
+  for (int i = 0; i < %(steps)d; i++) {
+    float pt, ph;
+    predictor_forward(&pt, &ph);
+    int t100 = 2400 + (int)(80 * sin(i / 9.0)), h100 = 3500 + (int)(400 * cos(i / 13.0));
+    if (i %% %(every)d == 0) predictor_update((float)t100 / 100.0f, (float)h100 / 100.0f);
+    predictor_shift(pt, ph);
+    printf("%%a %%a\n", pt, ph);
+  }
+  return 0;
+}
+"""
+
+
+def _c_floats(values):
+    return ", ".join(f"{float(v).hex()}f" for v in np.asarray(values, dtype=np.float32))
+
+
+def run_c(backend, steps, cc, workdir):
+    src, exe = os.path.join(workdir, f"{backend}.c"), os.path.join(workdir, backend)
+    with open(src, "w") as f:
+        f.write(_DRIVER % {
+            "define": f"PREDICTOR_{backend.upper()}", "window": WINDOW_SIZE, "steps": steps, "every": UPDATE_EVERY,
+            "y_mean": _c_floats(P.Y_MEAN), "y_std": _c_floats(P.Y_STD),
+            "header": os.path.join(ROOT, "edge_node", "predictors.h"),
+        })
+    # predictors.h의 fp-contract=off pragma와 같은 조건을 명령줄에서도 (컴파일러가 pragma를 무시해도 FMA 금지)
+    subprocess.run([cc, "-O2", "-std=c99", "-ffp-contract=off", "-o", exe, src, "-lm"], check=True)
+    out = subprocess.run([exe], check=True, capture_output=True, text=True).stdout.splitlines()
+    return [tuple(float.fromhex(v) for v in line.split()) for line in out]
+
+
+def run_python(backend, steps):
+    m = P.new_model(verbose=False, predictor=backend)
+    hundred = np.float32(100)
+    out = []
+    for i in range(steps):
+        p = m.predict()
+        pt, ph = np.float32(p[0]), np.float32(p[1])
+        t100 = 2400 + int(80 * math.sin(i / 9.0))
+        h100 = 3500 + int(400 * math.cos(i / 13.0))
+        if i % UPDATE_EVERY == 0:
+            m.online_update(np.float32(t100) / hundred, np.float32(h100) / hundred)
+        m.shift_window(pt, ph, np.float32(0))
+        out.append((float(pt), float(ph)))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="경량 예측기 C/Python 비트 단위 일치 검증")
+    parser.add_argument("--steps", type=int, default=2000, help="예측 스텝 수 (절반은 predictor_update)")
+    parser.add_argument("--backend", default=",".join(BACKENDS), help="쉼표 구분 (ar, holt, kalman)")
+    parser.add_argument("--cc", default=os.environ.get("CC", "gcc"), help="C 컴파일러")
+    parser.add_argument("--keep", action="store_true", help="생성한 C 소스·바이너리 디렉터리 유지")
+    args = parser.parse_args()
+
+    backends = [b for b in args.backend.split(",") if b]
+    unknown = [b for b in backends if b not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backend: {', '.join(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix="aoii-predictor-parity-")
+    failed = 0
+    try:
+        for backend in backends:
+            c_out = run_c(backend, args.steps, args.cc, workdir)
+            py_out = run_python(backend, args.steps)
+            bad = next((i for i, (c, py) in enumerate(zip(c_out, py_out)) if c != py), None)
+            if len(c_out) != len(py_out) or bad is not None:
+                failed += 1
+                if bad is None:
+                    print(f"MISMATCH {backend}: C {len(c_out)} steps vs Python {len(py_out)}")
+                else:
+                    print(f"MISMATCH {backend} at step {bad}: C {c_out[bad]} vs Python {py_out[bad]}")
+            else:
+                print(f"OK {backend}: {args.steps} predictions ({args.steps // UPDATE_EVERY} updates) bit-identical")
+    finally:
+        if args.keep:
+            print(f"(C 소스: {workdir})")
+        else:
+            for name in os.listdir(workdir):
+                os.remove(os.path.join(workdir, name))
+            os.rmdir(workdir)
+    if not failed:
+        print(f"(C: {args.cc}, edge_node/predictors.h)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+가상 엣지 노드 부하 발생기: MLP_edge_sensor.ino loop()의 Python 포트를 수천 개 노드로 돌려
+gateway.py를 pty(가상 시리얼)로 구동. gateway_edge.ino와 같은 "Received: ..." 라인을 쓰고 회신을 기다린다.
+
+실행: python simulation/virtual_fleet.py --nodes 1000 --minutes 30 --speedup 60 [--loss 0.02] [--airtime-ms 60]
+
+- 센서 값: dataset/Pre_Train_Dataset.csv를 1분 간격으로 보간한 트레이스 (노드마다 시작 위치·노이즈 다름)
+- 엣지 루프: forward → δ 판정(오차·하트비트) → 전송 → 1초 회신 대기(시간 동기화) → update_model → shift_window
+- 부팅 시 waitForTimeSync(): "0.0,0.0" 전송 후 3초 대기, 실패 시 1초 뒤 재시도
+- 무선 구간: 에어타임이 겹친 프레임은 충돌, --loss/--downlink-loss 확률로 유실,
+  게이트웨이 노드(gateway_edge.ino)가 회신 대기 중 도착한 프레임은 유실 (반이중)
+- 시간: 가상 시간 기준. --speedup 배속으로 실시간 재생 (inf = 최대 속도). 엣지의 1초 회신 창도 배속 적용
+- 엣지 타임스탬프는 펌웨어 정수 폭으로 자름: 기본 64비트 (MLP_edge_sensor.ino uint64_t),
+  --edge-ts-bits 32는 unsigned long으로 만드는 구 펌웨어(0.3~0.7)처럼 2^32 ms마다 wrap
+"""
+import os
+import sys
+import csv
+import tty
+import time
+import heapq
+import json
+import select
+import signal
+import argparse
+import subprocess
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GATEWAY_DIR = os.path.join(ROOT, "gateway")
+sys.path.insert(0, GATEWAY_DIR)
+
+from gateway_params import new_model
+
+DATASET_PATH = os.path.join(ROOT, "dataset", "Pre_Train_Dataset.csv")
+
+# MLP_edge_sensor.ino 상수
+BETA_TEMP = 0.5
+BETA_HUM = 3.0
+EPSILON = 0.001
+HEARTBEAT_INTERVAL = 600.0   # s
+LOOP_SLEEP = 60.0            # esp_light_sleep 60 s
+REPLY_WAIT = 1.0             # 전송 후 회신 대기 (s)
+SYNC_WAIT = 3.0              # waitForTimeSync 회신 대기 (s)
+SYNC_RETRY_DELAY = 1.0
+UTC_OFFSET_SEC = 28800       # UTC-8
+EDGE_TS_BITS = 64            # edge_timestamp_ms 정수 폭 (구 펌웨어 unsigned long = 32)
+# gateway_edge.ino: 회신 송신 전 delay(50)
+RELAY_REPLY_DELAY = 0.05
+
+
+def load_trace(path=DATASET_PATH, max_gap_sec=3600):
+    """데이터셋 → 1분 간격 (temp, hum) float32 배열. 측정 공백은 max_gap_sec로 압축 후 선형 보간."""
+    ts, temp, hum = [], [], []
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            ts.append(np.datetime64(row["timestamp"], "s").astype(np.int64))
+            temp.append(float(row["temperature"]))
+            hum.append(float(row["humidity"]))
+    ts = np.array(ts, dtype=np.float64)
+    gaps = np.clip(np.diff(ts, prepend=ts[0]), 0, max_gap_sec)
+    t_rel = np.cumsum(gaps)
+    grid = np.arange(0, t_rel[-1], 60.0)
+    return np.interp(grid, t_rel, temp).astype(np.float32), np.interp(grid, t_rel, hum).astype(np.float32)
+
+
+class VirtualEdgeNode:
+    """MLP_edge_sensor.ino 1대. 모델 수식은 GatewayMLP(forward/update_model과 동일 구조)를 그대로 사용."""
+
+    def __init__(self, node_id, trace_t, trace_h, offset, boot_time, rng, noise=0.02, ts_bits=EDGE_TS_BITS):
+        self.node_id = node_id
+        self.ts_mask = (1 << ts_bits) - 1
+        self.trace_t = trace_t
+        self.trace_h = trace_h
+        self.offset = offset
+        self.boot_time = boot_time
+        self.rng = rng
+        self.noise = noise
+        self.model = new_model(verbose=False)
+        self.beta_temp = BETA_TEMP
+        self.beta_hum = BETA_HUM
+
+        self.last_sync_unix = 0
+        self.sync_millis = 0
+        self.last_send_millis = 0
+        self.synced = False
+        self.pending = None  # 전송 후 회신 대기 중인 (pred_t, pred_h, cur_t, cur_h, time_n)
+
+        self.tx = 0
+        self.heartbeats = 0
+        self.sync_ok = 0
+        self.sync_lost = 0
+
+    def millis(self, vnow):
+        return int((vnow - self.boot_time) * 1000)
+
+    def get_time_n(self, vnow):
+        if self.last_sync_unix == 0:
+            return 0.5
+        current_unix = self.last_sync_unix + (self.millis(vnow) - self.sync_millis) // 1000
+        local_sec = (current_unix - UTC_OFFSET_SEC) % 86400
+        return local_sec / 86400.0
+
+    def read_sensor(self, vnow):
+        i = (self.offset + int((vnow - self.boot_time) // 60)) % len(self.trace_t)
+        t = float(self.trace_t[i]) + self.rng.normal(0.0, self.noise)
+        h = float(self.trace_h[i]) + self.rng.normal(0.0, self.noise * 5)
+        return t, h
+
+    def apply_sync_reply(self, vnow, reply):
+        """apply_sync_reply(): "ts" 또는 "ts,beta_t,beta_h" (적응형 δ)."""
+        fields = str(reply).split(",")
+        self.last_sync_unix = int(fields[0])
+        self.sync_millis = self.millis(vnow)
+        if len(fields) >= 3:
+            bt, bh = float(fields[1]), float(fields[2])
+            if bt > 0 and bh > 0:
+                self.beta_temp, self.beta_hum = bt, bh
+
+    def sync_frame(self):
+        return f"{self.node_id},0.0,0.0"
+
+    def on_sync_reply(self, vnow, reply):
+        if reply is not None and len(str(reply)) > 8:
+            self.apply_sync_reply(vnow, reply)
+            self.synced = True
+            self.last_send_millis = self.millis(vnow + SYNC_RETRY_DELAY)  # setup(): delay(1000) 후
+            return True
+        return False
+
+    def step(self, vnow):
+        """loop() 앞부분: 센서 → forward → δ 판정. 전송할 프레임 문자열 또는 None(SKIP)."""
+        cur_t, cur_h = self.read_sensor(vnow)
+        time_n = self.get_time_n(vnow)
+        pred = self.model.predict()
+        pred_t, pred_h = float(pred[0]), float(pred[1])
+
+        err_t = abs(cur_t - pred_t)
+        err_h = abs(cur_h - pred_h)
+        is_heartbeat = self.millis(vnow) - self.last_send_millis >= HEARTBEAT_INTERVAL * 1000
+        send = (err_t >= self.beta_temp - EPSILON) or (err_h >= self.beta_hum - EPSILON) or self.last_sync_unix == 0 or is_heartbeat
+
+        if not send:
+            self.model.shift_window(pred_t, pred_h, time_n)
+            return None
+
+        if is_heartbeat and err_t <= self.beta_temp and err_h <= self.beta_hum:
+            self.heartbeats += 1
+        self.tx += 1
+        self.last_send_millis = self.millis(vnow)
+        edge_timestamp_ms = (self.last_sync_unix * 1000 + (self.millis(vnow) - self.sync_millis)) & self.ts_mask
+        self.pending = (pred_t, pred_h, cur_t, cur_h, time_n)
+        return f"{self.node_id},{edge_timestamp_ms},{cur_t:.2f},{cur_h:.2f}"
+
+    def on_data_reply(self, vnow, reply):
+        """loop() 뒷부분: 회신이 있으면 시간 재동기화, 회신 여부와 무관하게 update_model → shift_window."""
+        pred_t, pred_h, cur_t, cur_h, time_n = self.pending
+        self.pending = None
+        if reply is not None and len(str(reply)) > 5:
+            self.apply_sync_reply(vnow, reply)
+            self.sync_ok += 1
+        else:
+            self.sync_lost += 1
+        self.model.online_update(cur_t, cur_h, lr=0.01)
+        self.model.shift_window(pred_t, pred_h, time_n)
+
+
+class PtyGatewayLink:
+    """gateway_edge.ino 역할: pty master에 "Received: ..." 출력, 게이트웨이(pty slave 사용)의 회신 라인 수신."""
+
+    def __init__(self, spawn=True, log_path=None, poll_interval="0.005", extra_env=None):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)  # 에코·개행 변환 끄기 (pyserial 연결 전)
+        self.port = os.ttyname(self.slave)
+        self._buf = b""
+        self.proc = None
+        self._log = None
+        if spawn:
+            env = dict(os.environ)
+            env.update({"SERIAL_PORT": self.port, "GATEWAY_POLL_INTERVAL": str(poll_interval)})
+            env.update(extra_env or {})
+            self._log = open(log_path, "w") if log_path else subprocess.DEVNULL
+            self.proc = subprocess.Popen(
+                [sys.executable, os.path.join(GATEWAY_DIR, "gateway.py")],
+                env=env, stdout=self._log, stderr=subprocess.STDOUT, cwd=ROOT,
+            )
+
+    def _write(self, text):
+        os.write(self.master, (text + "\r\n").encode())
+
+    def _drain(self):
+        """이전 교환의 늦은 회신 등 남은 라인 버림. 버린 라인 수 반환."""
+        dropped = 0
+        while select.select([self.master], [], [], 0)[0]:
+            self._buf += os.read(self.master, 65536)
+        while b"\n" in self._buf:
+            _, self._buf = self._buf.split(b"\n", 1)
+            dropped += 1
+        return dropped
+
+    def _read_line(self, deadline):
+        while b"\n" not in self._buf:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            if not select.select([self.master], [], [], remaining)[0]:
+                return None
+            self._buf += os.read(self.master, 65536)
+        line, self._buf = self._buf.split(b"\n", 1)
+        return line.decode("utf-8", errors="ignore").strip()
+
+    def exchange(self, frame, window_real):
+        """프레임 1개 전달 후 window_real초 동안 회신 대기. (회신 라인 "ts[,beta_t,beta_h]" 또는 None, 지연 s, 늦은 회신 수)."""
+        late = self._drain()
+        t0 = time.perf_counter()
+        self._write("Received: " + frame)
+        deadline = t0 + window_real
+        reply = None
+        while reply is None:
+            line = self._read_line(deadline)
+            if line is None:
+                break
+            if line.split(",")[0].isdigit():  # income.toInt()가 읽는 시각 필드가 있는 라인
+                reply = line
+        latency = time.perf_counter() - t0
+        if reply is not None:
+            self._write(f"Sync sent: {reply}")
+        self._write("-----------------------")
+        return reply, latency, late
+
+    def wait_ready(self, timeout=30.0):
+        """게이트웨이가 시리얼을 열고 회신할 때까지 기본 노드 동기화 요청을 반복."""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if self.proc is not None and self.proc.poll() is not None:
+                raise RuntimeError(f"gateway exited (rc={self.proc.returncode})")
+            reply, _, _ = self.exchange("0.0,0.0", 0.5)
+            if reply is not None:
+                return True
+        return False
+
+    def close(self):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.send_signal(signal.SIGINT)
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        if self._log not in (None, subprocess.DEVNULL):
+            self._log.close()
+        os.close(self.master)
+        os.close(self.slave)
+
+
+class FleetSimulator:
+    WAKE, AIR_END = 0, 1
+
+    def __init__(self, link, n_nodes, speedup=60.0, airtime=0.06, uplink_loss=0.0, downlink_loss=0.0,
+                 collision_loss=1.0, boot_spread=600.0, wake_jitter=0.5, seed=1, trace=None, ts_bits=EDGE_TS_BITS):
+        self.link = link
+        self.speedup = speedup
+        self.airtime = airtime
+        self.uplink_loss = uplink_loss
+        self.downlink_loss = downlink_loss
+        self.collision_loss = collision_loss
+        self.wake_jitter = wake_jitter  # light sleep 복귀·센서 읽기 시간 편차 (s)
+        self.rng = np.random.default_rng(seed)
+
+        trace_t, trace_h = trace if trace is not None else load_trace()
+        self.v0 = time.time()
+        self.nodes = []
+        self._events = []
+        self._seq = 0
+        for i in range(n_nodes):
+            boot = self.v0 + self.rng.uniform(0, max(boot_spread, LOOP_SLEEP))  # 부팅 시점 분산
+            node = VirtualEdgeNode(
+                f"n{i:05d}", trace_t, trace_h, int(self.rng.integers(len(trace_t))), boot,
+                np.random.default_rng(seed * 100003 + i), ts_bits=ts_bits,
+            )
+            self.nodes.append(node)
+            self._push(boot, self.WAKE, i)
+
+        self._on_air = []           # [(end, frame_record)]
+        self._relay_busy_until = 0.0
+        self.stats = {k: 0 for k in (
+            "sync_frames", "data_frames", "lost_collision", "lost_uplink", "lost_relay_busy",
+            "delivered", "reply_ok", "reply_timeout", "reply_lost_downlink", "late_replies",
+        )}
+        self.latencies = []
+        self.max_lag = 0.0
+
+    def _push(self, vtime, kind, idx, data=None):
+        self._seq += 1
+        heapq.heappush(self._events, (vtime, self._seq, kind, idx, data))
+
+    def _pace(self, vtime, r0):
+        if self.speedup == float("inf"):
+            return
+        target = r0 + (vtime - self.v0) / self.speedup
+        delay = target - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            self.max_lag = max(self.max_lag, -delay)
+
+    def _next_wake(self, vtime):
+        return vtime + self.rng.uniform(0, self.wake_jitter)
+
+    def _transmit(self, vnow, idx, frame, kind):
+        rec = {"idx": idx, "frame": frame, "kind": kind, "collided": False}
+        for end, other in self._on_air:
+            if end > vnow:
+                other["collided"] = True
+                rec["collided"] = True
+        self._on_air = [(e, o) for e, o in self._on_air if e > vnow]
+        self._on_air.append((vnow + self.airtime, rec))
+        self._push(vnow + self.airtime, self.AIR_END, idx, rec)
+        self.stats["sync_frames" if kind == "sync" else "data_frames"] += 1
+
+    def _deliver(self, vnow, rec):
+        """무선 구간 통과 여부 판정 → 게이트웨이 교환 → 엣지 기준 회신 수신 여부."""
+        wait = SYNC_WAIT if rec["kind"] == "sync" else REPLY_WAIT
+        if rec["collided"] and self.rng.random() < self.collision_loss:
+            self.stats["lost_collision"] += 1
+            return None, wait
+        if self.rng.random() < self.uplink_loss:
+            self.stats["lost_uplink"] += 1
+            return None, wait
+        if vnow < self._relay_busy_until:
+            self.stats["lost_relay_busy"] += 1
+            return None, wait
+
+        window_real = max((REPLY_WAIT - RELAY_REPLY_DELAY - self.airtime) / self.speedup, 0.002)
+        reply, latency, late = self.link.exchange(rec["frame"], window_real)
+        self.stats["delivered"] += 1
+        self.stats["late_replies"] += late
+        self.latencies.append(latency)
+        latency_v = latency * self.speedup if self.speedup != float("inf") else latency
+        self._relay_busy_until = vnow + min(latency_v, REPLY_WAIT) + RELAY_REPLY_DELAY + self.airtime
+
+        if reply is None:
+            self.stats["reply_timeout"] += 1
+            return None, wait
+        if self.rng.random() < self.downlink_loss:
+            self.stats["reply_lost_downlink"] += 1
+            return None, wait
+        self.stats["reply_ok"] += 1
+        return reply, min(latency_v + RELAY_REPLY_DELAY + self.airtime, wait)
+
+    def run(self, minutes):
+        v_end = self.v0 + minutes * 60.0
+        r0 = time.perf_counter()
+        while self._events and self._events[0][0] < v_end:
+            vnow, _, kind, idx, rec = heapq.heappop(self._events)
+            self._pace(vnow, r0)
+            node = self.nodes[idx]
+            if kind == self.WAKE:
+                if not node.synced:
+                    self._transmit(vnow, idx, node.sync_frame(), "sync")
+                else:
+                    frame = node.step(vnow)
+                    if frame is None:
+                        self._push(self._next_wake(vnow + LOOP_SLEEP), self.WAKE, idx)
+                    else:
+                        self._transmit(vnow, idx, frame, "data")
+            else:
+                reply, waited = self._deliver(vnow, rec)
+                if rec["kind"] == "sync":
+                    # 성공: delay(1000) 후 loop() 시작 / 실패: delay(1000) 후 재요청
+                    node.on_sync_reply(vnow + waited, reply)
+                    self._push(self._next_wake(vnow + waited + SYNC_RETRY_DELAY), self.WAKE, idx)
+                else:
+                    node.on_data_reply(vnow + waited, reply)
+                    self._push(self._next_wake(vnow + waited + LOOP_SLEEP), self.WAKE, idx)
+        return self.report(time.perf_counter() - r0, minutes)
+
+    def report(self, real_elapsed, minutes):
+        s = dict(self.stats)
+        data = s["data_frames"]
+        edge_sync_lost = sum(n.sync_lost for n in self.nodes)
+        lat = np.array(self.latencies) * 1000.0 if self.latencies else np.zeros(1)
+        return {
+            "nodes": len(self.nodes),
+            "virtual_minutes": minutes,
+            "speedup": self.speedup,
+            "real_elapsed_s": round(real_elapsed, 2),
+            "max_lag_s": round(self.max_lag, 3),
+            **s,
+            "synced_nodes": sum(n.synced for n in self.nodes),
+            "gateway_throughput_fps": round(s["delivered"] / real_elapsed, 1) if real_elapsed > 0 else None,
+            "reply_latency_ms": {
+                "p50": round(float(np.percentile(lat, 50)), 2),
+                "p95": round(float(np.percentile(lat, 95)), 2),
+                "p99": round(float(np.percentile(lat, 99)), 2),
+            },
+            "sync_loss_rate": round(edge_sync_lost / data, 4) if data else None,
+            "gateway_sync_loss_rate": round(s["reply_timeout"] / s["delivered"], 4) if s["delivered"] else None,
+            "tx_per_node_day": round(data / len(self.nodes) * 1440.0 / minutes, 1) if self.nodes else None,
+            "diverged_nodes": sum(1 for n in self.nodes if n.sync_lost > 0),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 엣지 노드 부하 발생기 (gateway.py pty 구동)")
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--minutes", type=float, default=30, help="가상 시간 (분)")
+    parser.add_argument("--speedup", type=float, default=60.0, help="배속 (inf = 대기 없이 최대 속도)")
+    parser.add_argument("--airtime-ms", type=float, default=60.0, help="프레임 1개 에어타임 (가상 ms)")
+    parser.add_argument("--loss", type=float, default=0.0, help="업링크 유실 확률")
+    parser.add_argument("--downlink-loss", type=float, default=0.0, help="회신 유실 확률")
+    parser.add_argument("--collision-loss", type=float, default=1.0, help="충돌 시 유실 확률")
+    parser.add_argument("--boot-spread-min", type=float, default=30.0, help="노드 부팅 시점 분산 구간 (분)")
+    parser.add_argument("--wake-jitter-ms", type=float, default=500.0, help="루프 주기 편차 (ms)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--edge-ts-bits", type=int, choices=(32, 64), default=EDGE_TS_BITS,
+                        help="엣지 타임스탬프 정수 폭 (32 = unsigned long 구 펌웨어, wrap)")
+    parser.add_argument("--no-spawn", action="store_true", help="게이트웨이를 띄우지 않고 pty 경로만 출력 (직접 실행)")
+    parser.add_argument("--gateway-log", default=None, help="게이트웨이 stdout 저장 경로")
+    parser.add_argument("--json", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    link = PtyGatewayLink(spawn=not args.no_spawn, log_path=args.gateway_log)
+    try:
+        if args.no_spawn:
+            print(f"pty: {link.port}  →  SERIAL_PORT={link.port} python gateway/gateway.py")
+        if not link.wait_ready(timeout=120 if args.no_spawn else 30):
+            print("gateway not responding")
+            return 1
+        print(f"gateway ready on {link.port}, {args.nodes} nodes x {args.minutes} min @ x{args.speedup}")
+        sim = FleetSimulator(
+            link, args.nodes, speedup=args.speedup, airtime=args.airtime_ms / 1000.0,
+            uplink_loss=args.loss, downlink_loss=args.downlink_loss, collision_loss=args.collision_loss,
+            boot_spread=args.boot_spread_min * 60.0, wake_jitter=args.wake_jitter_ms / 1000.0, seed=args.seed,
+            ts_bits=args.edge_ts_bits,
+        )
+        result = sim.run(args.minutes)
+    finally:
+        link.close()
+
+    result["created_at"] = datetime.now().isoformat(timespec="seconds")
+    print(json.dumps(result, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())